@@ -0,0 +1,466 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+Providers micro-benchmark.
+
+Runs every summary and synthetic provider registered in builtin packages against synthetic object memory
+(see `mallet.recorded_lldb`) and measures latency, number of SB API calls and Python allocations. Results are
+written as JSON and compared with stored baseline. Exit status is 1 if any provider regressed in SB API calls or
+allocations. Latency depends on the machine and its load, so it is only reported, unless `--check-latency` is given.
+
+Usage::
+
+    python helpers/benchmark.py                         # Run and compare with baseline.
+    python helpers/benchmark.py -o results.json         # Save results.
+    python helpers/benchmark.py --check-latency         # Treat latency regressions as failures.
+    python helpers/benchmark.py --update-baseline       # Store new baseline.
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import shlex
+import logging
+import argparse
+import platform
+import importlib
+import tracemalloc
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from mallet import recorded_lldb
+recorded_lldb.install()
+from mallet import loader
+
+
+# Benchmarked packages.
+PACKAGES = ["Foundation", "UIKit", "CFNetwork", "QuartzCore", "CoreGraphics", "AFNetworking", "StoreKit"]
+# Benchmarked architectures.
+ARCHITECTURES = ["arm64", "armv7"]
+# Default baseline path.
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Allowed regressions: relative latency (noisy), relative allocations and absolute SB API calls.
+LATENCY_TOLERANCE = 0.5
+LATENCY_MIN_DELTA = 20.0  # Microseconds.
+ALLOCATIONS_TOLERANCE = 0.1
+# Number of runs measuring allocations.
+ALLOCATIONS_RUNS = 10
+SB_CALLS_TOLERANCE = 0
+
+# Collection classes used for ivars of given class.
+_COLLECTION_CLASSES = {"NSArray": "__NSArrayI", "NSMutableArray": "__NSArrayM",
+                       "NSSet": "__NSSetI", "NSMutableSet": "__NSSetM",
+                       "NSOrderedSet": "__NSOrderedSetI", "NSMutableOrderedSet": "__NSOrderedSetM",
+                       "NSDictionary": "__NSDictionaryI", "NSMutableDictionary": "__NSDictionaryM"}
+# String classes.
+_STRING_CLASSES = ["NSString", "NSMutableString", "NSData", "NSMutableData",
+                   "NSLocale", "NSDecimalNumber", "UIColor", "UIFont"]
+# Concrete classes of `id` ivars.
+_ID_IVARS_CLASSES = {"_private": {"NSOperationQueue": "__NSOperationQueueInternal",
+                                  "NSOperation": "__NSOperationInternal",
+                                  "NSBlockOperation": "__NSOperationInternal"}}
+
+
+class ObjectFactory(object):
+    """
+    Creates synthetic objects. Ivars are filled with sample values based on class dumps. Objects which layouts
+    are not described by class dumps (private CoreFoundation / CoreAnimation structures) are created by fixtures.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param bool is_64bit: True if architecture is 64bit.
+    :param dict[str, function] fixtures: Maps class name to function which creates object.
+    """
+    def __init__(self, builder):
+        """
+        :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+        """
+        super(ObjectFactory, self).__init__()
+        self.builder = builder
+        self.is_64bit = builder.pointer_size == 8
+        self.fixtures = {"CALayer": self.new_layer,
+                         "CGImage": self.new_image,
+                         "_CFURLRequest": self.new_cf_url_request,
+                         "_CFURLResponse": self.new_cf_url_response,
+                         "CFURLResponse": self.new_cf_url_response}
+
+    def new_object(self, class_name, depth=2):
+        """
+        Creates object of given class with sample ivars values.
+
+        :param str class_name: Class name.
+        :param int depth: Depth of nested objects.
+        :return: Object address.
+        :rtype: int
+        """
+        if class_name in self.fixtures:
+            return self.fixtures[class_name]()
+        if class_name in _COLLECTION_CLASSES:
+            return self.builder.new_collection(_COLLECTION_CLASSES[class_name],
+                                               [self.builder.new_string("item{}".format(i)) for i in range(3)])
+        if class_name == "NSURL":
+            return self.builder.new_url("https://example.com/path")
+        if class_name == "NSNumber":
+            return self.builder.new_number(1)
+        if class_name == "NSDate":
+            return self.builder.new_date(500000000.0)
+        if class_name in _STRING_CLASSES:
+            return self.builder.new_string("{} value".format(class_name), class_name)
+
+        t = self.builder.type_table.find_type(class_name)
+        ivars = dict()
+        for field in t.fields:
+            value = self.sample_value(class_name, field.name, field.type, depth)
+            if value is not None:
+                ivars[field.offset] = (field.type.name, value)
+        return self.builder.new_object(class_name, ivars)
+
+    def sample_value(self, class_name, ivar_name, t, depth):
+        """
+        Returns sample value of given type.
+
+        :param str class_name: Class name.
+        :param str ivar_name: Ivar name.
+        :param recorded_lldb.SBType t: Ivar type.
+        :param int depth: Depth of nested objects.
+        :return: Sample value.
+        :rtype: int | float | dict | None
+        """
+        if t.kind == "basic" and t.fmt:
+            return 1.5 if t.fmt in "fd" else 1
+        if t.kind == "struct":
+            return {f.name: self.sample_value(class_name, f.name, f.type, depth) for f in t.fields}
+        if t.kind != "pointer":
+            return None
+
+        pointee_name = t.pointee.name[len("struct "):] if t.pointee.name.startswith("struct ") else t.pointee.name
+        if t.name == "id":
+            pointee_name = _ID_IVARS_CLASSES.get(ivar_name, dict()).get(class_name)
+        # Private structures are always created, providers expects them.
+        if pointee_name in self.fixtures:
+            return self.new_object(pointee_name, depth - 1)
+        if pointee_name is None or depth <= 0:
+            return None
+        if t.pointee.kind == "class":
+            return self.new_object(pointee_name, depth - 1)
+        return None
+
+    def new_layer(self):
+        """
+        Creates CALayer with position and bounds stored in internal CA::Layer.
+
+        :return: Layer address.
+        :rtype: int
+        """
+        b = self.builder
+        internal = b.allocate(0x100)
+        b.write_value(internal + (0x30 if self.is_64bit else 0x20), "CADoublePoint", (50.0, 25.0))
+        b.write_value(internal + (0x40 if self.is_64bit else 0x30), "CADoubleRect", (0.0, 0.0, 100.0, 50.0))
+        return b.new_object("CALayer", {"_attr": {"layer": internal}})
+
+    def new_image(self):
+        """
+        Creates CGImage.
+
+        :return: Image address.
+        :rtype: int
+        """
+        offset = 0x18 if self.is_64bit else 0x0c
+        return self.builder.new_object("CGImage", {offset: ("NSInteger", 640),
+                                                   offset + self.builder.pointer_size: ("NSInteger", 480)})
+
+    def new_http_message(self, method):
+        """
+        Creates CFHTTPMessage content with headers and HTTP method.
+
+        :param str | None method: HTTP method.
+        :return: Message address.
+        :rtype: int
+        """
+        b = self.builder
+        ptr = b.pointer_size
+        headers = self.new_object("NSMutableDictionary")
+        header_dict = b.allocate(ptr * 4)
+        b.write_value(header_dict + ptr, "NSDictionary *", headers)
+        message = b.allocate(0x100)
+        b.write_value(message + (0x60 if self.is_64bit else 0x30), "void *", header_dict)
+        if method is not None:
+            b.write_value(message + (0x88 if self.is_64bit else 0x44), "NSString *", b.new_string(method))
+        return message
+
+    def new_cf_url_request(self):
+        """
+        Creates _CFURLRequest.
+
+        :return: Request address.
+        :rtype: int
+        """
+        b = self.builder
+        request = b.allocate(0x100)
+        b.write_value(request + (0x28 if self.is_64bit else 0x14), "NSURL *",
+                      b.new_url("http://example.com/path"))
+        b.write_value(request + (0x58 if self.is_64bit else 0x30), "void *", self.new_http_message("GET"))
+        return request
+
+    def new_cf_url_response(self):
+        """
+        Creates _CFURLResponse.
+
+        :return: Response address.
+        :rtype: int
+        """
+        b = self.builder
+        response = b.allocate(0x100)
+        b.write_value(response + (0x20 if self.is_64bit else 0x10), "NSURL *",
+                      b.new_url("http://example.com/path"))
+        b.write_value(response + (0x70 if self.is_64bit else 0x44), "void *", self.new_http_message(None))
+        return response
+
+
+def find_providers(packages=None):
+    """
+    Returns providers registered in `lldbinit` files of packages.
+
+    :param list[str] packages: Packages names.
+    :return: List of tuples: package name, kind ("summary" or "synthetic"), provider path and type name.
+    :rtype: list[(str, str, str, str)]
+    """
+    mallet_path = os.path.dirname(os.path.abspath(loader.__file__))
+    providers = list()
+    for package in packages or PACKAGES:
+        lldbinit_path = os.path.join(mallet_path, package, "lldbinit")
+        if not os.path.exists(lldbinit_path):
+            continue
+        with open(lldbinit_path) as lldbinit_file:
+            for line in lldbinit_file:
+                tokens = shlex.split(line)
+                if tokens[:3] == ["type", "summary", "add"] and "-F" in tokens:
+                    kind = "summary"
+                    path = tokens[tokens.index("-F") + 1]
+                elif tokens[:3] == ["type", "synthetic", "add"] and "-l" in tokens:
+                    kind = "synthetic"
+                    path = tokens[tokens.index("-l") + 1]
+                else:
+                    continue
+                type_name = tokens[tokens.index("--category") + 2]
+                providers.append((package, kind, path, type_name))
+    return providers
+
+
+def load_provider(path):
+    """
+    Returns provider function or class.
+
+    :param str path: Full path, e.g. `mallet.UIKit.UIView.summary_provider`.
+    :rtype: function | class
+    """
+    module_name, name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), name)
+
+
+def run_provider(kind, provider, value):
+    """
+    Computes summary or all synthetic children of value.
+
+    :param str kind: "summary" or "synthetic".
+    :param function | class provider: Provider function or class.
+    :param recorded_lldb.SBValue value: Value.
+    :return: Summary or list of children names.
+    :rtype: str | list[str]
+    """
+    if kind == "summary":
+        return provider(value, dict())
+    synthetic = provider(value, dict())
+    synthetic.update()
+    return [synthetic.get_child_at_index(i).GetName() for i in range(synthetic.num_children())]
+
+
+def benchmark_provider(target, kind, provider, iterations):
+    """
+    Benchmarks provider on "object" variable of target.
+
+    :param recorded_lldb.SBTarget target: Target.
+    :param str kind: "summary" or "synthetic".
+    :param function | class provider: Provider function or class.
+    :param int iterations: Number of iterations.
+    :return: Measurements.
+    :rtype: dict
+    """
+    # Warm up (imports, type cache, class dumps).
+    result = run_provider(kind, provider, target.FindVariable("object"))
+
+    # SB API calls.
+    value = target.FindVariable("object")
+    recorded_lldb.reset_statistics()
+    run_provider(kind, provider, value)
+    sb_calls = dict(recorded_lldb.statistics)
+
+    # Allocations. Garbage collector is paused, so peak doesn't depend on collections of garbage of previous runs.
+    # The first runs allocate also entries of shared caches and free lists, the minimum is the steady state.
+    allocated = None
+    for _ in range(ALLOCATIONS_RUNS):
+        value = target.FindVariable("object")
+        gc.collect()
+        gc.disable()
+        tracemalloc.start()
+        try:
+            run_provider(kind, provider, value)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            gc.enable()
+        allocated = peak if allocated is None else min(allocated, peak)
+
+    # Latency.
+    durations = list()
+    for _ in range(iterations):
+        value = target.FindVariable("object")
+        start = time.perf_counter()
+        run_provider(kind, provider, value)
+        durations.append((time.perf_counter() - start) * 1000000.0)
+    durations.sort()
+
+    return {"result": result,
+            "latency_us": durations[len(durations) // 2],
+            "latency_min_us": durations[0],
+            "sb_calls": sum(sb_calls.values()),
+            "sb_calls_by_method": sb_calls,
+            "allocated_bytes": allocated}
+
+
+def run(packages=None, architectures=None, iterations=50):
+    """
+    Runs benchmark for all providers and architectures.
+
+    :param list[str] packages: Packages names.
+    :param list[str] architectures: Architectures names.
+    :param int iterations: Number of iterations.
+    :return: Results, maps benchmark name to measurements.
+    :rtype: dict[str, dict]
+    """
+    recorded_lldb.register_builtin_class_dumps(loader.get_shared_lazy_class_dump_manager())
+    class_dump_manager = recorded_lldb.get_builtin_class_dump_manager()
+
+    results = dict()
+    for architecture in architectures or ARCHITECTURES:
+        for package, kind, path, type_name in find_providers(packages):
+            name = "{}/{}/{}/{}".format(architecture, kind, path[len("mallet."):], type_name)
+            builder = recorded_lldb.MemoryImageBuilder(architecture, class_dump_manager)
+            builder.add_variable("object", "{} *".format(type_name), ObjectFactory(builder).new_object(type_name))
+            target = recorded_lldb.SBTarget(builder.build(), class_dump_manager)
+            recorded_lldb.debugger.SetSelectedTarget(target)
+            try:
+                results[name] = benchmark_provider(target, kind, load_provider(path), iterations)
+            except Exception as e:
+                results[name] = {"error": "{}: {}".format(e.__class__.__name__, e)}
+    return results
+
+
+def compare(results, baseline, check_latency=False):
+    """
+    Compares results with baseline.
+
+    :param dict[str, dict] results: Benchmark results.
+    :param dict[str, dict] baseline: Baseline results.
+    :param bool check_latency: True if latency regressions are regressions, otherwise they are warnings.
+    :return: Lists of regressions and warnings descriptions.
+    :rtype: (list[str], list[str])
+    """
+    regressions = list()
+    warnings = list()
+    for name, base in sorted(baseline.items()):
+        current = results.get(name)
+        if current is None:
+            continue
+        if "error" in current and "error" not in base:
+            regressions.append("{}: {}".format(name, current["error"]))
+            continue
+        if "error" in current or "error" in base:
+            continue
+        # Minimal latency is the least sensitive to noise of other processes.
+        if current["latency_min_us"] > max(base["latency_min_us"] * (1 + LATENCY_TOLERANCE),
+                                           base["latency_min_us"] + LATENCY_MIN_DELTA):
+            (regressions if check_latency else warnings).append(
+                "{}: latency {:.1f}us > {:.1f}us".format(name, current["latency_min_us"], base["latency_min_us"]))
+        if current["sb_calls"] > base["sb_calls"] + SB_CALLS_TOLERANCE:
+            regressions.append("{}: SB API calls {} > {}".format(name, current["sb_calls"], base["sb_calls"]))
+        if current["allocated_bytes"] > base["allocated_bytes"] * (1 + ALLOCATIONS_TOLERANCE):
+            regressions.append("{}: allocations {}B > {}B".format(name, current["allocated_bytes"],
+                                                                 base["allocated_bytes"]))
+    return regressions, warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks Mallet providers on synthetic memory.")
+    parser.add_argument("-p", "--package", action="append", dest="packages", help="Package name (default: all).")
+    parser.add_argument("-a", "--arch", action="append", dest="architectures",
+                        help="Architecture name (default: {}).".format(", ".join(ARCHITECTURES)))
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="Number of timed iterations.")
+    parser.add_argument("-o", "--output", help="Output JSON file.")
+    parser.add_argument("-b", "--baseline", default=BASELINE_PATH, help="Baseline JSON file.")
+    parser.add_argument("--check-latency", action="store_true", help="Fails on latency regressions.")
+    parser.add_argument("--update-baseline", action="store_true", help="Stores results as new baseline.")
+    args = parser.parse_args()
+
+    # Providers errors (e.g. missing ivars) are not printed, but still formatted like in LLDB.
+    logging.getLogger("mallet").addHandler(logging.NullHandler())
+    results = run(args.packages, args.architectures, args.iterations)
+    output = {"python": platform.python_version(),
+              "iterations": args.iterations,
+              "results": results}
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(output, output_file, indent=2, sort_keys=True)
+    for name in sorted(results):
+        r = results[name]
+        if "error" in r:
+            print("{:<100} {}".format(name, r["error"]))
+        else:
+            print("{:<100} {:>9.1f}us {:>5} calls {:>8}B".format(name, r["latency_us"], r["sb_calls"],
+                                                                 r["allocated_bytes"]))
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(output, baseline_file, indent=2, sort_keys=True)
+        print("Baseline saved to {}.".format(args.baseline))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Baseline {} not found.".format(args.baseline))
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    regressions, warnings = compare(results, baseline, args.check_latency)
+    for warning in warnings:
+        print("WARNING {}".format(warning))
+    for regression in regressions:
+        print("REGRESSION {}".format(regression))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -59,7 +59,6 @@ class AFHTTPRequestSerializerSyntheticProvider(NSObject.NSObjectSyntheticProvide
                                   summary_function=self.get_http_request_headers_summary)
 
         self.synthetic_type = self.SYNTHETIC_PROXY_VALUE
-        self.synthetic_proxy_value = self.get_proxy_value()
 
     @staticmethod
     def get_string_encoding_summary(value):
@@ -122,6 +121,9 @@ class AFHTTPRequestSerializerSyntheticProvider(NSObject.NSObjectSyntheticProvide
     def get_child_index(self, name):
         return None
 
+    def update_synthetic_children(self):
+        self.synthetic_proxy_value = self.get_proxy_value()
+
     def summaries_parts(self):
         return [self.string_encoding_summary,
                 self.allows_cellular_access_summary,
@@ -72,9 +72,13 @@ class CFURLRequestSyntheticProvider(SummaryBase.SummaryBaseSyntheticProvider):
         return "{}".format(value)
 
     def summaries_parts(self):
-        return [self.http_message_content_provider.http_method_summary,
+        content_provider = self.http_message_content_provider
+        if content_provider is None:
+            return [self.url_summary]
+        tmp1_provider = content_provider.tmp1_provider
+        return [content_provider.http_method_summary,
                 self.url_summary,
-                self.http_message_content_provider.tmp1_provider.http_body_summary]
+                None if tmp1_provider is None else tmp1_provider.http_body_summary]
 
 
 def summary_provider(value_obj, internal_dict):
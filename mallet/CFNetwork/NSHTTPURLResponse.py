@@ -47,7 +47,8 @@ class NSHTTPURLResponseSyntheticProvider(NSURLResponse.NSURLResponseSyntheticPro
         return provider.summary()
 
     def summaries_parts(self):
-        return self.response_internal_provider.summaries_parts()
+        provider = self.response_internal_provider
+        return list() if provider is None else provider.summaries_parts()
 
 
 def summary_provider(value_obj, internal_dict):
@@ -51,7 +51,8 @@ class NSURLConnectionSyntheticProvider(NSObject.NSObjectSyntheticProvider):
         return provider.summary()
 
     def summaries_parts(self):
-        return self.internal_provider.summaries_parts()
+        provider = self.internal_provider
+        return list() if provider is None else provider.summaries_parts()
 
 
 def summary_provider(value_obj, internal_dict):
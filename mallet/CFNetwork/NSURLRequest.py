@@ -51,7 +51,6 @@ class NSURLRequestSyntheticProvider(NSObject.NSObjectSyntheticProvider):
                                   summary_function=self.get_request_internal_summary)
 
         self.synthetic_type = self.SYNTHETIC_PROXY_VALUE
-        self.synthetic_proxy_value = self.get_proxy_value()
 
     @staticmethod
     def get_request_internal_summary(provider):
@@ -65,15 +64,23 @@ class NSURLRequestSyntheticProvider(NSObject.NSObjectSyntheticProvider):
         Returns proxy value.
 
         :return: Proxy value.
-        :rtype: lldb.SBValue
+        :rtype: lldb.SBValue | None
         """
         request_internal = self.request_internal_provider
         """:type: NSURLRequestInternal.NSURLRequestInternalSyntheticProvider"""
+        if request_internal is None:
+            return None
         request = request_internal.request_provider
         """:type: CFURLResponse.CFURLResponseSyntheticProvider"""
+        if request is None:
+            return None
         http_message_content = request.http_message_content_provider
         """:type: CFHTTPMessage.CFHTTPMessageContentSyntheticProvider"""
+        if http_message_content is None:
+            return None
         headers_dict = http_message_content.get_http_header_dict_provider()
+        if headers_dict is None:
+            return None
         headers_count = headers_dict.all_http_header_fields_value
 
         if headers_count is None or headers_count == 0:
@@ -83,8 +90,12 @@ class NSURLRequestSyntheticProvider(NSObject.NSObjectSyntheticProvider):
     def get_child_index(self, name):
         return None
 
+    def update_synthetic_children(self):
+        self.synthetic_proxy_value = self.get_proxy_value()
+
     def summaries_parts(self):
-        return self.request_internal_provider.summaries_parts()
+        provider = self.request_internal_provider
+        return list() if provider is None else provider.summaries_parts()
 
 
 def get_cache_policy_text(value):
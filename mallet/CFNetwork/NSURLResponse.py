@@ -40,7 +40,6 @@ class NSURLResponseSyntheticProvider(NSObject.NSObjectSyntheticProvider):
                                   summary_function=self.get_response_internal_summary)
 
         self.synthetic_type = self.SYNTHETIC_PROXY_VALUE
-        self.synthetic_proxy_value = self.get_proxy_value()
 
     @staticmethod
     def get_response_internal_summary(provider):
@@ -54,15 +53,23 @@ class NSURLResponseSyntheticProvider(NSObject.NSObjectSyntheticProvider):
         Returns proxy value.
 
         :return: Proxy value.
-        :rtype: lldb.SBValue
+        :rtype: lldb.SBValue | None
         """
         response_internal = self.response_internal_provider
         """:type: NSURLResponseInternal.NSURLResponseInternalSyntheticProvider"""
+        if response_internal is None:
+            return None
         request = response_internal.response_provider
         """:type: CFURLRequest.CFURLRequestSyntheticProvider"""
+        if request is None:
+            return None
         http_message_content = request.http_message_content_provider
         """:type: CFHTTPMessage.CFHTTPMessageContentSyntheticProvider"""
+        if http_message_content is None:
+            return None
         headers_dict = http_message_content.get_http_header_dict_provider()
+        if headers_dict is None:
+            return None
         headers_count = headers_dict.all_http_header_fields_value
 
         if headers_count is None or headers_count == 0:
@@ -72,8 +79,12 @@ class NSURLResponseSyntheticProvider(NSObject.NSObjectSyntheticProvider):
     def get_child_index(self, name):
         return None
 
+    def update_synthetic_children(self):
+        self.synthetic_proxy_value = self.get_proxy_value()
+
     def summaries_parts(self):
-        return self.response_internal_provider.summaries_parts()
+        provider = self.response_internal_provider
+        return list() if provider is None else provider.summaries_parts()
 
 
 def summary_provider(value_obj, internal_dict):
@@ -47,7 +47,8 @@ class NSURLResponseInternalSyntheticProvider(NSObject.NSObjectSyntheticProvider)
         return provider.summary()
 
     def summaries_parts(self):
-        return self.response_provider.summaries_parts()
+        provider = self.response_provider
+        return list() if provider is None else provider.summaries_parts()
 
 
 def summary_provider(value_obj, internal_dict):
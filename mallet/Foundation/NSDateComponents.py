@@ -218,10 +218,6 @@ class NSDateComponentsSyntheticProvider(NSObject.NSObjectSyntheticProvider):
                 synthetic_children.append(name)
         self.synthetic_children = synthetic_children
 
-    def update(self):
-        self.update_synthetic_children()
-        return True
-
     def summaries_parts(self):
         year_value = self.year_value
         month_value = self.month_value
@@ -50,7 +50,8 @@ class NSOperationQueueSyntheticProvider(NSObject.NSObjectSyntheticProvider):
         return provider.summary()
 
     def summaries_parts(self):
-        return self.private_provider.summaries_parts()
+        provider = self.private_provider
+        return list() if provider is None else provider.summaries_parts()
 
 
 def summary_provider(value_obj, internal_dict):
@@ -151,11 +151,15 @@ class NSOperationQueueInternalSyntheticProvider(NSObject.NSObjectSyntheticProvid
     def get_name_summary(value):
         return "name={}".format(value)
 
-    def get_operations_count(self):
+    def iter_operations(self, max_count=None):
         """
-        Returns operations count.
-        :return: Operations count.
-        :rtype: int
+        Iterates over operations of the queue, following `__nextOp` pointers of operations (starting from
+        `__firstOperation` or `__pendingFirstOperation`). Iteration stops on nil, already visited operation
+        or after `max_count` operations.
+
+        :param int | None max_count: Maximal number of operations (None - unlimited).
+        :return: Generator of operations providers.
+        :rtype: collections.Iterable[NSOperation.NSOperationSyntheticProvider]
         """
         addresses = set()
 
@@ -163,23 +167,34 @@ class NSOperationQueueInternalSyntheticProvider(NSObject.NSObjectSyntheticProvid
         operation = self.first_operation
         """:type: lldb.SBValue"""
         operation_value = SummaryBase.get_unsigned_value(operation)
-        if operation_value == 0:
+        if not operation_value:
             operation = self.pending_first_operation
             """:type: lldb.SBValue"""
             operation_value = SummaryBase.get_unsigned_value(operation)
 
-        # Add operation address to set.
-        while operation_value != 0:
+        # Stops on nil or already visited operation.
+        while operation_value and operation_value not in addresses:
+            if max_count is not None and len(addresses) >= max_count:
+                return
             addresses.add(operation_value)
+            operation_provider = NSOperation.NSOperationSyntheticProvider(operation, self.internal_dict)
+            yield operation_provider
 
             # Get next operation.
-            operation_provider = NSOperation.NSOperationSyntheticProvider(operation, self.internal_dict)
             operation_internal_provider = operation_provider.private_provider
             """:type: NSOperationInternal.NSOperationInternalSyntheticProvider"""
+            if operation_internal_provider is None:
+                break
             operation = operation_internal_provider.next_operation
             operation_value = SummaryBase.get_unsigned_value(operation)
 
-        return len(addresses)
+    def get_operations_count(self):
+        """
+        Returns operations count.
+        :return: Operations count.
+        :rtype: int
+        """
+        return sum(1 for _ in self.iter_operations())
 
     def get_operations_count_summary(self):
         count = self.get_operations_count()
@@ -51,7 +51,7 @@ class NSURLComponentsSyntheticProvider(NSObject.NSObjectSyntheticProvider):
                                   primitive_value_function=SummaryBase.get_stripped_summary_value,
                                   summary_function=self.get_host_component_summary)
         self.register_child_value("port_component", ivar_name="_portComponent",
-                                  primitive_value_function=SummaryBase.get_description_value,
+                                  primitive_value_function=SummaryBase.get_number_value,
                                   summary_function=self.get_port_component_summary)
         self.register_child_value("path_component", ivar_name="_pathComponent",
                                   primitive_value_function=SummaryBase.get_stripped_summary_value,
@@ -111,10 +111,6 @@ class NSURLComponentsSyntheticProvider(NSObject.NSObjectSyntheticProvider):
                 synthetic_children.append(name)
         self.synthetic_children = synthetic_children
 
-    def update(self):
-        self.update_synthetic_children()
-        return True
-
     def summaries_parts(self):
         return [self.url_string_summary,
                 self.scheme_component_summary,
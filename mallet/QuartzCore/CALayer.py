@@ -22,9 +22,18 @@
 # IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import struct
 from .. import helpers
+from .. import loader
+from .. import memory_cache
+from .. import memory_regions
 from ..Foundation import NSObject
 from . import CALayerIvars
+from . import CALayerInternalLayer
+
+
+# Position (x, y) and bounds (x, y, width, height) of internal layer, bounds directly follow position.
+GEOMETRY = struct.Struct("<6d")
 
 
 class CALayerSyntheticProvider(NSObject.NSObjectSyntheticProvider):
@@ -55,22 +64,71 @@ class CALayerSyntheticProvider(NSObject.NSObjectSyntheticProvider):
         Returns position provider.
 
         :return: Position provider.
-        :rtype: CADoublePoint.CADoublePointSyntheticProvider
+        :rtype: CADoublePoint.CADoublePointSyntheticProvider | None
         """
-        return self.attr_provider.layer_provider.position_provider
+        layer_provider = self.get_layer_provider()
+        return None if layer_provider is None else layer_provider.position_provider
 
     def get_bounds_provider(self):
         """
         Returns bounds provider.
 
         :return: bounds provider.
-        :rtype: CADoubleRect.CADoubleRectSyntheticProvider
+        :rtype: CADoubleRect.CADoubleRectSyntheticProvider | None
+        """
+        layer_provider = self.get_layer_provider()
+        return None if layer_provider is None else layer_provider.bounds_provider
+
+    def get_layer_provider(self):
+        """
+        Returns internal layer provider.
+
+        :return: Internal layer provider.
+        :rtype: CALayerInternalLayer.CALayerInternalLayerSyntheticProvider | None
         """
-        return self.attr_provider.layer_provider.bounds_provider
+        attr_provider = self.attr_provider
+        return None if attr_provider is None else attr_provider.layer_provider
 
     def summaries_parts(self):
-        return self.attr_provider.summaries_parts()
+        provider = self.attr_provider
+        return list() if provider is None else provider.summaries_parts()
 
 
 def summary_provider(value_obj, internal_dict):
     return helpers.generic_summary_provider(value_obj, internal_dict, CALayerSyntheticProvider)
+
+
+def decode_geometry(process, layer_address, architecture_name, is_64bit):
+    """
+    Decodes position and bounds of layer directly from memory, without creating providers: follows `layer`
+    pointer of `_attr` structure (`_CALayerIvars`) to internal layer and unpacks its position and bounds
+    with single read.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param int layer_address: CALayer address.
+    :param str architecture_name: Architecture name.
+    :param bool is_64bit: True if architecture is 64 bit.
+    :return: Position x, y and bounds x, y, width, height or None if layer cannot be decoded.
+    :rtype: (float, float, float, float, float, float) | None
+    """
+    regions = memory_regions.get_memory_regions()
+    if not regions.is_plausible_object_pointer(process, layer_address, architecture_name):
+        return None
+    attr = loader.get_shared_lazy_class_dump_manager().get_ivar("QuartzCore", architecture_name, "CALayer", "_attr")
+    if attr is None or attr.offset is None:
+        return None
+
+    cache = memory_cache.get_memory_cache()
+    pointer_size = 8 if is_64bit else 4
+    internal_layer = cache.read_unsigned(process, layer_address + attr.offset + CALayerIvars.LAYER_OFFSET,
+                                         pointer_size)
+    if not internal_layer:
+        return None
+    if is_64bit:
+        position_offset = CALayerInternalLayer.POSITION_OFFSET_64
+    else:
+        position_offset = CALayerInternalLayer.POSITION_OFFSET_32
+    data = cache.read(process, internal_layer + position_offset, GEOMETRY.size)
+    if data is None:
+        return None
+    return GEOMETRY.unpack(data)
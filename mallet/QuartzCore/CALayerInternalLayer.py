@@ -27,23 +27,37 @@ from . import CADoublePoint
 from . import CADoubleRect
 
 
+# Offsets of position (CADoublePoint) and bounds (CADoubleRect) on 64 and 32 bit architectures.
+POSITION_OFFSET_64 = 0x30
+BOUNDS_OFFSET_64 = 0x40
+POSITION_OFFSET_32 = 0x20
+BOUNDS_OFFSET_32 = 0x30
+# Offsets of sublayers array (CALayerArray) on 64 and 32 bit architectures. UNVERIFIED: CA::Layer isn't part
+# of class dumps and these offsets weren't checked against CoreAnimation of any iOS version. Decoded sublayers
+# have to be validated, invalid sublayers pointers are reported by `layer-tree` (see `layer_hierarchy`).
+SUBLAYERS_OFFSET_64 = 0x18
+SUBLAYERS_OFFSET_32 = 0x14
+
+
 class CALayerInternalLayerSyntheticProvider(SummaryBase.SummaryBaseSyntheticProvider):
     """
     Class representing CALayer internals.
     """
     # Name:                          armv7                 i386                  arm64                 x86_64
+    # CALayerArray *sublayers     20 (0x014) / 4        20 (0x014) / 4        24 (0x018) / 8        24 (0x018) / 8
     # CADoublPoint position       32 (0x020) / 16       32 (0x020) / 16       48 (0x030) / 16       48 (0x030) / 16
     # CADoubleRect bounds         48 (0x030) / 32       48 (0x030) / 32       64 (0x040) / 16       64 (0x040) / 16
+    # Sublayers offsets are unverified (see SUBLAYERS_OFFSET_64).
 
     def __init__(self, value_obj, internal_dict):
         super(CALayerInternalLayerSyntheticProvider, self).__init__(value_obj, internal_dict)
 
         if self.is_64bit:
-            position_offset = 0x30
-            bounds_offset = 0x40
+            position_offset = POSITION_OFFSET_64
+            bounds_offset = BOUNDS_OFFSET_64
         else:
-            position_offset = 0x20
-            bounds_offset = 0x30
+            position_offset = POSITION_OFFSET_32
+            bounds_offset = BOUNDS_OFFSET_32
 
         # Using CGPoint for workaround. LLDB cannot find type CADoublePoint.
         self.register_child_value("position", ivar_name="position", type_name="CGPoint", offset=position_offset,
@@ -26,6 +26,10 @@ from ..common import SummaryBase
 from . import CALayerInternalLayer
 
 
+# Offset of `layer` pointer (after refcount and magic).
+LAYER_OFFSET = 8
+
+
 class CALayerIvarsSyntheticProvider(SummaryBase.SummaryBaseSyntheticProvider):
     """
     Class representing CALayer private ivar.
@@ -64,4 +68,5 @@ class CALayerIvarsSyntheticProvider(SummaryBase.SummaryBaseSyntheticProvider):
         return provider.summary()
 
     def summaries_parts(self):
-        return self.layer_provider.summaries_parts()
\ No newline at end of file
+        provider = self.layer_provider
+        return list() if provider is None else provider.summaries_parts()
\ No newline at end of file
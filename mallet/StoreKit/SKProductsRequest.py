@@ -51,7 +51,8 @@ class SKProductsRequestSyntheticProvider(SKRequest.SKRequestSyntheticProvider):
         return provider.summary()
 
     def summaries_parts(self):
-        return self.products_request_internal_provider.summaries_parts()
+        provider = self.products_request_internal_provider
+        return list() if provider is None else provider.summaries_parts()
 
 
 def summary_provider(value_obj, internal_dict):
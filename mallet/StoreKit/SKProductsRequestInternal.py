@@ -46,4 +46,4 @@ class SKProductsRequestInternalSyntheticProvider(NSObject.NSObjectSyntheticProvi
             return "@\"{} products\"".format(value)
 
     def summaries_parts(self):
-        return self.product_identifiers_provider.summaries_parts()
+        return [self.product_identifiers_summary]
@@ -98,7 +98,8 @@ class UIAlertViewSyntheticProvider(UIView.UIViewSyntheticProvider):
         return "style={}".format(get_alert_view_style_name(value))
 
     def get_title_summary(self):
-        return self.alert_controller_provider.title_summary
+        alert_controller_provider = self.alert_controller_provider
+        return None if alert_controller_provider is None else alert_controller_provider.title_summary
 
     def summaries_parts(self):
         return [self.get_title_summary(), self.message_summary, self.alert_view_style_summary]
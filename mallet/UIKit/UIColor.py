@@ -23,6 +23,7 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from .. import helpers
+from .. import object_description
 from ..common import SummaryBase
 from ..Foundation import NSObject
 
@@ -58,7 +59,7 @@ def summary_provider(value_obj, internal_dict):
     :return: UIColor summary.
     :rtype: str
     """
-    class_name = helpers.get_object_class_name(value_obj)
+    class_name = object_description.get_object_describer().get_class_name(value_obj)
 
     if class_name == "UIDeviceWhiteColor" or class_name == "UICachedDeviceWhiteColor":
         from . import UIDeviceWhiteColor
@@ -23,6 +23,7 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from .. import helpers
+from .. import object_description
 from ..common import SummaryBase
 from ..Foundation import NSObject
 
@@ -51,7 +52,7 @@ def summary_provider(value_obj, internal_dict):
     :return: UIEvent summary.
     :rtype: str
     """
-    class_name = helpers.get_object_class_name(value_obj)
+    class_name = object_description.get_object_describer().get_class_name(value_obj)
 
     if class_name == "UITouchesEvent":
         from . import UITouchesEvent
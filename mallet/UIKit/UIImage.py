@@ -70,8 +70,11 @@ class UIImageSyntheticProvider(NSObject.NSObjectSyntheticProvider):
         if scale == 0 or scale is None:
             return None
 
-        width = self.image_ref_provider.width_value
-        height = self.image_ref_provider.height_value
+        image_ref_provider = self.image_ref_provider
+        if image_ref_provider is None:
+            return None
+        width = image_ref_provider.width_value
+        height = image_ref_provider.height_value
         if width is None or height is None:
             return None
 
@@ -51,7 +51,16 @@ class UIScrollViewSyntheticProvider(UIView.UIViewSyntheticProvider):
                                   summary_function=self.get_maximum_zoom_scale_summary)
 
     def get_content_offset_summary(self):
-        origin = self.layer_provider.get_bounds_provider().origin_provider
+        geometry = self.get_layer_geometry()
+        if geometry is not None:
+            _, _, x, y, _, _ = geometry
+            return "contentOffset=({}, {})".format(SummaryBase.formatted_float(x), SummaryBase.formatted_float(y))
+
+        layer_provider = self.layer_provider
+        bounds = None if layer_provider is None else layer_provider.get_bounds_provider()
+        if bounds is None:
+            return None
+        origin = bounds.origin_provider
         return "contentOffset=({}, {})".format(SummaryBase.formatted_float(origin.x_value),
                                                SummaryBase.formatted_float(origin.y_value))
 
@@ -23,6 +23,7 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from .. import helpers
+from .. import summary_verbosity
 from ..common import SummaryBase
 from ..QuartzCore import CALayer
 from . import UIResponder
@@ -50,6 +51,12 @@ class UIViewSyntheticProvider(UIResponder.UIResponderSyntheticProvider):
         self.register_child_value("layer", ivar_name="_layer",
                                   provider_class=CALayer.CALayerSyntheticProvider)
         self.frame = None
+        self.layer_geometry = None
+
+    def reset_cached_values(self):
+        super(UIViewSyntheticProvider, self).reset_cached_values()
+        self.frame = None
+        self.layer_geometry = None
 
     @staticmethod
     def get_tag_summary(value):
@@ -58,10 +65,45 @@ class UIViewSyntheticProvider(UIResponder.UIResponderSyntheticProvider):
         else:
             return None
 
+    @helpers.save_parameter("layer_geometry")
+    def get_layer_geometry(self):
+        """
+        Returns position and bounds of view layer decoded directly from memory (see `CALayer.decode_geometry`).
+
+        :return: Position x, y and bounds x, y, width, height or None if layer cannot be decoded.
+        :rtype: (float, float, float, float, float, float) | None
+        """
+        # Layer is nested object, it isn't shown by fast summaries.
+        if summary_verbosity.get_summary_verbosity().max_cost < summary_verbosity.COST_NESTED:
+            return None
+        ivar = self.get_ivar("_layer")
+        if ivar is None or ivar.offset is None:
+            return None
+        layer_address = self.read_pointer(ivar.offset)
+        if layer_address is None:
+            return None
+        return CALayer.decode_geometry(self.get_process(), layer_address, self.architecture_name, self.is_64bit)
+
     @helpers.save_parameter("frame")
     def get_frame(self):
-        position = self.layer_provider.get_position_provider()
-        bounds = self.layer_provider.get_bounds_provider()
+        geometry = self.get_layer_geometry()
+        if geometry is not None:
+            position_x, position_y, _, _, width, height = geometry
+            frame = Rect()
+            frame.width = width
+            frame.height = height
+            frame.x = position_x - width / 2
+            frame.y = position_y - height / 2
+            return frame
+
+        # Layer memory cannot be decoded, using providers.
+        layer_provider = self.layer_provider
+        if layer_provider is None:
+            return None
+        position = layer_provider.get_position_provider()
+        bounds = layer_provider.get_bounds_provider()
+        if position is None or bounds is None:
+            return None
 
         frame = Rect()
         frame.width = bounds.size_provider.width_value
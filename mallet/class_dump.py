@@ -25,7 +25,9 @@
 import json
 import os
 import logging
+import threading
 from . import logger
+from . import tracer
 
 
 class_dumps_folder_name = "class_dumps"
@@ -37,12 +39,14 @@ class LazyClassDumpManager(object):
     Lazy loads class data into memory.
 
     :param dict[str, Module] modules: Maps module name to module.
+    :param dict[(str, str, str), int | None] instance_sizes: Maps module, architecture and class name to instance size.
     """
     def __init__(self):
         super(LazyClassDumpManager, self).__init__()
         log = logging.getLogger(__name__)
         log.debug("LazyClassDumpManager: created.")
         self.modules = dict()
+        self.instance_sizes = dict()
 
     def register_module(self, module_name, module_path):
         """
@@ -55,7 +59,7 @@ class LazyClassDumpManager(object):
         module_path = os.path.normpath(module_path)
         # Check if directory exists.
         if not os.path.exists(module_path):
-            log.error("LazyClassDumpManager: Cannot find module \"{}\" directory \"{}\".".format(module_name, module_path))
+            log.error("LazyClassDumpManager: Cannot find module \"%s\" directory \"%s\".", module_name, module_path)
             return
 
         # Loads module.
@@ -112,6 +116,39 @@ class LazyClassDumpManager(object):
         c = module.get_class_or_load(architecture_name, class_name)
         return c
 
+    def get_instance_size(self, module_name, architecture_name, class_name):
+        """
+        Returns size of class instance (end of the last ivar of class and its super classes).
+
+        :param str module_name: Module name.
+        :param str architecture_name: Architecture name.
+        :param str class_name: Class name.
+        :return: Size of class instance or None if class is not found.
+        :rtype: int | None
+        """
+        key = (module_name, architecture_name, class_name)
+        if key in self.instance_sizes:
+            return self.instance_sizes[key]
+
+        size = None
+        c = self.get_class(module_name, architecture_name, class_name)
+        while c is not None:
+            for ivar in c.ivars:
+                if ivar.offset is not None and ivar.size is not None:
+                    size = max(size or 0, ivar.offset + ivar.size)
+            if c.super_class_name is None:
+                break
+            # Super class can be defined in another module.
+            super_class = self.get_class(module_name, architecture_name, c.super_class_name)
+            if super_class is None:
+                super_module_name = self.find_module_for_class(architecture_name, c.super_class_name)
+                if super_module_name is not None:
+                    super_class = self.get_class(super_module_name, architecture_name, c.super_class_name)
+            c = super_class
+
+        self.instance_sizes[key] = size
+        return size
+
     def get_ivar(self, module_name, architecture_name, class_name, ivar_name):
         """
         Returns Ivar object based on module name, architecture name, class name and ivar name.
@@ -210,6 +247,8 @@ class Module(object):
     :param str dir_path: Path to module directory.
     :param dict[str, str] module_file_map: Module map. Maps class name to class file path.
     :param dict[str, Architecture] architectures: Maps architecture name to Architecture object.
+    :param threading.RLock lock: Lock of loading classes, class JSON is loaded only once when many threads
+                                 ask for the same class.
     """
     def __init__(self, name, dir_path=None):
         """
@@ -220,6 +259,7 @@ class Module(object):
         self.dir_path = dir_path
         self.module_file_map = None
         self.architectures = dict()
+        self.lock = threading.RLock()
         if dir_path:
             self._read_module_map()
 
@@ -344,7 +384,7 @@ class Module(object):
         # Check if module map exists.
         module_map_file_path = os.path.join(self.dir_path, module_map_file_name)
         if not os.path.exists(module_map_file_path):
-            log.error("Module: _read_module_map: Cannot find module map \"{}\" at \"{}\".".format(self.name, module_map_file_path))
+            log.error("Module: _read_module_map: Cannot find module map \"%s\" at \"%s\".", self.name, module_map_file_path)
             raise Exception()
 
         # Reads module map into memory.
@@ -360,47 +400,60 @@ class Module(object):
         :return: Class object for given architecture and class name.
         :rtype: Class | None
         """
-        log = logging.getLogger(__name__)
-        # Load architecture.
-        a = self.get_architecture(architecture_name)
-        if not a:
-            a = Architecture(architecture_name)
-            self.architectures[architecture_name] = a
-
-        # Load class.
-        c = a.get_class(class_name)
-        if c:
-            return c
-
-        # Read class when not yet exists.
-        if class_name in self.module_file_map:
-            # Get path to class json.
-            class_path = self.module_file_map[class_name]
-            class_path = os.path.join(self.dir_path, class_path)
-            # File doesn't exists.
-            if not os.path.exists(class_path):
-                log.error("Module: get_class_or_load: Cannot find file: \"{}\".".format(class_path))
-                return None
-
-            # Open file.
-            with open(class_path, "r") as f:
-                json_data = json.load(f)
-
-                # File is empty.
-                if not json_data:
-                    log.error("Module: get_class_or_load: Cannot open file \"{}\".".format(class_path))
+        # Fast path, class is already loaded.
+        a = self.architectures.get(architecture_name)
+        if a:
+            c = a.get_class(class_name)
+            if c:
+                return c
+
+        # Class is loaded under lock, another thread could load it in the meantime.
+        with self.lock:
+            log = logging.getLogger(__name__)
+            # Load architecture.
+            a = self.get_architecture(architecture_name)
+            if not a:
+                a = Architecture(architecture_name)
+                self.architectures[architecture_name] = a
+
+            # Load class.
+            c = a.get_class(class_name)
+            if c:
+                return c
+
+            # Read class when not yet exists.
+            if class_name in self.module_file_map:
+                t = tracer.get_tracer()
+                if t.enabled:
+                    t.trace("class_dump_load", class_name)
+
+                # Get path to class json.
+                class_path = self.module_file_map[class_name]
+                class_path = os.path.join(self.dir_path, class_path)
+                # File doesn't exists.
+                if not os.path.exists(class_path):
+                    log.error("Module: get_class_or_load: Cannot find file: \"%s\".", class_path)
                     return None
 
-                # File doesn't contains architecture information.
-                if architecture_name not in json_data:
-                    log.error("Module: get_class_or_load: Cannot find architecture in \"{}\".".format(class_path))
-                    return None
+                # Open file.
+                with open(class_path, "r") as f:
+                    json_data = json.load(f)
 
-                # Read JSON data.
-                class_data = json_data[architecture_name]
-                # Create class object.
-                c = a.read_json(class_data)
-        return c
+                    # File is empty.
+                    if not json_data:
+                        log.error("Module: get_class_or_load: Cannot open file \"%s\".", class_path)
+                        return None
+
+                    # File doesn't contains architecture information.
+                    if architecture_name not in json_data:
+                        log.error("Module: get_class_or_load: Cannot find architecture in \"%s\".", class_path)
+                        return None
+
+                    # Read JSON data.
+                    class_data = json_data[architecture_name]
+                    # Create class object.
+                    c = a.read_json(class_data)
+            return c
 
     def __str__(self):
         return "<{}: {}>".format(self.__class__.__name__, self.name)
@@ -0,0 +1,155 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import threading
+from . import helpers
+from . import memory_cache
+from . import tagged_pointer
+from . import type_cache
+
+
+class ClassNameResolver(object):
+    """
+    Resolves class names of objects given only by address (e.g. objects found by walking memory of other objects).
+
+    Class name is resolved by LLDB Objective-C runtime (dynamic type of `id` value, without running code) once
+    per class, object isa (read through memory cache) is used as cache key. On 64 bit architectures isa contains
+    also inline reference count and flags, so only class bits are used.
+
+    :param dict[int, dict[int, str]] class_names: Maps process unique ID to dictionary of class address
+        (masked isa) and class name.
+    :param threading.Lock lock: Lock of adding processes.
+    """
+    # Class bits of non-pointer isa (objc-private.h).
+    ISA_MASKS = {
+        "arm64": 0x0000000ffffffff8,
+        "x86_64": 0x00007ffffffffff8,
+    }
+
+    def __init__(self):
+        super(ClassNameResolver, self).__init__()
+        self.class_names = dict()
+        self.lock = threading.Lock()
+
+    def clean_cache(self):
+        """
+        Cleans cached class names.
+        """
+        self.class_names = dict()
+
+    def get_class_name(self, process, address, architecture_name, isa=None):
+        """
+        Returns class name of object at given address.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Object address.
+        :param str architecture_name: Architecture name.
+        :param int isa: Object isa if it was already read.
+        :return: Class name or None if object class cannot be resolved.
+        :rtype: str | None
+        """
+        if address == 0:
+            return None
+        # Tagged pointers have no isa.
+        if tagged_pointer.is_tagged_pointer(address, architecture_name):
+            return self.__resolve(process, address)
+
+        if isa is None:
+            isa = memory_cache.get_memory_cache().read_pointer(process, address)
+        if not isa:
+            return None
+        isa &= self.ISA_MASKS.get(architecture_name, 0xffffffffffffffff)
+
+        process_id = process.GetUniqueID()
+        class_names = self.class_names.get(process_id)
+        if class_names is None:
+            with self.lock:
+                class_names = self.class_names.setdefault(process_id, dict())
+        class_name = class_names.get(isa)
+        if class_name is None:
+            class_name = self.__resolve(process, address)
+            if class_name is not None:
+                class_names[isa] = class_name
+        return class_name
+
+    @staticmethod
+    def __resolve(process, address):
+        """
+        Resolves class name using dynamic type of `id` value pointing to object.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Object address.
+        :return: Class name or None.
+        :rtype: str | None
+        """
+        value = create_object_value(process, address)
+        if value is None:
+            return None
+        dynamic_value = value.GetDynamicValue(lldb.eDynamicDontRunTarget)
+        """:type: lldb.SBValue"""
+        if not dynamic_value.IsDynamic():
+            return None
+        return helpers.get_pointer_class_name(dynamic_value)
+
+
+def create_object_value(process, address, name="object"):
+    """
+    Creates `id` value pointing to object at given address (pointer is stored as value data, so the value doesn't
+    depend on any variable).
+
+    :param lldb.SBProcess process: LLDB process.
+    :param int address: Object address.
+    :param str name: Value name.
+    :return: LLDB value or None if `id` type is not available.
+    :rtype: lldb.SBValue | None
+    """
+    target = process.GetTarget()
+    """:type: lldb.SBTarget"""
+    id_type = type_cache.get_type_cache().get_type("id", target)
+    if not id_type:
+        return None
+    pointer_size = process.GetAddressByteSize()
+    if pointer_size == 8:
+        data = lldb.SBData.CreateDataFromUInt64Array(process.GetByteOrder(), pointer_size, [address])
+    else:
+        data = lldb.SBData.CreateDataFromUInt32Array(process.GetByteOrder(), pointer_size, [address])
+    return target.CreateValueFromData(name, data, id_type)
+
+
+__shared_class_name_resolver = None
+""":type: ClassNameResolver"""
+
+
+def get_class_name_resolver():
+    """
+    Returns shared ClassNameResolver.
+
+    :return: ClassNameResolver singleton.
+    :rtype: ClassNameResolver
+    """
+    global __shared_class_name_resolver
+    if __shared_class_name_resolver is None:
+        __shared_class_name_resolver = ClassNameResolver()
+    return __shared_class_name_resolver
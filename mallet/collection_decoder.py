@@ -0,0 +1,301 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import collections
+import lldb
+import logging
+import struct
+from . import class_name_resolver
+from . import helpers
+from . import memory_cache
+
+
+CountLayout = collections.namedtuple("CountLayout", ["min_version", "offset", "size", "bits"])
+"""
+Layout of collection count field.
+
+:param int min_version: Minimal Foundation version which uses this layout.
+:param int offset: Offset of count field (from object address).
+:param int size: Size of count field (in bytes).
+:param int bits: Number of bits used by count (count is stored in bit field with other values).
+"""
+
+
+class CollectionDecoder(object):
+    """
+    Reads count of Foundation collections (NSArray, NSDictionary, NSSet) and elements of immutable arrays directly
+    from object memory.
+
+    Count field is read with single memory read, independently of collection size. Layouts depend on architecture
+    and Foundation version (taken from loaded Foundation module).
+
+    :param dict[int, int] pointer_sizes: Maps process unique ID to pointer size.
+    :param dict[int, int | None] foundation_versions: Maps process unique ID to Foundation version.
+    """
+    # Count field layouts per pointer size. Layouts of the same class are sorted by Foundation version (descending).
+    LAYOUTS = {
+        8: {
+            "__NSArrayI": [CountLayout(0, 8, 8, 64)],
+            "__NSArrayI_Transfer": [CountLayout(0, 8, 8, 64)],
+            "__NSArrayM": [CountLayout(1437, 24, 8, 64), CountLayout(0, 8, 8, 64)],
+            "__NSCFArray": [CountLayout(0, 16, 8, 64)],
+            "__NSDictionaryI": [CountLayout(0, 8, 8, 58)],
+            "__NSDictionaryM": [CountLayout(1437, 20, 4, 25), CountLayout(0, 8, 8, 58)],
+            "__NSSetI": [CountLayout(0, 8, 8, 58)],
+            "__NSSetM": [CountLayout(1437, 28, 4, 26), CountLayout(0, 8, 8, 58)],
+        },
+        4: {
+            "__NSArrayI": [CountLayout(0, 4, 4, 32)],
+            "__NSArrayI_Transfer": [CountLayout(0, 4, 4, 32)],
+            "__NSArrayM": [CountLayout(1437, 12, 4, 32), CountLayout(0, 4, 4, 32)],
+            "__NSCFArray": [CountLayout(0, 8, 4, 32)],
+            "__NSDictionaryI": [CountLayout(0, 4, 4, 26)],
+            "__NSDictionaryM": [CountLayout(1437, 12, 4, 25), CountLayout(0, 4, 4, 26)],
+            "__NSSetI": [CountLayout(0, 4, 4, 26)],
+            "__NSSetM": [CountLayout(1437, 16, 4, 26), CountLayout(0, 4, 4, 26)],
+        },
+    }
+
+    # Classes with constant number of elements.
+    CONSTANT_COUNTS = {
+        "__NSArray0": 0,
+        "__NSSingleObjectArrayI": 1,
+        "__NSDictionary0": 0,
+        "__NSSingleEntryDictionaryI": 1,
+        "__NSSingleObjectSetI": 1,
+    }
+
+    # Elements storage of immutable arrays: offset (in pointers) and flag if elements are stored inline, otherwise
+    # storage pointer is stored at offset.
+    ARRAY_STORAGES = {
+        "__NSArrayI": (2, True),
+        "__NSArrayI_Transfer": (2, False),
+        "__NSSingleObjectArrayI": (1, True),
+        "__NSArray0": (0, True),
+    }
+
+    # Maximal number of decoded elements, bigger counts are treated as corrupted memory.
+    MAX_ELEMENTS = 100000
+
+    def __init__(self):
+        super(CollectionDecoder, self).__init__()
+        self.pointer_sizes = dict()
+        self.foundation_versions = dict()
+
+    def clean_cache(self):
+        """
+        Cleans cached process information.
+        """
+        self.pointer_sizes = dict()
+        self.foundation_versions = dict()
+
+    def get_count(self, obj, address=None):
+        """
+        Returns number of elements in collection.
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to collection).
+        :param int address: Collection address if already known.
+        :return: Number of elements or None if collection class or its layout is not supported.
+        :rtype: int | None
+        """
+        class_name = helpers.get_pointer_class_name(obj)
+        if class_name in self.CONSTANT_COUNTS:
+            return self.CONSTANT_COUNTS[class_name]
+
+        if address is None:
+            address = obj.GetValueAsUnsigned()
+        if address == 0:
+            return None
+        return self.read_count(obj.GetProcess(), address, class_name)
+
+    def read_count(self, process, address, class_name):
+        """
+        Returns number of elements in collection with given class at given address.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Collection address.
+        :param str class_name: Collection class name.
+        :return: Number of elements or None if collection class or its layout is not supported.
+        :rtype: int | None
+        """
+        if class_name in self.CONSTANT_COUNTS:
+            return self.CONSTANT_COUNTS[class_name]
+        if address == 0:
+            return None
+
+        layout = self.get_layout(process, class_name)
+        if layout is None:
+            return None
+
+        count = memory_cache.get_memory_cache().read_unsigned(process, address + layout.offset, layout.size)
+        if count is None:
+            logger = logging.getLogger(__name__)
+            logger.debug("Cannot read count of %s at 0x%x.", class_name, address)
+            return None
+        return count & ((1 << layout.bits) - 1)
+
+    def get_elements(self, process, address, class_name):
+        """
+        Returns addresses of elements of immutable array read directly from its storage (with one memory read).
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Array address.
+        :param str class_name: Array class name.
+        :return: Addresses of elements or None if storage layout of class is not supported.
+        :rtype: list[int] | None
+        """
+        if class_name not in self.ARRAY_STORAGES or address == 0:
+            return None
+        count = self.read_count(process, address, class_name)
+        if count is None or count > self.MAX_ELEMENTS:
+            return None
+        if count == 0:
+            return list()
+
+        cache = memory_cache.get_memory_cache()
+        pointer_size = self.get_pointer_size(process)
+        offset, is_inline = self.ARRAY_STORAGES[class_name]
+        storage_address = address + offset * pointer_size
+        if not is_inline:
+            storage_address = cache.read_pointer(process, storage_address)
+            if not storage_address:
+                return None
+        data = cache.read(process, storage_address, count * pointer_size)
+        if data is None:
+            logger = logging.getLogger(__name__)
+            logger.debug("Cannot read elements of %s at 0x%x.", class_name, address)
+            return None
+        return list(struct.unpack("<{}{}".format(count, "Q" if pointer_size == 8 else "I"), data))
+
+    def get_pointer_size(self, process):
+        """
+        Returns pointer size of given process.
+
+        :param lldb.SBProcess process: LLDB process.
+        :rtype: int
+        """
+        process_id = process.GetUniqueID()
+        pointer_size = self.pointer_sizes.get(process_id)
+        if pointer_size is None:
+            pointer_size = process.GetAddressByteSize()
+            self.pointer_sizes[process_id] = pointer_size
+        return pointer_size
+
+    def get_layout(self, process, class_name):
+        """
+        Returns count field layout of given class in given process.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param str class_name: Collection class name.
+        :return: Count field layout or None.
+        :rtype: CountLayout | None
+        """
+        process_id = process.GetUniqueID()
+        pointer_size = self.pointer_sizes.get(process_id)
+        if pointer_size is None:
+            pointer_size = process.GetAddressByteSize()
+            self.pointer_sizes[process_id] = pointer_size
+
+        layouts = self.LAYOUTS.get(pointer_size, dict()).get(class_name)
+        if layouts is None:
+            return None
+        if len(layouts) == 1:
+            return layouts[0]
+
+        if process_id not in self.foundation_versions:
+            self.foundation_versions[process_id] = get_module_version(process.GetTarget(), "Foundation")
+        version = self.foundation_versions[process_id]
+        # Layout cannot be chosen without Foundation version.
+        if version is None:
+            return None
+        for layout in layouts:
+            if version >= layout.min_version:
+                return layout
+        return None
+
+
+def get_module_version(target, module_name):
+    """
+    Returns major version of module (e.g. 1200 for Foundation 1200.0.0).
+
+    :param lldb.SBTarget target: LLDB target.
+    :param str module_name: Module file name.
+    :return: Major module version or None.
+    :rtype: int | None
+    """
+    module = target.FindModule(lldb.SBFileSpec(module_name))
+    """:type: lldb.SBModule"""
+    if not module.IsValid():
+        return None
+    version = module.GetVersion()
+    if version is None or len(version) == 0:
+        return None
+    return version[0]
+
+
+def get_array_elements(process, address, class_name):
+    """
+    Returns addresses of array elements. Storage of immutable arrays is decoded directly from memory, elements
+    of other arrays are read from synthetic children of LLDB data formatters (which don't run code either).
+
+    :param lldb.SBProcess process: LLDB process.
+    :param int address: Array address.
+    :param str class_name: Array class name.
+    :return: Addresses of elements.
+    :rtype: list[int]
+    """
+    decoder = get_collection_decoder()
+    elements = decoder.get_elements(process, address, class_name)
+    if elements is not None:
+        return elements
+
+    value = class_name_resolver.create_object_value(process, address, "array")
+    if value is None:
+        return list()
+    value = value.GetDynamicValue(lldb.eDynamicDontRunTarget)
+    """:type: lldb.SBValue"""
+    value.SetPreferSyntheticValue(True)
+    count = value.GetNumChildren()
+    if count > decoder.MAX_ELEMENTS:
+        logger = logging.getLogger(__name__)
+        logger.warning("Array %s at 0x%x has too many elements (%d).", class_name, address, count)
+        return list()
+    return [value.GetChildAtIndex(index).GetValueAsUnsigned() for index in range(count)]
+
+
+__shared_collection_decoder = None
+""":type: CollectionDecoder"""
+
+
+def get_collection_decoder():
+    """
+    Returns shared CollectionDecoder.
+
+    :return: CollectionDecoder singleton.
+    :rtype: CollectionDecoder
+    """
+    global __shared_collection_decoder
+    if __shared_collection_decoder is None:
+        __shared_collection_decoder = CollectionDecoder()
+    return __shared_collection_decoder
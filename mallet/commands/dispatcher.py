@@ -0,0 +1,84 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import shlex
+
+__commands = dict()
+""":type: dict[str, (function, str)]"""
+
+
+def register_command(name, function, help_text):
+    """
+    Registers `mallet` subcommand.
+
+    Subcommand function is called with debugger, list of arguments, result object and internal dictionary.
+
+    :param str name: Subcommand name.
+    :param function function: Subcommand function.
+    :param str help_text: One line help.
+    """
+    __commands[name] = (function, help_text)
+
+
+def get_usage():
+    """
+    Returns usage of `mallet` command.
+
+    :return: Usage.
+    :rtype: str
+    """
+    lines = ["Usage: mallet <subcommand> [arguments]", "", "Subcommands:"]
+    for name in sorted(__commands):
+        lines.append("  {:<16} {}".format(name, __commands[name][1]))
+    return "\n".join(lines)
+
+
+def mallet_command(debugger, command, result, internal_dict):
+    """
+    Runs `mallet` subcommand.
+
+    mallet subcommand [arguments]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param str command: Command attributes.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    try:
+        args = shlex.split(command)
+    except ValueError as e:
+        result.SetError("Cannot parse arguments: {}.".format(e))
+        return
+
+    if len(args) == 0 or args[0] in ["help", "-h", "--help"]:
+        print(get_usage(), file=result)
+        return
+
+    name = args[0]
+    if name not in __commands:
+        result.SetError("Unknown subcommand \"{}\".\n{}".format(name, get_usage()))
+        return
+
+    function, _ = __commands[name]
+    function(debugger, args[1:], result, internal_dict)
@@ -0,0 +1,110 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from . import dispatcher
+from . import view_tree
+from .. import layer_hierarchy
+from ..common import SummaryBase
+
+# Maximal number of printed addresses of layers with invalid sublayers pointer.
+MAX_INVALID_ADDRESSES = 5
+
+
+def layer_tree(debugger, args, result, internal_dict):
+    """
+    Prints layer hierarchy decoded directly from memory (breadth first), without running code in the target.
+    Each layer is printed with its class, address, position and bounds. Depth and count equal to 0 are unlimited.
+    Layers can be also written to JSON Lines file. Layers which sublayers pointer failed validation are reported
+    after the tree.
+
+    mallet layer-tree <layer> [depth] [count] [file.jsonl]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    if len(args) == 0:
+        result.SetError("Missing layer.")
+        return
+    limits = view_tree.parse_limits(args[1:3], result)
+    if limits is None:
+        return
+    max_depth, max_count = limits
+
+    process = debugger.GetSelectedTarget().GetProcess()
+    """:type: lldb.SBProcess"""
+    address = view_tree.get_address(process, args[0])
+    if address is None:
+        result.SetError("Cannot find layer \"{}\".".format(args[0]))
+        return
+
+    walker = layer_hierarchy.LayerHierarchyWalker(process, max_depth, max_count)
+    if not walker.is_valid():
+        result.SetError("CALayer ivars are not available for this architecture.")
+        return
+
+    output_path = args[3] if len(args) > 3 else None
+    if view_tree.print_nodes(walker.walk(address), result, output_path, format_node, node_to_json):
+        print("{} layer{}{}.".format(walker.count, "" if walker.count == 1 else "s",
+                                     " (limited)" if walker.truncated else ""), file=result)
+        if len(walker.invalid_sublayers) > 0:
+            # Offset of sublayers is unverified, it can be wrong for this OS version.
+            count = len(walker.invalid_sublayers)
+            addresses = ", ".join("0x{:x}".format(a) for a in walker.invalid_sublayers[:MAX_INVALID_ADDRESSES])
+            print("Warning: sublayers pointer of {} layer{} failed validation ({}{}), their sublayers are missing."
+                  .format(count, "" if count == 1 else "s", addresses,
+                          ", ..." if count > MAX_INVALID_ADDRESSES else ""), file=result)
+
+
+def format_node(node):
+    """
+    Returns description of layer.
+
+    :param layer_hierarchy.LayerNode node: Layer.
+    :rtype: str
+    """
+    position = ", ".join(SummaryBase.formatted_float(f) for f in node.position)
+    bounds = "{} {}; {} {}".format(*[SummaryBase.formatted_float(f) for f in node.bounds])
+    return "{}<{}: 0x{:x}; position = ({}); bounds = ({})>".format("   | " * node.depth, node.class_name,
+                                                                  node.address, position, bounds)
+
+
+def node_to_json(node):
+    """
+    Returns JSON representation of layer.
+
+    :param layer_hierarchy.LayerNode node: Layer.
+    :rtype: dict
+    """
+    return {"depth": node.depth,
+            "address": "0x{:x}".format(node.address),
+            "class": node.class_name,
+            "position": list(node.position),
+            "bounds": list(node.bounds),
+            "parent": "0x{:x}".format(node.parent) if node.parent is not None else None}
+
+
+dispatcher.register_command("layer-tree", layer_tree, "Layer hierarchy decoded from memory: <layer> [depth] [count] "
+                                                      "[file.jsonl].")
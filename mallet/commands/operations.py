@@ -0,0 +1,148 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import collections
+from . import dispatcher
+from .. import class_name_resolver
+from .. import helpers
+from ..common import SummaryBase
+from ..Foundation import NSOperationQueue
+from ..Foundation import NSOperationQueueInternal
+
+# Maximal number of printed operations if limit is not given.
+DEFAULT_MAX_COUNT = 10000
+
+
+def operations(debugger, args, result, internal_dict):
+    """
+    Prints all operations of operation queue (following linked list of operations) with their state, priority
+    and QoS, followed by number of operations per state. Count equal to 0 is unlimited.
+
+    mallet operations <queue> [count]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    if len(args) == 0:
+        result.SetError("Missing operation queue.")
+        return
+    try:
+        max_count = int(args[1]) if len(args) > 1 else DEFAULT_MAX_COUNT
+    except ValueError:
+        result.SetError("Invalid number \"{}\".".format(args[1]))
+        return
+
+    process = debugger.GetSelectedTarget().GetProcess()
+    """:type: lldb.SBProcess"""
+    queue = get_value(process, args[0])
+    if queue is None:
+        result.SetError("Cannot find operation queue \"{}\".".format(args[0]))
+        return
+    queue_internal_provider = get_queue_internal_provider(queue, internal_dict)
+    if queue_internal_provider is None:
+        result.SetError("\"{}\" is not an operation queue.".format(args[0]))
+        return
+
+    architecture_name = helpers.architecture_name_from_target(process.GetTarget())
+    resolver = class_name_resolver.get_class_name_resolver()
+    states = collections.Counter()
+    cancelled_count = 0
+    count = 0
+    limited = False
+    # One more operation is read to check if the list was limited.
+    for operation_provider in queue_internal_provider.iter_operations(max_count + 1 if max_count else None):
+        if max_count and count >= max_count:
+            limited = True
+            break
+        address = operation_provider.value_obj.GetValueAsUnsigned()
+        class_name = resolver.get_class_name(process, address, architecture_name)
+        operation_internal_provider = operation_provider.private_provider
+        summary = None
+        if operation_internal_provider is not None:
+            states[operation_internal_provider.state_value] += 1
+            if operation_internal_provider.cancelled_value:
+                cancelled_count += 1
+            summary = SummaryBase.join_summaries(operation_internal_provider.state_summary,
+                                                 operation_internal_provider.priority_summary,
+                                                 operation_internal_provider.qos_summary,
+                                                 operation_internal_provider.ready_summary,
+                                                 operation_internal_provider.cancelled_summary,
+                                                 operation_internal_provider.name_summary)
+        print("[{}] <{}: 0x{:x}> {}".format(count, class_name or "?", address, summary or ""), file=result)
+        count += 1
+
+    print("{} operation{}{}.".format(count, "" if count == 1 else "s", " (limited)" if limited else ""),
+          file=result)
+    for state in sorted(states, key=lambda s: (s is None, s)):
+        print("  state={}: {}".format(state, states[state]), file=result)
+    if cancelled_count > 0:
+        print("  cancelled: {}".format(cancelled_count), file=result)
+
+
+def get_value(process, argument):
+    """
+    Returns value of object given by variable path (in selected frame) or address.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param str argument: Variable path or address.
+    :return: Dynamic value of object or None.
+    :rtype: lldb.SBValue | None
+    """
+    try:
+        address = int(argument, 0)
+    except ValueError:
+        frame = process.GetSelectedThread().GetSelectedFrame()
+        """:type: lldb.SBFrame"""
+        if not frame.IsValid():
+            return None
+        value = frame.GetValueForVariablePath(argument, lldb.eDynamicDontRunTarget)
+        """:type: lldb.SBValue"""
+        return value if value.IsValid() and value.GetValueAsUnsigned() != 0 else None
+
+    if address == 0:
+        return None
+    value = class_name_resolver.create_object_value(process, address, "queue")
+    if value is None:
+        return None
+    return value.GetDynamicValue(lldb.eDynamicDontRunTarget)
+
+
+def get_queue_internal_provider(queue, internal_dict):
+    """
+    Returns provider of queue internals (`__NSOperationQueueInternal`) of NSOperationQueue or queue internals value.
+
+    :param lldb.SBValue queue: NSOperationQueue or __NSOperationQueueInternal value.
+    :param dict internal_dict: Internal LLDB dictionary.
+    :rtype: NSOperationQueueInternal.NSOperationQueueInternalSyntheticProvider | None
+    """
+    class_name = helpers.get_pointer_class_name(queue)
+    if class_name == "__NSOperationQueueInternal":
+        return NSOperationQueueInternal.NSOperationQueueInternalSyntheticProvider(queue, internal_dict)
+    return NSOperationQueue.NSOperationQueueSyntheticProvider(queue, internal_dict).private_provider
+
+
+dispatcher.register_command("operations", operations, "Operations of operation queue: <queue> [count].")
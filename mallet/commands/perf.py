@@ -0,0 +1,81 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from . import dispatcher
+from .. import perf_stats
+
+
+def perf(debugger, args, result, internal_dict):
+    """
+    Prints p50 / p95 / p99 latencies of providers and slow summaries log.
+
+    mallet perf [report [p50 | p95 | p99 | max | count | total] [limit] | slow | reset | threshold [ms] | enable | disable]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    stats = perf_stats.get_perf_stats()
+    action = args[0] if len(args) > 0 else "report"
+
+    if action == "report":
+        sort_key = args[1] if len(args) > 1 else "p99"
+        if sort_key not in ["p50", "p95", "p99", "max", "count", "total"]:
+            result.SetError("Invalid sort column \"{}\".".format(sort_key))
+            return
+        try:
+            limit = int(args[2]) if len(args) > 2 else None
+        except ValueError:
+            result.SetError("Invalid limit \"{}\".".format(args[2]))
+            return
+        if not stats.enabled:
+            print("Latency statistics are disabled.", file=result)
+        print(stats.report(sort_key, limit), file=result)
+        print("", file=result)
+        print(stats.slow_log_report(), file=result)
+    elif action == "slow":
+        print(stats.slow_log_report(), file=result)
+    elif action == "reset":
+        stats.reset()
+        print("Latency statistics reset.", file=result)
+    elif action == "threshold":
+        if len(args) > 1:
+            try:
+                stats.slow_threshold = float(args[1]) / 1000.0
+            except ValueError:
+                result.SetError("Invalid threshold \"{}\".".format(args[1]))
+                return
+        print("Slow summary threshold: {:.1f}ms.".format(stats.slow_threshold * 1000.0), file=result)
+    elif action == "enable":
+        stats.enabled = True
+        print("Latency statistics enabled.", file=result)
+    elif action == "disable":
+        stats.enabled = False
+        print("Latency statistics disabled.", file=result)
+    else:
+        result.SetError("Unknown action \"{}\", use report, slow, reset, threshold, enable or disable.".format(action))
+
+
+dispatcher.register_command("perf", perf, "Providers latency: report [sort] [limit], slow, reset, threshold [ms].")
@@ -0,0 +1,75 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from . import dispatcher
+from .. import object_description
+from .. import summary_prefetch
+
+
+def prefetch(debugger, args, result, internal_dict):
+    """
+    Controls prefetching of summaries of selected frame variables (run by stop hook).
+
+    mallet prefetch [run | enable [depth] | disable | cancel | status]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    prefetcher = summary_prefetch.get_summary_prefetcher()
+    action = args[0] if len(args) > 0 else "status"
+
+    try:
+        number = int(args[1]) if len(args) > 1 else None
+    except ValueError:
+        result.SetError("Invalid number \"{}\".".format(args[1]))
+        return
+
+    if action == "run":
+        # Called by stop hook, doesn't print anything.
+        frame = debugger.GetSelectedTarget().GetProcess().GetSelectedThread().GetSelectedFrame()
+        prefetcher.prefetch(frame)
+    elif action == "enable":
+        if object_description.get_object_describer().allow_running_target:
+            result.SetError("Prefetching cannot be enabled when running code in the target is allowed "
+                            "(run_target_code).")
+            return
+        prefetcher.configure(True, number or prefetcher.depth, prefetcher.max_values)
+        prefetcher.install_stop_hook(debugger)
+        print("Prefetching enabled (depth {}).".format(prefetcher.depth), file=result)
+    elif action == "disable":
+        prefetcher.configure(False, prefetcher.depth, prefetcher.max_values)
+        print("Prefetching disabled.", file=result)
+    elif action == "cancel":
+        prefetcher.cancel()
+        print("Prefetching cancelled.", file=result)
+    elif action == "status":
+        print(prefetcher.status(), file=result)
+    else:
+        result.SetError("Unknown action \"{}\", use run, enable, disable, cancel or status.".format(action))
+
+
+dispatcher.register_command("prefetch", prefetch, "Summaries prefetching: run, enable [depth], disable, cancel, "
+                                                  "status.")
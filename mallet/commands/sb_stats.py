@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from . import dispatcher
+from .. import sb_accounting
+
+
+def sb_stats(debugger, args, result, internal_dict):
+    """
+    Controls SB API calls accounting and prints report with providers which make the most (and duplicated) calls.
+
+    mallet sb-stats [enable | disable | reset | report [limit]]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    accounting = sb_accounting.get_sb_accounting()
+    action = args[0] if len(args) > 0 else "report"
+
+    if action == "enable":
+        accounting.enable()
+        print("SB API accounting enabled.", file=result)
+    elif action == "disable":
+        accounting.disable()
+        print("SB API accounting disabled.", file=result)
+    elif action == "reset":
+        accounting.reset()
+        print("SB API accounting statistics reset.", file=result)
+    elif action == "report":
+        try:
+            limit = int(args[1]) if len(args) > 1 else 10
+        except ValueError:
+            result.SetError("Invalid limit \"{}\".".format(args[1]))
+            return
+        print(accounting.report(limit), file=result)
+    else:
+        result.SetError("Unknown action \"{}\", use enable, disable, reset or report.".format(action))
+
+
+dispatcher.register_command("sb-stats", sb_stats, "SB API calls accounting: enable, disable, reset, report [limit].")
@@ -0,0 +1,92 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import importlib
+from . import dispatcher
+from .. import summary_verbosity
+
+
+def summary(debugger, args, result, internal_dict):
+    """
+    Prints summary of variable computed with given verbosity level (by default full, with all nested objects).
+
+    mallet summary <variable> [full | fast]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    if len(args) == 0:
+        result.SetError("Missing variable.")
+        return
+    level = args[1] if len(args) > 1 else summary_verbosity.VERBOSITY_FULL
+    if level not in summary_verbosity.VERBOSITY_LEVELS:
+        result.SetError("Unknown verbosity level \"{}\", use full or fast.".format(level))
+        return
+
+    frame = debugger.GetSelectedTarget().GetProcess().GetSelectedThread().GetSelectedFrame()
+    """:type: lldb.SBFrame"""
+    if not frame.IsValid():
+        result.SetError("No selected frame.")
+        return
+    value = frame.GetValueForVariablePath(args[0], lldb.eDynamicDontRunTarget)
+    """:type: lldb.SBValue"""
+    if not value.IsValid():
+        result.SetError("Cannot find variable \"{}\".".format(args[0]))
+        return
+
+    verbosity = summary_verbosity.get_summary_verbosity()
+    verbosity.forced_level = level
+    try:
+        text = get_summary(value, internal_dict)
+    finally:
+        verbosity.forced_level = None
+    print("({}) {} = {}".format(value.GetTypeName(), args[0], text), file=result)
+
+
+def get_summary(value, internal_dict):
+    """
+    Computes summary of value. Summary provider function is called directly, because LLDB caches summaries.
+
+    :param lldb.SBValue value: LLDB value.
+    :param dict internal_dict: Internal LLDB dictionary.
+    :return: Summary.
+    :rtype: str | None
+    """
+    type_summary = value.GetTypeSummary()
+    """:type: lldb.SBTypeSummary"""
+    if type_summary.IsValid() and type_summary.IsFunctionName():
+        module_name, _, function_name = type_summary.GetData().rpartition(".")
+        try:
+            function = getattr(importlib.import_module(module_name), function_name)
+        except (ImportError, AttributeError, ValueError):
+            function = None
+        if function is not None:
+            return function(value, internal_dict)
+    return value.GetSummary()
+
+
+dispatcher.register_command("summary", summary, "Summary of variable: <variable> [full | fast].")
@@ -0,0 +1,64 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from . import dispatcher
+from .. import tracer
+
+
+def trace(debugger, args, result, internal_dict):
+    """
+    Controls hot path events tracer and dumps recorded events.
+
+    mallet trace [dump [limit] | enable [size] | disable | clear]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    t = tracer.get_tracer()
+    action = args[0] if len(args) > 0 else "dump"
+
+    try:
+        number = int(args[1]) if len(args) > 1 else None
+    except ValueError:
+        result.SetError("Invalid number \"{}\".".format(args[1]))
+        return
+
+    if action == "dump":
+        print(t.dump(number), file=result)
+    elif action == "enable":
+        t.enable(number)
+        print("Tracer enabled ({} events).".format(t.size), file=result)
+    elif action == "disable":
+        t.disable()
+        print("Tracer disabled.", file=result)
+    elif action == "clear":
+        t.clear()
+        print("Tracer cleared.", file=result)
+    else:
+        result.SetError("Unknown action \"{}\", use dump, enable, disable or clear.".format(action))
+
+
+dispatcher.register_command("trace", trace, "Hot path events tracer: dump [limit], enable [size], disable, clear.")
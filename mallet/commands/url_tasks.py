@@ -0,0 +1,340 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import json
+from . import dispatcher
+from . import operations
+from .. import class_name_resolver
+from .. import collection_decoder
+from .. import helpers
+from .. import memory_cache
+from .. import number_decoder
+from .. import tagged_pointer
+from ..CFNetwork import NSURLSessionTask
+
+# Maximal number of printed tasks if limit is not given.
+DEFAULT_MAX_COUNT = 10000
+# Maximal number of not requested pages read together with requested pages while prefetching tasks.
+PREFETCH_MAX_GAP = 2
+# Ivars which are followed to find task collections (NSURLSession of AFURLSessionManager).
+SESSION_IVAR_NAMES = ("_session",)
+# Depth of base class children searched for task collections.
+MAX_BASE_CLASS_DEPTH = 4
+
+
+def url_tasks(debugger, args, result, internal_dict):
+    """
+    Prints all tasks of URL session (NSURLSession or AFURLSessionManager) with their identifier, state, byte counters
+    and URL as table or JSON. Tasks are found in task collections of the session (ivars containing "task" in name,
+    like internal task map of NSURLSession or `_mutableTaskDelegatesKeyedByTaskIdentifier` of AFURLSessionManager)
+    or in given collection. Count equal to 0 is unlimited.
+
+    mallet url-tasks <session | collection> [table | json] [count]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    if len(args) == 0:
+        result.SetError("Missing URL session.")
+        return
+    output_format = args[1] if len(args) > 1 else "table"
+    if output_format not in ("table", "json"):
+        result.SetError("Invalid format \"{}\".".format(output_format))
+        return
+    try:
+        max_count = int(args[2]) if len(args) > 2 else DEFAULT_MAX_COUNT
+    except ValueError:
+        result.SetError("Invalid number \"{}\".".format(args[2]))
+        return
+
+    process = debugger.GetSelectedTarget().GetProcess()
+    """:type: lldb.SBProcess"""
+    session = operations.get_value(process, args[0])
+    if session is None:
+        result.SetError("Cannot find URL session \"{}\".".format(args[0]))
+        return
+
+    architecture_name = helpers.architecture_name_from_target(process.GetTarget())
+    session_address = session.GetValueAsUnsigned()
+    if is_collection_class_name(helpers.get_pointer_class_name(session)):
+        collections = [(session_address, helpers.get_pointer_class_name(session))]
+    else:
+        collections = find_task_collections(process, session, architecture_name)
+    if len(collections) == 0:
+        result.SetError("\"{}\" has no task collections.".format(args[0]))
+        return
+
+    tasks = get_tasks(process, collections, architecture_name, internal_dict, max_count + 1 if max_count else None)
+    limited = max_count and len(tasks) > max_count
+    if limited:
+        tasks = tasks[:max_count]
+
+    if output_format == "json":
+        print(json.dumps(tasks, indent=2), file=result)
+        return
+    print("{:>8}  {:<10}  {:>23}  {:>23}  {}".format("id", "state", "received/toReceive", "sent/toSend", "URL"),
+          file=result)
+    for task in tasks:
+        print(format_task(task), file=result)
+    print("{} task{}{}.".format(len(tasks), "" if len(tasks) == 1 else "s", " (limited)" if limited else ""),
+          file=result)
+
+
+def find_task_collections(process, value, architecture_name, depth=0):
+    """
+    Returns collections of tasks stored in ivars of object (ivars containing "task" in name). Ivars of base classes
+    and session of session manager are also searched.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param lldb.SBValue value: Dynamic value of object.
+    :param str architecture_name: Architecture name.
+    :param int depth: Depth of base class children.
+    :return: List of collection address and class name.
+    :rtype: list[(int, str)]
+    """
+    resolver = class_name_resolver.get_class_name_resolver()
+    collections = list()
+    value = value.GetNonSyntheticValue()
+    """:type: lldb.SBValue"""
+    for index in range(value.GetNumChildren()):
+        child = value.GetChildAtIndex(index)
+        """:type: lldb.SBValue"""
+        name = child.GetName() or ""
+        if not child.TypeIsPointerType():
+            # Base class child.
+            if depth < MAX_BASE_CLASS_DEPTH and child.GetNumChildren() > 0:
+                collections.extend(find_task_collections(process, child, architecture_name, depth + 1))
+            continue
+
+        address = child.GetValueAsUnsigned()
+        if address == 0:
+            continue
+        class_name = resolver.get_class_name(process, address, architecture_name)
+        if "task" in name.lower() and is_collection_class_name(class_name):
+            collections.append((address, class_name))
+        elif name in SESSION_IVAR_NAMES and depth == 0:
+            session = class_name_resolver.create_object_value(process, address, "session")
+            if session is not None:
+                session = session.GetDynamicValue(lldb.eDynamicDontRunTarget)
+                collections.extend(find_task_collections(process, session, architecture_name, MAX_BASE_CLASS_DEPTH))
+    return collections
+
+
+def get_tasks(process, collections, architecture_name, internal_dict, max_count):
+    """
+    Returns tasks (as dictionaries) found in collections. Collection entries which are not tasks (e.g. task
+    delegates of AFURLSessionManager) are returned only with task identifier taken from dictionary key.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param list[(int, str)] collections: List of collection address and class name.
+    :param str architecture_name: Architecture name.
+    :param dict internal_dict: Internal LLDB dictionary.
+    :param int | None max_count: Maximal number of returned tasks.
+    :rtype: list[dict]
+    """
+    resolver = class_name_resolver.get_class_name_resolver()
+    cache = memory_cache.get_memory_cache()
+    pointer_size = process.GetAddressByteSize()
+    entries = list()
+    for address, class_name in collections:
+        entries.extend(get_collection_entries(process, address, class_name, max_count))
+
+    # Isa of all objects with coalesced reads.
+    addresses = [address for entry in entries for address in entry if address]
+    cache.prefetch(process, [(address, pointer_size) for address in addresses
+                             if not tagged_pointer.is_tagged_pointer(address, architecture_name)], PREFETCH_MAX_GAP)
+
+    task_addresses = list()
+    identifiers = list()
+    for key, address in entries:
+        class_name = resolver.get_class_name(process, address, architecture_name)
+        if is_task_class_name(class_name):
+            task_addresses.append((address, class_name))
+        else:
+            key_class_name = resolver.get_class_name(process, key, architecture_name) if key else None
+            if is_task_class_name(key_class_name):
+                task_addresses.append((key, key_class_name))
+            elif key:
+                identifiers.append(get_number(process, key, key_class_name))
+
+    # Memory of all tasks with coalesced reads, instance size is taken once per class.
+    providers = list()
+    sizes = dict()
+    seen = set()
+    for address, class_name in task_addresses:
+        if address in seen:
+            continue
+        seen.add(address)
+        value = class_name_resolver.create_object_value(process, address, "task")
+        if value is None:
+            continue
+        provider = NSURLSessionTask.NSURLSessionTaskSyntheticProvider(
+            value.GetDynamicValue(lldb.eDynamicDontRunTarget), internal_dict)
+        if class_name not in sizes:
+            sizes[class_name] = provider.get_instance_size()
+        providers.append((provider, class_name))
+    cache.prefetch(process, [(provider.value_obj.GetValueAsUnsigned(), sizes[class_name])
+                             for provider, class_name in providers], PREFETCH_MAX_GAP)
+
+    tasks = [task_to_json(provider, class_name) for provider, class_name in providers]
+    task_identifiers = set(task["id"] for task in tasks)
+    tasks.extend({"id": identifier} for identifier in identifiers if identifier not in task_identifiers)
+    tasks.sort(key=lambda t: (t["id"] is None, t["id"]))
+    return tasks if max_count is None else tasks[:max_count]
+
+
+def get_collection_entries(process, address, class_name, max_count):
+    """
+    Returns entries of collection: pairs of key address (only for dictionaries) and object address. Number of
+    elements is decoded from memory, elements of immutable arrays are read directly from their storage.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param int address: Collection address.
+    :param str class_name: Collection class name.
+    :param int | None max_count: Maximal number of returned entries.
+    :rtype: list[(int | None, int)]
+    """
+    decoder = collection_decoder.get_collection_decoder()
+    count = decoder.read_count(process, address, class_name)
+    if count == 0:
+        return list()
+    if "Array" in class_name:
+        elements = collection_decoder.get_array_elements(process, address, class_name)
+        return [(None, element) for element in elements[:max_count]]
+
+    # Dictionaries and sets, elements are read from synthetic children of LLDB data formatters.
+    value = class_name_resolver.create_object_value(process, address, "collection")
+    if value is None:
+        return list()
+    value = value.GetDynamicValue(lldb.eDynamicDontRunTarget)
+    """:type: lldb.SBValue"""
+    value.SetPreferSyntheticValue(True)
+    if count is None:
+        count = value.GetNumChildren()
+    count = min(count, decoder.MAX_ELEMENTS)
+    if max_count is not None:
+        count = min(count, max_count)
+
+    entries = list()
+    for index in range(count):
+        child = value.GetChildAtIndex(index)
+        """:type: lldb.SBValue"""
+        key = child.GetChildMemberWithName("key")
+        """:type: lldb.SBValue"""
+        if key.IsValid():
+            entries.append((key.GetValueAsUnsigned(), child.GetChildMemberWithName("value").GetValueAsUnsigned()))
+        else:
+            entries.append((None, child.GetValueAsUnsigned()))
+    return entries
+
+
+def get_number(process, address, class_name):
+    """
+    Returns value of NSNumber at given address.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param int address: Number address.
+    :param str | None class_name: Number class name.
+    :rtype: int | float | None
+    """
+    value = class_name_resolver.create_object_value(process, address, "number")
+    if value is None:
+        return None
+    return number_decoder.get_number_decoder().get_number(value.GetDynamicValue(lldb.eDynamicDontRunTarget),
+                                                          class_name)
+
+
+def task_to_json(provider, class_name):
+    """
+    Returns JSON representation of task.
+
+    :param NSURLSessionTask.NSURLSessionTaskSyntheticProvider provider: Task provider.
+    :param str class_name: Task class name.
+    :rtype: dict
+    """
+    url = None
+    request_provider = provider.original_request_provider
+    if request_provider is not None and request_provider.request_internal_provider is not None:
+        cf_request_provider = request_provider.request_internal_provider.request_provider
+        url = None if cf_request_provider is None else cf_request_provider.url_value
+    state = provider.state_value
+    return {"id": provider.task_identifier_value,
+            "class": class_name,
+            "address": "0x{:x}".format(provider.value_obj.GetValueAsUnsigned()),
+            "state": None if state is None else NSURLSessionTask.get_session_task_state_text(state),
+            "received": provider.count_of_bytes_received_value,
+            "toReceive": provider.count_of_bytes_expected_to_receive_value,
+            "sent": provider.count_of_bytes_sent_value,
+            "toSend": provider.count_of_bytes_expected_to_send_value,
+            "description": provider.task_description_value,
+            "url": url}
+
+
+def format_task(task):
+    """
+    Returns table row of task.
+
+    :param dict task: Task JSON representation.
+    :rtype: str
+    """
+    def format_counts(count, expected):
+        if count is None and expected is None:
+            return "-"
+        return "{}/{}".format("?" if count is None else count, "?" if expected is None else expected)
+
+    return "{:>8}  {:<10}  {:>23}  {:>23}  {}".format("?" if task["id"] is None else task["id"],
+                                                      task.get("state") or "-",
+                                                      format_counts(task.get("received"), task.get("toReceive")),
+                                                      format_counts(task.get("sent"), task.get("toSend")),
+                                                      task.get("url") or "-")
+
+
+def is_task_class_name(class_name):
+    """
+    Checks if class name is name of NSURLSessionTask (or its private subclass).
+
+    :param str | None class_name: Class name.
+    :rtype: bool
+    """
+    if class_name is None or not class_name.endswith("Task"):
+        return False
+    return class_name.startswith("NSURLSession") or class_name.startswith("__NSCF")
+
+
+def is_collection_class_name(class_name):
+    """
+    Checks if class name is name of Foundation collection (array, dictionary, set or map table).
+
+    :param str | None class_name: Class name.
+    :rtype: bool
+    """
+    if class_name is None:
+        return False
+    return any(kind in class_name for kind in ("Array", "Dictionary", "Set", "MapTable"))
+
+
+dispatcher.register_command("url-tasks", url_tasks, "Tasks of URL session: <session> [table | json] [count].")
@@ -0,0 +1,182 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import json
+import os
+from . import dispatcher
+from .. import view_hierarchy
+from ..common import SummaryBase
+
+# Maximal number of printed views if limit is not given.
+DEFAULT_MAX_COUNT = 100000
+
+
+def view_tree(debugger, args, result, internal_dict):
+    """
+    Prints view hierarchy (like `recursiveDescription`) decoded directly from memory, without running code
+    in the target. Each view is printed with its class, address, frame and tag. Depth and count equal to 0 are
+    unlimited. Views can be also written to JSON Lines file.
+
+    mallet view-tree <view> [depth] [count] [file.jsonl]
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param list[str] args: Command arguments.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    if len(args) == 0:
+        result.SetError("Missing view.")
+        return
+    limits = parse_limits(args[1:3], result)
+    if limits is None:
+        return
+    max_depth, max_count = limits
+
+    process = debugger.GetSelectedTarget().GetProcess()
+    """:type: lldb.SBProcess"""
+    address = get_address(process, args[0])
+    if address is None:
+        result.SetError("Cannot find view \"{}\".".format(args[0]))
+        return
+
+    walker = view_hierarchy.ViewHierarchyWalker(process, max_depth, max_count)
+    if not walker.is_valid():
+        result.SetError("UIView ivars are not available for this architecture.")
+        return
+
+    output_path = args[3] if len(args) > 3 else None
+    if print_nodes(walker.walk(address), result, output_path, format_node, node_to_json):
+        print("{} view{}{}.".format(walker.count, "" if walker.count == 1 else "s",
+                                    " (limited)" if walker.truncated else ""), file=result)
+
+
+def parse_limits(args, result):
+    """
+    Parses depth and count limits (0 is unlimited, count is limited to `DEFAULT_MAX_COUNT` if it isn't given).
+
+    :param list[str] args: Depth and count arguments (can be empty).
+    :param lldb.SBCommandReturnObject result: Results (error is set if argument is not a number).
+    :return: Maximal depth and maximal count (None - unlimited) or None if arguments are invalid.
+    :rtype: (int | None, int | None) | None
+    """
+    limits = list()
+    for argument in args:
+        try:
+            limits.append(int(argument))
+        except ValueError:
+            result.SetError("Invalid number \"{}\".".format(argument))
+            return None
+    max_depth = limits[0] if len(limits) > 0 else 0
+    max_count = limits[1] if len(limits) > 1 else DEFAULT_MAX_COUNT
+    return max_depth or None, max_count or None
+
+
+def print_nodes(nodes, result, output_path, format_function, json_function):
+    """
+    Prints nodes of hierarchy as they are found and writes them to JSON Lines file.
+
+    :param collections.Iterable nodes: Nodes.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param str | None output_path: JSON Lines file path.
+    :param function format_function: Returns description of node.
+    :param function json_function: Returns JSON representation of node.
+    :return: False if output file cannot be opened.
+    :rtype: bool
+    """
+    output_file = None
+    if output_path is not None:
+        output_path = os.path.expanduser(output_path)
+        try:
+            output_file = open(output_path, "w")
+        except IOError as error:
+            result.SetError("Cannot open file \"{}\": {}.".format(output_path, error))
+            return False
+    try:
+        for node in nodes:
+            print(format_function(node), file=result)
+            if output_file is not None:
+                output_file.write(json.dumps(json_function(node)) + "\n")
+    finally:
+        if output_file is not None:
+            output_file.close()
+    return True
+
+
+def get_address(process, argument):
+    """
+    Returns address of object given by variable path (in selected frame) or address.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param str argument: Variable path or address.
+    :return: Object address or None.
+    :rtype: int | None
+    """
+    try:
+        address = int(argument, 0)
+    except ValueError:
+        frame = process.GetSelectedThread().GetSelectedFrame()
+        """:type: lldb.SBFrame"""
+        if not frame.IsValid():
+            return None
+        value = frame.GetValueForVariablePath(argument, lldb.eNoDynamicValues)
+        """:type: lldb.SBValue"""
+        if not value.IsValid():
+            return None
+        address = value.GetValueAsUnsigned()
+    return address if address != 0 else None
+
+
+def format_node(node):
+    """
+    Returns description of view in `recursiveDescription` format.
+
+    :param view_hierarchy.ViewNode node: View.
+    :rtype: str
+    """
+    parts = ["{}: 0x{:x}".format(node.class_name or "?", node.address)]
+    if node.frame is not None:
+        parts.append("frame = ({} {}; {} {})".format(*[SummaryBase.formatted_float(f) for f in node.frame]))
+    if node.tag:
+        parts.append("tag = {}".format(node.tag))
+    return "{}<{}>".format("   | " * node.depth, "; ".join(parts))
+
+
+def node_to_json(node):
+    """
+    Returns JSON representation of view.
+
+    :param view_hierarchy.ViewNode node: View.
+    :rtype: dict
+    """
+    return {"depth": node.depth,
+            "address": "0x{:x}".format(node.address),
+            "class": node.class_name,
+            "frame": list(node.frame) if node.frame is not None else None,
+            "tag": node.tag,
+            "parent": "0x{:x}".format(node.parent) if node.parent is not None else None}
+
+
+dispatcher.register_command("view-tree", view_tree, "View hierarchy decoded from memory: <view> [depth] [count] "
+                                                    "[file.jsonl].")
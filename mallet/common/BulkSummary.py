@@ -0,0 +1,183 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import collections
+from .. import helpers
+from .. import loader
+from .. import memory_cache
+from .. import memory_regions
+from .. import tracer
+
+
+# Maximal number of pages between objects which are read together with objects memory (objects of the same class
+# are often allocated close to each other, one bigger read is cheaper than many small reads).
+PREFETCH_MAX_GAP = 4
+
+
+class SummaryGroup(object):
+    """
+    Values of the same (dynamic) class summarized by one provider class.
+
+    :param str class_name: Class name of values.
+    :param class | None provider_class: Summary provider class (subclass of SummaryBaseSyntheticProvider).
+    :param list[int] indexes: Indexes of values in the list passed to `get_summaries`.
+    :param list[lldb.SBValue] values: Values.
+    :param int | None instance_size: Size of object memory of the class (computed by provider of the first
+        plausible value).
+    """
+    def __init__(self, class_name, provider_class):
+        """
+        :param str class_name: Class name of values.
+        :param class | None provider_class: Summary provider class.
+        """
+        super(SummaryGroup, self).__init__()
+        self.class_name = class_name
+        self.provider_class = provider_class
+        self.indexes = list()
+        self.values = list()
+        self.instance_size = None
+
+
+def get_summaries(values, internal_dict, provider_classes):
+    """
+    Returns summaries of many values (e.g. elements of collection or views of hierarchy) in the same order.
+
+    Values are grouped by their dynamic class. Provider class and object layout (instance size) are resolved
+    once per group, memory of all objects is read with few coalesced reads and then summaries are computed
+    from cached memory. Provider class of values whose class isn't in `provider_classes` is found through
+    superclasses. Values without provider use LLDB summary.
+
+    :param list[lldb.SBValue] values: Values.
+    :param dict internal_dict: Internal LLDB dictionary.
+    :param dict[str, class] provider_classes: Maps class name to summary provider class.
+    :return: Summaries (in order of values).
+    :rtype: list[str | None]
+    """
+    summaries = [None] * len(values)
+    if len(values) == 0:
+        return summaries
+
+    t = tracer.get_tracer()
+    target = values[0].GetTarget()
+    process = target.GetProcess()
+    architecture_name = helpers.architecture_name_from_target(target)
+    groups = get_summary_groups(values, provider_classes, architecture_name)
+
+    # Object memory of all values.
+    regions = memory_regions.get_memory_regions()
+    ranges = list()
+    for group in groups:
+        if group.provider_class is None:
+            continue
+        for value in group.values:
+            address = value.GetValueAsUnsigned()
+            if not regions.is_plausible_object_pointer(process, address, architecture_name):
+                continue
+            if group.instance_size is None:
+                group.instance_size = group.provider_class(value, internal_dict).get_instance_size()
+            ranges.append((address, group.instance_size))
+    if len(ranges) > 0:
+        memory_cache.get_memory_cache().prefetch(process, ranges, PREFETCH_MAX_GAP)
+
+    for group in groups:
+        if t.enabled:
+            t.trace("bulk_summary", group.class_name, len(group.values))
+        for index, value in zip(group.indexes, group.values):
+            if group.provider_class is None:
+                summaries[index] = value.GetSummary()
+            else:
+                summaries[index] = helpers.generic_summary_provider(value, internal_dict, group.provider_class)
+    return summaries
+
+
+def get_summary_groups(values, provider_classes, architecture_name):
+    """
+    Groups values by their dynamic class and resolves provider class of every group.
+
+    :param list[lldb.SBValue] values: Values.
+    :param dict[str, class] provider_classes: Maps class name to summary provider class.
+    :param str architecture_name: Architecture name.
+    :return: Groups (in order of first value of every group).
+    :rtype: list[SummaryGroup]
+    """
+    groups = collections.OrderedDict()
+    """:type: collections.OrderedDict[str, SummaryGroup]"""
+    for index, value in enumerate(values):
+        dynamic_value = value.GetDynamicValue(lldb.eDynamicDontRunTarget)
+        """:type: lldb.SBValue"""
+        class_name = helpers.get_pointer_class_name(dynamic_value)
+        group = groups.get(class_name)
+        if group is None:
+            provider_class = find_provider_class(dynamic_value, class_name, provider_classes, architecture_name)
+            group = SummaryGroup(class_name, provider_class)
+            groups[class_name] = group
+        group.indexes.append(index)
+        group.values.append(dynamic_value)
+    return list(groups.values())
+
+
+def find_provider_class(value, class_name, provider_classes, architecture_name):
+    """
+    Returns provider class of class or of its nearest superclass. Superclasses are taken from LLDB type
+    (classes of the application) or from class dumps (system classes).
+
+    :param lldb.SBValue value: Dynamic value.
+    :param str class_name: Class name.
+    :param dict[str, class] provider_classes: Maps class name to summary provider class.
+    :param str architecture_name: Architecture name.
+    :return: Provider class or None.
+    :rtype: class | None
+    """
+    if class_name is None:
+        return None
+    manager = loader.get_shared_lazy_class_dump_manager()
+    t = value.GetType()
+    """:type: lldb.SBType"""
+    if t.IsPointerType():
+        t = t.GetPointeeType()
+
+    visited = set()
+    while class_name is not None and class_name not in visited:
+        if class_name in provider_classes:
+            return provider_classes[class_name]
+        visited.add(class_name)
+
+        # Superclass from LLDB type.
+        super_class_name = None
+        if t is not None and t.IsValid() and t.GetNumberOfDirectBaseClasses() > 0:
+            t = t.GetDirectBaseClassAtIndex(0).GetType()
+            super_class_name = t.GetName()
+        else:
+            t = None
+        # Superclass from class dumps.
+        if super_class_name is None:
+            module_name = manager.find_module_for_class(architecture_name, class_name)
+            if module_name is not None:
+                c = manager.get_class(module_name, architecture_name, class_name)
+                if c is not None:
+                    super_class_name = c.super_class_name
+        class_name = super_class_name
+    return None
+
@@ -23,12 +23,49 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 import lldb
+import struct
+import time
+import threading
 import logging
 from .. import loader
 from .. import helpers
+from .. import collection_decoder
+from .. import memory_cache
+from .. import memory_regions
+from .. import number_decoder
+from .. import object_description
+from .. import perf_stats
+from .. import provider_registry
+from .. import string_decoder
+from .. import summary_budget
+from .. import summary_verbosity
+from .. import tracer
 from .. import type_cache
 
 
+# Scalar types which can be read directly from memory. Maps type name to its size (0 for pointer size)
+# and flag if it is floating point type.
+SCALAR_TYPES = {"char": (1, False),
+                "signed char": (1, False),
+                "unsigned char": (1, False),
+                "BOOL": (1, False),
+                "bool": (1, False),
+                "_Bool": (1, False),
+                "short": (2, False),
+                "unsigned short": (2, False),
+                "int": (4, False),
+                "unsigned int": (4, False),
+                "long": (0, False),
+                "unsigned long": (0, False),
+                "long long": (8, False),
+                "unsigned long long": (8, False),
+                "NSInteger": (0, False),
+                "NSUInteger": (0, False),
+                "float": (4, True),
+                "double": (8, True),
+                "CGFloat": (0, True)}
+
+
 class RegisterValue(object):
     """
     Stores register value parameters.
@@ -48,6 +85,8 @@ class RegisterValue(object):
     :param (int | float | str | SummaryBaseSyntheticProvider) -> str | None summary_function: Summary function.
     :param bool cache_summary: Indicates if summary value should be cached.
     :param str | None cached_summary: Cached summary.
+    :param int cost: Cost tier (`summary_verbosity.COST_*`), parts above maximal cost of verbosity level
+        are skipped in summaries.
     """
     def __init__(self):
         self.attribute_name = None
@@ -69,6 +108,8 @@ class RegisterValue(object):
         self.cache_summary = False
         self.cached_summary = None
 
+        self.cost = summary_verbosity.COST_NESTED
+
 
 class SummaryBaseSyntheticProvider(object):
     """
@@ -96,11 +137,22 @@ class SummaryBaseSyntheticProvider(object):
     :param int architecture: Architecture type.
     :param str architecture_name: Architecture name.
     :param bool is_64bit: Is 64 bit architecture.
+    :param bool | None plausible: Cached result of `is_plausible`.
+    :param int | None data_address: Address of object data (pointed object or value itself).
+    :param lldb.SBProcess | None process: LLDB process (used to read memory).
     :param list[RegisterValue] registered_child_values: List of registered parameters.
     :param str synthetic_type: Type of synthetic children (list of proxy object).
     :param list[str] synthetic_children: List of synthetic children.
     :param str synthetic_proxy_name: Name of registered parameter which will be used as proxy for synthetic child.
     :param lldb.SBValue synthetic_proxy_value: LLDB value which will be used as proxy for synthetic child.
+    :param lldb.SBValue | None synthetic_proxy_copy: Synthetic copy of proxy value (reset by `update`).
+    :param int | None synthetic_proxy_count: Number of children of proxy value (reset by `update`).
+    :param (int, int) | None fingerprint: Fingerprint of object memory from last `update`.
+    :param int | None instance_size: Cached size of object memory (see `get_instance_size`).
+    :param bool memory_recorded: True if object memory was recorded as dependency of computed summary.
+    :param int | None update_stop_id: Process stop ID (including expression stops) of last `update`.
+    :param threading.RLock lock: Lock of provider state, held by `update`, synthetic children callbacks and summaries
+        (registered provider can be reused by summary in another thread, see `provider_registry`).
     """
 
     SYNTHETIC_CHILDREN = "SYNTHETIC_CHILDREN"
@@ -127,12 +179,26 @@ class SummaryBaseSyntheticProvider(object):
         self.architecture = helpers.architecture_type_from_target(self.target)
         self.architecture_name = helpers.architecture_name_from_target(self.target)
         self.is_64bit = helpers.is_64bit_architecture(self.architecture)
+        self.plausible = None
+        self.data_address = None
+        self.process = None
 
         self.registered_child_values = list()
         self.synthetic_type = self.SYNTHETIC_CHILDREN
         self.synthetic_children = list()
         self.synthetic_proxy_name = None
         self.synthetic_proxy_value = None
+        self.synthetic_proxy_copy = None
+        self.synthetic_proxy_count = None
+        self.fingerprint = None
+        self.instance_size = None
+        self.memory_recorded = False
+        self.update_stop_id = None
+        self.lock = threading.RLock()
+
+        t = tracer.get_tracer()
+        if t.enabled:
+            t.trace("provider_init", self.__class__.__name__)
 
     def get_type(self, type_name):
         """
@@ -171,6 +237,127 @@ class SummaryBaseSyntheticProvider(object):
         """
         return get_address_value(self.value_obj)
 
+    def is_plausible(self):
+        """
+        Checks if object pointer is plausible (not nil, aligned, not tagged pointer and pointing to readable memory).
+        Providers of implausible objects (uninitialized or dangling pointers) don't read any child values.
+
+        :return: True if object pointer is plausible or value is not a pointer.
+        :rtype: bool
+        """
+        if self.plausible is None:
+            self.plausible = True
+            if self.dynamic_value_obj.TypeIsPointerType():
+                pointer = self.dynamic_value_obj.GetValueAsUnsigned()
+                regions = memory_regions.get_memory_regions()
+                self.plausible = regions.is_plausible_object_pointer(self.get_process(), pointer,
+                                                                     self.architecture_name)
+                if not self.plausible:
+                    t = tracer.get_tracer()
+                    if t.enabled:
+                        t.trace("implausible_pointer", self.__class__.__name__, pointer)
+                self.data_address = pointer
+            else:
+                address = self.dynamic_value_obj.GetLoadAddress()
+                if address != lldb.LLDB_INVALID_ADDRESS:
+                    self.data_address = address
+        return self.plausible
+
+    def get_process(self):
+        """
+        Returns LLDB process.
+
+        :return: LLDB process.
+        :rtype: lldb.SBProcess
+        """
+        if self.process is None:
+            self.process = self.target.GetProcess()
+        return self.process
+
+    def read_memory(self, offset, size):
+        """
+        Reads object memory (through shared memory cache).
+
+        :param int offset: Offset from object address.
+        :param int size: Number of bytes.
+        :return: Memory content or None.
+        :rtype: bytes | None
+        """
+        if not self.is_plausible() or self.data_address is None:
+            return None
+        return memory_cache.get_memory_cache().read(self.get_process(), self.data_address + offset, size)
+
+    def read_unsigned(self, offset, size):
+        """
+        Reads unsigned integer from object memory.
+
+        :param int offset: Offset from object address.
+        :param int size: Integer size.
+        :return: Integer or None.
+        :rtype: int | None
+        """
+        data = self.read_memory(offset, size)
+        return None if data is None else int.from_bytes(data, "little")
+
+    def read_signed(self, offset, size):
+        """
+        Reads signed integer from object memory.
+
+        :param int offset: Offset from object address.
+        :param int size: Integer size.
+        :return: Integer or None.
+        :rtype: int | None
+        """
+        data = self.read_memory(offset, size)
+        return None if data is None else int.from_bytes(data, "little", signed=True)
+
+    def read_pointer(self, offset):
+        """
+        Reads pointer from object memory.
+
+        :param int offset: Offset from object address.
+        :return: Pointer or None.
+        :rtype: int | None
+        """
+        return self.read_unsigned(offset, 8 if self.is_64bit else 4)
+
+    def read_scalar_value(self, r):
+        """
+        Reads primitive value of registered scalar child value (with known offset and type) directly from memory,
+        without creating child value.
+
+        :param RegisterValue r: Registered child value.
+        :return: Primitive value or None if value cannot be read from memory.
+        :rtype: int | float | bool | None
+        """
+        if r.offset is None:
+            return None
+        scalar_type = SCALAR_TYPES.get(r.type_name)
+        if scalar_type is None:
+            return None
+        size, is_float = scalar_type
+        if size == 0:
+            size = 8 if self.is_64bit else 4
+
+        function = r.primitive_value_function
+        if is_float:
+            if function is not get_float_value:
+                return None
+        elif function is not get_signed_value and function is not get_unsigned_value and function is not get_bool_value:
+            return None
+
+        data = self.read_memory(r.offset, size)
+        if data is None:
+            return None
+        if is_float:
+            return struct.unpack("<d" if size == 8 else "<f", data)[0]
+        if function is get_unsigned_value:
+            return int.from_bytes(data, "little")
+        value = int.from_bytes(data, "little", signed=True)
+        if function is get_bool_value:
+            return value != 0
+        return value
+
     def get_child_value(self, ivar_name, type_name=None, offset=None):
         """
         Returns child value (SBValue) with given name (or offset). If variable cannot be find by name then uses ivar offset.
@@ -186,17 +373,30 @@ class SummaryBaseSyntheticProvider(object):
         :return: Child value with given name.
         :rtype: lldb.SBValue | None
         """
+        t = tracer.get_tracer()
+        if t.enabled:
+            t.trace("child_value", ivar_name, offset if offset is not None else lldb.LLDB_INVALID_ADDRESS)
+
+        # Skip uninitialized or dangling pointers.
+        if not self.is_plausible():
+            return None
+
+        # Child values are read by LLDB, so object memory is recorded as dependency of computed summary.
+        if not self.memory_recorded and memory_cache.get_memory_cache().recorders:
+            self.memory_recorded = True
+            self.read_memory(0, self.get_instance_size())
+
         logger = logging.getLogger(__name__)
         # Using offset if provided.
         if offset is not None:
             # Error: missing type_name
             if not type_name:
-                logger.error("get_child_value: using offset {} without type name.".format(offset))
+                logger.error("get_child_value: using offset %s without type name.", offset)
                 return None
             t = self.get_type(type_name)
             # Error: cannot find type with given name.
             if t is None:
-                logger.error("get_child_value: cannot find type for name: {}.".format(type_name))
+                logger.error("get_child_value: cannot find type for name: %s.", type_name)
                 return None
             value = self.dynamic_value_obj.CreateChildAtOffset(ivar_name, offset, t)
             """:type: lldb.SBValue"""
@@ -214,7 +414,7 @@ class SummaryBaseSyntheticProvider(object):
             # Find ivar object.
             ivar = self.get_ivar(ivar_name)
             if ivar is None:
-                logger.error("get_child_value: no ivar {} for type {}.".format(ivar_name, self.type_name))
+                logger.error("get_child_value: no ivar %s for type %s.", ivar_name, self.type_name)
                 return None
 
             # Get value from offset.
@@ -223,7 +423,7 @@ class SummaryBaseSyntheticProvider(object):
             t = self.get_type(type_name)
 
             if t is None:
-                logger.error("get_child_value: cannot find type for name: {}.".format(type_name))
+                logger.error("get_child_value: cannot find type for name: %s.", type_name)
                 return None
             value = self.dynamic_value_obj.CreateChildAtOffset(ivar_name, ivar.offset, t)
             """:type: lldb.SBValue"""
@@ -242,31 +442,75 @@ class SummaryBaseSyntheticProvider(object):
         :return: Number of children that the object have.
         :rtype: int
         """
-        log = logging.getLogger(__name__)
-        if self.synthetic_type == self.SYNTHETIC_CHILDREN:
-            return len(self.synthetic_children)
-        elif self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
-            value = getattr(self, self.synthetic_proxy_name)
-            """:type: lldb.SBValue"""
-            if value is not None:
-                value = get_synthetic_value_copy(value)
-                count = value.GetNumChildren()
-                """:type: int"""
-                return count
-            log.error("num_children: Cannot get proxy value: {} for type {}.".format(self.synthetic_proxy_name, self.type_name))
+        stats = perf_stats.get_perf_stats()
+        if not stats.enabled:
+            return self.__num_children()
+        start = time.perf_counter()
+        count = self.__num_children()
+        stats.record(self.__class__.__name__, "num_children", time.perf_counter() - start, self.value_obj)
+        return count
+
+    def __num_children(self):
+        """
+        Returns the number of children that the object have.
+
+        :return: Number of children that the object have.
+        :rtype: int
+        """
+        # Registered provider can be used by summary in another thread.
+        with self.lock:
+            log = logging.getLogger(__name__)
+            if not self.is_plausible():
+                return 0
+            if self.synthetic_type == self.SYNTHETIC_CHILDREN:
+                return len(self.synthetic_children)
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
+                value = self.get_synthetic_proxy()
+                if value is not None:
+                    return self.get_synthetic_proxy_count()
+                log.error("num_children: Cannot get proxy value: %s for type %s.", self.synthetic_proxy_name, self.type_name)
+                return 0
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
+                value = self.get_synthetic_proxy()
+                if value is not None:
+                    return self.get_synthetic_proxy_count()
+                log.error("num_children: No proxy value for type %s.", self.type_name)
+                # Returns child number for current object.
+                return self.value_obj.GetNumChildren()
+
+            log.error("num_children: Unknown synthetic type: %s for type %s.", self.synthetic_type, self.type_name)
             return 0
-        elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
-            if self.synthetic_proxy_value is not None:
-                value = get_synthetic_value_copy(self.synthetic_proxy_value)
-                count = value.GetNumChildren()
-                """:type: int"""
-                return count
-            log.error("num_children: No proxy value for type {}.".format(self.type_name))
-            # Returns child number for current object.
-            return self.value_obj.GetNumChildren()
-
-        log.error("num_children: Unknown synthetic type: {} for type {}.".format(self.synthetic_type, self.type_name))
-        return 0
+
+    def get_synthetic_proxy(self):
+        """
+        Returns synthetic copy of proxy value. Copy is created once (per `update`) and reused by all synthetic
+        children callbacks.
+
+        :return: Synthetic copy of proxy value or None.
+        :rtype: lldb.SBValue | None
+        """
+        if self.synthetic_proxy_copy is None:
+            value = None
+            if self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
+                value = getattr(self, self.synthetic_proxy_name)
+                """:type: lldb.SBValue"""
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
+                value = self.synthetic_proxy_value
+            if value is not None:
+                self.synthetic_proxy_copy = get_synthetic_value_copy(value)
+        return self.synthetic_proxy_copy
+
+    def get_synthetic_proxy_count(self):
+        """
+        Returns number of children of proxy value (computed once per `update`).
+
+        :return: Number of children of proxy value.
+        :rtype: int
+        """
+        if self.synthetic_proxy_count is None:
+            value = self.get_synthetic_proxy()
+            self.synthetic_proxy_count = 0 if value is None else value.GetNumChildren()
+        return self.synthetic_proxy_count
 
     def get_child_index(self, name):
         """
@@ -277,42 +521,42 @@ class SummaryBaseSyntheticProvider(object):
         :return: The index of the synthetic child.
         :rtype: int
         """
-        log = logging.getLogger(__name__)
-        if self.synthetic_type == self.SYNTHETIC_CHILDREN:
-            r = self.get_registered_child_value_parameter(ivar_name=name)
-            index = None
-            if r is None:
-                log.debug("get_child_index: Cannot find registered child with ivar name: {} for class {}.".format(name, self.type_name))
+        # Registered provider can be used by summary in another thread.
+        with self.lock:
+            log = logging.getLogger(__name__)
+            if self.synthetic_type == self.SYNTHETIC_CHILDREN:
+                r = self.get_registered_child_value_parameter(ivar_name=name)
+                index = None
+                if r is None:
+                    log.debug("get_child_index: Cannot find registered child with ivar name: %s for class %s.", name, self.type_name)
+                    return index
+
+                if self.synthetic_children.count(r.attribute_name):
+                    index = self.synthetic_children.index(r.attribute_name)
+                else:
+                    log = logging.getLogger(__name__)
+                    log.debug("get_child_index: Cannot find child with name: %s for class %s.", name, self.type_name)
                 return index
-
-            if self.synthetic_children.count(r.attribute_name):
-                index = self.synthetic_children.index(r.attribute_name)
-            else:
-                log = logging.getLogger(__name__)
-                log.debug("get_child_index: Cannot find child with name: {} for class {}.".format(name, self.type_name))
-            return index
-        elif self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
-            value = getattr(self, self.synthetic_proxy_name)
-            """:type: lldb.SBValue"""
-            if value is not None:
-                value = get_synthetic_value_copy(value)
-                index = value.GetIndexOfChildWithName(name)
-                """:type: int"""
-                return index
-            log.error("get_child_index: Cannot get proxy value: {} for type {}.".format(self.synthetic_proxy_name, self.type_name))
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
+                value = self.get_synthetic_proxy()
+                if value is not None:
+                    index = value.GetIndexOfChildWithName(name)
+                    """:type: int"""
+                    return index
+                log.error("get_child_index: Cannot get proxy value: %s for type %s.", self.synthetic_proxy_name, self.type_name)
+                return None
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
+                value = self.get_synthetic_proxy()
+                if value is not None:
+                    index = value.GetIndexOfChildWithName(name)
+                    """:type: int"""
+                    return index
+                log.error("get_child_index: No proxy value for type %s.", self.type_name)
+                # Returns index of child for current object.
+                return self.value_obj.GetIndexOfChildWithName(name)
+
+            log.error("get_child_index: Unknown synthetic type: %s for type %s.", self.synthetic_type, self.type_name)
             return None
-        elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
-            if self.synthetic_proxy_value is not None:
-                value = get_synthetic_value_copy(self.synthetic_proxy_value)
-                index = value.GetIndexOfChildWithName(name)
-                """:type: int"""
-                return index
-            log.error("get_child_index: No proxy value for type {}.".format(self.type_name))
-            # Returns index of child for current object.
-            return self.value_obj.GetIndexOfChildWithName(name)
-
-        log.error("get_child_index: Unknown synthetic type: {} for type {}.".format(self.synthetic_type, self.type_name))
-        return None
 
     def get_child_at_index(self, index):
         """
@@ -323,33 +567,49 @@ class SummaryBaseSyntheticProvider(object):
         :return: LLDB SBValue object representing the child.
         :rtype: lldb.SBValue
         """
-        log = logging.getLogger(__name__)
-        if self.synthetic_type == self.SYNTHETIC_CHILDREN:
-            name = self.synthetic_children[index]
-            value = getattr(self, name)
-            return value
-        elif self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
-            value = getattr(self, self.synthetic_proxy_name)
-            """:type: lldb.SBValue"""
-            if value is not None:
-                value = get_synthetic_value_copy(value)
-                child = value.GetChildAtIndex(index)
-                """:type: lldb.SBValue"""
-                return child
-            log.error("get_child_at_index: Cannot get proxy value: {} for type {}".format(self.synthetic_proxy_name, self.type_name))
-            return None
-        elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
-            if self.synthetic_proxy_value is not None:
-                value = get_synthetic_value_copy(self.synthetic_proxy_value)
-                child = value.GetChildAtIndex(index)
-                """:type: lldb.SBValue"""
-                return child
-            log.error("get_child_at_index: No proxy value for type {}.".format(self.type_name))
-            # Return child for current object.
-            return self.value_obj.GetChildAtIndex(index)
+        stats = perf_stats.get_perf_stats()
+        if not stats.enabled:
+            return self.__get_child_at_index(index)
+        start = time.perf_counter()
+        child = self.__get_child_at_index(index)
+        stats.record(self.__class__.__name__, "get_child_at_index", time.perf_counter() - start, self.value_obj)
+        return child
+
+    def __get_child_at_index(self, index):
+        """
+        Returns LLDB SBValue object representing the child at the index given as argument.
 
-        log.error("get_child_at_index: Unknown synthetic type: {} for type {}.".format(self.synthetic_type, self.type_name))
-        return None
+        :param int index: Index of synthetic child.
+        :return: LLDB SBValue object representing the child.
+        :rtype: lldb.SBValue
+        """
+        # Registered provider can be used by summary in another thread.
+        with self.lock:
+            log = logging.getLogger(__name__)
+            if self.synthetic_type == self.SYNTHETIC_CHILDREN:
+                name = self.synthetic_children[index]
+                value = getattr(self, name)
+                return value
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
+                value = self.get_synthetic_proxy()
+                if value is not None:
+                    child = value.GetChildAtIndex(index)
+                    """:type: lldb.SBValue"""
+                    return child
+                log.error("get_child_at_index: Cannot get proxy value: %s for type %s", self.synthetic_proxy_name, self.type_name)
+                return None
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
+                value = self.get_synthetic_proxy()
+                if value is not None:
+                    child = value.GetChildAtIndex(index)
+                    """:type: lldb.SBValue"""
+                    return child
+                log.error("get_child_at_index: No proxy value for type %s.", self.type_name)
+                # Return child for current object.
+                return self.value_obj.GetChildAtIndex(index)
+
+            log.error("get_child_at_index: Unknown synthetic type: %s for type %s.", self.synthetic_type, self.type_name)
+            return None
 
     def update(self):
         """
@@ -362,10 +622,105 @@ class SummaryBaseSyntheticProvider(object):
         If nothing, None, or anything other than True is returned, LLDB will discard the cached information and ask.
         Regardless, whenever necessary LLDB will call update.
 
-        :return: True if internal state of the Python object was changed.
+        Object memory (isa and ivars) is fingerprinted. If it changed, cached child values are dropped
+        and synthetic children are updated (`update_synthetic_children`). Children of proxy values are also
+        compared by count, because collections can change without change of object memory.
+        Updated provider is registered, so summary of the same object can reuse it in current stop.
+
+        :return: True if object didn't change and LLDB can keep cached children.
         :rtype: bool
         """
-        return True
+        # Registered provider can be used by summary in another thread.
+        with self.lock:
+            # Variable can point to another object after resume.
+            self.plausible = None
+            self.data_address = None
+            previous_count = self.synthetic_proxy_count
+            self.synthetic_proxy_copy = None
+            self.synthetic_proxy_count = None
+
+            fingerprint = self.get_fingerprint()
+
+            # Summary of the same object can reuse this provider in current stop.
+            process = self.get_process()
+            self.update_stop_id = process.GetStopID(True)
+            if self.plausible and self.data_address is not None:
+                key = (process.GetUniqueID(), self.__class__.__name__, self.data_address)
+                provider_registry.get_provider_registry().register(key, self)
+
+            if fingerprint is not None and fingerprint == self.fingerprint:
+                if self.synthetic_type == self.SYNTHETIC_CHILDREN:
+                    return True
+                return previous_count is not None and self.get_synthetic_proxy_count() == previous_count
+
+            self.fingerprint = fingerprint
+            self.reset_cached_values()
+            self.update_synthetic_children()
+            return False
+
+    def update_synthetic_children(self):
+        """
+        Updates synthetic children (or proxy value) after object memory changed. Called by `update`.
+        """
+        pass
+
+    def reset_cached_values(self):
+        """
+        Drops cached values, providers and summaries of registered child values.
+        """
+        for r in self.registered_child_values:
+            r.cached_value = None
+            r.cached_primitive_value = None
+            r.cached_provider = None
+            r.cached_summary = None
+
+    def get_instance_size(self):
+        """
+        Returns size of object memory: instance size from class dumps or LLDB type (for objects)
+        or value size (for structures), extended to cover child values registered with offset.
+
+        :return: Size of object memory.
+        :rtype: int
+        """
+        if self.instance_size is not None:
+            return self.instance_size
+
+        pointer_size = 8 if self.is_64bit else 4
+        if not self.dynamic_value_obj.TypeIsPointerType():
+            size = self.dynamic_value_obj.GetByteSize()
+        else:
+            size = None
+            if self.module_name is not None and self.type_name is not None:
+                size = loader.get_shared_lazy_class_dump_manager().get_instance_size(self.module_name,
+                                                                                    self.architecture_name,
+                                                                                    self.type_name)
+            if size is None:
+                size = self.dynamic_value_obj.GetType().GetPointeeType().GetByteSize()
+            size = max(size or 0, pointer_size)
+
+        for r in self.registered_child_values:
+            if r.offset is None or r.type_name is None:
+                continue
+            if r.type_name in SCALAR_TYPES:
+                size = max(size, r.offset + (SCALAR_TYPES[r.type_name][0] or pointer_size))
+                continue
+            t = self.get_type(r.type_name)
+            if t is not None:
+                size = max(size, r.offset + t.GetByteSize())
+        self.instance_size = size
+        return size
+
+    def get_fingerprint(self):
+        """
+        Returns fingerprint of object: its address and hash of its memory (isa and ivars).
+
+        :return: Fingerprint or None if object memory cannot be read.
+        :rtype: (int, int) | None
+        """
+        data = self.read_memory(0, self.get_instance_size())
+        if data is None:
+            return None
+        return self.data_address, hash(data)
 
     def has_children(self):
         """
@@ -378,33 +733,33 @@ class SummaryBaseSyntheticProvider(object):
         :return: True if this object might have children, and False if this object can be guaranteed not to have children.
         :rtype: bool
         """
-        log = logging.getLogger(__name__)
-        if self.synthetic_type == self.SYNTHETIC_CHILDREN:
-            if len(self.synthetic_children) > 0:
+        # Registered provider can be used by summary in another thread.
+        with self.lock:
+            log = logging.getLogger(__name__)
+            if self.synthetic_type == self.SYNTHETIC_CHILDREN:
+                if len(self.synthetic_children) > 0:
+                    return True
                 return True
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
+                value = self.get_synthetic_proxy()
+                if value is not None:
+                    has_children = value.MightHaveChildren()
+                    """:type: bool"""
+                    return has_children
+                log.error("has_children: Cannot get proxy value: %s for type %s", self.synthetic_proxy_name, self.type_name)
+                return True
+            elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
+                value = self.get_synthetic_proxy()
+                if value is not None:
+                    has_children = value.MightHaveChildren()
+                    """:type: bool"""
+                    return has_children
+                log.error("has_children: No proxy value for type %s.", self.type_name)
+                # Returns value for current object.
+                return self.value_obj.MightHaveChildren()
+
+            log.error("has_children: Unknown synthetic type: %s for type %s.", self.synthetic_type, self.type_name)
             return True
-        elif self.synthetic_type == self.SYNTHETIC_PROXY_NAME:
-            value = getattr(self, self.synthetic_proxy_name)
-            """:type: lldb.SBValue"""
-            if value is not None:
-                value = get_synthetic_value_copy(value)
-                has_children = value.MightHaveChildren()
-                """:type: bool"""
-                return has_children
-            log.error("has_children: Cannot get proxy value: {} for type {}".format(self.synthetic_proxy_name, self.type_name))
-            return True
-        elif self.synthetic_type == self.SYNTHETIC_PROXY_VALUE:
-            if self.synthetic_proxy_value is not None:
-                value = get_synthetic_value_copy(self.synthetic_proxy_value)
-                has_children = value.MightHaveChildren()
-                """:type: bool"""
-                return has_children
-            log.error("has_children: No proxy value for type {}.".format(self.type_name))
-            # Returns value for current object.
-            return self.value_obj.MightHaveChildren()
-
-        log.error("has_children: Unknown synthetic type: {} for type {}.".format(self.synthetic_type, self.type_name))
-        return True
 
     # def get_value(self):
     #     """
@@ -423,7 +778,7 @@ class SummaryBaseSyntheticProvider(object):
     def register_child_value(self, attribute_name, ivar_name=None, type_name=None, offset=None, cache_value=True,
                              primitive_value_function=None, cache_primitive_value=False,
                              provider_class=None, cache_provider=True,
-                             summary_function=None, cache_summary=False):
+                             summary_function=None, cache_summary=False, cost=None):
         """
         Creates four attributes:
         1. `attribute_name` - Stores child value object (SBValue) using ivar_name, type_name and offset.
@@ -448,6 +803,8 @@ class SummaryBaseSyntheticProvider(object):
         :param (int | float | str | SummaryBaseSyntheticProvider) -> str | None summary_function: Summary function or method.
         Summary function will be called only when primitive value or provider is not None.
         :param bool cache_summary: Indicates if summary value should be cached.
+        :param int cost: Cost tier (`summary_verbosity.COST_DIRECT` or `COST_NESTED`). By default values with
+        integer, float or bool primitive value functions are direct, other values are nested.
         """
 
         if self.get_registered_child_value_parameter(attribute_name=attribute_name) is not None:
@@ -476,6 +833,14 @@ class SummaryBaseSyntheticProvider(object):
         r.summary_function = summary_function
         r.cache_summary = cache_summary
 
+        # Cost tier.
+        if cost is None:
+            if provider_class is None and primitive_value_function in DIRECT_VALUE_FUNCTIONS:
+                cost = summary_verbosity.COST_DIRECT
+            else:
+                cost = summary_verbosity.COST_NESTED
+        r.cost = cost
+
         self.registered_child_values.append(r)
 
     def get_registered_child_value_parameter(self, attribute_name=None, ivar_name=None):
@@ -532,42 +897,57 @@ class SummaryBaseSyntheticProvider(object):
         # Get registered value.
         r = self.get_registered_child_value_parameter(attribute_name)
         if r is None:
-            logger.error("__getattr__: Cannot find registered attribute \"{}\" in object {}.".format(attribute_name, self.type_name))
+            logger.error("__getattr__: Cannot find registered attribute \"%s\" in object %s.", attribute_name, self.type_name)
             raise AttributeError("{!r} object has no attribute {!r}".format(self.__class__, attribute_name))
 
         # Get child value.
         if primitive_value is False and provider_value is False and summary_value is False:
-            # logger.debug("__getattr__: Getting child value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+            # logger.debug("__getattr__: Getting child value for name \"%s\" in object %s.", attribute_name, self.type_name)
             # Get cached value.
             if r.cache_value is True and r.cached_value is not None:
-                # logger.debug("__getattr__: Getting cached child value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                # logger.debug("__getattr__: Getting cached child value for name \"%s\" in object %s.", attribute_name, self.type_name)
                 return r.cached_value
 
             # Computing child value.
-            # logger.debug("__getattr__: Computing child value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+            # logger.debug("__getattr__: Computing child value for name \"%s\" in object %s.", attribute_name, self.type_name)
             value = self.get_child_value(r.ivar_name, r.type_name, r.offset)
             if r.cache_value is True:
                 r.cached_value = value
             return value
         # Getting primitive value.
         elif primitive_value is True:
-            # logger.debug("__getattr__: Getting primitive value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+            # logger.debug("__getattr__: Getting primitive value for name \"%s\" in object %s.", attribute_name, self.type_name)
             # Check is primitive function exists.
             if r.primitive_value_function is None:
-                logger.error("__getattr__: Primitive function not found for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                logger.error("__getattr__: Primitive function not found for name \"%s\" in object %s.", attribute_name, self.type_name)
                 raise AttributeError("{!r} object has no attribute {!r}".format(self.__class__, item))
 
             # Get cached value.
             if r.cache_primitive_value is True and r.cached_primitive_value is not None:
-                # logger.debug("__getattr__: Getting cached primitive value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                # logger.debug("__getattr__: Getting cached primitive value for name \"%s\" in object %s.", attribute_name, self.type_name)
                 return r.cached_primitive_value
 
+            # Primitive value of nested object skipped by verbosity level.
+            if r.cost > summary_verbosity.get_summary_verbosity().max_cost:
+                return None
+
+            # Read scalar value directly from memory.
+            primitive = self.read_scalar_value(r)
+            if primitive is not None:
+                if r.cache_primitive_value is True:
+                    r.cached_primitive_value = primitive
+                return primitive
+
+            # Summary time budget exceeded (only scalar values are read).
+            if summary_budget.get_summary_budget().is_exceeded():
+                return None
+
             # Get child value.
-            # logger.debug("__getattr__: Computing primitive value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+            # logger.debug("__getattr__: Computing primitive value for name \"%s\" in object %s.", attribute_name, self.type_name)
             value = getattr(self, attribute_name)
             """:type: lldb.SBValue"""
             if value is None:
-                # logger.debug("__getattr__: Cannot compute child value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                # logger.debug("__getattr__: Cannot compute child value for name \"%s\" in object %s.", attribute_name, self.type_name)
                 return None
 
             # Computing primitive value.
@@ -577,23 +957,28 @@ class SummaryBaseSyntheticProvider(object):
             return primitive
         # Getting provider.
         elif provider_value is True:
-            # logger.debug("__getattr__: Getting provider for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+            # logger.debug("__getattr__: Getting provider for name \"%s\" in object %s.", attribute_name, self.type_name)
             # Check is provider class exists.
             if r.provider_class is None:
-                logger.error("__getattr__: Provider class not found for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                logger.error("__getattr__: Provider class not found for name \"%s\" in object %s.", attribute_name, self.type_name)
                 raise AttributeError("{!r} object has no attribute {!r}".format(self.__class__, item))
 
             # Get cached value.
             if r.cache_provider is True and r.cached_provider is not None:
-                # logger.debug("__getattr__: Getting cached provider for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                # logger.debug("__getattr__: Getting cached provider for name \"%s\" in object %s.", attribute_name, self.type_name)
                 return r.cached_provider
 
+            # Summary time budget exceeded or nested providers skipped by verbosity level.
+            if r.cost > summary_verbosity.get_summary_verbosity().max_cost or \
+                    summary_budget.get_summary_budget().is_exceeded():
+                return None
+
             # Get child value.
-            # logger.debug("__getattr__: Computing provider for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+            # logger.debug("__getattr__: Computing provider for name \"%s\" in object %s.", attribute_name, self.type_name)
             value = getattr(self, attribute_name)
             """:type: lldb.SBValue"""
             if value is None:
-                # logger.debug("__getattr__: Cannot compute child value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                # logger.debug("__getattr__: Cannot compute child value for name \"%s\" in object %s.", attribute_name, self.type_name)
                 return None
 
             # Computing provider.
@@ -604,42 +989,47 @@ class SummaryBaseSyntheticProvider(object):
             return provider
         # Getting summary.
         elif summary_value is True:
-            # logger.debug("__getattr__: Getting summary for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+            # logger.debug("__getattr__: Getting summary for name \"%s\" in object %s.", attribute_name, self.type_name)
             # Check if summary function exists.
             if r.summary_function is None:
-                logger.error("__getattr__: Summary function not found for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                logger.error("__getattr__: Summary function not found for name \"%s\" in object %s.", attribute_name, self.type_name)
                 raise AttributeError("{!r} object has no attribute {!r}".format(self.__class__, item))
 
             # Check if primitive function and provider class are None.
             if r.primitive_value_function is None and r.provider_class is None:
-                logger.error("__getattr__: Primitive function and provider class not found for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                logger.error("__getattr__: Primitive function and provider class not found for name \"%s\" in object %s.", attribute_name, self.type_name)
                 raise AttributeError("{!r} object has no attribute {!r}".format(self.__class__, item))
 
             # Get cached summary.
             if r.cache_summary is True and r.cached_summary is not None:
-                # logger.debug("__getattr__: Getting cached summary for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                # logger.debug("__getattr__: Getting cached summary for name \"%s\" in object %s.", attribute_name, self.type_name)
                 return r.cached_summary
 
+            # Summary time budget exceeded or part skipped by verbosity level.
+            if r.cost > summary_verbosity.get_summary_verbosity().max_cost or \
+                    summary_budget.get_summary_budget().is_exceeded():
+                return None
+
             # Getting primitive value.
-            # logger.debug("__getattr__: Computing summary for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+            # logger.debug("__getattr__: Computing summary for name \"%s\" in object %s.", attribute_name, self.type_name)
             if r.primitive_value_function:
                 primitive = getattr(self, attribute_name+"_value")
                 """:type: str | int | float | None"""
                 if primitive is None:
-                    # logger.debug("__getattr__: Cannot compute primitive value for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                    # logger.debug("__getattr__: Cannot compute primitive value for name \"%s\" in object %s.", attribute_name, self.type_name)
                     return None
                 summary_function_parameter = primitive
             else:
                 provider = getattr(self, attribute_name+"_provider")
                 """:type: SummaryBaseSyntheticProvider"""
                 if provider is None:
-                    # logger.debug("__getattr__: Cannot compute provider for name \"{}\" in object {}.".format(attribute_name, self.type_name))
+                    # logger.debug("__getattr__: Cannot compute provider for name \"%s\" in object %s.", attribute_name, self.type_name)
                     return None
                 summary_function_parameter = provider
 
-            # Computing summary.
+            # Computing summary (partial summaries are not cached).
             summary = r.summary_function(summary_function_parameter)
-            if r.cache_summary is True:
+            if r.cache_summary is True and not summary_budget.get_summary_budget().is_exceeded():
                 r.cached_summary = summary
             return summary
 
@@ -656,10 +1046,27 @@ class SummaryBaseSyntheticProvider(object):
         """
         Return object summary.
 
+        Summary is limited by time budget (`summary_budget`). If the budget is exceeded, remaining parts are skipped
+        and summary ends with ellipsis. Parts above the cost of verbosity level of the category (`summary_verbosity`)
+        are skipped.
+
         :return: Object summary.
         :rtype: str | None
         """
-        return join_summaries(*self.summaries_parts())
+        budget = summary_budget.get_summary_budget()
+        verbosity = summary_verbosity.get_summary_verbosity()
+        outermost = budget.enter()
+        if outermost:
+            verbosity.enter(self.module_name)
+        try:
+            summary = join_summaries(*self.summaries_parts())
+            if outermost and budget.exceeded:
+                summary = join_summaries(summary, budget.ELLIPSIS)
+            return summary
+        finally:
+            budget.leave()
+            if outermost:
+                verbosity.leave()
 
 
 def get_signed_value(obj):
@@ -714,15 +1121,35 @@ def get_float_value(obj):
     return None
 
 
+# Primitive value functions of direct ivars (cost tier of registered child values).
+DIRECT_VALUE_FUNCTIONS = {get_signed_value, get_unsigned_value, get_bool_value, get_float_value}
+
+
 def get_summary_value(obj):
     """
     Returns summary from LLDB value.
 
+    Strings, numbers, dates and URLs are decoded directly from memory, other values use LLDB formatters.
+    Nothing is returned when time budget of current summary is exceeded.
+
     :param lldb.SBValue obj: LLDB value object.
     :return: Summary from LLDB value.
     :rtype: str | None
     """
-    return None if obj is None else obj.GetSummary()
+    if obj is None or summary_budget.get_summary_budget().is_exceeded():
+        return None
+    class_name = helpers.get_pointer_class_name(obj)
+    summary = string_decoder.get_string_decoder().get_summary(obj, class_name)
+    if summary is None:
+        summary = number_decoder.get_number_decoder().get_summary(obj, class_name)
+    if summary is None and class_name in object_description.ObjectDescriber.URL_CLASS_NAMES:
+        # LLDB NSURL summary is quoted description.
+        description = object_description.get_object_describer().decode_description(obj)
+        summary = None if description is None else "@\"{}\"".format(description)
+    if summary is None:
+        memory_cache.get_memory_cache().record_untracked_read()
+        summary = obj.GetSummary()
+    return summary
 
 
 def get_stripped_summary_value(obj):
@@ -742,15 +1169,40 @@ def get_stripped_summary_value(obj):
     return summary
 
 
+def get_number_value(obj):
+    """
+    Returns value of NSNumber decoded directly from memory (tagged pointer or __NSCFNumber).
+
+    :param lldb.SBValue obj: LLDB value object.
+    :return: Number value.
+    :rtype: int | float | None
+    """
+    return None if obj is None else number_decoder.get_number_decoder().get_number(obj)
+
+
+def get_date_value(obj):
+    """
+    Returns date (in UTC) of NSDate decoded directly from memory (tagged pointer or __NSDate).
+
+    :param lldb.SBValue obj: LLDB value object.
+    :return: Date.
+    :rtype: datetime.datetime | None
+    """
+    return None if obj is None else number_decoder.get_number_decoder().get_date(obj)
+
+
 def get_description_value(obj):
     """
     Returns object description from LLDB value.
 
+    Descriptions of common Foundation objects are decoded from memory. Other objects are described
+    (by running `-description` in the target) only if running code in the target is allowed.
+
     :param lldb.SBValue obj: LLDB value object.
     :return: Object description from LLDB value.
     :rtype: str | None
     """
-    desc = None if obj is None else obj.GetObjectDescription()
+    desc = None if obj is None else object_description.get_object_describer().get_description(obj)
     if desc == "<nil>":
         desc = None
     return desc
@@ -777,6 +1229,8 @@ def get_count_value(obj):
     """
     Returns count of child objects from LLDB value.
 
+    Count of Foundation collections is read directly from memory, other values use LLDB synthetic children.
+
     :param lldb.SBValue obj: LLDB value object.
     :return: Count of child objects from LLDB value.
     :rtype: int | None
@@ -786,9 +1240,17 @@ def get_count_value(obj):
         return None
 
     # Return 0 if object has no value.
-    if obj.GetValue() is None or obj.GetValueAsUnsigned() == 0:
+    if obj.GetValue() is None:
+        return 0
+    address = obj.GetValueAsUnsigned()
+    if address == 0:
         return 0
-    return obj.GetNumChildren()
+
+    count = collection_decoder.get_collection_decoder().get_count(obj, address)
+    if count is None:
+        memory_cache.get_memory_cache().record_untracked_read()
+        count = obj.GetNumChildren()
+    return count
 
 
 def get_synthetic_count_value(obj):
@@ -807,20 +1269,32 @@ def get_synthetic_count_value(obj):
     if obj.GetValue() is None:
         return 0
 
+    count = collection_decoder.get_collection_decoder().get_count(obj)
+    if count is not None:
+        return count
+
     # Get synthetic value.
     obj = get_synthetic_value_copy(obj)
 
+    memory_cache.get_memory_cache().record_untracked_read()
     return obj.GetNumChildren()
 
 
 def get_nsset_count_value(obj):
     """
-    Returns count of child objects NSSet using summary value.
+    Returns count of child objects NSSet read directly from memory or using summary value.
 
     :param lldb.SBValue obj: LLDB value representing NSSet.
     :return: Count of child objects from LLDB synthetic value.
     :rtype: int | None
     """
+    if obj is None:
+        return None
+
+    count = collection_decoder.get_collection_decoder().get_count(obj)
+    if count is not None:
+        return count
+
     summary = get_summary_value(obj)
     if summary is None:
         return None
@@ -0,0 +1,219 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+from .. import recorded_lldb
+
+
+def record_memory(debugger, command, result, internal_dict):
+    """
+    Records memory of object and objects referenced by it to JSON file, which can be loaded by `recorded_lldb`.
+
+    record_memory variable file_path [depth] [size]
+
+    - variable: Variable which memory should be recorded.
+    - file_path: Output JSON file path.
+    - depth: How deep references are followed (default 4).
+    - size: Number of bytes recorded for every object (default 256).
+
+    :param lldb.SBDebugger debugger: LLDB debugger.
+    :param str command: Command attributes.
+    :param lldb.SBCommandReturnObject result: Results.
+    :param dict internal_dict: Internal LLDB dictionary.
+    """
+    args = command.split(" ")
+    if len(args) < 2 or len(args) > 4:
+        result.SetError("Usage: record_memory variable file_path [depth] [size]")
+        return
+
+    target = debugger.GetSelectedTarget()
+    """:type: lldb.SBTarget"""
+    process = target.GetProcess()
+    """:type: lldb.SBProcess"""
+    frame = process.GetSelectedThread().GetSelectedFrame()
+    """:type: lldb.SBFrame"""
+
+    variable_name = args[0]
+    file_path = args[1]
+    max_depth = int(args[2]) if len(args) > 2 else 4
+    object_size = int(args[3]) if len(args) > 3 else 256
+
+    value = frame.FindVariable(variable_name, lldb.eDynamicDontRunTarget)
+    """:type: lldb.SBValue"""
+    if not value:
+        result.SetError("Cannot find variable \"{}\".".format(variable_name))
+        return
+
+    recorder = MemoryRecorder(target, object_size)
+    recorder.record_variable(variable_name, value, max_depth)
+    recorder.image.save(file_path)
+    print("Recorded {} bytes in {} regions to \"{}\".".format(sum(len(r) for r in recorder.image.regions),
+                                                              len(recorder.image.regions), file_path), file=result)
+
+
+class MemoryRecorder(object):
+    """
+    Records process memory into `recorded_lldb.MemoryImage`.
+
+    Memory is recorded in aligned chunks. Every pointer sized word in recorded object which points to readable memory
+    is followed (up to given depth). For Objective-C objects also class name, LLDB summary and collection elements are recorded.
+
+    :param lldb.SBTarget target: LLDB target.
+    :param lldb.SBProcess process: LLDB process.
+    :param int object_size: Number of bytes recorded for every object.
+    :param int pointer_size: Pointer size.
+    :param dict[int, bytes] chunks: Maps chunk address to its content.
+    :param recorded_lldb.MemoryImage image: Recorded image.
+    """
+    CHUNK_SIZE = 0x100
+    MAX_ELEMENTS = 1000
+
+    def __init__(self, target, object_size):
+        """
+        :param lldb.SBTarget target: LLDB target.
+        :param int object_size: Number of bytes recorded for every object.
+        """
+        super(MemoryRecorder, self).__init__()
+        self.target = target
+        self.process = target.GetProcess()
+        self.object_size = object_size
+        self.pointer_size = target.GetAddressByteSize()
+        self.chunks = dict()
+        self.image = recorded_lldb.MemoryImage(target.GetTriple())
+        self.id_type = target.GetBasicType(lldb.eBasicTypeObjCID)
+
+        # Foundation version determines layouts of collections.
+        foundation = target.FindModule(lldb.SBFileSpec("Foundation"))
+        """:type: lldb.SBModule"""
+        if foundation.IsValid():
+            self.image.modules["Foundation"] = foundation.GetVersion()
+
+    def record_variable(self, name, value, max_depth):
+        """
+        Records variable and all objects referenced by it.
+
+        :param str name: Variable name.
+        :param lldb.SBValue value: Variable value.
+        :param int max_depth: How deep references are followed.
+        """
+        address = value.GetLoadAddress()
+        self.read(address, value.GetByteSize())
+        self.image.variables[name] = (value.GetTypeName(), address)
+
+        visited = set()
+        queue = [(value.GetValueAsUnsigned(), 0)]
+        while len(queue) > 0:
+            address, depth = queue.pop(0)
+            if address in visited or depth > max_depth:
+                continue
+            visited.add(address)
+
+            data = self.read(address, self.object_size)
+            if data is None:
+                continue
+            self.record_object(address)
+
+            # Follow all pointers.
+            for offset in range(0, len(data) - self.pointer_size + 1, self.pointer_size):
+                pointer = int.from_bytes(data[offset:offset + self.pointer_size], "little")
+                if pointer != 0 and pointer % self.pointer_size == 0 and pointer not in visited:
+                    queue.append((pointer, depth + 1))
+
+        self.flush()
+
+    def read(self, address, size):
+        """
+        Reads memory in chunks and stores it.
+
+        :param int address: Address.
+        :param int size: Number of bytes.
+        :return: Read bytes or None.
+        :rtype: bytes | None
+        """
+        data = b""
+        chunk_address = address - address % self.CHUNK_SIZE
+        while chunk_address < address + size:
+            if chunk_address not in self.chunks:
+                error = lldb.SBError()
+                chunk = self.process.ReadMemory(chunk_address, self.CHUNK_SIZE, error)
+                if not error.Success() or chunk is None:
+                    break
+                self.chunks[chunk_address] = chunk
+            data += self.chunks[chunk_address]
+            chunk_address += self.CHUNK_SIZE
+
+        start = address % self.CHUNK_SIZE
+        data = data[start:start + size]
+        return data if len(data) > 0 else None
+
+    def record_object(self, address):
+        """
+        Records Objective-C object information (class name, summary, elements).
+
+        :param int address: Object address.
+        """
+        if self.pointer_size == 8:
+            data = lldb.SBData.CreateDataFromUInt64Array(self.process.GetByteOrder(), self.pointer_size, [address])
+        else:
+            data = lldb.SBData.CreateDataFromUInt32Array(self.process.GetByteOrder(), self.pointer_size, [address])
+        value = self.target.CreateValueFromData("object", data, self.id_type)
+        """:type: lldb.SBValue"""
+        dynamic_value = value.GetDynamicValue(lldb.eDynamicDontRunTarget)
+        """:type: lldb.SBValue"""
+        if not dynamic_value.IsDynamic():
+            return
+
+        class_name = dynamic_value.GetType().GetPointeeType().GetName()
+        isa = self.read(address, self.pointer_size)
+        if class_name is None or isa is None:
+            return
+        self.image.classes[int.from_bytes(isa, "little")] = class_name
+
+        summary = dynamic_value.GetSummary()
+        if summary is not None:
+            self.image.summaries[address] = summary
+
+        # Collections elements.
+        if "Array" in class_name or "Set" in class_name or "Dictionary" in class_name:
+            dynamic_value.SetPreferSyntheticValue(True)
+            count = min(dynamic_value.GetNumChildren(), self.MAX_ELEMENTS)
+            self.image.elements[address] = [dynamic_value.GetChildAtIndex(i).GetValueAsUnsigned() for i in range(count)]
+
+    def flush(self):
+        """
+        Merges recorded chunks into image regions.
+        """
+        region_start = None
+        region_data = b""
+        for chunk_address in sorted(self.chunks):
+            if region_start is not None and region_start + len(region_data) == chunk_address:
+                region_data += self.chunks[chunk_address]
+                continue
+            if region_start is not None:
+                self.image.add_region(region_start, region_data)
+            region_start = chunk_address
+            region_data = self.chunks[chunk_address]
+        if region_start is not None:
+            self.image.add_region(region_start, region_data)
+        self.chunks = dict()
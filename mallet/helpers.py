@@ -24,7 +24,15 @@
 
 import lldb
 import os
+import time
 import logging
+from . import memory_cache
+from . import perf_stats
+from . import provider_registry
+from . import summary_budget
+from . import summary_cache
+from . import summary_verbosity
+from . import tracer
 
 Architecture_unknown = 0
 Architecture_armv7 = 1
@@ -212,6 +220,21 @@ def get_dynamic_non_synthetic_type_name(value_obj):
     return type_name
 
 
+def get_pointer_class_name(value_obj):
+    """
+    Returns class name of (dynamic) pointer value, it is type name without asterisk. Doesn't read any memory.
+
+    :param lldb.SBValue value_obj: LLDB object.
+    :return: Class name.
+    :rtype: str | None
+    """
+    type_name = value_obj.GetTypeName()
+    """:type: str"""
+    if type_name is None:
+        return None
+    return type_name.rstrip("*").strip()
+
+
 def generic_summary_provider(value_obj, internal_dict, class_synthetic_provider):
     """
     Checks value type and returns summary.
@@ -227,11 +250,80 @@ def generic_summary_provider(value_obj, internal_dict, class_synthetic_provider)
     # type_name = value_obj.GetTypeName() if value_obj.GetTypeName() else "Unknown type name"
 
     # Using Class Summary Provider.
-    provider = class_synthetic_provider(value_obj, internal_dict)
-    if provider is not None:
-        # logger.debug("generic_summary_provider: using summary provider {} for \"{}\"."
-        #                               .format(class_synthetic_provider, type_name))
-        return provider.summary()
+    stats = perf_stats.get_perf_stats()
+    t = tracer.get_tracer()
+    start = time.perf_counter() if stats.enabled or t.enabled else None
+
+    # Reuses summary from previous stop if memory it depends on didn't change.
+    summaries = summary_cache.get_summary_cache()
+    registry = provider_registry.get_provider_registry()
+    # Summaries with forced verbosity level (commands) are not reused.
+    reuse = summaries.enabled and summary_verbosity.get_summary_verbosity().forced_level is None
+    key = None
+    if reuse or len(registry.providers) > 0:
+        key = summaries.get_key(value_obj, class_synthetic_provider)
+    recorder = None
+    if key is not None and reuse:
+        summary = summaries.get_summary(value_obj.GetProcess(), key)
+        if summary is not None:
+            if start is not None:
+                duration = time.perf_counter() - start
+                if stats.enabled:
+                    stats.record(class_synthetic_provider.__name__, "summary", duration, value_obj)
+                if t.enabled:
+                    t.trace("summary_reuse", class_synthetic_provider.__name__, int(duration * 1000000))
+            return summary
+        recorder = memory_cache.get_memory_cache().start_recording()
+
+    try:
+        # Reuses synthetic provider of the same object (created by LLDB and updated in current stop).
+        provider = None
+        if key is not None and len(registry.providers) > 0:
+            provider = registry.find(key, value_obj.GetProcess().GetStopID(True))
+            if provider is not None:
+                if t.enabled:
+                    t.trace("provider_reuse", class_synthetic_provider.__name__, key[2])
+                # Child values cached by the provider are not read again, so dependencies of summary are unknown.
+                if recorder is not None:
+                    recorder.complete = False
+        # Reused provider can be updated or used by another thread at the same time. New provider is not shared,
+        # and `with` would allocate bound method of the lock in every nested summary.
+        lock = provider.lock if provider is not None else None
+        if provider is None:
+            provider = class_synthetic_provider(value_obj, internal_dict)
+        if provider is not None:
+            if lock is not None:
+                lock.acquire()
+            try:
+                # Junk variable (uninitialized or dangling pointer).
+                if not provider.is_plausible():
+                    return None
+
+                # logger.debug("generic_summary_provider: using summary provider {} for \"{}\"."
+                #                               .format(class_synthetic_provider, type_name))
+                budget = summary_budget.get_summary_budget()
+                # Clears flag of previous summary (nested summaries keep flag of the outermost summary).
+                budget.clear()
+                summary = provider.summary()
+            finally:
+                if lock is not None:
+                    lock.release()
+            timed_out = budget.exceeded
+            if recorder is not None and not timed_out:
+                memory_cache.get_memory_cache().stop_recording(recorder)
+                summaries.store(value_obj.GetProcess(), key, recorder, summary)
+            if start is not None:
+                duration = time.perf_counter() - start
+                if stats.enabled:
+                    stats.record(class_synthetic_provider.__name__, "summary", duration, value_obj)
+                    if timed_out:
+                        stats.record_timeout(class_synthetic_provider.__name__, duration, value_obj)
+                if t.enabled:
+                    t.trace("summary", class_synthetic_provider.__name__, int(duration * 1000000))
+            return summary
+    finally:
+        if recorder is not None:
+            memory_cache.get_memory_cache().stop_recording(recorder)
 
     # Summary not available.
     # logger.debug("generic_summary_provider: summary unavailable")
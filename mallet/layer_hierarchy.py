@@ -0,0 +1,217 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import collections
+import logging
+from . import class_name_resolver
+from . import collection_decoder
+from . import helpers
+from . import loader
+from . import memory_cache
+from . import memory_regions
+from .QuartzCore import CALayer
+from .QuartzCore import CALayerInternalLayer
+from .QuartzCore import CALayerIvars
+
+
+LayerNode = collections.namedtuple("LayerNode", ["depth", "address", "class_name", "position", "bounds", "parent"])
+"""
+Layer found in layer hierarchy.
+
+:param int depth: Depth of layer (0 for root layer).
+:param int address: Layer address.
+:param str class_name: Layer class name.
+:param (float, float) position: Position x and y.
+:param (float, float, float, float) bounds: Bounds x, y, width and height.
+:param int | None parent: Superlayer address (None for root layer).
+"""
+
+
+class LayerHierarchyWalker(object):
+    """
+    Walks layer hierarchy directly in process memory, without running code in the target.
+
+    Layers are visited breadth first, one level at a time. Memory of all layers of a level (layer objects, internal
+    layers with geometry and sublayers arrays) is read with few coalesced reads before layers are decoded.
+    Every layer is visited once (corrupted memory cannot cause loops) and layers which cannot be decoded
+    (unreadable memory, unknown class) are skipped with their sublayers.
+
+    Offset of sublayers array in internal layer is unverified (see `CALayerInternalLayer`). Layers which sublayers
+    pointer isn't a pointer to an array are collected in `invalid_sublayers`, so callers can report that
+    the hierarchy is incomplete.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param str architecture_name: Architecture name.
+    :param int pointer_size: Pointer size.
+    :param int | None max_depth: Maximal depth of visited layers (None - unlimited).
+    :param int | None max_count: Maximal number of visited layers (None - unlimited).
+    :param int count: Number of visited layers.
+    :param bool truncated: True if some layers were skipped because of limits.
+    :param list[int] invalid_sublayers: Addresses of layers which sublayers pointer failed validation.
+    :param class_dump.Ivar | None attr_ivar: `_attr` ivar of CALayer.
+    :param int position_offset: Offset of position in internal layer.
+    :param int sublayers_offset: Offset of sublayers array in internal layer.
+    """
+    # Maximal number of pages between prefetched objects.
+    PREFETCH_MAX_GAP = 4
+
+    def __init__(self, process, max_depth=None, max_count=None):
+        """
+        :param lldb.SBProcess process: LLDB process.
+        :param int | None max_depth: Maximal depth of visited layers (None - unlimited).
+        :param int | None max_count: Maximal number of visited layers (None - unlimited).
+        """
+        super(LayerHierarchyWalker, self).__init__()
+        self.process = process
+        self.architecture_name = helpers.architecture_name_from_target(process.GetTarget())
+        is_64bit = helpers.is_64bit_architecture_from_name(self.architecture_name)
+        self.pointer_size = 8 if is_64bit else 4
+        self.max_depth = max_depth
+        self.max_count = max_count
+        self.count = 0
+        self.truncated = False
+        self.invalid_sublayers = list()
+
+        self.attr_ivar = loader.get_shared_lazy_class_dump_manager().get_ivar("QuartzCore", self.architecture_name,
+                                                                              "CALayer", "_attr")
+        if is_64bit:
+            self.position_offset = CALayerInternalLayer.POSITION_OFFSET_64
+            self.sublayers_offset = CALayerInternalLayer.SUBLAYERS_OFFSET_64
+        else:
+            self.position_offset = CALayerInternalLayer.POSITION_OFFSET_32
+            self.sublayers_offset = CALayerInternalLayer.SUBLAYERS_OFFSET_32
+
+    def is_valid(self):
+        """
+        Checks if CALayer ivars are available for process architecture.
+
+        :rtype: bool
+        """
+        return self.attr_ivar is not None and self.attr_ivar.offset is not None
+
+    def walk(self, root_address):
+        """
+        Walks layer hierarchy starting from given layer.
+
+        :param int root_address: Root layer address.
+        :return: Generator of visited layers.
+        :rtype: collections.Iterable[LayerNode]
+        """
+        resolver = class_name_resolver.get_class_name_resolver()
+        cache = memory_cache.get_memory_cache()
+        visited = {root_address}
+        level = [(root_address, None)]
+        depth = 0
+        while len(level) > 0:
+            next_level = list()
+            for (address, parent), fields in zip(level, self.read_level([address for address, _ in level])):
+                if self.max_count is not None and self.count >= self.max_count:
+                    self.truncated = True
+                    return
+                if fields is None:
+                    continue
+                isa, internal_layer = fields
+                class_name = resolver.get_class_name(self.process, address, self.architecture_name, isa)
+                data = cache.read(self.process, internal_layer + self.position_offset, CALayer.GEOMETRY.size)
+                if class_name is None or data is None:
+                    logger = logging.getLogger(__name__)
+                    logger.debug("Cannot decode layer at 0x%x.", address)
+                    continue
+                self.count += 1
+                position_x, position_y, bounds_x, bounds_y, width, height = CALayer.GEOMETRY.unpack(data)
+                yield LayerNode(depth, address, class_name, (position_x, position_y),
+                                (bounds_x, bounds_y, width, height), parent)
+
+                sublayers = self.get_sublayers(internal_layer)
+                if sublayers is None:
+                    logger = logging.getLogger(__name__)
+                    logger.debug("Invalid sublayers pointer of layer at 0x%x.", address)
+                    self.invalid_sublayers.append(address)
+                    continue
+                if len(sublayers) > 0 and self.max_depth is not None and depth >= self.max_depth:
+                    self.truncated = True
+                    continue
+                for sublayer in sublayers:
+                    if sublayer not in visited:
+                        visited.add(sublayer)
+                        next_level.append((sublayer, address))
+            level = next_level
+            depth += 1
+
+    def read_level(self, addresses):
+        """
+        Prefetches memory of layers of one level and reads their isa and internal layer pointers.
+
+        :param list[int] addresses: Layers addresses.
+        :return: Isa and internal layer address of every layer (None if layer memory cannot be read).
+        :rtype: list[(int, int) | None]
+        """
+        cache = memory_cache.get_memory_cache()
+        layer_size = self.attr_ivar.offset + CALayerIvars.LAYER_OFFSET + self.pointer_size
+        cache.prefetch(self.process, [(address, layer_size) for address in addresses], self.PREFETCH_MAX_GAP)
+
+        fields = list()
+        for address in addresses:
+            data = cache.read(self.process, address, layer_size)
+            internal_layer = None if data is None else int.from_bytes(data[-self.pointer_size:], "little")
+            if internal_layer:
+                fields.append((int.from_bytes(data[:self.pointer_size], "little"), internal_layer))
+            else:
+                fields.append(None)
+
+        # Internal layers (sublayers array and geometry), followed by sublayers arrays.
+        internal_layer_size = self.position_offset + CALayer.GEOMETRY.size
+        internal_layers = [f[1] for f in fields if f is not None]
+        cache.prefetch(self.process, [(internal_layer, internal_layer_size) for internal_layer in internal_layers],
+                       self.PREFETCH_MAX_GAP)
+        arrays = [cache.read_unsigned(self.process, internal_layer + self.sublayers_offset, self.pointer_size)
+                  for internal_layer in internal_layers]
+        cache.prefetch(self.process, [(array, 4 * self.pointer_size) for array in arrays if array],
+                       self.PREFETCH_MAX_GAP)
+        return fields
+
+    def get_sublayers(self, internal_layer):
+        """
+        Returns addresses of sublayers of layer. Sublayers pointer has to point to an array (class name contains
+        "Array", like CALayerArray or __NSArrayM).
+
+        :param int internal_layer: Internal layer address.
+        :return: Sublayers addresses (empty list for nil sublayers) or None if sublayers pointer is invalid.
+        :rtype: list[int] | None
+        """
+        array_address = memory_cache.get_memory_cache().read_unsigned(
+            self.process, internal_layer + self.sublayers_offset, self.pointer_size)
+        if array_address == 0:
+            return list()
+        regions = memory_regions.get_memory_regions()
+        if array_address is None or not regions.is_plausible_object_pointer(self.process, array_address,
+                                                                            self.architecture_name):
+            return None
+        class_name = class_name_resolver.get_class_name_resolver().get_class_name(self.process, array_address,
+                                                                                 self.architecture_name)
+        if class_name is None or "Array" not in class_name:
+            return None
+        sublayers = collection_decoder.get_array_elements(self.process, array_address, class_name)
+        return [sublayer for sublayer in sublayers
+                if regions.is_plausible_object_pointer(self.process, sublayer, self.architecture_name)]
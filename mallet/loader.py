@@ -25,10 +25,27 @@
 import lldb
 import os
 import logging
+import threading
 from . import logger
 import imp
 from . import class_dump
+from . import class_name_resolver
+from . import collection_decoder
+from . import memory_cache
+from . import memory_regions
 from . import type_cache
+from . import sb_accounting
+from . import number_decoder
+from . import object_description
+from . import perf_stats
+from . import provider_registry
+from . import string_decoder
+from . import summary_budget
+from . import summary_cache
+from . import summary_prefetch
+from . import summary_verbosity
+from . import tagged_pointer
+from . import tracer
 from . import helpers
 import yaml
 import sys
@@ -232,9 +249,102 @@ class Loader(object):
         else:
             logger.get_shared_logger_configurator().disable_loggers()
 
+        # SB API calls accounting.
+        enable_sb_accounting = False
+        if "sb_accounting" in user_configuration:
+            enable_sb_accounting = bool(user_configuration["sb_accounting"])
+        if enable_sb_accounting:
+            sb_accounting.get_sb_accounting().enable()
+        else:
+            sb_accounting.get_sb_accounting().disable()
+
+        # Providers latency statistics.
+        enable_perf_stats = True
+        if "perf_stats" in user_configuration:
+            enable_perf_stats = bool(user_configuration["perf_stats"])
+        slow_summary_threshold = perf_stats.PerfStats.DEFAULT_SLOW_THRESHOLD
+        if "slow_summary_threshold_ms" in user_configuration:
+            slow_summary_threshold = float(user_configuration["slow_summary_threshold_ms"]) / 1000.0
+        slow_summary_log_size = perf_stats.PerfStats.DEFAULT_SLOW_LOG_SIZE
+        if "slow_summary_log_size" in user_configuration:
+            slow_summary_log_size = int(user_configuration["slow_summary_log_size"])
+        perf_stats.get_perf_stats().configure(enable_perf_stats, slow_summary_threshold, slow_summary_log_size)
+
+        # Summary time budget.
+        budget = summary_budget.SummaryBudget.DEFAULT_BUDGET
+        if "summary_budget_ms" in user_configuration:
+            budget = float(user_configuration["summary_budget_ms"]) / 1000.0
+        summary_budget.get_summary_budget().budget = budget if budget > 0 else None
+
+        # Summaries verbosity per category.
+        verbosity_levels = dict()
+        if "summary_verbosity" in user_configuration and isinstance(user_configuration["summary_verbosity"], dict):
+            verbosity_levels = user_configuration["summary_verbosity"]
+        summary_verbosity.get_summary_verbosity().configure(verbosity_levels)
+
+        # Hot path events tracer.
+        enable_tracer = False
+        if "trace" in user_configuration:
+            enable_tracer = bool(user_configuration["trace"])
+        tracer_size = None
+        if "trace_buffer_size" in user_configuration:
+            tracer_size = int(user_configuration["trace_buffer_size"])
+        if enable_tracer:
+            tracer.get_tracer().enable(tracer_size)
+        else:
+            tracer.get_tracer().disable()
+
         # Cleans shared type cache.
         type_cache.clean_type_cache()
 
+        # Strings decoder.
+        max_string_length = string_decoder.StringDecoder.DEFAULT_MAX_LENGTH
+        if "max_string_length" in user_configuration:
+            max_string_length = int(user_configuration["max_string_length"])
+        string_decoder.get_string_decoder().clean_cache()
+        string_decoder.get_string_decoder().max_length = max_string_length
+
+        # Running code in the target (object descriptions, class names).
+        run_target_code = False
+        if "run_target_code" in user_configuration:
+            run_target_code = bool(user_configuration["run_target_code"])
+        object_description.get_object_describer().allow_running_target = run_target_code
+
+        # Reusing summaries of unchanged objects.
+        incremental_summaries = False
+        if "incremental_summaries" in user_configuration:
+            incremental_summaries = bool(user_configuration["incremental_summaries"])
+        summary_cache.get_summary_cache().clean_cache()
+        summary_cache.get_summary_cache().enabled = incremental_summaries
+
+        # Prefetching summaries of selected frame variables (stop hook).
+        prefetch_summaries = False
+        if "prefetch_summaries" in user_configuration:
+            prefetch_summaries = bool(user_configuration["prefetch_summaries"])
+        prefetch_depth = summary_prefetch.SummaryPrefetcher.DEFAULT_DEPTH
+        if "prefetch_depth" in user_configuration:
+            prefetch_depth = int(user_configuration["prefetch_depth"])
+        prefetch_max_values = summary_prefetch.SummaryPrefetcher.DEFAULT_MAX_VALUES
+        if "prefetch_max_values" in user_configuration:
+            prefetch_max_values = int(user_configuration["prefetch_max_values"])
+        if prefetch_summaries and run_target_code:
+            log.warning("Prefetching summaries is disabled, because running code in the target is allowed.")
+            prefetch_summaries = False
+        prefetcher = summary_prefetch.get_summary_prefetcher()
+        prefetcher.configure(prefetch_summaries, prefetch_depth, prefetch_max_values)
+        if prefetch_summaries:
+            prefetcher.install_stop_hook(self.debugger)
+
+        # Collections, numbers and tagged pointers decoders, class names, memory regions map, memory cache and live
+        # providers.
+        collection_decoder.get_collection_decoder().clean_cache()
+        number_decoder.get_number_decoder().clean_cache()
+        tagged_pointer.get_tagged_pointers().clean_cache()
+        class_name_resolver.get_class_name_resolver().clean_cache()
+        memory_regions.get_memory_regions().clean_cache()
+        memory_cache.get_memory_cache().clean_cache()
+        provider_registry.get_provider_registry().clean_cache()
+
         # Load builtin packages.
         builtin_packages = None
         if "builtin_packages" in user_configuration and isinstance(user_configuration["builtin_packages"], list):
@@ -505,6 +615,7 @@ class Loader(object):
 
 __shared_lazy_class_dump_manager = None
 """:type: class_dump.LazyClassDumpManager"""
+__shared_lazy_class_dump_manager_lock = threading.Lock()
 __shared_loader = None
 """:type: Loader"""
 
@@ -518,9 +629,11 @@ def get_shared_lazy_class_dump_manager():
     """
     global __shared_lazy_class_dump_manager
     if __shared_lazy_class_dump_manager is None:
-        __shared_lazy_class_dump_manager = class_dump.LazyClassDumpManager()
-        log = logging.getLogger(__name__)
-        log.debug("Creating shared class dump manager.")
+        with __shared_lazy_class_dump_manager_lock:
+            if __shared_lazy_class_dump_manager is None:
+                __shared_lazy_class_dump_manager = class_dump.LazyClassDumpManager()
+                log = logging.getLogger(__name__)
+                log.debug("Creating shared class dump manager.")
     return __shared_lazy_class_dump_manager
 
 
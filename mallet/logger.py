@@ -29,16 +29,24 @@ import os
 class LoggerConfigurator(object):
     """
     Configures logger.
+
+    Disabled loggers have level above CRITICAL, so calls with lazy arguments (`log.debug("%s", value)`)
+    return immediately without formatting message.
+
     :param logging.Formatter __formatter: Shared formatter.
     :param logging.FileHandler __file_handler: Shared file handler.
     :param logging.NullHandler __null_handler: Shared NULL handler.
     """
     __HANDLER_NAME = "mallet_handler"
     __LOGGER_FILE_PATH = os.path.expanduser("~/Library/Logs/mallet.log")
+    __PACKAGE_LOGGER_NAME = "mallet"
+    __DISABLED_LEVEL = logging.CRITICAL + 1
     __LOGGER_NAMES = ["mallet.logger",
                       "mallet.class_dump",
                       "mallet.helpers",
                       "mallet.type_cache",
+                      "mallet.sb_accounting",
+                      "mallet.perf_stats",
                       "mallet.loader",
                       "mallet.common.SummaryBase",
                       ]
@@ -68,6 +76,8 @@ class LoggerConfigurator(object):
         for logger_name in self.__LOGGER_NAMES:
             logger = logging.getLogger(logger_name)
             self.__configure_logger(logger)
+        # Other Mallet loggers (e.g. in packages) inherit level from package logger.
+        logging.getLogger(self.__PACKAGE_LOGGER_NAME).setLevel(logging.DEBUG)
 
     def disable_loggers(self):
         """
@@ -76,6 +86,7 @@ class LoggerConfigurator(object):
         for logger_name in self.__LOGGER_NAMES:
             logger = logging.getLogger(logger_name)
             self.__configure_null_logger(logger)
+        logging.getLogger(self.__PACKAGE_LOGGER_NAME).setLevel(self.__DISABLED_LEVEL)
 
     def __configure_logger(self, logger):
         """
@@ -85,11 +96,11 @@ class LoggerConfigurator(object):
         """
         previous_handler = getattr(logger, self.__HANDLER_NAME, None)
         new_handler = self.__file_handler
+        logger.setLevel(logging.DEBUG)
         # Remove previous handler and add new only when they are different.
         if previous_handler != new_handler:
             if previous_handler is not None:
                 logger.removeHandler(previous_handler)
-            logger.setLevel(logging.DEBUG)
             logger.addHandler(new_handler)
             setattr(logger, self.__HANDLER_NAME, new_handler)
             # log = logging.getLogger(__name__)
@@ -103,11 +114,12 @@ class LoggerConfigurator(object):
         """
         previous_handler = getattr(logger, self.__HANDLER_NAME, None)
         new_handler = self.__null_handler
+        # Level above CRITICAL, disabled logger doesn't create (and format) records.
+        logger.setLevel(self.__DISABLED_LEVEL)
         # Remove previous handler and add new only when they are different.
         if previous_handler != new_handler:
             if previous_handler is not None:
                 logger.removeHandler(previous_handler)
-            logger.setLevel(logging.DEBUG)
             logger.addHandler(new_handler)
             setattr(logger, self.__HANDLER_NAME, new_handler)
 
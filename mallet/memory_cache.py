@@ -0,0 +1,361 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import logging
+import struct
+import threading
+
+
+class MemoryCache(object):
+    """
+    Page granular cache of process memory shared by all providers.
+
+    Memory is read in aligned pages and every smaller read is served from cached pages. Missing pages of one read
+    (or prefetch) are coalesced into as few `SBProcess.ReadMemory` calls as possible, which matters when every read
+    is a round-trip to the device. Cache is dropped when process stop ID changes: process was resumed or evaluated
+    an expression (`expr`, object descriptions), which can change memory (see `get_stop_key`).
+    Unreadable pages are cached too, so invalid addresses are not read again in the same stop.
+    Cache can be used from several threads. Pages are fetched and added to dictionary of pages under lock, cached
+    pages are never modified. Dictionary is replaced (not cleared) on new stop, so read started before the stop
+    changed uses pages of one stop, but pages fetched by other threads can be added to the dictionary during the read
+    (it is not a snapshot). Recorders are per thread.
+
+    :param (int, int) | None stop_key: Process unique ID and stop ID of cached pages.
+    :param dict[int, bytes | None] pages: Maps page number to its content (None if page is not readable). Content of
+        page at the end of readable memory can be shorter than page size.
+    :param int reads: Number of `ReadMemory` calls made by the cache (since last `clean_cache`).
+    :param int hits: Number of reads served only from cached pages (since last `clean_cache`).
+    :param threading.Lock lock: Lock of fetching pages, replacing pages dictionary and counters.
+    :param threading.local local: Thread local state (active recorders of memory reads of current thread).
+    """
+    # Page size (in bytes).
+    PAGE_SIZE = 4096
+    # Maximal number of cached pages (for one stop).
+    MAX_PAGES = 1024
+    # Maximal number of pages read with single read when pages are separated by gaps.
+    MAX_RUN_PAGES = 64
+
+    def __init__(self):
+        super(MemoryCache, self).__init__()
+        self.stop_key = None
+        self.pages = dict()
+        self.reads = 0
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    @property
+    def recorders(self):
+        """
+        Returns active recorders of memory reads of current thread.
+
+        :rtype: list[ReadRecorder]
+        """
+        recorders = getattr(self.local, "recorders", None)
+        if recorders is None:
+            recorders = list()
+            self.local.recorders = recorders
+        return recorders
+
+    def clean_cache(self):
+        """
+        Drops cached pages and statistics.
+        """
+        with self.lock:
+            self.stop_key = None
+            self.pages = dict()
+            self.reads = 0
+            self.hits = 0
+
+    def __update(self, process):
+        """
+        Drops cached pages if process was resumed since pages were read.
+
+        :param lldb.SBProcess process: LLDB process.
+        """
+        stop_key = get_stop_key(process)
+        if stop_key != self.stop_key or len(self.pages) >= self.MAX_PAGES:
+            with self.lock:
+                if stop_key != self.stop_key or len(self.pages) >= self.MAX_PAGES:
+                    self.pages = dict()
+                    self.stop_key = stop_key
+
+    def read(self, process, address, size):
+        """
+        Reads memory.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Start address.
+        :param int size: Number of bytes.
+        :return: Memory content or None if any part of memory is not readable.
+        :rtype: bytes | None
+        """
+        recorders = self.recorders
+        if recorders:
+            for recorder in recorders:
+                recorder.ranges.append((address, size))
+        if size <= 0:
+            return b"" if size == 0 else None
+        if address < 0 or address + size > 0xffffffffffffffff:
+            return None
+        self.__update(process)
+
+        first_page = address // self.PAGE_SIZE
+        last_page = (address + size - 1) // self.PAGE_SIZE
+        pages = self.pages
+        if first_page == last_page and first_page in pages:
+            with self.lock:
+                self.hits += 1
+            data = pages[first_page]
+        else:
+            with self.lock:
+                self.__fetch(process, range(first_page, last_page + 1))
+                pages = self.pages
+            chunks = list()
+            for page_number in range(first_page, last_page + 1):
+                page = pages.get(page_number)
+                if page is None:
+                    return None
+                chunks.append(page)
+                if len(page) < self.PAGE_SIZE:
+                    break
+            data = b"".join(chunks)
+
+        offset = address - first_page * self.PAGE_SIZE
+        if data is None or offset + size > len(data):
+            return None
+        return data[offset:offset + size]
+
+    def start_recording(self):
+        """
+        Starts recording of memory ranges read through the cache.
+
+        :return: New recorder.
+        :rtype: ReadRecorder
+        """
+        recorder = ReadRecorder()
+        self.recorders.append(recorder)
+        return recorder
+
+    def stop_recording(self, recorder):
+        """
+        Stops recording of memory reads.
+
+        :param ReadRecorder recorder: Recorder returned by `start_recording`.
+        """
+        if recorder in self.recorders:
+            self.recorders.remove(recorder)
+
+    def record_untracked_read(self):
+        """
+        Marks active recordings as incomplete, because memory was read bypassing the cache
+        (by LLDB formatters or by running code in the target).
+        """
+        for recorder in self.recorders:
+            recorder.complete = False
+
+    def read_unsigned(self, process, address, size):
+        """
+        Reads unsigned integer (little endian).
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Address.
+        :param int size: Integer size.
+        :return: Integer or None.
+        :rtype: int | None
+        """
+        data = self.read(process, address, size)
+        return None if data is None else int.from_bytes(data, "little")
+
+    def read_signed(self, process, address, size):
+        """
+        Reads signed integer (little endian).
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Address.
+        :param int size: Integer size.
+        :return: Integer or None.
+        :rtype: int | None
+        """
+        data = self.read(process, address, size)
+        return None if data is None else int.from_bytes(data, "little", signed=True)
+
+    def read_pointer(self, process, address):
+        """
+        Reads pointer.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Address.
+        :return: Pointer or None.
+        :rtype: int | None
+        """
+        return self.read_unsigned(process, address, process.GetAddressByteSize())
+
+    def read_double(self, process, address):
+        """
+        Reads double.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Address.
+        :return: Double or None.
+        :rtype: float | None
+        """
+        data = self.read(process, address, 8)
+        return None if data is None else struct.unpack("<d", data)[0]
+
+    def prefetch(self, process, ranges, max_gap=0):
+        """
+        Reads pages of all given memory ranges (with coalesced reads), so later reads are served from cache.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param list[(int, int)] ranges: List of start address and size.
+        :param int max_gap: Maximal number of not requested pages between two requested pages which are read
+                            with single read (together with requested pages).
+        """
+        self.__update(process)
+        page_numbers = set()
+        for address, size in ranges:
+            if size <= 0 or address < 0:
+                continue
+            page_numbers.update(range(address // self.PAGE_SIZE, (address + size - 1) // self.PAGE_SIZE + 1))
+        with self.lock:
+            self.__fetch(process, sorted(page_numbers), max_gap)
+
+    def __fetch(self, process, page_numbers, max_gap=0):
+        """
+        Reads missing pages (called with lock). Consecutive pages (or pages separated by at most `max_gap` pages)
+        are read with single read.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param list[int] | range page_numbers: Sorted page numbers.
+        :param int max_gap: Maximal number of not requested pages read together with requested pages.
+        """
+        run_start = None
+        run_length = 0
+        for page_number in page_numbers:
+            if page_number in self.pages:
+                continue
+            if run_start is not None and run_start + run_length == page_number:
+                run_length += 1
+                continue
+            if run_start is not None and page_number - (run_start + run_length) <= max_gap and \
+                    run_length < self.MAX_RUN_PAGES:
+                run_length = page_number - run_start + 1
+                continue
+            if run_start is not None:
+                self.__fetch_run(process, run_start, run_length)
+            run_start = page_number
+            run_length = 1
+        if run_start is not None:
+            self.__fetch_run(process, run_start, run_length)
+
+    def __fetch_run(self, process, first_page, count):
+        """
+        Reads consecutive pages (called with lock). If pages cannot be read at once, they are read one by one.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int first_page: First page number.
+        :param int count: Number of pages.
+        """
+        error = lldb.SBError()
+        self.reads += 1
+        data = process.ReadMemory(first_page * self.PAGE_SIZE, count * self.PAGE_SIZE, error)
+        if not error.Success() or data is None:
+            data = b""
+        if len(data) == count * self.PAGE_SIZE:
+            for index in range(count):
+                self.pages[first_page + index] = bytes(data[index * self.PAGE_SIZE:(index + 1) * self.PAGE_SIZE])
+            return
+
+        if count > 1:
+            for index in range(count):
+                self.__fetch_run(process, first_page + index, 1)
+            return
+
+        # Partially readable (end of readable memory) or unreadable page.
+        if len(data) == 0:
+            logger = logging.getLogger(__name__)
+            logger.debug("__fetch_run: cannot read page at 0x%x.", first_page * self.PAGE_SIZE)
+        self.pages[first_page] = bytes(data) if len(data) > 0 else None
+
+
+class ReadRecorder(object):
+    """
+    Memory ranges read through the cache while recorder was active.
+
+    :param list[(int, int)] ranges: List of start address and size of every read (can overlap).
+    :param bool complete: False if memory was also read bypassing the cache, so ranges are not the only dependencies.
+    """
+    def __init__(self):
+        super(ReadRecorder, self).__init__()
+        self.ranges = list()
+        self.complete = True
+
+    def get_merged_ranges(self):
+        """
+        Returns sorted ranges with overlapping and adjacent ranges merged.
+
+        :return: List of start address and size.
+        :rtype: list[(int, int)]
+        """
+        merged = list()
+        for address, size in sorted(self.ranges):
+            if size <= 0:
+                continue
+            if merged and address <= merged[-1][0] + merged[-1][1]:
+                last_address, last_size = merged[-1]
+                merged[-1] = (last_address, max(last_size, address + size - last_address))
+            else:
+                merged.append((address, size))
+        return merged
+
+
+def get_stop_key(process):
+    """
+    Returns key of process memory state: process unique ID and stop ID. Stop ID includes stops of expressions
+    evaluated in the target, because expressions can change memory in the same (natural) stop.
+
+    :param lldb.SBProcess process: LLDB process.
+    :return: Process unique ID and stop ID.
+    :rtype: (int, int)
+    """
+    return process.GetUniqueID(), process.GetStopID(True)
+
+
+__shared_memory_cache = None
+""":type: MemoryCache"""
+
+
+def get_memory_cache():
+    """
+    Returns shared MemoryCache.
+
+    :return: MemoryCache singleton.
+    :rtype: MemoryCache
+    """
+    global __shared_memory_cache
+    if __shared_memory_cache is None:
+        __shared_memory_cache = MemoryCache()
+    return __shared_memory_cache
@@ -0,0 +1,171 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import bisect
+import lldb
+import logging
+import threading
+from . import helpers
+from . import memory_cache
+from . import tagged_pointer
+
+
+class MemoryRegions(object):
+    """
+    Caches map of process memory regions (`SBProcess.GetMemoryRegions`) and checks if pointers are plausible.
+
+    Uninitialized and dangling pointers usually point to unmapped memory. Checking them with binary search on cached
+    region map is much cheaper than reading memory (and logging errors) through several levels of child values.
+    Map is fetched once per process stop (including expression stops). If process cannot provide regions then all pointers are accepted.
+    Map is replaced at once (start and end addresses together), so it can be read from several threads.
+
+    :param (int, int) | None stop_key: Process unique ID and stop ID of cached map.
+    :param (list[int], list[int]) | None regions: Sorted start addresses of readable regions and their end addresses
+        (None if map is unavailable).
+    :param threading.Lock lock: Lock of fetching map.
+    """
+    def __init__(self):
+        super(MemoryRegions, self).__init__()
+        self.stop_key = None
+        self.regions = None
+        self.lock = threading.Lock()
+
+    def clean_cache(self):
+        """
+        Cleans cached regions map.
+        """
+        self.stop_key = None
+        self.regions = None
+
+    def update(self, process):
+        """
+        Fetches regions map if process stopped since last update.
+
+        :param lldb.SBProcess process: LLDB process.
+        :return: Start and end addresses of readable regions or None if regions map is unavailable.
+        :rtype: (list[int], list[int]) | None
+        """
+        stop_key = memory_cache.get_stop_key(process)
+        if stop_key == self.stop_key:
+            return self.regions
+        with self.lock:
+            if stop_key != self.stop_key:
+                self.regions = self.__fetch(process, stop_key)
+                self.stop_key = stop_key
+            return self.regions
+
+    @staticmethod
+    def __fetch(process, stop_key):
+        """
+        Fetches regions map.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param (int, int) stop_key: Process unique ID and stop ID.
+        :return: Start and end addresses of readable regions or None if regions map is unavailable.
+        :rtype: (list[int], list[int]) | None
+        """
+        try:
+            regions = process.GetMemoryRegions()
+            """:type: lldb.SBMemoryRegionInfoList"""
+        except AttributeError:
+            # Older LLDB.
+            return None
+
+        starts = list()
+        ends = list()
+        region = lldb.SBMemoryRegionInfo()
+        for index in range(regions.GetSize()):
+            if not regions.GetMemoryRegionAtIndex(index, region):
+                continue
+            if not region.IsReadable():
+                continue
+            start = region.GetRegionBase()
+            end = region.GetRegionEnd()
+            # Merge adjacent regions.
+            if ends and ends[-1] == start:
+                ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+
+        if not starts:
+            logger = logging.getLogger(__name__)
+            logger.debug("update: no memory regions for process %s.", stop_key[0])
+            return None
+        return starts, ends
+
+    def is_readable(self, process, address, size=1):
+        """
+        Checks if given address range is mapped and readable.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Start address.
+        :param int size: Range size.
+        :return: True if range is readable, False if not, None if regions map is unavailable.
+        :rtype: bool | None
+        """
+        regions = self.update(process)
+        if regions is None:
+            return None
+        starts, ends = regions
+        index = bisect.bisect_right(starts, address) - 1
+        if index < 0:
+            return False
+        return address + size <= ends[index]
+
+    def is_plausible_object_pointer(self, process, pointer, architecture_name):
+        """
+        Checks if pointer can point to (not tagged) object: it is not nil, is aligned, is not tagged pointer
+        and points to readable memory (if regions map is available).
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int pointer: Pointer.
+        :param str architecture_name: Architecture name.
+        :rtype: bool
+        """
+        if pointer == 0:
+            return False
+        pointer_size = 8 if helpers.is_64bit_architecture_from_name(architecture_name) else 4
+        if pointer % pointer_size != 0:
+            return False
+        if tagged_pointer.is_tagged_pointer(pointer, architecture_name):
+            return False
+        return self.is_readable(process, pointer, pointer_size) is not False
+
+
+__shared_memory_regions = None
+""":type: MemoryRegions"""
+
+
+def get_memory_regions():
+    """
+    Returns shared MemoryRegions.
+
+    :return: MemoryRegions singleton.
+    :rtype: MemoryRegions
+    """
+    global __shared_memory_regions
+    if __shared_memory_regions is None:
+        __shared_memory_regions = MemoryRegions()
+    return __shared_memory_regions
@@ -0,0 +1,289 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import datetime
+import struct
+from . import collection_decoder
+from . import helpers
+from . import memory_cache
+from . import tagged_pointer
+
+
+class NumberDecoder(object):
+    """
+    Decodes NSNumber and NSDate objects directly from process memory.
+
+    Supports tagged pointers and inline `__NSCFNumber` (CFNumber) and `__NSDate` layouts, so values can be read
+    without LLDB formatters or running code in the target.
+
+    :param dict[int, int] pointer_sizes: Maps process unique ID to pointer size.
+    :param dict[int, int | None] foundation_versions: Maps process unique ID to Foundation version.
+    """
+    NUMBER_CLASS_NAMES = {"__NSCFNumber", "NSCFNumber"}
+    DATE_CLASS_NAMES = {"__NSDate", "__NSTaggedDate", "NSDate"}
+
+    # CFNumber canonical types (CFNumber.c) with struct format and type name used by LLDB formatter.
+    CF_NUMBER_TYPES = {1: ("b", "char"),
+                       2: ("h", "short"),
+                       3: ("i", "int"),
+                       4: ("q", "long"),
+                       5: ("f", "float"),
+                       6: ("d", "double")}
+    CF_NUMBER_SINT128_TYPE = 17
+    # Tagged NSNumber type codes (lowest 4 bits of payload).
+    TAGGED_NUMBER_TYPES = {0: "char", 1: "short", 4: "short", 2: "int", 8: "int", 3: "long", 12: "long"}
+
+    # New tagged NSDate encoding (compressed exponent) is used since Foundation 1600.
+    TAGGED_DATE_FOUNDATION_VERSION = 1600
+    TAGGED_DATE_EXPONENT_BIAS = 0x3ef
+
+    # NSDate reference date.
+    REFERENCE_DATE = datetime.datetime(2001, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def __init__(self):
+        super(NumberDecoder, self).__init__()
+        self.pointer_sizes = dict()
+        self.foundation_versions = dict()
+
+    def clean_cache(self):
+        """
+        Cleans cached process information.
+        """
+        self.pointer_sizes = dict()
+        self.foundation_versions = dict()
+
+    def get_summary(self, obj, class_name=None):
+        """
+        Returns summary of NSNumber or NSDate in the same format as LLDB formatters, e.g. "(int)5"
+        or "2001-01-01 00:00:00 UTC".
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to number or date).
+        :param str class_name: Class name of the value if already known.
+        :return: Summary or None if value is not supported or cannot be decoded.
+        :rtype: str | None
+        """
+        if class_name is None:
+            class_name = helpers.get_pointer_class_name(obj)
+        if class_name in self.NUMBER_CLASS_NAMES:
+            number = self.__decode_number(obj)
+            if number is None:
+                return None
+            type_name, value = number
+            return "({}){}".format(type_name, format_number(value))
+        elif class_name in self.DATE_CLASS_NAMES:
+            date = self.get_date(obj, class_name)
+            if date is None:
+                return None
+            return date.strftime("%Y-%m-%d %H:%M:%S UTC")
+        return None
+
+    def get_number(self, obj, class_name=None):
+        """
+        Returns value of NSNumber.
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to number).
+        :param str class_name: Class name of the value if already known.
+        :return: Number value or None.
+        :rtype: int | float | None
+        """
+        if class_name is None:
+            class_name = helpers.get_pointer_class_name(obj)
+        if class_name not in self.NUMBER_CLASS_NAMES:
+            return None
+        number = self.__decode_number(obj)
+        return None if number is None else number[1]
+
+    def get_time_interval(self, obj, class_name=None):
+        """
+        Returns time interval since reference date (1 January 2001 UTC) of NSDate.
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to date).
+        :param str class_name: Class name of the value if already known.
+        :return: Time interval or None.
+        :rtype: float | None
+        """
+        if class_name is None:
+            class_name = helpers.get_pointer_class_name(obj)
+        if class_name not in self.DATE_CLASS_NAMES:
+            return None
+
+        pointer = obj.GetValueAsUnsigned()
+        if pointer == 0:
+            return None
+        process = obj.GetProcess()
+        """:type: lldb.SBProcess"""
+
+        payload = tagged_pointer.get_tagged_pointers().get_payload(process, pointer)
+        if payload is not None:
+            info_bits = payload & 0xf
+            value_bits = payload >> 4
+            if class_name == "__NSTaggedDate" and \
+                    self.__get_foundation_version(process) >= self.TAGGED_DATE_FOUNDATION_VERSION:
+                return self.decode_tagged_time_interval(value_bits << 4)
+            bits = ((value_bits << 8) | (info_bits << 4)) & 0xffffffffffffffff
+            return struct.unpack("<d", bits.to_bytes(8, "little"))[0]
+
+        pointer_size = self.__get_pointer_size(process)
+        return memory_cache.get_memory_cache().read_double(process, pointer + pointer_size)
+
+    def get_date(self, obj, class_name=None):
+        """
+        Returns date (in UTC) of NSDate.
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to date).
+        :param str class_name: Class name of the value if already known.
+        :return: Date or None.
+        :rtype: datetime.datetime | None
+        """
+        interval = self.get_time_interval(obj, class_name)
+        if interval is None:
+            return None
+        try:
+            return self.REFERENCE_DATE + datetime.timedelta(seconds=interval)
+        except (OverflowError, ValueError):
+            return None
+
+    def __decode_number(self, obj):
+        """
+        Decodes NSNumber (tagged pointer or __NSCFNumber).
+
+        :param lldb.SBValue obj: LLDB value object.
+        :return: Type name and value or None.
+        :rtype: (str, int | float) | None
+        """
+        pointer = obj.GetValueAsUnsigned()
+        if pointer == 0:
+            return None
+        process = obj.GetProcess()
+        """:type: lldb.SBProcess"""
+
+        payload = tagged_pointer.get_tagged_pointers().get_payload(process, pointer, signed=True)
+        if payload is not None:
+            type_name = self.TAGGED_NUMBER_TYPES.get(payload & 0xf)
+            if type_name is None:
+                return None
+            return type_name, payload >> 4
+
+        # CFRuntimeBase (isa, info) followed by value. Info and value (up to 64 bits) are read at once.
+        pointer_size = self.__get_pointer_size(process)
+        value_offset = 2 * pointer_size
+        cache = memory_cache.get_memory_cache()
+        data = cache.read(process, pointer + pointer_size, value_offset - pointer_size + 8)
+        if data is None:
+            return None
+        number_type = bytearray(data[0:1])[0] & 0x1f
+
+        if number_type in self.CF_NUMBER_TYPES:
+            fmt, type_name = self.CF_NUMBER_TYPES[number_type]
+            value = struct.unpack_from("<" + fmt, data, value_offset - pointer_size)[0]
+            # Single precision float has at most 7 significant digits.
+            if fmt == "f":
+                value = float("{:.7g}".format(value))
+            return type_name, value
+        elif number_type == self.CF_NUMBER_SINT128_TYPE:
+            value = cache.read_signed(process, pointer + value_offset, 16)
+            if value is None:
+                return None
+            return "int128_t", value
+        return None
+
+    def __get_pointer_size(self, process):
+        """
+        Returns (cached) pointer size of process.
+
+        :param lldb.SBProcess process: LLDB process.
+        :rtype: int
+        """
+        process_id = process.GetUniqueID()
+        pointer_size = self.pointer_sizes.get(process_id)
+        if pointer_size is None:
+            pointer_size = process.GetAddressByteSize()
+            self.pointer_sizes[process_id] = pointer_size
+        return pointer_size
+
+    def __get_foundation_version(self, process):
+        """
+        Returns (cached) Foundation version of process, 0 if it is unknown.
+
+        :param lldb.SBProcess process: LLDB process.
+        :rtype: int
+        """
+        process_id = process.GetUniqueID()
+        if process_id not in self.foundation_versions:
+            version = collection_decoder.get_module_version(process.GetTarget(), "Foundation")
+            self.foundation_versions[process_id] = version if version is not None else 0
+        return self.foundation_versions[process_id]
+
+    @classmethod
+    def decode_tagged_time_interval(cls, encoded):
+        """
+        Decodes time interval of tagged NSDate (Foundation 1600 and later).
+
+        Sign and fraction are stored like in double, exponent is stored as 7-bit signed value relative to bias.
+
+        :param int encoded: Encoded time interval.
+        :return: Time interval.
+        :rtype: float
+        """
+        if encoded == 0:
+            return 0.0
+        if encoded == 0xffffffffffffffff:
+            return -0.0
+        fraction = encoded & ((1 << 52) - 1)
+        exponent = (encoded >> 52) & 0x7f
+        sign = (encoded >> 59) & 1
+        if exponent & 0x40:
+            exponent -= 0x80
+        exponent = (exponent + cls.TAGGED_DATE_EXPONENT_BIAS) & 0x7ff
+        bits = (sign << 63) | (exponent << 52) | fraction
+        return struct.unpack("<d", bits.to_bytes(8, "little"))[0]
+
+
+def format_number(value):
+    """
+    Formats number value, floats are formatted with shortest representation.
+
+    :param int | float value: Number value.
+    :rtype: str
+    """
+    if isinstance(value, float):
+        return "{!r}".format(value)
+    return "{}".format(value)
+
+
+__shared_number_decoder = None
+""":type: NumberDecoder"""
+
+
+def get_number_decoder():
+    """
+    Returns shared NumberDecoder.
+
+    :return: NumberDecoder singleton.
+    :rtype: NumberDecoder
+    """
+    global __shared_number_decoder
+    if __shared_number_decoder is None:
+        __shared_number_decoder = NumberDecoder()
+    return __shared_number_decoder
@@ -0,0 +1,196 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import struct
+import threading
+import uuid
+from . import helpers
+from . import memory_cache
+from . import number_decoder
+from . import string_decoder
+
+
+class ObjectDescriber(object):
+    """
+    Returns descriptions and class names of objects without running code in the target.
+
+    `GetObjectDescription()` and expressions run code in the inferior. It is slow, can deadlock on locks held
+    by the stopped thread and can change application state. By default descriptions of common Foundation objects
+    (strings, numbers, dates, URLs, UUIDs, NSNull) are decoded from memory and no code is run. Running code
+    in the target has to be explicitly allowed (`run_target_code` in mallet.yml). Code is never run by background
+    threads (summaries prefetching), which forbid it with `forbid_running_target`.
+
+    :param bool allow_running_target: True if code can be run in the target when object cannot be decoded.
+    :param threading.local local: Thread local state (True if running code is forbidden in current thread).
+    """
+    URL_CLASS_NAMES = {"NSURL"}
+    UUID_CLASS_NAMES = {"__NSConcreteUUID"}
+    NULL_CLASS_NAMES = {"NSNull"}
+
+    # Maximal depth of NSURL base URLs.
+    MAX_URL_DEPTH = 4
+
+    def __init__(self):
+        super(ObjectDescriber, self).__init__()
+        self.allow_running_target = False
+        self.local = threading.local()
+
+    def forbid_running_target(self):
+        """
+        Forbids running code in the target in current thread, regardless of `allow_running_target`.
+        """
+        self.local.forbidden = True
+
+    def can_run_target(self):
+        """
+        Checks if code can be run in the target in current thread.
+
+        :return: True if running code is allowed and not forbidden in current thread.
+        :rtype: bool
+        """
+        return self.allow_running_target and not getattr(self.local, "forbidden", False)
+
+    def get_description(self, obj):
+        """
+        Returns object description. Code is run in the target (`-description`) only if it is allowed and object
+        cannot be decoded from memory.
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to object).
+        :return: Object description or None.
+        :rtype: str | None
+        """
+        description = self.decode_description(obj)
+        if description is None and self.can_run_target():
+            memory_cache.get_memory_cache().record_untracked_read()
+            description = obj.GetObjectDescription()
+        return description
+
+    def decode_description(self, obj):
+        """
+        Returns description of common Foundation objects decoded from memory.
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to object).
+        :return: Object description or None if object is not supported.
+        :rtype: str | None
+        """
+        class_name = helpers.get_pointer_class_name(obj)
+        if class_name is None:
+            return None
+
+        decoder = number_decoder.get_number_decoder()
+        if class_name in decoder.NUMBER_CLASS_NAMES:
+            number = decoder.get_number(obj, class_name)
+            return None if number is None else number_decoder.format_number(number)
+        elif class_name in decoder.DATE_CLASS_NAMES:
+            date = decoder.get_date(obj, class_name)
+            return None if date is None else date.strftime("%Y-%m-%d %H:%M:%S +0000")
+        elif class_name in self.NULL_CLASS_NAMES:
+            return "<null>"
+        elif class_name in self.URL_CLASS_NAMES:
+            return self.__decode_url(obj.GetProcess(), obj.GetValueAsUnsigned(), 0)
+        elif class_name in self.UUID_CLASS_NAMES:
+            return self.__decode_uuid(obj.GetProcess(), obj.GetValueAsUnsigned())
+        return string_decoder.get_string_decoder().get_text(obj, class_name)
+
+    def get_class_name(self, obj):
+        """
+        Returns class name of object. Without running code uses dynamic type resolved by LLDB Objective-C runtime
+        (which reads isa from memory), otherwise asks object for its class.
+
+        :param lldb.SBValue obj: LLDB value object.
+        :return: Class name.
+        :rtype: str | None
+        """
+        if self.can_run_target():
+            memory_cache.get_memory_cache().record_untracked_read()
+            return helpers.get_object_class_name(obj)
+        dynamic_value_obj = obj.GetDynamicValue(lldb.eDynamicDontRunTarget)
+        """:type: lldb.SBValue"""
+        return helpers.get_pointer_class_name(dynamic_value_obj)
+
+    def __decode_url(self, process, address, depth):
+        """
+        Decodes NSURL (CFURL) description: relative string and optional base URL.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: URL address.
+        :param int depth: Depth of base URLs.
+        :return: URL description or None.
+        :rtype: str | None
+        """
+        if address == 0 or depth > self.MAX_URL_DEPTH:
+            return None
+
+        # isa, reserved pointer and 8 bytes of flags and encoding followed by string and base URL.
+        pointer_size = process.GetAddressByteSize()
+        pointer_format = "<Q" if pointer_size == 8 else "<I"
+        data = memory_cache.get_memory_cache().read(process, address + 2 * pointer_size + 8, 2 * pointer_size)
+        if data is None:
+            return None
+        string_address = struct.unpack_from(pointer_format, data, 0)[0]
+        base_address = struct.unpack_from(pointer_format, data, pointer_size)[0]
+
+        text = string_decoder.get_string_decoder().get_text_at_address(process, string_address)
+        if text is None:
+            return None
+        if base_address != 0:
+            base = self.__decode_url(process, base_address, depth + 1)
+            if base is not None:
+                text = "{} -- {}".format(text, base)
+        return text
+
+    @staticmethod
+    def __decode_uuid(process, address):
+        """
+        Decodes NSUUID description (uppercase UUID string).
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: UUID address.
+        :return: UUID description or None.
+        :rtype: str | None
+        """
+        if address == 0:
+            return None
+        data = memory_cache.get_memory_cache().read(process, address + process.GetAddressByteSize(), 16)
+        if data is None:
+            return None
+        return str(uuid.UUID(bytes=bytes(data))).upper()
+
+
+__shared_object_describer = None
+""":type: ObjectDescriber"""
+
+
+def get_object_describer():
+    """
+    Returns shared ObjectDescriber.
+
+    :return: ObjectDescriber singleton.
+    :rtype: ObjectDescriber
+    """
+    global __shared_object_describer
+    if __shared_object_describer is None:
+        __shared_object_describer = ObjectDescriber()
+    return __shared_object_describer
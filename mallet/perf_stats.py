@@ -0,0 +1,273 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import bisect
+import collections
+import logging
+import threading
+import time
+
+
+class LatencyHistogram(object):
+    """
+    Latency histogram with fixed buckets.
+
+    :param list[int] counts: Number of samples in every bucket (last bucket counts samples above all bounds).
+    :param int count: Number of samples.
+    :param float total: Sum of all samples (in seconds).
+    :param float max: Maximal sample (in seconds).
+    """
+    # Upper bounds of buckets in seconds (10us - 1s).
+    BUCKET_BOUNDS = [0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                     0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                     0.1, 0.25, 0.5, 1.0]
+
+    def __init__(self):
+        super(LatencyHistogram, self).__init__()
+        self.counts = [0] * (len(self.BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration):
+        """
+        Adds sample.
+
+        :param float duration: Duration in seconds.
+        """
+        self.counts[bisect.bisect_left(self.BUCKET_BOUNDS, duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, percent):
+        """
+        Returns approximated percentile, linearly interpolated inside bucket which contains it.
+
+        :param float percent: Percent (0 - 100).
+        :return: Percentile in seconds.
+        :rtype: float
+        """
+        if self.count == 0:
+            return 0.0
+        rank = percent / 100.0 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count > 0 and cumulative + count >= rank:
+                lower = self.BUCKET_BOUNDS[index - 1] if index > 0 else 0.0
+                upper = self.BUCKET_BOUNDS[index] if index < len(self.BUCKET_BOUNDS) else self.max
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.max
+
+
+class SlowSummary(object):
+    """
+    Slow summary (or synthetic children) call.
+
+    :param float timestamp: Time of the call.
+    :param str provider_name: Provider class name.
+    :param str operation: Operation name, like "summary" or "num_children".
+    :param str type_name: Value type name.
+    :param int address: Value address.
+    :param float duration: Duration in seconds.
+    """
+    def __init__(self, timestamp, provider_name, operation, type_name, address, duration):
+        super(SlowSummary, self).__init__()
+        self.timestamp = timestamp
+        self.provider_name = provider_name
+        self.operation = operation
+        self.type_name = type_name
+        self.address = address
+        self.duration = duration
+
+    def __str__(self):
+        return "{} {:>9.1f}ms  {} {} ({}) 0x{:x}".format(
+            time.strftime("%H:%M:%S", time.localtime(self.timestamp)), self.duration * 1000.0,
+            self.operation, self.type_name, self.provider_name, self.address or 0)
+
+
+class PerfStats(object):
+    """
+    Latency statistics of providers.
+
+    :param bool enabled: True if timings are recorded.
+    :param float slow_threshold: Threshold (in seconds) above which calls are logged as slow.
+    :param dict[(str, str), LatencyHistogram] histograms: Maps provider class name and operation to histogram.
+    :param collections.deque slow_log: Ring buffer with slow calls.
+    :param collections.Counter timeouts: Maps provider class name to number of summaries which exceeded time budget.
+    :param threading.Lock lock: Lock of histograms and counters (providers can be called from several threads).
+    """
+    DEFAULT_SLOW_THRESHOLD = 0.05
+    DEFAULT_SLOW_LOG_SIZE = 100
+
+    def __init__(self):
+        super(PerfStats, self).__init__()
+        self.enabled = True
+        self.slow_threshold = self.DEFAULT_SLOW_THRESHOLD
+        self.histograms = dict()
+        self.slow_log = collections.deque(maxlen=self.DEFAULT_SLOW_LOG_SIZE)
+        self.timeouts = collections.Counter()
+        self.lock = threading.Lock()
+
+    def configure(self, enabled=True, slow_threshold=DEFAULT_SLOW_THRESHOLD, slow_log_size=DEFAULT_SLOW_LOG_SIZE):
+        """
+        Configures statistics.
+
+        :param bool enabled: True if timings should be recorded.
+        :param float slow_threshold: Threshold (in seconds) above which calls are logged as slow.
+        :param int slow_log_size: Maximal number of slow calls in log.
+        """
+        self.enabled = enabled
+        self.slow_threshold = slow_threshold
+        if slow_log_size != self.slow_log.maxlen:
+            self.slow_log = collections.deque(self.slow_log, maxlen=slow_log_size)
+
+    def reset(self):
+        """
+        Removes all collected statistics.
+        """
+        with self.lock:
+            self.histograms = dict()
+            self.slow_log.clear()
+            self.timeouts = collections.Counter()
+
+    def record(self, provider_name, operation, duration, value_obj):
+        """
+        Records duration of provider operation.
+
+        :param str provider_name: Provider class name.
+        :param str operation: Operation name, like "summary" or "num_children".
+        :param float duration: Duration in seconds.
+        :param lldb.SBValue value_obj: Value (type and address are read only for slow calls).
+        """
+        key = (provider_name, operation)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram()
+                self.histograms[key] = histogram
+            histogram.add(duration)
+
+        if duration >= self.slow_threshold:
+            type_name, address = self.__get_value_info(value_obj)
+            self.slow_log.append(SlowSummary(time.time(), provider_name, operation, type_name, address, duration))
+            logger = logging.getLogger(__name__)
+            logger.info("Slow %s of %s (%s) at 0x%x: %.1fms.", operation, type_name, provider_name, address or 0,
+                        duration * 1000.0)
+
+    def record_timeout(self, provider_name, duration, value_obj):
+        """
+        Records summary which exceeded time budget (and was truncated).
+
+        :param str provider_name: Provider class name.
+        :param float duration: Duration in seconds.
+        :param lldb.SBValue value_obj: Value.
+        """
+        with self.lock:
+            self.timeouts[provider_name] += 1
+        type_name, address = self.__get_value_info(value_obj)
+        self.slow_log.append(SlowSummary(time.time(), provider_name, "summary timeout", type_name, address, duration))
+        logger = logging.getLogger(__name__)
+        logger.info("Summary of %s (%s) at 0x%x exceeded time budget: %.1fms.", type_name, provider_name,
+                    address or 0, duration * 1000.0)
+
+    @staticmethod
+    def __get_value_info(value_obj):
+        """
+        Returns value type name and address (pointer value for pointers).
+
+        :param lldb.SBValue value_obj: Value.
+        :return: Type name and address.
+        :rtype: (str, int)
+        """
+        if value_obj is None:
+            return None, None
+        if value_obj.GetType().IsPointerType():
+            return value_obj.GetTypeName(), value_obj.GetValueAsUnsigned()
+        return value_obj.GetTypeName(), value_obj.GetLoadAddress()
+
+    def report(self, sort_key="p99", limit=None):
+        """
+        Returns table with p50 / p95 / p99 latencies per provider and operation.
+
+        :param str sort_key: Column used to sort rows: "p50", "p95", "p99", "max", "count" or "total".
+        :param int limit: Maximal number of rows.
+        :return: Report.
+        :rtype: str
+        """
+        rows = list()
+        with self.lock:
+            for (provider_name, operation), h in self.histograms.items():
+                rows.append({"provider": provider_name, "operation": operation, "count": h.count, "total": h.total,
+                             "p50": h.percentile(50), "p95": h.percentile(95), "p99": h.percentile(99),
+                             "max": h.max})
+            timeouts = self.timeouts.most_common(limit)
+        rows.sort(key=lambda r: r[sort_key], reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+
+        lines = ["{:<50} {:<20} {:>8} {:>9} {:>9} {:>9} {:>9}".format("Provider", "Operation", "Count", "p50 ms",
+                                                                     "p95 ms", "p99 ms", "max ms")]
+        for r in rows:
+            lines.append("{:<50} {:<20} {:>8} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f}".format(
+                r["provider"], r["operation"], r["count"], r["p50"] * 1000.0, r["p95"] * 1000.0, r["p99"] * 1000.0,
+                r["max"] * 1000.0))
+        if len(timeouts) > 0:
+            lines.append("")
+            lines.append("Summaries truncated by time budget:")
+            for provider_name, count in timeouts:
+                lines.append("{:<50} {:>8}".format(provider_name, count))
+        return "\n".join(lines)
+
+    def slow_log_report(self):
+        """
+        Returns slow calls log.
+
+        :return: Slow calls log.
+        :rtype: str
+        """
+        lines = ["Slow calls (threshold {:.1f}ms, {} / {}):".format(self.slow_threshold * 1000.0,
+                                                                   len(self.slow_log), self.slow_log.maxlen)]
+        lines.extend(str(s) for s in self.slow_log)
+        return "\n".join(lines)
+
+
+__shared_perf_stats = None
+""":type: PerfStats"""
+
+
+def get_perf_stats():
+    """
+    Returns shared PerfStats.
+
+    :return: PerfStats singleton.
+    :rtype: PerfStats
+    """
+    global __shared_perf_stats
+    if __shared_perf_stats is None:
+        __shared_perf_stats = PerfStats()
+    return __shared_perf_stats
@@ -0,0 +1,91 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import weakref
+
+
+class ProviderRegistry(object):
+    """
+    Live synthetic providers created by LLDB, so summary of the same object can reuse them.
+
+    For types with both summary and synthetic providers LLDB creates synthetic provider (and updates it every stop)
+    and calls summary function separately. Summary function reuses provider of the same class and object which was
+    updated in current stop, instead of decoding the object again. Providers are referenced weakly, so they are
+    removed when LLDB releases them.
+
+    Registered provider can be updated and used by summary in different threads at the same time, so both hold
+    the lock of the provider (`SummaryBaseSyntheticProvider.lock`).
+
+    :param weakref.WeakValueDictionary providers: Maps process unique ID, provider class name and object address
+        to provider.
+    """
+    def __init__(self):
+        super(ProviderRegistry, self).__init__()
+        self.providers = weakref.WeakValueDictionary()
+
+    def clean_cache(self):
+        """
+        Forgets all providers.
+        """
+        self.providers = weakref.WeakValueDictionary()
+
+    def register(self, key, provider):
+        """
+        Registers updated provider.
+
+        :param (int, str, int) key: Process unique ID, provider class name and object address.
+        :param SummaryBase.SummaryBaseSyntheticProvider provider: Provider.
+        """
+        self.providers[key] = provider
+
+    def find(self, key, stop_id):
+        """
+        Returns provider of given object updated in given stop.
+
+        :param (int, str, int) key: Process unique ID, provider class name and object address.
+        :param int stop_id: Current process stop ID (including expression stops).
+        :return: Provider or None.
+        :rtype: SummaryBase.SummaryBaseSyntheticProvider | None
+        """
+        provider = self.providers.get(key)
+        if provider is None or provider.update_stop_id != stop_id or provider.data_address != key[2]:
+            return None
+        return provider
+
+
+__shared_provider_registry = None
+""":type: ProviderRegistry"""
+
+
+def get_provider_registry():
+    """
+    Returns shared ProviderRegistry.
+
+    :return: ProviderRegistry singleton.
+    :rtype: ProviderRegistry
+    """
+    global __shared_provider_registry
+    if __shared_provider_registry is None:
+        __shared_provider_registry = ProviderRegistry()
+    return __shared_provider_registry
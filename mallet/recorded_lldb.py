@@ -0,0 +1,2054 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+Recorded memory LLDB stand-in.
+
+Implements small subset of LLDB Python API (`SBValue`, `SBType`, `SBProcess`, `SBTarget`, ...) which is used by
+Mallet providers. Values are backed by recorded (or synthetic) memory image and types are built from class dumps.
+It allows to run providers without live process, e.g. to profile or benchmark them.
+
+Usage::
+
+    from mallet import recorded_lldb
+    recorded_lldb.install()
+    image = recorded_lldb.MemoryImage.load("image.json")
+    target = recorded_lldb.SBTarget(image)
+    value = target.FindVariable("view")
+
+    from mallet.UIKit import UIView
+    print(UIView.UIViewSyntheticProvider(value, {}).summary())
+"""
+
+import bisect
+import collections
+import json
+import os
+import struct
+import sys
+from . import class_dump
+
+# Constants (values match LLDB enumerations).
+LLDB_INVALID_ADDRESS = 0xffffffffffffffff
+
+eNoDynamicValues = 0
+eDynamicCanRunTarget = 1
+eDynamicDontRunTarget = 2
+
+eByteOrderInvalid = 0
+eByteOrderBig = 1
+eByteOrderPDP = 2
+eByteOrderLittle = 4
+
+eStateInvalid = 0
+eStateStopped = 5
+eStateRunning = 6
+
+eLanguageTypeObjC = 0x0010
+eLanguageTypeObjC_plus_plus = 0x0011
+eLanguageTypeSwift = 0x001e
+
+eBasicTypeInvalid = 0
+eBasicTypeVoid = 1
+eBasicTypeChar = 2
+eBasicTypeSignedChar = 3
+eBasicTypeUnsignedChar = 4
+eBasicTypeWChar = 5
+eBasicTypeSignedWChar = 6
+eBasicTypeUnsignedWChar = 7
+eBasicTypeChar16 = 8
+eBasicTypeChar32 = 9
+eBasicTypeShort = 10
+eBasicTypeUnsignedShort = 11
+eBasicTypeInt = 12
+eBasicTypeUnsignedInt = 13
+eBasicTypeLong = 14
+eBasicTypeUnsignedLong = 15
+eBasicTypeLongLong = 16
+eBasicTypeUnsignedLongLong = 17
+eBasicTypeInt128 = 18
+eBasicTypeUnsignedInt128 = 19
+eBasicTypeBool = 20
+eBasicTypeHalf = 21
+eBasicTypeFloat = 22
+eBasicTypeDouble = 23
+eBasicTypeLongDouble = 24
+eBasicTypeFloatComplex = 25
+eBasicTypeDoubleComplex = 26
+eBasicTypeLongDoubleComplex = 27
+eBasicTypeObjCID = 28
+eBasicTypeObjCClass = 29
+eBasicTypeObjCSel = 30
+eBasicTypeNullPtr = 31
+
+# Basic type names.
+_BASIC_TYPE_NAMES = {eBasicTypeVoid: "void",
+                     eBasicTypeChar: "char",
+                     eBasicTypeSignedChar: "signed char",
+                     eBasicTypeUnsignedChar: "unsigned char",
+                     eBasicTypeShort: "short",
+                     eBasicTypeUnsignedShort: "unsigned short",
+                     eBasicTypeInt: "int",
+                     eBasicTypeUnsignedInt: "unsigned int",
+                     eBasicTypeLong: "long",
+                     eBasicTypeUnsignedLong: "unsigned long",
+                     eBasicTypeLongLong: "long long",
+                     eBasicTypeUnsignedLongLong: "unsigned long long",
+                     eBasicTypeUnsignedInt128: "unsigned __int128",
+                     eBasicTypeBool: "_Bool",
+                     eBasicTypeFloat: "float",
+                     eBasicTypeDouble: "double",
+                     eBasicTypeObjCID: "id",
+                     eBasicTypeObjCClass: "Class",
+                     eBasicTypeObjCSel: "SEL"}
+
+# Names of builtin packages with class dumps.
+BUILTIN_CLASS_DUMP_PACKAGES = ["Foundation", "QuartzCore", "CFNetwork", "UIKit", "StoreKit"]
+
+# Statistics of SB API calls. Maps "SBClass.Method" to number of calls.
+statistics = collections.Counter()
+""":type: collections.Counter"""
+# Depth of nested SB API calls, only outermost calls (made by providers) are counted.
+_call_depth = [0]
+
+
+def _counted(cls):
+    """
+    Class decorator. Counts calls of all public (LLDB style, capitalized) methods in `statistics`.
+
+    :param class cls: Decorated class.
+    :return: Decorated class.
+    """
+    def wrap(name, method):
+        key = "{}.{}".format(cls.__name__, name)
+
+        def counted_method(*args, **kwargs):
+            if _call_depth[0] == 0:
+                statistics[key] += 1
+            _call_depth[0] += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                _call_depth[0] -= 1
+        counted_method.__name__ = method.__name__
+        counted_method.__doc__ = method.__doc__
+        return counted_method
+
+    for name, method in list(vars(cls).items()):
+        if name[:1].isupper() and callable(method):
+            setattr(cls, name, wrap(name, method))
+    return cls
+
+
+def reset_statistics():
+    """
+    Resets SB API calls statistics.
+    """
+    statistics.clear()
+
+
+def install(force=False):
+    """
+    Installs this module as `lldb` module, so Mallet providers can be imported without LLDB.
+
+    :param bool force: Replaces `lldb` module even if it is already loaded.
+    :return: Installed `lldb` module.
+    :rtype: module
+    """
+    if force or "lldb" not in sys.modules:
+        sys.modules["lldb"] = sys.modules[__name__]
+    return sys.modules["lldb"]
+
+
+def get_builtin_class_dump_manager(packages=None):
+    """
+    Returns class dump manager with registered builtin class dumps.
+
+    :param list[str] packages: List of packages names, by default all builtin packages with class dumps.
+    :return: Class dump manager.
+    :rtype: class_dump.LazyClassDumpManager
+    """
+    manager = class_dump.LazyClassDumpManager()
+    register_builtin_class_dumps(manager, packages)
+    return manager
+
+
+def register_builtin_class_dumps(manager, packages=None):
+    """
+    Registers builtin class dumps in class dump manager, e.g. in shared manager used by providers.
+
+    :param class_dump.LazyClassDumpManager manager: Class dump manager.
+    :param list[str] packages: List of packages names, by default all builtin packages with class dumps.
+    """
+    if packages is None:
+        packages = BUILTIN_CLASS_DUMP_PACKAGES
+    package_dir_path = os.path.dirname(os.path.realpath(__file__))
+    for package in packages:
+        class_dumps_path = os.path.join(package_dir_path, package, class_dump.class_dumps_folder_name)
+        if os.path.exists(class_dumps_path) and package not in manager.modules:
+            manager.register_module(package, class_dumps_path)
+
+
+class MemoryImage(object):
+    """
+    Recorded memory image.
+
+    :param str triple: Target triple, e.g. "x86_64-apple-ios".
+    :param list[int] region_starts: Sorted list of regions start addresses.
+    :param list[bytearray] regions: List of regions content (same order as `region_starts`).
+    :param dict[int, str] classes: Maps isa address to class name.
+    :param dict[int, str] tagged_pointers: Maps tagged pointer to its class name.
+    :param dict[int, str] summaries: Maps object address to summary returned by LLDB formatters.
+    :param dict[int, str] descriptions: Maps object address to object description.
+    :param dict[int, list[int]] elements: Maps collection address to addresses of its elements.
+    :param dict[str, (str, int)] variables: Maps variable name to its type name and address.
+    :param dict[str, list[int]] modules: Maps module name to its version, e.g. {"Foundation": [1200]}.
+    """
+    def __init__(self, triple):
+        """
+        :param str triple: Target triple.
+        """
+        super(MemoryImage, self).__init__()
+        self.triple = triple
+        self.region_starts = list()
+        self.regions = list()
+        self.classes = dict()
+        self.tagged_pointers = dict()
+        self.summaries = dict()
+        self.descriptions = dict()
+        self.elements = dict()
+        self.variables = dict()
+        self.modules = dict()
+
+    def add_region(self, address, data):
+        """
+        Adds memory region.
+
+        :param int address: Region start address.
+        :param bytes | bytearray data: Region content.
+        :return: Region content.
+        :rtype: bytearray
+        """
+        index = bisect.bisect_left(self.region_starts, address)
+        region = bytearray(data)
+        self.region_starts.insert(index, address)
+        self.regions.insert(index, region)
+        return region
+
+    def find_region(self, address, size=1):
+        """
+        Finds region which contains given address range.
+
+        :param int address: Start address.
+        :param int size: Range size.
+        :return: Region start address and content or None.
+        :rtype: (int, bytearray) | None
+        """
+        index = bisect.bisect_right(self.region_starts, address) - 1
+        if index < 0:
+            return None
+        start = self.region_starts[index]
+        region = self.regions[index]
+        if address + size > start + len(region):
+            return None
+        return start, region
+
+    def read(self, address, size):
+        """
+        Reads memory.
+
+        :param int address: Start address.
+        :param int size: Number of bytes.
+        :return: Memory content or None if memory is not readable.
+        :rtype: bytes | None
+        """
+        if address is None or size < 0:
+            return None
+        r = self.find_region(address, size)
+        if r is None:
+            return None
+        start, region = r
+        return bytes(region[address - start:address - start + size])
+
+    def write(self, address, data):
+        """
+        Writes memory.
+
+        :param int address: Start address.
+        :param bytes data: New content.
+        """
+        r = self.find_region(address, len(data))
+        if r is None:
+            raise ValueError("Address 0x{:x} is not mapped.".format(address))
+        start, region = r
+        region[address - start:address - start + len(data)] = data
+
+    @classmethod
+    def from_json(cls, json_data):
+        """
+        Creates memory image from JSON data.
+
+        :param dict json_data: JSON representation of image.
+        :return: Memory image.
+        :rtype: MemoryImage
+        """
+        image = cls(json_data["triple"])
+        for r in json_data.get("regions", list()):
+            image.add_region(int(r["address"], 16), bytes.fromhex(r["bytes"]))
+        image.classes = {int(k, 16): v for k, v in json_data.get("classes", dict()).items()}
+        image.tagged_pointers = {int(k, 16): v for k, v in json_data.get("tagged_pointers", dict()).items()}
+        image.summaries = {int(k, 16): v for k, v in json_data.get("summaries", dict()).items()}
+        image.descriptions = {int(k, 16): v for k, v in json_data.get("descriptions", dict()).items()}
+        image.elements = {int(k, 16): [int(e, 16) for e in v] for k, v in json_data.get("elements", dict()).items()}
+        image.variables = {k: (v["type"], int(v["address"], 16)) for k, v in json_data.get("variables", dict()).items()}
+        image.modules = {k: list(v) for k, v in json_data.get("modules", dict()).items()}
+        return image
+
+    def json_data(self):
+        """
+        Returns JSON representation of memory image.
+
+        :return: JSON representation of memory image.
+        :rtype: dict
+        """
+        j = dict()
+        j["triple"] = self.triple
+        j["regions"] = [{"address": "0x{:x}".format(start), "bytes": bytes(region).hex()}
+                        for start, region in zip(self.region_starts, self.regions)]
+        j["classes"] = {"0x{:x}".format(k): v for k, v in self.classes.items()}
+        j["tagged_pointers"] = {"0x{:x}".format(k): v for k, v in self.tagged_pointers.items()}
+        j["summaries"] = {"0x{:x}".format(k): v for k, v in self.summaries.items()}
+        j["descriptions"] = {"0x{:x}".format(k): v for k, v in self.descriptions.items()}
+        j["elements"] = {"0x{:x}".format(k): ["0x{:x}".format(e) for e in v] for k, v in self.elements.items()}
+        j["variables"] = {k: {"type": t, "address": "0x{:x}".format(a)} for k, (t, a) in self.variables.items()}
+        j["modules"] = {k: list(v) for k, v in self.modules.items()}
+        return j
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Loads memory image from JSON file.
+
+        :param str file_path: File path.
+        :return: Memory image.
+        :rtype: MemoryImage
+        """
+        with open(file_path, "r") as f:
+            return cls.from_json(json.load(f))
+
+    def save(self, file_path):
+        """
+        Saves memory image to JSON file.
+
+        :param str file_path: File path.
+        """
+        with open(file_path, "w") as f:
+            json.dump(self.json_data(), f, sort_keys=True, indent=2, separators=(",", ":"))
+
+
+class TypeTable(object):
+    """
+    Small type table. Contains basic C types, CoreGraphics / UIKit structures and Objective-C classes
+    from class dumps.
+
+    :param str architecture_name: Architecture name.
+    :param int pointer_size: Pointer size.
+    :param class_dump.LazyClassDumpManager class_dump_manager: Class dump manager.
+    :param dict[str, SBType] types: Maps type name to type.
+    """
+    # Basic types, format (for `struct` module) and size (None - pointer size).
+    __BASIC_TYPES = {"void": ("", 0),
+                     "char": ("b", 1),
+                     "signed char": ("b", 1),
+                     "unsigned char": ("B", 1),
+                     "_Bool": ("B", 1),
+                     "bool": ("B", 1),
+                     "BOOL": ("b", 1),
+                     "short": ("h", 2),
+                     "unsigned short": ("H", 2),
+                     "int": ("i", 4),
+                     "unsigned int": ("I", 4),
+                     "long": ("l", None),
+                     "unsigned long": ("L", None),
+                     "long long": ("q", 8),
+                     "unsigned long long": ("Q", 8),
+                     "float": ("f", 4),
+                     "double": ("d", 8),
+                     "unsigned __int128": ("", 16),
+                     "uuid_t": ("", 16)}
+
+    # Type aliases.
+    __ALIASES_64 = {"NSInteger": "long", "NSUInteger": "unsigned long", "CGFloat": "double"}
+    __ALIASES_32 = {"NSInteger": "int", "NSUInteger": "unsigned int", "CGFloat": "float"}
+
+    # Structures and its fields.
+    __STRUCTURES = {"CGPoint": [("x", "CGFloat"), ("y", "CGFloat")],
+                    "CGSize": [("width", "CGFloat"), ("height", "CGFloat")],
+                    "CGRect": [("origin", "CGPoint"), ("size", "CGSize")],
+                    "CGVector": [("dx", "CGFloat"), ("dy", "CGFloat")],
+                    "CGAffineTransform": [("a", "CGFloat"), ("b", "CGFloat"), ("c", "CGFloat"),
+                                          ("d", "CGFloat"), ("tx", "CGFloat"), ("ty", "CGFloat")],
+                    "UIEdgeInsets": [("top", "CGFloat"), ("left", "CGFloat"),
+                                     ("bottom", "CGFloat"), ("right", "CGFloat")],
+                    "UIOffset": [("horizontal", "CGFloat"), ("vertical", "CGFloat")],
+                    "_NSRange": [("location", "NSUInteger"), ("length", "NSUInteger")],
+                    "_CALayerIvars": [("refcount", "int"), ("magic", "unsigned int"), ("layer", "void *")],
+                    "CADoublePoint": [("x", "double"), ("y", "double")],
+                    "CADoubleSize": [("width", "double"), ("height", "double")],
+                    "CADoubleRect": [("origin", "CADoublePoint"), ("size", "CADoubleSize")]}
+
+    def __init__(self, architecture_name, class_dump_manager=None):
+        """
+        :param str architecture_name: Architecture name.
+        :param class_dump.LazyClassDumpManager class_dump_manager: Class dump manager.
+        """
+        super(TypeTable, self).__init__()
+        self.architecture_name = architecture_name
+        self.pointer_size = 8 if architecture_name in ["x86_64", "arm64"] else 4
+        self.class_dump_manager = class_dump_manager
+        self.types = dict()
+
+    def find_type(self, type_name):
+        """
+        Returns type with given name. Returns invalid type if type cannot be found.
+
+        :param str type_name: Type name.
+        :return: Type with given name.
+        :rtype: SBType
+        """
+        if type_name is None:
+            return SBType()
+        type_name = " ".join(type_name.split())
+        if type_name in self.types:
+            return self.types[type_name]
+
+        t = self.__create_type(type_name)
+        self.types[type_name] = t
+        return t
+
+    def __create_type(self, type_name):
+        """
+        Creates type for given name.
+
+        :param str type_name: Type name.
+        :return: Type with given name.
+        :rtype: SBType
+        """
+        aliases = self.__ALIASES_64 if self.pointer_size == 8 else self.__ALIASES_32
+
+        # Pointers.
+        if type_name.endswith("*"):
+            pointee = self.find_type(type_name[:-1].strip())
+            if pointee.kind is None:
+                pointee = SBType(type_name[:-1].strip(), "opaque", 0, pointer_size=self.pointer_size)
+            return pointee.pointer_type()
+        # Bit fields, e.g. "unsigned int :1".
+        if ":" in type_name and "{" not in type_name:
+            return self.find_type(type_name.split(":")[0].strip())
+        # Protocols, e.g. "NSObject<OS_dispatch_queue>" or "id <NSURLSessionDelegate>".
+        if "<" in type_name and "{" not in type_name:
+            return self.find_type(type_name.split("<")[0].strip())
+        # Aliases.
+        if type_name in aliases:
+            return self.__create_alias(type_name, self.find_type(aliases[type_name]))
+        # Basic types.
+        if type_name in self.__BASIC_TYPES:
+            fmt, size = self.__BASIC_TYPES[type_name]
+            if size is None:
+                size = self.pointer_size
+                fmt = fmt if self.pointer_size == 8 else fmt.replace("l", "i").replace("L", "I")
+            return SBType(type_name, "basic", size, fmt=fmt.replace("l", "q").replace("L", "Q"),
+                          pointer_size=self.pointer_size)
+        # Objective-C pointer types.
+        if type_name in ["id", "Class", "SEL", "CDUnknownBlockType"]:
+            pointee = SBType("objc_object", "class", 0, pointer_size=self.pointer_size)
+            return SBType(type_name, "pointer", self.pointer_size, pointee=pointee, pointer_size=self.pointer_size)
+        # Structures.
+        name = type_name[len("struct "):] if type_name.startswith("struct ") else type_name
+        if name in self.__STRUCTURES:
+            return self.__create_structure(type_name, self.__STRUCTURES[name])
+        # Arrays, e.g. "char [160]".
+        if type_name.endswith("]") and "[" in type_name:
+            element_name, count = type_name[:-1].rsplit("[", 1)
+            element = self.find_type(element_name.strip())
+            count = int(count) if count.strip().isdigit() else 0
+            return SBType(type_name, "array", element.size * count, pointee=element,
+                          pointer_size=self.pointer_size)
+        # Objective-C classes from class dumps.
+        if self.__is_identifier(name):
+            return self.__create_class(name)
+        return SBType()
+
+    @staticmethod
+    def __is_identifier(name):
+        """
+        Returns True if name looks like C identifier.
+
+        :param str name: Name.
+        :rtype: bool
+        """
+        return len(name) > 0 and name.replace("_", "a").isalnum() and not name[0].isdigit()
+
+    @staticmethod
+    def __create_alias(type_name, t):
+        """
+        Creates type alias (typedef).
+
+        :param str type_name: Alias name.
+        :param SBType t: Aliased type.
+        :rtype: SBType
+        """
+        alias = SBType(type_name, t.kind, t.size, fmt=t.fmt, pointee=t.pointee, pointer_size=t.pointer_size)
+        alias.fields = t.fields
+        return alias
+
+    def __create_structure(self, type_name, fields_definition):
+        """
+        Creates structure type.
+
+        :param str type_name: Structure name.
+        :param list[(str, str)] fields_definition: List of fields names and types.
+        :rtype: SBType
+        """
+        fields = list()
+        offset = 0
+        for field_name, field_type_name in fields_definition:
+            field_type = self.find_type(field_type_name)
+            fields.append(SBTypeMember(field_name, offset, field_type))
+            offset += field_type.size
+        t = SBType(type_name, "struct", offset, pointer_size=self.pointer_size)
+        t.fields = fields
+        return t
+
+    def __create_class(self, class_name):
+        """
+        Creates Objective-C class type with ivars from class dumps.
+
+        :param str class_name: Class name.
+        :rtype: SBType
+        """
+        t = SBType(class_name, "class", 0, pointer_size=self.pointer_size)
+        if self.class_dump_manager is None:
+            return t
+        # Prevents infinite recursion for ivars of the same type.
+        self.types[class_name] = t
+
+        fields = list()
+        size = self.pointer_size
+        name = class_name
+        while name is not None:
+            module_name = self.class_dump_manager.find_module_for_class(self.architecture_name, name)
+            if module_name is None:
+                break
+            c = self.class_dump_manager.get_class(module_name, self.architecture_name, name)
+            for ivar in c.ivars:
+                if ivar.offset is None:
+                    continue
+                ivar_type = self.find_type(ivar.ivarType)
+                if ivar_type.kind is None:
+                    ivar_type = SBType(ivar.ivarType, "opaque", 0, pointer_size=self.pointer_size)
+                fields.append(SBTypeMember(ivar.name, ivar.offset, ivar_type))
+                size = max(size, ivar.offset + ivar_type.size)
+            name = c.super_class_name
+        t.fields = sorted(fields, key=lambda f: f.offset)
+        t.size = size
+        return t
+
+
+@_counted
+class SBError(object):
+    """
+    LLDB error.
+    """
+    def __init__(self, error_string=None):
+        super(SBError, self).__init__()
+        self.error_string = error_string
+
+    def Success(self):
+        return self.error_string is None
+
+    def Fail(self):
+        return self.error_string is not None
+
+    def GetCString(self):
+        return self.error_string
+
+    def SetErrorString(self, error_string):
+        self.error_string = error_string
+
+    def Clear(self):
+        self.error_string = None
+
+    def __bool__(self):
+        return self.Success()
+
+
+@_counted
+class SBAddress(object):
+    """
+    LLDB address.
+    """
+    def __init__(self, address=LLDB_INVALID_ADDRESS, target=None):
+        super(SBAddress, self).__init__()
+        self.address = address
+
+    def GetFileAddress(self):
+        return self.address
+
+    def GetLoadAddress(self, target=None):
+        return self.address
+
+    def IsValid(self):
+        return self.address != LLDB_INVALID_ADDRESS
+
+    def __bool__(self):
+        return self.IsValid()
+
+
+@_counted
+class SBData(object):
+    """
+    LLDB data.
+    """
+    def __init__(self, data=b"", byte_order=eByteOrderLittle, address_byte_size=8):
+        super(SBData, self).__init__()
+        self.data = data
+        self.byte_order = byte_order
+        self.address_byte_size = address_byte_size
+
+    @staticmethod
+    def CreateDataFromUInt64Array(byte_order, address_byte_size, array):
+        prefix = ">" if byte_order == eByteOrderBig else "<"
+        return SBData(struct.pack("{}{}Q".format(prefix, len(array)), *array), byte_order, address_byte_size)
+
+    @staticmethod
+    def CreateDataFromUInt32Array(byte_order, address_byte_size, array):
+        prefix = ">" if byte_order == eByteOrderBig else "<"
+        return SBData(struct.pack("{}{}I".format(prefix, len(array)), *array), byte_order, address_byte_size)
+
+    def SetByteOrder(self, byte_order):
+        self.byte_order = byte_order
+
+    def GetByteOrder(self):
+        return self.byte_order
+
+    def GetByteSize(self):
+        return len(self.data)
+
+    def __unpack(self, fmt, error, offset):
+        size = struct.calcsize(fmt)
+        if offset + size > len(self.data):
+            if error is not None:
+                error.SetErrorString("Out of bounds.")
+            return 0
+        prefix = ">" if self.byte_order == eByteOrderBig else "<"
+        return struct.unpack_from(prefix + fmt, self.data, offset)[0]
+
+    def GetUnsignedInt8(self, error, offset):
+        return self.__unpack("B", error, offset)
+
+    def GetUnsignedInt16(self, error, offset):
+        return self.__unpack("H", error, offset)
+
+    def GetUnsignedInt32(self, error, offset):
+        return self.__unpack("I", error, offset)
+
+    def GetUnsignedInt64(self, error, offset):
+        return self.__unpack("Q", error, offset)
+
+    def GetSignedInt32(self, error, offset):
+        return self.__unpack("i", error, offset)
+
+    def GetSignedInt64(self, error, offset):
+        return self.__unpack("q", error, offset)
+
+    def GetFloat(self, error, offset):
+        return self.__unpack("f", error, offset)
+
+    def GetDouble(self, error, offset):
+        return self.__unpack("d", error, offset)
+
+    def GetAddress(self, error, offset):
+        return self.__unpack("Q" if self.address_byte_size == 8 else "I", error, offset)
+
+    def ReadRawData(self, error, offset, size):
+        return bytes(self.data[offset:offset + size])
+
+    def IsValid(self):
+        return True
+
+
+class SBTypeMember(object):
+    """
+    LLDB type member (structure field or ivar).
+
+    :param str name: Member name.
+    :param int offset: Member offset in bytes.
+    :param SBType type: Member type.
+    """
+    def __init__(self, name, offset, t):
+        super(SBTypeMember, self).__init__()
+        self.name = name
+        self.offset = offset
+        self.type = t
+
+    def GetName(self):
+        return self.name
+
+    def GetOffsetInBytes(self):
+        return self.offset
+
+    def GetType(self):
+        return self.type
+
+
+@_counted
+class SBType(object):
+    """
+    LLDB type.
+
+    :param str name: Type name.
+    :param str kind: Type kind: "basic", "pointer", "struct", "class", "array", "opaque" or None (invalid).
+    :param int size: Byte size.
+    :param str fmt: `struct` module format of basic type.
+    :param SBType pointee: Pointee type (for pointers and arrays).
+    :param list[SBTypeMember] fields: Structure fields or class ivars.
+    :param int pointer_size: Pointer size of architecture.
+    """
+    def __init__(self, name=None, kind=None, size=0, fmt="", pointee=None, pointer_size=8):
+        super(SBType, self).__init__()
+        self.name = name
+        self.kind = kind
+        self.size = size
+        self.fmt = fmt
+        self.pointee = pointee
+        self.pointer_size = pointer_size
+        self.fields = list()
+        self.__pointer_type = None
+
+    def IsValid(self):
+        return self.kind is not None
+
+    def __bool__(self):
+        return self.IsValid()
+
+    def GetName(self):
+        return self.name
+
+    def GetByteSize(self):
+        return self.size
+
+    def IsPointerType(self):
+        return self.kind == "pointer"
+
+    def IsReferenceType(self):
+        return False
+
+    def IsArrayType(self):
+        return self.kind == "array"
+
+    def GetPointeeType(self):
+        return self.pointee if self.pointee is not None else SBType()
+
+    def GetDereferencedType(self):
+        return self
+
+    def GetPointerType(self):
+        return self.pointer_type()
+
+    def pointer_type(self):
+        """
+        Returns pointer type (not counted as SB API call).
+
+        :rtype: SBType
+        """
+        if self.__pointer_type is None:
+            self.__pointer_type = SBType("{} *".format(self.name), "pointer", self.pointer_size, pointee=self,
+                                         pointer_size=self.pointer_size)
+        return self.__pointer_type
+
+    def GetNumberOfFields(self):
+        return len(self.fields)
+
+    def GetFieldAtIndex(self, index):
+        return self.fields[index]
+
+    def GetNumberOfDirectBaseClasses(self):
+        # Ivars of superclasses are flattened into class type.
+        return 0
+
+    def GetDirectBaseClassAtIndex(self, index):
+        return SBTypeMember(None, 0, SBType())
+
+    def __eq__(self, other):
+        return isinstance(other, SBType) and self.name == other.name and self.kind == other.kind
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.name, self.kind))
+
+    def __str__(self):
+        return "<{}: {}>".format(self.__class__.__name__, self.name)
+
+
+@_counted
+class SBValue(object):
+    """
+    LLDB value backed by recorded memory.
+
+    :param SBTarget target: Target.
+    :param str name: Value name.
+    :param SBType type: Value type.
+    :param int address: Value address (location) or None.
+    :param bytes data: Value content for values without address.
+    :param bool dynamic: True if value is dynamic.
+    :param int prefer_dynamic: Preferred dynamic type.
+    :param bool prefer_synthetic: Preferred synthetic value.
+    :param SBValue static_value: Static (not dynamic) value.
+    """
+    def __init__(self, target=None, name=None, t=None, address=None, data=None):
+        super(SBValue, self).__init__()
+        self.target = target
+        self.name = name
+        self.type = t if t is not None else SBType()
+        self.address = address
+        self.data = data
+        self.dynamic = False
+        self.prefer_dynamic = eNoDynamicValues
+        self.prefer_synthetic = False
+        self.static_value = None
+
+    def __copy(self, t=None):
+        """
+        Returns copy of the value.
+
+        :param SBType t: New type.
+        :rtype: SBValue
+        """
+        value = SBValue(self.target, self.name, t if t is not None else self.type, self.address, self.data)
+        value.dynamic = self.dynamic
+        value.prefer_dynamic = self.prefer_dynamic
+        value.prefer_synthetic = self.prefer_synthetic
+        value.static_value = self.static_value
+        return value
+
+    def __get_bytes(self):
+        """
+        Returns value content.
+
+        :rtype: bytes | None
+        """
+        if self.data is not None:
+            return self.data
+        if self.target is None or self.address is None:
+            return None
+        return self.target.process.read_memory(self.address, self.type.GetByteSize())
+
+    def __get_pointer(self):
+        """
+        Returns pointer value (for pointer types) or None.
+
+        :rtype: int | None
+        """
+        if not self.type.IsPointerType():
+            return None
+        data = self.__get_bytes()
+        if data is None:
+            return None
+        fmt = "<Q" if len(data) == 8 else "<I"
+        return struct.unpack(fmt, data)[0]
+
+    def __get_object_address(self):
+        """
+        Returns address of pointed object (for pointers) or address of value.
+
+        :rtype: int | None
+        """
+        if self.type.IsPointerType():
+            return self.__get_pointer()
+        return self.address
+
+    def __get_class_name(self):
+        """
+        Returns class name of pointed object reading isa pointer.
+
+        :rtype: str | None
+        """
+        address = self.__get_pointer()
+        if not address:
+            return None
+        if address in self.target.image.tagged_pointers:
+            return self.target.image.tagged_pointers[address]
+        isa_data = self.target.process.read_memory(address, self.target.pointer_size)
+        if isa_data is None:
+            return None
+        isa = struct.unpack("<Q" if len(isa_data) == 8 else "<I", isa_data)[0]
+        return self.target.image.classes.get(isa)
+
+    def IsValid(self):
+        return self.type.IsValid() and (self.data is not None or self.address is not None)
+
+    def __bool__(self):
+        return self.IsValid()
+
+    def GetName(self):
+        return self.name
+
+    def GetType(self):
+        return self.type
+
+    def GetTypeName(self):
+        return self.type.GetName()
+
+    def GetDisplayTypeName(self):
+        return self.type.GetName()
+
+    def GetByteSize(self):
+        return self.type.GetByteSize()
+
+    def GetTarget(self):
+        return self.target
+
+    def GetProcess(self):
+        return self.target.process if self.target is not None else None
+
+    def GetError(self):
+        if self.__get_bytes() is None:
+            return SBError("Cannot read memory.")
+        return SBError()
+
+    def GetAddress(self):
+        return SBAddress(self.address if self.address is not None else LLDB_INVALID_ADDRESS)
+
+    def GetLoadAddress(self):
+        return self.address if self.address is not None else LLDB_INVALID_ADDRESS
+
+    def GetData(self):
+        data = self.__get_bytes()
+        return SBData(data if data is not None else b"", address_byte_size=self.target.pointer_size)
+
+    def GetValueAsUnsigned(self, fail_value=0):
+        data = self.__get_bytes()
+        if data is None or len(data) == 0 or self.type.kind not in ["basic", "pointer"] or self.type.fmt in ["f", "d"]:
+            return fail_value
+        return int.from_bytes(data, "little", signed=False)
+
+    def GetValueAsSigned(self, fail_value=0):
+        data = self.__get_bytes()
+        if data is None or len(data) == 0 or self.type.kind not in ["basic", "pointer"] or self.type.fmt in ["f", "d"]:
+            return fail_value
+        return int.from_bytes(data, "little", signed=True)
+
+    def GetValue(self):
+        data = self.__get_bytes()
+        if data is None:
+            return None
+        if self.type.IsPointerType():
+            return "0x{:0{width}x}".format(self.__get_pointer(), width=self.target.pointer_size * 2)
+        if self.type.kind != "basic" or not self.type.fmt:
+            return None
+        value = struct.unpack("<" + self.type.fmt, data)[0]
+        if self.type.fmt in ["f", "d"]:
+            return "{!r}".format(value)
+        return "{}".format(value)
+
+    def GetSummary(self):
+        address = self.__get_object_address()
+        if address is None:
+            return None
+        return self.target.image.summaries.get(address)
+
+    def GetObjectDescription(self):
+        address = self.__get_object_address()
+        if address is None:
+            return None
+        if address == 0 and self.type.IsPointerType():
+            return "<nil>"
+        return self.target.image.descriptions.get(address)
+
+    def GetTypeSummary(self):
+        # Summaries are registered by class name (pointers to objects) or type name in default category.
+        name = self.__get_class_name() if self.type.IsPointerType() else None
+        return debugger.GetDefaultCategory().get_type_summary(name or self.type.GetName())
+
+    def TypeIsPointerType(self):
+        return self.type.IsPointerType()
+
+    def IsDynamic(self):
+        return self.dynamic
+
+    def IsSynthetic(self):
+        return self.prefer_synthetic
+
+    def GetPreferDynamicValue(self):
+        return self.prefer_dynamic
+
+    def SetPreferDynamicValue(self, use_dynamic):
+        self.prefer_dynamic = use_dynamic
+
+    def GetPreferSyntheticValue(self):
+        return self.prefer_synthetic
+
+    def SetPreferSyntheticValue(self, use_synthetic):
+        self.prefer_synthetic = use_synthetic
+
+    def GetStaticValue(self):
+        return self.static_value if self.static_value is not None else self
+
+    def GetNonSyntheticValue(self):
+        value = self.__copy()
+        value.prefer_synthetic = False
+        return value
+
+    def GetDynamicValue(self, use_dynamic):
+        static_value = self.GetStaticValue()
+        if use_dynamic == eNoDynamicValues:
+            return static_value
+
+        class_name = self.__get_class_name()
+        t = self.type
+        if class_name is not None:
+            t = self.target.type_table.find_type(class_name).GetPointerType()
+        value = static_value.__copy(t)
+        value.dynamic = class_name is not None
+        value.prefer_dynamic = use_dynamic
+        value.static_value = static_value
+        return value
+
+    def GetNumChildren(self):
+        address = self.__get_object_address()
+        if address is not None and address in self.target.image.elements:
+            return len(self.target.image.elements[address])
+        t = self.type.GetPointeeType() if self.type.IsPointerType() else self.type
+        return len(t.fields)
+
+    def MightHaveChildren(self):
+        return self.GetNumChildren() > 0
+
+    def GetChildAtIndex(self, index):
+        address = self.__get_object_address()
+        if address is not None and address in self.target.image.elements:
+            elements = self.target.image.elements[address]
+            if 0 <= index < len(elements):
+                return self.target.create_pointer_value("[{}]".format(index), elements[index])
+            return SBValue()
+        t = self.type.GetPointeeType() if self.type.IsPointerType() else self.type
+        if 0 <= index < len(t.fields):
+            field = t.fields[index]
+            return self.CreateChildAtOffset(field.name, field.offset, field.type)
+        return SBValue()
+
+    def GetIndexOfChildWithName(self, name):
+        address = self.__get_object_address()
+        if address is not None and address in self.target.image.elements:
+            if name.startswith("[") and name.endswith("]") and name[1:-1].isdigit():
+                return int(name[1:-1])
+            return LLDB_INVALID_ADDRESS & 0xffffffff
+        t = self.type.GetPointeeType() if self.type.IsPointerType() else self.type
+        for index, field in enumerate(t.fields):
+            if field.name == name:
+                return index
+        return LLDB_INVALID_ADDRESS & 0xffffffff
+
+    def GetChildMemberWithName(self, name, use_dynamic=eNoDynamicValues):
+        t = self.type.GetPointeeType() if self.type.IsPointerType() else self.type
+        for field in t.fields:
+            if field.name == name:
+                value = self.CreateChildAtOffset(field.name, field.offset, field.type)
+                if use_dynamic != eNoDynamicValues:
+                    value = value.GetDynamicValue(use_dynamic)
+                return value
+        return SBValue()
+
+    def CreateChildAtOffset(self, name, offset, t):
+        if not t or not self.IsValid():
+            return SBValue()
+        base = self.__get_object_address()
+        if base is None:
+            if self.data is None:
+                return SBValue()
+            # Value without address (e.g. value created from data).
+            data = self.data[offset:offset + t.GetByteSize()]
+            return SBValue(self.target, name, t, data=data if len(data) == t.GetByteSize() else None)
+        return SBValue(self.target, name, t, address=base + offset)
+
+    def CreateValueFromAddress(self, name, address, t):
+        return self.target.CreateValueFromAddress(name, SBAddress(address), t)
+
+    def Dereference(self):
+        address = self.__get_pointer()
+        if address is None:
+            return SBValue()
+        return SBValue(self.target, "*{}".format(self.name), self.type.GetPointeeType(), address=address)
+
+    def Cast(self, t):
+        return self.__copy(t)
+
+    def __str__(self):
+        return "({}) {} = {}".format(self.GetTypeName(), self.name, self.GetValue())
+
+
+@_counted
+class SBMemoryRegionInfo(object):
+    """
+    Memory region information. Recorded regions are readable and writable.
+
+    :param int base: Region start address.
+    :param int end: Region end address.
+    :param bool readable: Is region readable.
+    """
+    def __init__(self, base=0, end=0, readable=True):
+        super(SBMemoryRegionInfo, self).__init__()
+        self.base = base
+        self.end = end
+        self.readable = readable
+
+    def GetRegionBase(self):
+        return self.base
+
+    def GetRegionEnd(self):
+        return self.end
+
+    def IsReadable(self):
+        return self.readable
+
+    def IsWritable(self):
+        return self.readable
+
+    def IsExecutable(self):
+        return False
+
+    def IsMapped(self):
+        return self.readable
+
+
+@_counted
+class SBMemoryRegionInfoList(object):
+    """
+    List of memory regions.
+
+    :param list[SBMemoryRegionInfo] regions: Regions.
+    """
+    def __init__(self):
+        super(SBMemoryRegionInfoList, self).__init__()
+        self.regions = list()
+
+    def GetSize(self):
+        return len(self.regions)
+
+    def Append(self, region_info):
+        self.regions.append(region_info)
+
+    def GetMemoryRegionAtIndex(self, index, region_info):
+        if index < 0 or index >= len(self.regions):
+            return False
+        region = self.regions[index]
+        region_info.base = region.base
+        region_info.end = region.end
+        region_info.readable = region.readable
+        return True
+
+
+@_counted
+class SBProcess(object):
+    """
+    LLDB process backed by recorded memory image.
+
+    :param SBTarget target: Target.
+    :param int unique_id: Process unique ID.
+    :param int stop_id: Stop ID (including stops of evaluated expressions).
+    :param int natural_stop_id: Stop ID of the last natural stop (without expressions).
+    :param int state: Process state.
+    """
+    __next_unique_id = 1
+
+    def __init__(self, target):
+        """
+        :param SBTarget target: Target.
+        """
+        super(SBProcess, self).__init__()
+        self.target = target
+        self.unique_id = SBProcess.__next_unique_id
+        SBProcess.__next_unique_id += 1
+        self.stop_id = 1
+        self.natural_stop_id = 1
+        self.state = eStateStopped
+
+    def read_memory(self, address, size):
+        """
+        Reads memory from image (not counted as SB API call).
+
+        :param int address: Start address.
+        :param int size: Number of bytes.
+        :return: Memory content or None.
+        :rtype: bytes | None
+        """
+        return self.target.image.read(address, size)
+
+    def IsValid(self):
+        return True
+
+    def __bool__(self):
+        return True
+
+    def GetTarget(self):
+        return self.target
+
+    def GetUniqueID(self):
+        return self.unique_id
+
+    def GetProcessID(self):
+        return self.unique_id
+
+    def GetStopID(self, include_expression_stops=False):
+        return self.stop_id if include_expression_stops else self.natural_stop_id
+
+    def GetState(self):
+        return self.state
+
+    def GetSelectedThread(self):
+        return SBThread(self)
+
+    def GetAddressByteSize(self):
+        return self.target.pointer_size
+
+    def GetByteOrder(self):
+        return eByteOrderLittle
+
+    def GetMemoryRegions(self):
+        regions = SBMemoryRegionInfoList()
+        for start, region in zip(self.target.image.region_starts, self.target.image.regions):
+            regions.Append(SBMemoryRegionInfo(start, start + len(region)))
+        return regions
+
+    def GetMemoryRegionInfo(self, address, region_info):
+        r = self.target.image.find_region(address)
+        if r is None:
+            return SBError("no region for 0x{:x}".format(address))
+        start, region = r
+        region_info.base = start
+        region_info.end = start + len(region)
+        region_info.readable = True
+        return SBError()
+
+    def ReadMemory(self, address, size, error):
+        data = self.read_memory(address, size)
+        if data is None:
+            # Like LLDB, returns readable part of memory (up to the end of region).
+            r = self.target.image.find_region(address)
+            if r is not None:
+                start, region = r
+                data = bytes(region[address - start:address - start + size])
+        if data is None:
+            error.SetErrorString("memory read failed for 0x{:x}".format(address))
+            return None
+        error.Clear()
+        return data
+
+    def ReadPointerFromMemory(self, address, error):
+        data = self.__read_exactly(address, self.target.pointer_size, error)
+        if data is None:
+            return LLDB_INVALID_ADDRESS
+        return int.from_bytes(data, "little")
+
+    def ReadUnsignedFromMemory(self, address, size, error):
+        data = self.__read_exactly(address, size, error)
+        if data is None:
+            return 0
+        return int.from_bytes(data, "little")
+
+    def __read_exactly(self, address, size, error):
+        data = self.read_memory(address, size)
+        if data is None:
+            error.SetErrorString("memory read failed for 0x{:x}".format(address))
+            return None
+        error.Clear()
+        return data
+
+    def ReadCStringFromMemory(self, address, max_size, error):
+        data = self.ReadMemory(address, max_size, error)
+        if data is None:
+            return None
+        return data.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+    def Continue(self):
+        """
+        Simulates resume and next stop (increments stop ID).
+        """
+        self.state = eStateRunning
+        self.stop_id += 1
+        self.natural_stop_id = self.stop_id
+        self.state = eStateStopped
+        return SBError()
+
+    def WriteMemory(self, address, data, error):
+        # Like LLDB, writing memory doesn't change stop ID.
+        r = self.target.image.find_region(address, len(data))
+        if r is None:
+            error.SetErrorString("memory write failed for 0x{:x}".format(address))
+            return 0
+        self.target.image.write(address, bytes(data))
+        error.Clear()
+        return len(data)
+
+    def run_expression(self, memory_writes=None):
+        """
+        Simulates expression evaluated in the target: process is resumed and stopped (expression stop),
+        expression can change memory (not counted as SB API call).
+
+        :param dict[int, bytes] memory_writes: Maps address to data written by expression.
+        """
+        self.state = eStateRunning
+        for address, data in (memory_writes or dict()).items():
+            self.target.image.write(address, data)
+        self.stop_id += 1
+        self.state = eStateStopped
+
+
+@_counted
+class SBTarget(object):
+    """
+    LLDB target backed by recorded memory image.
+
+    :param MemoryImage image: Memory image.
+    :param TypeTable type_table: Type table.
+    :param SBProcess process: Process.
+    :param int pointer_size: Pointer size.
+    """
+    def __init__(self, image, class_dump_manager=None):
+        """
+        :param MemoryImage image: Memory image.
+        :param class_dump.LazyClassDumpManager class_dump_manager: Class dump manager, by default builtin class dumps.
+        """
+        super(SBTarget, self).__init__()
+        self.image = image
+        if class_dump_manager is None:
+            class_dump_manager = get_builtin_class_dump_manager()
+        self.type_table = TypeTable(image.triple.split("-")[0], class_dump_manager)
+        self.pointer_size = self.type_table.pointer_size
+        self.process = SBProcess(self)
+
+    def create_pointer_value(self, name, address, type_name="id"):
+        """
+        Creates pointer value (with pointer stored as data) to object at given address.
+
+        :param str name: Value name.
+        :param int address: Object address.
+        :param str type_name: Pointer type name.
+        :rtype: SBValue
+        """
+        t = self.type_table.find_type(type_name)
+        data = address.to_bytes(self.pointer_size, "little")
+        return SBValue(self, name, t, data=data)
+
+    def IsValid(self):
+        return True
+
+    def __bool__(self):
+        return True
+
+    def GetTriple(self):
+        return self.image.triple
+
+    def GetProcess(self):
+        return self.process
+
+    def GetAddressByteSize(self):
+        return self.pointer_size
+
+    def GetByteOrder(self):
+        return eByteOrderLittle
+
+    def FindFirstType(self, type_name):
+        return self.type_table.find_type(type_name)
+
+    def GetBasicType(self, basic_type):
+        type_name = _BASIC_TYPE_NAMES.get(basic_type)
+        if type_name is None:
+            return SBType()
+        return self.type_table.find_type(type_name)
+
+    def CreateValueFromAddress(self, name, address, t):
+        return SBValue(self, name, t, address=address.GetLoadAddress(self))
+
+    def CreateValueFromData(self, name, data, t):
+        return SBValue(self, name, t, data=bytes(data.data))
+
+    def FindModule(self, file_spec):
+        version = self.image.modules.get(file_spec.GetFilename())
+        return SBModule(file_spec, version)
+
+    def FindSymbols(self, name, symbol_type=0):
+        # Recorded image doesn't contain symbols.
+        return SBSymbolContextList()
+
+    def FindVariable(self, name):
+        """
+        Returns recorded variable with given name (not LLDB API, there is no frame in recorded image).
+
+        :param str name: Variable name.
+        :rtype: SBValue
+        """
+        if name not in self.image.variables:
+            return SBValue()
+        type_name, address = self.image.variables[name]
+        return SBValue(self, name, self.type_table.find_type(type_name), address=address)
+
+
+@_counted
+class SBFileSpec(object):
+    """
+    LLDB file specification.
+
+    :param str path: File path.
+    """
+    def __init__(self, path=None, resolve=False):
+        super(SBFileSpec, self).__init__()
+        self.path = path
+
+    def IsValid(self):
+        return self.path is not None
+
+    def GetFilename(self):
+        return None if self.path is None else os.path.basename(self.path)
+
+
+@_counted
+class SBModule(object):
+    """
+    LLDB module. Recorded image stores only modules versions.
+
+    :param SBFileSpec file_spec: Module file specification.
+    :param list[int] version: Module version or None if module is not loaded.
+    """
+    def __init__(self, file_spec=None, version=None):
+        super(SBModule, self).__init__()
+        self.file_spec = file_spec
+        self.version = version
+
+    def IsValid(self):
+        return self.version is not None
+
+    def GetFileSpec(self):
+        return self.file_spec
+
+    def GetVersion(self):
+        return list(self.version) if self.version is not None else []
+
+
+@_counted
+class SBSymbolContextList(object):
+    """
+    List of symbol contexts. Always empty, recorded image doesn't contain symbols.
+    """
+    def IsValid(self):
+        return True
+
+    def GetSize(self):
+        return 0
+
+    def GetContextAtIndex(self, index):
+        raise IndexError(index)
+
+
+@_counted
+class SBExpressionOptions(object):
+    """
+    LLDB expression options. Options are ignored, recorded memory cannot run expressions.
+    """
+    def SetIgnoreBreakpoints(self, ignore=True):
+        pass
+
+    def SetLanguage(self, language):
+        pass
+
+    def SetTryAllThreads(self, run_others=True):
+        pass
+
+    def SetTimeoutInMicroSeconds(self, timeout=0):
+        pass
+
+    def SetUnwindOnError(self, unwind=True):
+        pass
+
+    def SetFetchDynamicValue(self, dynamic=eDynamicCanRunTarget):
+        pass
+
+    def SetCoerceResultToId(self, coerce=True):
+        pass
+
+
+@_counted
+class SBFrame(object):
+    """
+    LLDB frame. Expressions cannot be evaluated without live process, so they always fail.
+
+    :param SBThread thread: Thread.
+    """
+    def __init__(self, thread=None):
+        super(SBFrame, self).__init__()
+        self.thread = thread
+
+    def IsValid(self):
+        return self.thread is not None
+
+    def GetThread(self):
+        return self.thread
+
+    def EvaluateExpression(self, expression, options=None):
+        # Expressions are not evaluated, but they run in the target like in LLDB (expression stop).
+        if self.thread is not None:
+            self.thread.process.run_expression()
+        return SBValue()
+
+    def FindVariable(self, name):
+        if self.thread is None:
+            return SBValue()
+        return self.thread.process.target.FindVariable(name)
+
+    def GetValueForVariablePath(self, path, use_dynamic=eNoDynamicValues):
+        # Only names of recorded variables are supported (no member access).
+        value = self.FindVariable(path)
+        if value.IsValid() and use_dynamic != eNoDynamicValues:
+            value = value.GetDynamicValue(use_dynamic)
+        return value
+
+    def GetVariables(self, arguments, local_variables, statics, in_scope_only, use_dynamic=eNoDynamicValues):
+        # All recorded variables are locals of the only frame.
+        values = SBValueList()
+        if self.thread is None or not local_variables:
+            return values
+        target = self.thread.process.target
+        for name in sorted(target.image.variables):
+            value = target.FindVariable(name)
+            if use_dynamic != eNoDynamicValues:
+                value = value.GetDynamicValue(use_dynamic)
+            values.Append(value)
+        return values
+
+
+@_counted
+class SBValueList(object):
+    """
+    List of LLDB values.
+
+    :param list[SBValue] values: Values.
+    """
+    def __init__(self):
+        super(SBValueList, self).__init__()
+        self.values = list()
+
+    def IsValid(self):
+        return True
+
+    def GetSize(self):
+        return len(self.values)
+
+    def GetValueAtIndex(self, index):
+        if 0 <= index < len(self.values):
+            return self.values[index]
+        return SBValue()
+
+    def Append(self, value):
+        self.values.append(value)
+
+
+@_counted
+class SBThread(object):
+    """
+    LLDB thread.
+
+    :param SBProcess process: Process.
+    """
+    def __init__(self, process=None):
+        super(SBThread, self).__init__()
+        self.process = process
+
+    def IsValid(self):
+        return self.process is not None
+
+    def GetProcess(self):
+        return self.process
+
+    def GetSelectedFrame(self):
+        return SBFrame(self)
+
+    def GetFrameAtIndex(self, index):
+        return SBFrame(self) if index == 0 else SBFrame()
+
+
+@_counted
+class SBTypeNameSpecifier(object):
+    """
+    Name of type to which formatter is applied (regular expressions are not supported).
+
+    :param str name: Type name.
+    """
+    def __init__(self, name=None, is_regex=False):
+        super(SBTypeNameSpecifier, self).__init__()
+        self.name = name
+
+    def IsValid(self):
+        return self.name is not None
+
+    def GetName(self):
+        return self.name
+
+
+@_counted
+class SBTypeSummary(object):
+    """
+    Type summary, only summaries computed by Python function are supported.
+
+    :param str function_name: Full name of summary function.
+    """
+    def __init__(self, function_name=None):
+        super(SBTypeSummary, self).__init__()
+        self.function_name = function_name
+
+    @staticmethod
+    def CreateWithFunctionName(function_name, options=0):
+        return SBTypeSummary(function_name)
+
+    def IsValid(self):
+        return self.function_name is not None
+
+    def IsFunctionName(self):
+        return self.function_name is not None
+
+    def GetData(self):
+        return self.function_name
+
+
+@_counted
+class SBTypeCategory(object):
+    """
+    Category of type formatters.
+
+    :param dict[str, SBTypeSummary] summaries: Maps type name to summary.
+    """
+    def __init__(self):
+        super(SBTypeCategory, self).__init__()
+        self.summaries = dict()
+
+    def IsValid(self):
+        return True
+
+    def AddTypeSummary(self, type_name_specifier, type_summary):
+        self.summaries[type_name_specifier.GetName()] = type_summary
+        return True
+
+    def DeleteTypeSummary(self, type_name_specifier):
+        return self.summaries.pop(type_name_specifier.GetName(), None) is not None
+
+    def get_type_summary(self, type_name):
+        """
+        Returns summary of type or invalid summary.
+
+        :param str | None type_name: Type name.
+        :rtype: SBTypeSummary
+        """
+        return self.summaries.get(type_name) or SBTypeSummary()
+
+
+@_counted
+class SBDebugger(object):
+    """
+    LLDB debugger with one selected target.
+
+    :param SBTarget selected_target: Selected target.
+    :param SBTypeCategory default_category: Default category of type formatters.
+    """
+    def __init__(self):
+        super(SBDebugger, self).__init__()
+        self.selected_target = None
+        self.default_category = SBTypeCategory()
+
+    def GetSelectedTarget(self):
+        return self.selected_target
+
+    def SetSelectedTarget(self, target):
+        self.selected_target = target
+
+    def GetDefaultCategory(self):
+        return self.default_category
+
+
+# Shared debugger (like `lldb.debugger` in LLDB script interpreter).
+debugger = SBDebugger()
+
+
+class MemoryImageBuilder(object):
+    """
+    Builds synthetic memory images, e.g. for benchmarks. Objects layouts are taken from class dumps.
+
+    :param MemoryImage image: Built memory image.
+    :param TypeTable type_table: Type table.
+    :param int pointer_size: Pointer size.
+    :param bytearray heap: Heap region.
+    :param int heap_start: Heap start address.
+    :param dict[str, int] class_addresses: Maps class name to fake isa address.
+    """
+    # Foundation version of built images (iOS 8, like builtin class dumps).
+    DEFAULT_FOUNDATION_VERSION = 1140
+    # Page size of built images.
+    PAGE_SIZE = 4096
+
+    def __init__(self, architecture_name="x86_64", class_dump_manager=None,
+                 foundation_version=DEFAULT_FOUNDATION_VERSION):
+        """
+        :param str architecture_name: Architecture name.
+        :param class_dump.LazyClassDumpManager class_dump_manager: Class dump manager, by default builtin class dumps.
+        :param int foundation_version: Foundation version, it determines layouts of collections.
+        """
+        super(MemoryImageBuilder, self).__init__()
+        if class_dump_manager is None:
+            class_dump_manager = get_builtin_class_dump_manager()
+        self.image = MemoryImage("{}-apple-ios".format(architecture_name))
+        self.image.modules["Foundation"] = [foundation_version]
+        self.type_table = TypeTable(architecture_name, class_dump_manager)
+        self.pointer_size = self.type_table.pointer_size
+        self.heap_start = 0x100000000 if self.pointer_size == 8 else 0x10000000
+        self.heap = self.image.add_region(self.heap_start, b"")
+        self.class_addresses = dict()
+
+    def allocate(self, size, alignment=16):
+        """
+        Allocates zeroed memory on heap.
+
+        :param int size: Number of bytes.
+        :param int alignment: Alignment.
+        :return: Address of allocated memory.
+        :rtype: int
+        """
+        padding = -len(self.heap) % alignment
+        address = self.heap_start + len(self.heap) + padding
+        self.heap.extend(b"\0" * (padding + max(size, 1)))
+        return address
+
+    def write_value(self, address, type_name, value):
+        """
+        Writes value of given type. Structures can be written using tuples or dictionaries.
+
+        :param int address: Address.
+        :param str type_name: Type name.
+        :param int | float | tuple | list | dict | None value: Value.
+        """
+        t = self.type_table.find_type(type_name)
+        self.__write_value(address, t, value)
+
+    def __write_value(self, address, t, value):
+        """
+        :param int address: Address.
+        :param SBType t: Type.
+        :param int | float | tuple | list | dict | None value: Value.
+        """
+        if value is None:
+            return
+        if t.kind == "pointer":
+            self.image.write(address, (value & ((1 << (8 * self.pointer_size)) - 1)).to_bytes(self.pointer_size, "little"))
+        elif t.kind == "basic" and t.fmt:
+            self.image.write(address, struct.pack("<" + t.fmt, value))
+        elif t.kind == "struct":
+            if isinstance(value, dict):
+                values = [value.get(f.name) for f in t.fields]
+            elif len(value) == len(t.fields):
+                values = list(value)
+            else:
+                # Flat list of scalars, e.g. (x, y, width, height) for CGRect.
+                self.__write_scalars(address, t, iter(value))
+                return
+            for field, field_value in zip(t.fields, values):
+                self.__write_value(address + field.offset, field.type, field_value)
+        elif isinstance(value, (bytes, bytearray)):
+            self.image.write(address, bytes(value))
+        else:
+            raise ValueError("Cannot write value of type {}.".format(t.name))
+
+    def __write_scalars(self, address, t, values):
+        """
+        Writes structure from flat list of scalars.
+
+        :param int address: Address.
+        :param SBType t: Structure type.
+        :param iterator values: Scalar values.
+        """
+        for field in t.fields:
+            if field.type.kind == "struct":
+                self.__write_scalars(address + field.offset, field.type, values)
+            else:
+                self.__write_value(address + field.offset, field.type, next(values))
+
+    def class_address(self, class_name):
+        """
+        Returns fake isa address for given class name.
+
+        :param str class_name: Class name.
+        :return: Class address.
+        :rtype: int
+        """
+        if class_name not in self.class_addresses:
+            address = self.allocate(self.pointer_size * 5)
+            self.class_addresses[class_name] = address
+            self.image.classes[address] = class_name
+        return self.class_addresses[class_name]
+
+    def new_object(self, class_name, ivars=None, size=None):
+        """
+        Creates new Objective-C object.
+
+        Ivars are given as dictionary which maps ivar name to value, or offset to tuple of type name and value.
+
+        :param str class_name: Class name.
+        :param dict[str | int, object] ivars: Ivars values.
+        :param int size: Object size (by default computed from class dumps).
+        :return: Object address.
+        :rtype: int
+        """
+        t = self.type_table.find_type(class_name)
+        if size is None:
+            size = t.size
+            # Ivars written at offsets.
+            for key, value in (ivars or dict()).items():
+                if not isinstance(key, str):
+                    size = max(size, key + self.type_table.find_type(value[0]).size)
+        address = self.allocate(max(size, self.pointer_size))
+        self.write_value(address, "Class", self.class_address(class_name))
+
+        for key, value in (ivars or dict()).items():
+            if isinstance(key, str):
+                fields = [f for f in t.fields if f.name == key]
+                if len(fields) == 0:
+                    raise ValueError("Class {} has no ivar {}.".format(class_name, key))
+                self.__write_value(address + fields[0].offset, fields[0].type, value)
+            else:
+                self.write_value(address + key, value[0], value[1])
+        return address
+
+    def new_struct(self, type_name, value):
+        """
+        Creates new structure on heap.
+
+        :param str type_name: Structure type name.
+        :param tuple | list | dict value: Structure value.
+        :return: Structure address.
+        :rtype: int
+        """
+        t = self.type_table.find_type(type_name)
+        address = self.allocate(t.size)
+        self.__write_value(address, t, value)
+        return address
+
+    def new_string(self, text, class_name="__NSCFString"):
+        """
+        Creates new string object with CFString layout. `__NSCFConstantString` stores contents out-of-line,
+        other classes inline. Its summary is also recorded like returned by LLDB NSString formatter.
+
+        :param str text: String content.
+        :param str class_name: String class name.
+        :return: String address.
+        :rtype: int
+        """
+        # CFString info bits: 0x08 - null byte, 0x10 - unicode, 0x40 - not inline contents.
+        is_ascii = all(ord(c) < 0x80 for c in text)
+        contents = text.encode("ascii") + b"\0" if is_ascii else text.encode("utf-16-le")
+        length = len(contents) - 1 if is_ascii else len(contents) // 2
+        info = 0x08 if is_ascii else 0x10
+        base_size = 2 * self.pointer_size if self.pointer_size == 8 else 8
+        pointer_format = "<Q" if self.pointer_size == 8 else "<I"
+
+        if class_name == "__NSCFConstantString":
+            address = self.new_object(class_name, size=base_size + 2 * self.pointer_size)
+            contents_address = self.allocate(len(contents))
+            self.image.write(contents_address, contents)
+            self.image.write(address + self.pointer_size, struct.pack("<I", 0x700 | 0x40 | 0x80 | info))
+            self.image.write(address + base_size, struct.pack(pointer_format, contents_address))
+            self.image.write(address + base_size + self.pointer_size, struct.pack(pointer_format, length))
+        else:
+            address = self.new_object(class_name, size=base_size + self.pointer_size + len(contents))
+            self.image.write(address + self.pointer_size, struct.pack("<I", info))
+            self.image.write(address + base_size, struct.pack(pointer_format, length))
+            self.image.write(address + base_size + self.pointer_size, contents)
+        self.set_summary(address, "@\"{}\"".format(text))
+        self.set_description(address, text)
+        return address
+
+    def new_url(self, text, base_url=None):
+        """
+        Creates new NSURL (CFURL layout with string and base URL). Its summary and description are also recorded.
+
+        :param str text: URL string.
+        :param int base_url: Base URL address.
+        :return: URL address.
+        :rtype: int
+        """
+        offset = 2 * self.pointer_size + 8
+        address = self.new_object("NSURL", {offset: ("NSString *", self.new_string(text)),
+                                            offset + self.pointer_size: ("NSURL *", base_url)})
+        self.set_summary(address, "@\"{}\"".format(text))
+        self.set_description(address, text)
+        return address
+
+    def new_tagged_pointer(self, class_name, tag_index, payload):
+        """
+        Creates new tagged pointer (not obfuscated, with classic layout).
+
+        :param str class_name: Class name reported for tagged pointer.
+        :param int tag_index: Tag index.
+        :param int payload: Payload.
+        :return: Tagged pointer.
+        :rtype: int
+        """
+        # Imported here, decoder requires `lldb` module (this module installed as `lldb`).
+        from . import tagged_pointer
+        pointer = tagged_pointer.make_tagged_pointer(payload, tag_index, self.type_table.architecture_name)
+        self.image.tagged_pointers[pointer] = class_name
+        return pointer
+
+    def new_number(self, value, tagged=False):
+        """
+        Creates new NSNumber (tagged pointer or __NSCFNumber with long long or double value).
+
+        :param int | float value: Number value.
+        :param bool tagged: Creates tagged pointer (only integers on 64-bit architectures).
+        :return: Number address.
+        :rtype: int
+        """
+        from . import tagged_pointer
+        if tagged:
+            # Type code 3: long.
+            return self.new_tagged_pointer("__NSCFNumber", tagged_pointer.TAG_NSNUMBER, (value << 4) | 3)
+
+        base_size = 2 * self.pointer_size
+        address = self.new_object("__NSCFNumber", size=base_size + 8)
+        # CFNumber canonical types: 4 - SInt64, 6 - Float64.
+        if isinstance(value, float):
+            self.image.write(address + self.pointer_size, bytes([6]))
+            self.image.write(address + base_size, struct.pack("<d", value))
+        else:
+            self.image.write(address + self.pointer_size, bytes([4]))
+            self.image.write(address + base_size, struct.pack("<q", value))
+        return address
+
+    def new_date(self, time_interval, tagged=False):
+        """
+        Creates new NSDate (tagged pointer or __NSDate).
+
+        :param float time_interval: Time interval since reference date.
+        :param bool tagged: Creates tagged pointer with classic encoding (only on 64-bit architectures).
+        :return: Date address.
+        :rtype: int
+        """
+        from . import tagged_pointer
+        bits = struct.unpack("<Q", struct.pack("<d", time_interval))[0]
+        if tagged:
+            # Classic encoding drops the lowest 4 bits of double.
+            return self.new_tagged_pointer("__NSDate", tagged_pointer.TAG_NSDATE, bits >> 4)
+
+        address = self.new_object("__NSDate", size=self.pointer_size + 8)
+        self.image.write(address + self.pointer_size, struct.pack("<d", time_interval))
+        return address
+
+    def new_collection(self, class_name, elements):
+        """
+        Creates new collection object (like NSArray). Count is written like in Foundation collections, elements
+        of immutable arrays are also written to their storage (addresses of elements of other collections
+        are only recorded).
+
+        :param str class_name: Collection class name.
+        :param list[int] elements: Elements addresses.
+        :return: Collection address.
+        :rtype: int
+        """
+        # Imported here, decoder requires `lldb` module (this module installed as `lldb`).
+        from . import collection_decoder
+        decoder_class = collection_decoder.CollectionDecoder
+        storage = decoder_class.ARRAY_STORAGES.get(class_name)
+        size = self.pointer_size * 6
+        if storage is not None and storage[1]:
+            size = max(size, self.pointer_size * (storage[0] + len(elements)))
+        address = self.new_object(class_name, size=size)
+        version = self.image.modules["Foundation"][0]
+        for layout in decoder_class.LAYOUTS[self.pointer_size].get(class_name, list()):
+            if version >= layout.min_version:
+                self.image.write(address + layout.offset, len(elements).to_bytes(layout.size, "little"))
+                break
+        if storage is not None and len(elements) > 0:
+            offset, is_inline = storage
+            storage_address = address + offset * self.pointer_size
+            if not is_inline:
+                list_address = self.allocate(self.pointer_size * len(elements))
+                self.image.write(storage_address, list_address.to_bytes(self.pointer_size, "little"))
+                storage_address = list_address
+            pointer_format = "<{}{}".format(len(elements), "Q" if self.pointer_size == 8 else "I")
+            self.image.write(storage_address, struct.pack(pointer_format, *elements))
+        self.image.elements[address] = list(elements)
+        self.set_summary(address, "{} element{}".format(len(elements), "" if len(elements) == 1 else "s"))
+        return address
+
+    def set_summary(self, address, summary):
+        """
+        Records object summary.
+
+        :param int address: Object address.
+        :param str summary: Summary.
+        """
+        self.image.summaries[address] = summary
+
+    def set_description(self, address, description):
+        """
+        Records object description.
+
+        :param int address: Object address.
+        :param str description: Description.
+        """
+        self.image.descriptions[address] = description
+
+    def add_variable(self, name, type_name, value):
+        """
+        Adds variable (stored on fake stack) to image.
+
+        :param str name: Variable name.
+        :param str type_name: Variable type name, e.g. "UIView *".
+        :param int | float | tuple | dict value: Variable value.
+        :return: Variable address.
+        :rtype: int
+        """
+        t = self.type_table.find_type(type_name)
+        address = self.allocate(t.size)
+        self.__write_value(address, t, value)
+        self.image.variables[name] = (type_name, address)
+        return address
+
+    def build(self):
+        """
+        Returns built image. Heap is padded to page size, like memory of real process.
+
+        :return: Memory image.
+        :rtype: MemoryImage
+        """
+        self.heap.extend(b"\0" * (-len(self.heap) % self.PAGE_SIZE))
+        return self.image
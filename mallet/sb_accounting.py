@@ -0,0 +1,281 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import sys
+import collections
+import logging
+import threading
+import lldb
+
+
+class _AccountingState(threading.local):
+    """
+    State of SB API calls made by current thread.
+
+    :param int call_depth: Number of nested wrapped methods being called.
+    """
+    def __init__(self):
+        super(_AccountingState, self).__init__()
+        self.call_depth = 0
+
+
+class SBAccounting(object):
+    """
+    Opt-in SB API calls accounting. Wraps public methods of `lldb.SBValue`, `lldb.SBProcess` and `lldb.SBTarget`,
+    counts calls per method and per provider class, and finds duplicated reads of the same address in one stop.
+
+    :param bool enabled: True if SB API methods are wrapped.
+    :param collections.Counter calls: Maps "SBClass.Method" to number of calls.
+    :param collections.Counter provider_calls: Maps (provider class name, "SBClass.Method") to number of calls.
+    :param collections.Counter duplicates: Maps (provider class name, "SBClass.Method") to number of duplicated reads.
+    :param collections.Counter duplicated_addresses: Maps ("SBClass.Method", address) to number of duplicated reads.
+    :param tuple stop: Current stop, process unique ID and stop ID.
+    :param set reads: Reads made in current stop.
+    :param _AccountingState state: State of SB API calls made by current thread.
+    :param threading.Lock lock: Lock of counters and reads (SB API can be called by several threads).
+    """
+    __WRAPPED_CLASSES = ["SBValue", "SBProcess", "SBTarget"]
+    # Methods which reads memory, reads are identified by value address, value type and arguments.
+    __READ_METHODS = {"SBValue.GetValue",
+                      "SBValue.GetValueAsSigned",
+                      "SBValue.GetValueAsUnsigned",
+                      "SBValue.GetSummary",
+                      "SBValue.GetObjectDescription",
+                      "SBValue.GetData",
+                      "SBValue.GetNumChildren",
+                      "SBValue.GetChildAtIndex",
+                      "SBValue.GetChildMemberWithName",
+                      "SBValue.GetDynamicValue",
+                      "SBValue.CreateChildAtOffset",
+                      "SBValue.Dereference",
+                      "SBProcess.ReadMemory",
+                      "SBProcess.ReadPointerFromMemory",
+                      "SBProcess.ReadUnsignedFromMemory",
+                      "SBProcess.ReadCStringFromMemory"}
+    # Provider which made call outside of any provider.
+    UNKNOWN_PROVIDER = "<none>"
+
+    def __init__(self):
+        super(SBAccounting, self).__init__()
+        self.enabled = False
+        self.calls = collections.Counter()
+        self.provider_calls = collections.Counter()
+        self.duplicates = collections.Counter()
+        self.duplicated_addresses = collections.Counter()
+        self.stop = None
+        self.reads = set()
+        self.state = _AccountingState()
+        self.lock = threading.Lock()
+
+    def enable(self):
+        """
+        Wraps SB API methods.
+        """
+        logger = logging.getLogger(__name__)
+        for class_name in self.__WRAPPED_CLASSES:
+            cls = getattr(lldb, class_name)
+            for name, method in list(vars(cls).items()):
+                if not name[:1].isupper() or not callable(method):
+                    continue
+                # Method could be wrapped by previously loaded module.
+                method = getattr(method, "__sb_accounting_wrapped__", method)
+                setattr(cls, name, self.__wrap("{}.{}".format(class_name, name), method))
+        self.enabled = True
+        logger.debug("SB API accounting enabled.")
+
+    def disable(self):
+        """
+        Restores original SB API methods.
+        """
+        logger = logging.getLogger(__name__)
+        for class_name in self.__WRAPPED_CLASSES:
+            cls = getattr(lldb, class_name)
+            for name, method in list(vars(cls).items()):
+                if hasattr(method, "__sb_accounting_wrapped__"):
+                    setattr(cls, name, method.__sb_accounting_wrapped__)
+        self.enabled = False
+        logger.debug("SB API accounting disabled.")
+
+    def reset(self):
+        """
+        Resets collected statistics.
+        """
+        with self.lock:
+            self.calls.clear()
+            self.provider_calls.clear()
+            self.duplicates.clear()
+            self.duplicated_addresses.clear()
+            self.stop = None
+            self.reads = set()
+
+    def __wrap(self, key, method):
+        """
+        Returns wrapped SB API method.
+
+        :param str key: Method key, "SBClass.Method".
+        :param function method: Original method.
+        :rtype: function
+        """
+        is_read = key in self.__READ_METHODS
+
+        def accounted_method(sb_object, *args, **kwargs):
+            # Calls made by wrapped methods (and by accounting) are not counted.
+            state = self.state
+            if state.call_depth == 0:
+                state.call_depth += 1
+                try:
+                    self.__account(key, sb_object, args, is_read)
+                finally:
+                    state.call_depth -= 1
+            state.call_depth += 1
+            try:
+                return method(sb_object, *args, **kwargs)
+            finally:
+                state.call_depth -= 1
+
+        accounted_method.__name__ = method.__name__
+        accounted_method.__doc__ = method.__doc__
+        accounted_method.__sb_accounting_wrapped__ = method
+        return accounted_method
+
+    def __account(self, key, sb_object, args, is_read):
+        """
+        Counts SB API call.
+
+        :param str key: Method key, "SBClass.Method".
+        :param lldb.SBValue | lldb.SBProcess | lldb.SBTarget sb_object: Called object.
+        :param tuple args: Call arguments.
+        :param bool is_read: True if method reads memory.
+        """
+        provider_name = self.__get_provider_name()
+        with self.lock:
+            self.calls[key] += 1
+            self.provider_calls[(provider_name, key)] += 1
+        if not is_read:
+            return
+
+        # Reads are grouped by stops.
+        if isinstance(sb_object, lldb.SBProcess):
+            process = sb_object
+            address = args[0] if args else None
+            read = (key, address) + tuple(a for a in args[1:] if isinstance(a, int))
+        else:
+            process = sb_object.GetProcess()
+            address = sb_object.GetLoadAddress()
+            read = (key, address, sb_object.GetTypeName()) + tuple(a for a in args if isinstance(a, (int, str)))
+        stop = (process.GetUniqueID(), process.GetStopID(True)) if process else None
+        with self.lock:
+            if stop != self.stop:
+                self.stop = stop
+                self.reads = set()
+
+            if read in self.reads:
+                self.duplicates[(provider_name, key)] += 1
+                self.duplicated_addresses[(key, address)] += 1
+            else:
+                self.reads.add(read)
+
+    def __get_provider_name(self):
+        """
+        Returns class name of the innermost provider on the call stack.
+
+        :return: Provider class name.
+        :rtype: str
+        """
+        from .common import SummaryBase
+        frame = sys._getframe(2)
+        while frame is not None:
+            obj = frame.f_locals.get("self")
+            if isinstance(obj, SummaryBase.SummaryBaseSyntheticProvider):
+                return obj.__class__.__name__
+            frame = frame.f_back
+        return self.UNKNOWN_PROVIDER
+
+    def report(self, limit=10):
+        """
+        Returns report with the worst offenders.
+
+        :param int limit: Number of rows in every section.
+        :return: Report.
+        :rtype: str
+        """
+        # Counters are copied, other threads can count calls while report is created.
+        with self.lock:
+            calls = self.calls.copy()
+            provider_calls = self.provider_calls.copy()
+            duplicates = self.duplicates.copy()
+            duplicated_addresses = self.duplicated_addresses.copy()
+
+        lines = list()
+        if not self.enabled:
+            lines.append("SB API accounting is disabled.")
+        lines.append("Total SB API calls: {}, duplicated reads: {}.".format(sum(calls.values()),
+                                                                          sum(duplicates.values())))
+
+        providers = collections.Counter()
+        for (provider_name, _), count in provider_calls.items():
+            providers[provider_name] += count
+        provider_duplicates = collections.Counter()
+        for (provider_name, _), count in duplicates.items():
+            provider_duplicates[provider_name] += count
+
+        lines.append("")
+        lines.append("Providers by SB API calls:")
+        for provider_name, count in providers.most_common(limit):
+            lines.append("{:>8} {:>8} dup  {}".format(count, provider_duplicates[provider_name], provider_name))
+
+        lines.append("")
+        lines.append("Methods by SB API calls:")
+        for key, count in calls.most_common(limit):
+            lines.append("{:>8}  {}".format(count, key))
+
+        lines.append("")
+        lines.append("Duplicated reads by provider and method:")
+        for (provider_name, key), count in duplicates.most_common(limit):
+            lines.append("{:>8} / {:<8} {} {}".format(count, provider_calls[(provider_name, key)],
+                                                     provider_name, key))
+
+        lines.append("")
+        lines.append("Duplicated reads by address:")
+        for (key, address), count in duplicated_addresses.most_common(limit):
+            address = "0x{:x}".format(address) if isinstance(address, int) else address
+            lines.append("{:>8}  {} {}".format(count, address, key))
+        return "\n".join(lines)
+
+
+__shared_sb_accounting = None
+""":type: SBAccounting"""
+
+
+def get_sb_accounting():
+    """
+    Returns shared SBAccounting.
+
+    :return: SBAccounting singleton.
+    :rtype: SBAccounting
+    """
+    global __shared_sb_accounting
+    if __shared_sb_accounting is None:
+        __shared_sb_accounting = SBAccounting()
+    return __shared_sb_accounting
@@ -0,0 +1,340 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import logging
+import struct
+from . import helpers
+from . import memory_cache
+from . import tagged_pointer
+
+
+class StringDecoder(object):
+    """
+    Decodes NSString / CFString objects directly from process memory.
+
+    Supports `__NSCFString` and `__NSCFConstantString` (inline and out-of-line CFString storage, 8-bit and UTF-16
+    contents) and tagged pointer strings (`NSTaggedPointerString`). Memory is read through shared memory cache.
+    Decoded strings are cached per process stop, so the same string is decoded once per stop.
+
+    :param int max_length: Maximal number of decoded characters, longer strings are truncated.
+    :param (int, int) | None stop_key: Process unique ID and stop ID (including expression stops) of cached strings.
+    :param dict[int, str] texts: Maps string address to its decoded content (for current stop).
+    :param dict[int, int] pointer_sizes: Maps process unique ID to pointer size.
+    """
+    DEFAULT_MAX_LENGTH = 1024
+    # Maximal number of cached strings (for one stop).
+    MAX_CACHE_SIZE = 4096
+
+    # Class names of strings backed by CFString structure.
+    CF_STRING_CLASS_NAMES = {"__NSCFString", "__NSCFConstantString", "NSCFString", "NSCFConstantString"}
+    TAGGED_POINTER_STRING_CLASS_NAME = "NSTaggedPointerString"
+
+    # CFString info bits (CFString.c).
+    __IS_MUTABLE_MASK = 0x01
+    __HAS_LENGTH_BYTE_MASK = 0x04
+    __HAS_LENGTH_BYTE = 0x04
+    __IS_UNICODE_MASK = 0x10
+    __CONTENTS_MASK = 0x60
+    __HAS_INLINE_CONTENTS = 0x00
+
+    # Characters escaped by LLDB string printer.
+    __ESCAPED_CHARACTERS = {"\0": "\\0", "\a": "\\a", "\b": "\\b", "\f": "\\f", "\n": "\\n", "\r": "\\r",
+                            "\t": "\\t", "\v": "\\v", "\"": "\\\"", "\\": "\\\\"}
+
+    # Alphabet of 6-bit and 5-bit encoded tagged pointer strings (Foundation).
+    __TAGGED_POINTER_ALPHABET = "eilotrm.apdnsIc ufkMShjTRxgC4013bDNvwyUL2O856P-B79AFKEWV_zGJ/HYX"
+
+    def __init__(self):
+        super(StringDecoder, self).__init__()
+        self.max_length = self.DEFAULT_MAX_LENGTH
+        self.stop_key = None
+        self.texts = dict()
+        self.pointer_sizes = dict()
+
+    def clean_cache(self):
+        """
+        Cleans cached strings and process information.
+        """
+        self.stop_key = None
+        self.texts = dict()
+        self.pointer_sizes = dict()
+
+    def get_summary(self, obj, class_name=None):
+        """
+        Returns summary of string object in the same format as LLDB NSString formatter (@"...").
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to string).
+        :param str class_name: Class name of the value if already known.
+        :return: String summary or None if value is not supported string or cannot be decoded.
+        :rtype: str | None
+        """
+        text = self.__get_decoded_text(obj, class_name)
+        return None if text is None else self.__format_summary(text)
+
+    def get_text(self, obj, class_name=None):
+        """
+        Returns content of string object (without quotes and escaping, truncated to `max_length` characters).
+
+        :param lldb.SBValue obj: LLDB value object (dynamic value of pointer to string).
+        :param str class_name: Class name of the value if already known.
+        :return: String content or None if value is not supported string or cannot be decoded.
+        :rtype: str | None
+        """
+        text = self.__get_decoded_text(obj, class_name)
+        return None if text is None else self.__truncate(text)
+
+    def get_text_at_address(self, process, address):
+        """
+        Returns content of string at given address (e.g. CFStringRef field of other object).
+
+        Address is treated as tagged pointer string if it has tag bit set, otherwise as CFString.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: String address.
+        :return: String content or None.
+        :rtype: str | None
+        """
+        if address == 0:
+            return None
+        text = self.__decode_text(process, address, tagged_pointer.could_be_tagged_pointer(address))
+        return None if text is None else self.__truncate(text)
+
+    def __get_decoded_text(self, obj, class_name):
+        """
+        Returns decoded (not truncated) content of string object.
+
+        :param lldb.SBValue obj: LLDB value object.
+        :param str | None class_name: Class name of the value if already known.
+        :rtype: str | None
+        """
+        if class_name is None:
+            class_name = helpers.get_pointer_class_name(obj)
+        is_tagged_pointer = class_name == self.TAGGED_POINTER_STRING_CLASS_NAME
+        if not is_tagged_pointer and class_name not in self.CF_STRING_CLASS_NAMES:
+            return None
+
+        address = obj.GetValueAsUnsigned()
+        if address == 0:
+            return None
+        return self.__decode_text(obj.GetProcess(), address, is_tagged_pointer)
+
+    def __decode_text(self, process, address, is_tagged_pointer):
+        """
+        Decodes string content (at most max_length + 1 characters), results are cached per stop.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: String address.
+        :param bool is_tagged_pointer: True if string is tagged pointer.
+        :rtype: str | None
+        """
+        stop_key = memory_cache.get_stop_key(process)
+        process_id = stop_key[0]
+        # Local reference, other thread can replace texts of previous stop in the meantime.
+        texts = self.texts
+        if stop_key != self.stop_key or len(texts) >= self.MAX_CACHE_SIZE:
+            texts = dict()
+            self.texts = texts
+            self.stop_key = stop_key
+
+        # Recorded summaries (incremental mode) need memory reads of the string, so cached text isn't used.
+        text = texts.get(address)
+        if text is not None and not memory_cache.get_memory_cache().recorders:
+            return text
+
+        if is_tagged_pointer:
+            text = self.__decode_tagged_pointer_string(process, address)
+        else:
+            pointer_size = self.pointer_sizes.get(process_id)
+            if pointer_size is None:
+                pointer_size = process.GetAddressByteSize()
+                self.pointer_sizes[process_id] = pointer_size
+            text = self.__decode_cf_string(process, address, pointer_size)
+        if text is None:
+            logger = logging.getLogger(__name__)
+            logger.debug("Cannot decode string at 0x%x.", address)
+            return None
+
+        texts[address] = text
+        return text
+
+    def __truncate(self, text):
+        """
+        Truncates text to max_length characters (adding ellipsis).
+
+        :param str text: Decoded text.
+        :rtype: str
+        """
+        if len(text) > self.max_length:
+            return text[:self.max_length] + "..."
+        return text
+
+    def __format_summary(self, text):
+        """
+        Formats decoded text like LLDB NSString formatter, escaping non printable characters.
+
+        :param str text: Decoded text (at most max_length + 1 characters).
+        :return: String summary.
+        :rtype: str
+        """
+        truncated = len(text) > self.max_length
+        if truncated:
+            text = text[:self.max_length]
+        if not text.isprintable() or "\"" in text or "\\" in text:
+            text = "".join(self.__escape_character(c) for c in text)
+        return "@\"{}{}\"".format(text, "..." if truncated else "")
+
+    @classmethod
+    def __escape_character(cls, character):
+        """
+        Returns escaped character.
+
+        :param str character: Character.
+        :rtype: str
+        """
+        escaped = cls.__ESCAPED_CHARACTERS.get(character)
+        if escaped is not None:
+            return escaped
+        if not character.isprintable():
+            return "\\x{:02x}".format(ord(character)) if ord(character) < 0x100 else "\\u{:04x}".format(ord(character))
+        return character
+
+    def __decode_cf_string(self, process, address, pointer_size):
+        """
+        Decodes CFString structure (used by __NSCFString and __NSCFConstantString).
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: String address.
+        :param int pointer_size: Pointer size.
+        :return: Decoded text or None.
+        :rtype: str | None
+        """
+        pointer_format = "<Q" if pointer_size == 8 else "<I"
+        # CFRuntimeBase: isa, info (4 bytes) and retain count (4 bytes on 64-bit) followed by two variant fields.
+        base_size = 2 * pointer_size if pointer_size == 8 else 8
+        header_size = base_size + 2 * pointer_size
+
+        cache = memory_cache.get_memory_cache()
+        data = cache.read(process, address, header_size)
+        if data is None:
+            return None
+
+        info = bytearray(data[pointer_size:pointer_size + 1])[0]
+        field0 = struct.unpack_from(pointer_format, data, base_size)[0]
+        field1 = struct.unpack_from(pointer_format, data, base_size + pointer_size)[0]
+        is_unicode = info & self.__IS_UNICODE_MASK != 0
+        has_length_byte = info & self.__HAS_LENGTH_BYTE_MASK != 0
+        has_explicit_length = info & (self.__IS_MUTABLE_MASK | self.__HAS_LENGTH_BYTE_MASK) != self.__HAS_LENGTH_BYTE
+        is_inline = info & self.__CONTENTS_MASK == self.__HAS_INLINE_CONTENTS
+
+        # Contents address and length.
+        if is_inline:
+            length = field0 if has_explicit_length else None
+            contents_address = address + base_size + (pointer_size if has_explicit_length else 0)
+        else:
+            length = field1 if has_explicit_length else None
+            contents_address = field0
+        if contents_address == 0:
+            return None
+
+        # Length byte (Pascal strings).
+        if not is_unicode and has_length_byte:
+            if length is None:
+                length = cache.read_unsigned(process, contents_address, 1)
+                if length is None:
+                    return None
+            contents_address += 1
+        if length is None or length < 0 or length >= 1 << 31:
+            return None
+
+        # Reads one character more than maximal length to detect truncation.
+        character_size = 2 if is_unicode else 1
+        contents = cache.read(process, contents_address, min(length, self.max_length + 1) * character_size)
+        if contents is None:
+            return None
+
+        if is_unicode:
+            return contents.decode("utf-16-le", "replace")
+        # Default 8-bit encoding of CoreFoundation on Darwin.
+        return contents.decode("mac_roman", "replace")
+
+    def __decode_tagged_pointer_string(self, process, address):
+        """
+        Decodes tagged pointer string (NSTaggedPointerString).
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int address: Tagged pointer.
+        :return: Decoded text or None.
+        :rtype: str | None
+        """
+        payload = tagged_pointer.get_tagged_pointers().get_payload(process, address)
+        return self.decode_tagged_pointer_payload(payload)
+
+    @classmethod
+    def decode_tagged_pointer_payload(cls, payload):
+        """
+        Decodes characters stored in tagged pointer string payload.
+
+        Lowest 4 bits store length. Strings up to 7 characters are stored as 8-bit characters, up to 9 characters
+        as 6-bit and up to 11 characters as 5-bit indexes in alphabet of most common characters.
+
+        :param int | None payload: Tagged pointer payload.
+        :return: Decoded text or None.
+        :rtype: str | None
+        """
+        if payload is None:
+            return None
+        length = payload & 0xf
+        data = payload >> 4
+        if length <= 7:
+            return data.to_bytes(8, "little")[:length].decode("mac_roman", "replace")
+        if length <= 9:
+            bits = 6
+        elif length <= 11:
+            bits = 5
+        else:
+            return None
+
+        mask = (1 << bits) - 1
+        characters = []
+        for _ in range(length):
+            characters.append(cls.__TAGGED_POINTER_ALPHABET[data & mask])
+            data >>= bits
+        return "".join(reversed(characters))
+
+
+__shared_string_decoder = None
+""":type: StringDecoder"""
+
+
+def get_string_decoder():
+    """
+    Returns shared StringDecoder.
+
+    :return: StringDecoder singleton.
+    :rtype: StringDecoder
+    """
+    global __shared_string_decoder
+    if __shared_string_decoder is None:
+        __shared_string_decoder = StringDecoder()
+    return __shared_string_decoder
@@ -0,0 +1,157 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import threading
+import time
+
+
+class _BudgetState(threading.local):
+    """
+    State of summary computed by current thread.
+
+    :param float | None deadline: Deadline of current summary (`time.perf_counter` time).
+    :param int depth: Number of nested summaries being computed.
+    :param bool exceeded: True if budget of current (or last) summary was exceeded.
+    """
+    def __init__(self):
+        super(_BudgetState, self).__init__()
+        self.deadline = None
+        self.depth = 0
+        self.exceeded = False
+
+
+class SummaryBudget(object):
+    """
+    Time budget of one (top level) summary. Nested summaries share the deadline of the outermost summary.
+
+    When budget is exceeded, providers stop computing child summaries and child providers (they return None),
+    so summary contains only parts computed so far followed by `ELLIPSIS`.
+
+    Budget is shared, deadline, depth and exceeded flag are kept per thread, so summaries computed in parallel
+    have independent deadlines.
+
+    :param float | None budget: Budget in seconds (None if summaries are not limited).
+    :param _BudgetState state: State of summary computed by current thread.
+    """
+    DEFAULT_BUDGET = 0.25
+    # Marker appended to summaries which were not computed completely.
+    ELLIPSIS = "..."
+
+    def __init__(self):
+        super(SummaryBudget, self).__init__()
+        self.budget = self.DEFAULT_BUDGET
+        self.state = _BudgetState()
+
+    @property
+    def deadline(self):
+        """
+        Deadline of current summary (`time.perf_counter` time).
+
+        :rtype: float | None
+        """
+        return self.state.deadline
+
+    @property
+    def depth(self):
+        """
+        Number of nested summaries being computed.
+
+        :rtype: int
+        """
+        return self.state.depth
+
+    @property
+    def exceeded(self):
+        """
+        True if budget of current (or last) summary was exceeded.
+
+        :rtype: bool
+        """
+        return self.state.exceeded
+
+    def clear(self):
+        """
+        Clears exceeded flag of last summary. Flag is not cleared while summary is computed, nested summaries share
+        it with the outermost summary.
+        """
+        state = self.state
+        if state.depth == 0:
+            state.exceeded = False
+
+    def enter(self):
+        """
+        Starts computing summary. Outermost summary sets the deadline.
+
+        :return: True if it is the outermost summary.
+        :rtype: bool
+        """
+        state = self.state
+        state.depth += 1
+        if state.depth > 1:
+            return False
+        state.exceeded = False
+        state.deadline = None if self.budget is None else time.perf_counter() + self.budget
+        return True
+
+    def leave(self):
+        """
+        Finishes computing summary.
+        """
+        state = self.state
+        state.depth = max(state.depth - 1, 0)
+        if state.depth == 0:
+            state.deadline = None
+
+    def is_exceeded(self):
+        """
+        Checks if budget of current summary is exceeded.
+
+        :return: True if budget is exceeded (always False outside of summary).
+        :rtype: bool
+        """
+        state = self.state
+        if state.depth == 0:
+            return False
+        if state.exceeded:
+            return True
+        if state.deadline is not None and time.perf_counter() > state.deadline:
+            state.exceeded = True
+        return state.exceeded
+
+
+__shared_summary_budget = None
+""":type: SummaryBudget"""
+
+
+def get_summary_budget():
+    """
+    Returns shared SummaryBudget.
+
+    :return: SummaryBudget singleton.
+    :rtype: SummaryBudget
+    """
+    global __shared_summary_budget
+    if __shared_summary_budget is None:
+        __shared_summary_budget = SummaryBudget()
+    return __shared_summary_budget
@@ -0,0 +1,183 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import collections
+import threading
+from . import memory_cache
+
+
+class SummaryCache(object):
+    """
+    Reuses summaries of objects which didn't change since previous stop (incremental mode).
+
+    While summary is computed, memory reads made through the shared memory cache are recorded (providers record
+    memory of their objects, nested providers and decoders record memory they read). Summary is stored per object
+    address together with list of these ranges and hash of their content. Before stored summary is returned its ranges
+    are hashed again (usually with few coalesced reads from memory cache, which is dropped at the next stop and after
+    expressions evaluated in the target) and if the hash didn't change the previous summary is returned without
+    creating any provider. Summaries which depend on memory read bypassing the cache (LLDB formatters, code run
+    in the target) are not stored. Entries are changed under lock, memory is hashed outside of it.
+
+    :param bool enabled: True if summaries are reused.
+    :param collections.OrderedDict[(int, str, int), SummaryEntry] entries: Maps process unique ID, provider class
+        name and object address to stored summary (least recently used first).
+    :param int hits: Number of reused summaries (since last `clean_cache`).
+    :param int misses: Number of computed summaries (since last `clean_cache`).
+    :param threading.Lock lock: Lock of entries and statistics.
+    """
+    # Maximal number of stored summaries.
+    MAX_ENTRIES = 4096
+
+    def __init__(self):
+        super(SummaryCache, self).__init__()
+        self.enabled = False
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def clean_cache(self):
+        """
+        Drops stored summaries and statistics.
+        """
+        with self.lock:
+            self.entries = collections.OrderedDict()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def get_key(value_obj, provider_class):
+        """
+        Returns key of stored summary: process unique ID, provider class name and object address.
+
+        :param lldb.SBValue value_obj: LLDB value object.
+        :param class provider_class: Summary provider class.
+        :return: Key or None if value has no address (e.g. structure in registers).
+        :rtype: (int, str, int) | None
+        """
+        if value_obj.TypeIsPointerType():
+            address = value_obj.GetValueAsUnsigned()
+        else:
+            address = value_obj.GetLoadAddress()
+        if address == 0 or address == lldb.LLDB_INVALID_ADDRESS:
+            return None
+        return value_obj.GetProcess().GetUniqueID(), provider_class.__name__, address
+
+    @staticmethod
+    def __get_digest(process, ranges):
+        """
+        Returns hash of memory content of given ranges.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param list[(int, int)] ranges: List of start address and size.
+        :return: Hash of memory.
+        :rtype: int
+        """
+        cache = memory_cache.get_memory_cache()
+        cache.prefetch(process, ranges)
+        return hash(tuple(cache.read(process, address, size) for address, size in ranges))
+
+    def get_summary(self, process, key):
+        """
+        Returns stored summary if memory it depends on didn't change.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param (int, str, int) key: Summary key (see `get_key`).
+        :return: Stored summary or None.
+        :rtype: str | None
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        digest = self.__get_digest(process, entry.dependencies)
+        with self.lock:
+            if digest != entry.digest:
+                if self.entries.get(key) is entry:
+                    del self.entries[key]
+                return None
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            self.hits += 1
+        return entry.summary
+
+    def store(self, process, key, recorder, summary):
+        """
+        Stores computed summary with memory ranges it depends on.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param (int, str, int) key: Summary key (see `get_key`).
+        :param memory_cache.ReadRecorder recorder: Memory reads recorded while summary was computed.
+        :param str | None summary: Computed summary.
+        """
+        with self.lock:
+            self.misses += 1
+        if summary is None or not recorder.complete:
+            return
+        dependencies = recorder.get_merged_ranges()
+        if len(dependencies) == 0:
+            return
+        entry = SummaryEntry(dependencies, self.__get_digest(process, dependencies), summary)
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.MAX_ENTRIES:
+                self.entries.popitem(last=False)
+
+
+class SummaryEntry(object):
+    """
+    Stored summary.
+
+    :param list[(int, int)] dependencies: Memory ranges (start address and size) summary depends on.
+    :param int digest: Hash of memory content of dependencies.
+    :param str summary: Summary.
+    """
+    def __init__(self, dependencies, digest, summary):
+        """
+        :param list[(int, int)] dependencies: Memory ranges summary depends on.
+        :param int digest: Hash of memory content of dependencies.
+        :param str summary: Summary.
+        """
+        super(SummaryEntry, self).__init__()
+        self.dependencies = dependencies
+        self.digest = digest
+        self.summary = summary
+
+
+__shared_summary_cache = None
+""":type: SummaryCache"""
+
+
+def get_summary_cache():
+    """
+    Returns shared SummaryCache.
+
+    :return: SummaryCache singleton.
+    :rtype: SummaryCache
+    """
+    global __shared_summary_cache
+    if __shared_summary_cache is None:
+        __shared_summary_cache = SummaryCache()
+    return __shared_summary_cache
@@ -0,0 +1,264 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import collections
+import logging
+import queue
+import threading
+import time
+from . import object_description
+from . import tracer
+
+
+class CancellationToken(object):
+    """
+    Cancellation token of prefetching in one stop. Token is cancelled explicitly (next stop, command) or when
+    process is resumed (process is not stopped or its stop ID changed). Stop ID includes expression stops,
+    so expression evaluated by LLDB (or another command) while prefetching also cancels the token.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param int stop_id: Process stop ID (including expression stops) of prefetched stop.
+    :param threading.Event event: Set when token is cancelled.
+    """
+    def __init__(self, process):
+        """
+        :param lldb.SBProcess process: LLDB process.
+        """
+        super(CancellationToken, self).__init__()
+        self.process = process
+        self.stop_id = process.GetStopID(True)
+        self.event = threading.Event()
+
+    def cancel(self):
+        """
+        Cancels prefetching.
+        """
+        self.event.set()
+
+    def is_cancelled(self):
+        """
+        Checks if prefetching was cancelled or process was resumed.
+
+        :return: True if prefetching should stop.
+        :rtype: bool
+        """
+        if self.event.is_set():
+            return True
+        if self.process.GetState() != lldb.eStateStopped or self.process.GetStopID(True) != self.stop_id:
+            self.event.set()
+            return True
+        return False
+
+
+class SummaryPrefetcher(object):
+    """
+    Computes summaries of variables of selected frame on background thread, right after process stops.
+
+    Stop hook (`mallet prefetch run`) enqueues selected frame, worker thread enumerates its variables (and their
+    children up to `depth` levels) and asks LLDB for their summaries and children. Providers load class dumps,
+    resolve types, read object memory into the memory cache and LLDB keeps computed summaries and synthetic
+    providers of frame variables, so the first rendering of variables view is served from caches.
+    Prefetching stops when process is resumed or next stop is prefetched.
+
+    Stop hook is installed once and stays installed when prefetching is disabled (LLDB copies it from dummy target
+    to every created target, so it can't be reliably removed). Disabled prefetcher ignores `mallet prefetch run`.
+
+    Prefetching and running code in the target (`run_target_code`) are mutually exclusive: expressions run
+    by summaries resume the process (which cancels prefetching) and would run on background thread while LLDB
+    renders variables. Worker thread never runs code in the target, prefetching can't be enabled when it is allowed.
+
+    :param bool enabled: True if stops are prefetched.
+    :param int depth: Number of prefetched levels (1 - frame variables, 2 - also their children).
+    :param int max_values: Maximal number of prefetched values per stop.
+    :param bool stop_hook_installed: True if stop hook was added to LLDB.
+    :param CancellationToken | None token: Token of last prefetched stop.
+    :param queue.Queue jobs: Frames waiting for worker, with their tokens.
+    :param threading.Thread | None worker: Worker thread.
+    :param threading.Lock lock: Lock of worker creation.
+    :param int prefetched: Number of values prefetched in last stop.
+    :param float duration: Duration of prefetching of last stop (in seconds).
+    :param int cancelled: Number of cancelled stops.
+    """
+    DEFAULT_DEPTH = 1
+    DEFAULT_MAX_VALUES = 64
+    # Maximal number of prefetched children of one value.
+    MAX_CHILDREN = 16
+
+    def __init__(self):
+        super(SummaryPrefetcher, self).__init__()
+        self.enabled = False
+        self.depth = self.DEFAULT_DEPTH
+        self.max_values = self.DEFAULT_MAX_VALUES
+        self.stop_hook_installed = False
+        self.token = None
+        self.jobs = queue.Queue()
+        self.worker = None
+        self.lock = threading.Lock()
+        self.prefetched = 0
+        self.duration = 0.0
+        self.cancelled = 0
+
+    def configure(self, enabled=False, depth=DEFAULT_DEPTH, max_values=DEFAULT_MAX_VALUES):
+        """
+        Configures prefetching. Disabling cancels prefetching of last stop, installed stop hook is kept
+        (it does nothing while prefetching is disabled).
+
+        :param bool enabled: True if stops should be prefetched.
+        :param int depth: Number of prefetched levels.
+        :param int max_values: Maximal number of prefetched values per stop.
+        """
+        self.enabled = enabled
+        self.depth = max(depth, 1)
+        self.max_values = max_values
+        if not enabled:
+            self.cancel()
+
+    def install_stop_hook(self, debugger):
+        """
+        Adds stop hook which prefetches selected frame (once). Without target it is added to dummy target,
+        so it is inherited by created targets.
+
+        :param lldb.SBDebugger debugger: LLDB debugger.
+        """
+        if self.stop_hook_installed:
+            return
+        debugger.HandleCommand("target stop-hook add -o \"mallet prefetch run\"")
+        self.stop_hook_installed = True
+
+    def prefetch(self, frame):
+        """
+        Cancels prefetching of previous stop and enqueues frame for worker thread.
+
+        :param lldb.SBFrame frame: Selected frame.
+        :return: True if frame was enqueued.
+        :rtype: bool
+        """
+        self.cancel()
+        if not self.enabled or not frame.IsValid():
+            return False
+        token = CancellationToken(frame.GetThread().GetProcess())
+        self.token = token
+        self.__start_worker()
+        self.jobs.put((frame, token))
+        return True
+
+    def cancel(self):
+        """
+        Cancels prefetching of last stop.
+        """
+        token = self.token
+        if token is not None and not token.event.is_set():
+            token.cancel()
+
+    def __start_worker(self):
+        """
+        Starts worker thread if it isn't running.
+        """
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.__run, name="mallet-prefetch")
+                self.worker.daemon = True
+                self.worker.start()
+
+    def __run(self):
+        """
+        Worker thread, prefetches enqueued frames.
+        """
+        # Summaries computed by worker thread only read memory.
+        object_description.get_object_describer().forbid_running_target()
+        while True:
+            frame, token = self.jobs.get()
+            try:
+                if not token.is_cancelled():
+                    self.__prefetch_frame(frame, token)
+            except Exception:
+                logger = logging.getLogger(__name__)
+                logger.exception("Prefetching of frame failed.")
+            finally:
+                self.jobs.task_done()
+
+    def __prefetch_frame(self, frame, token):
+        """
+        Prefetches summaries and children of frame variables (breadth first, up to `depth` levels).
+
+        :param lldb.SBFrame frame: Frame.
+        :param CancellationToken token: Cancellation token.
+        """
+        start = time.perf_counter()
+        t = tracer.get_tracer()
+        variables = frame.GetVariables(True, True, False, True)
+        """:type: lldb.SBValueList"""
+        pending = collections.deque((variables.GetValueAtIndex(i), 1) for i in range(variables.GetSize()))
+        count = 0
+        while len(pending) > 0 and count < self.max_values:
+            if token.is_cancelled():
+                self.cancelled += 1
+                if t.enabled:
+                    t.trace("prefetch_cancel", "", count)
+                break
+            value, level = pending.popleft()
+            if not value.IsValid():
+                continue
+            count += 1
+            value.GetSummary()
+            if level < self.depth:
+                number_of_children = min(value.GetNumChildren(), self.MAX_CHILDREN)
+                for index in range(number_of_children):
+                    pending.append((value.GetChildAtIndex(index), level + 1))
+
+        self.prefetched = count
+        self.duration = time.perf_counter() - start
+        if t.enabled:
+            t.trace("prefetch", "", int(self.duration * 1000000))
+
+    def status(self):
+        """
+        Returns prefetcher status.
+
+        :return: Status.
+        :rtype: str
+        """
+        lines = ["Prefetching {} (depth {}, at most {} values).".format("enabled" if self.enabled else "disabled",
+                                                                       self.depth, self.max_values),
+                 "Last stop: {} values in {:.1f}ms.".format(self.prefetched, self.duration * 1000.0),
+                 "Cancelled stops: {}.".format(self.cancelled)]
+        return "\n".join(lines)
+
+
+__shared_summary_prefetcher = None
+""":type: SummaryPrefetcher"""
+
+
+def get_summary_prefetcher():
+    """
+    Returns shared SummaryPrefetcher.
+
+    :return: SummaryPrefetcher singleton.
+    :rtype: SummaryPrefetcher
+    """
+    global __shared_summary_prefetcher
+    if __shared_summary_prefetcher is None:
+        __shared_summary_prefetcher = SummaryPrefetcher()
+    return __shared_summary_prefetcher
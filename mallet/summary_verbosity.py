@@ -0,0 +1,159 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import logging
+import threading
+
+
+# Cost tiers of registered child values.
+# Direct primitive ivar of the object (integer, float or bool read from object memory).
+COST_DIRECT = 0
+# Child object summary (strings, collections, dates) or nested provider.
+COST_NESTED = 1
+
+# Verbosity levels. "fast" summaries use only direct primitive ivars, "full" summaries use all parts.
+VERBOSITY_FAST = "fast"
+VERBOSITY_FULL = "full"
+VERBOSITY_LEVELS = {VERBOSITY_FAST: COST_DIRECT,
+                    VERBOSITY_FULL: COST_NESTED}
+
+
+class _VerbosityState(threading.local):
+    """
+    State of summary computed by current thread.
+
+    :param str | None forced_level: Verbosity level which overrides levels of all categories (used by commands).
+    :param int max_cost: Maximal cost of parts of currently computed summary.
+    """
+    def __init__(self):
+        super(_VerbosityState, self).__init__()
+        self.forced_level = None
+        self.max_cost = COST_NESTED
+
+
+class SummaryVerbosity(object):
+    """
+    Verbosity of summaries per category (package, like UIKit or CFNetwork).
+
+    Registered child values have cost tier. When summary is computed, parts whose cost is above the maximal cost
+    of verbosity level are skipped (they return None), so "fast" summaries don't create nested providers.
+    Synthetic children (expanded value) and `mallet summary` command are not limited.
+
+    Configured levels are shared, forced level and maximal cost are kept per thread, so forced level of command
+    doesn't change summaries computed in parallel.
+
+    :param str default_level: Verbosity level of categories without explicit level.
+    :param dict[str, str] levels: Maps category name to verbosity level.
+    :param _VerbosityState state: State of summary computed by current thread.
+    """
+    def __init__(self):
+        super(SummaryVerbosity, self).__init__()
+        self.default_level = VERBOSITY_FULL
+        self.levels = dict()
+        self.state = _VerbosityState()
+
+    @property
+    def forced_level(self):
+        """
+        Verbosity level which overrides levels of all categories in current thread (used by commands).
+
+        :rtype: str | None
+        """
+        return self.state.forced_level
+
+    @forced_level.setter
+    def forced_level(self, level):
+        self.state.forced_level = level
+
+    @property
+    def max_cost(self):
+        """
+        Maximal cost of parts of summary computed by current thread.
+
+        :rtype: int
+        """
+        return self.state.max_cost
+
+    def configure(self, levels):
+        """
+        Configures verbosity levels.
+
+        :param dict[str, str] levels: Maps category name (or "default") to verbosity level.
+        """
+        default_level = VERBOSITY_FULL
+        category_levels = dict()
+        for category, level in levels.items():
+            if level not in VERBOSITY_LEVELS:
+                logger = logging.getLogger(__name__)
+                logger.warning("configure: unknown verbosity level \"%s\" of category \"%s\".", level, category)
+                continue
+            if category == "default":
+                default_level = level
+            else:
+                category_levels[category] = level
+        self.default_level = default_level
+        self.levels = category_levels
+
+    def get_level(self, category):
+        """
+        Returns verbosity level of category.
+
+        :param str category: Category (package) name.
+        :return: Verbosity level.
+        :rtype: str
+        """
+        if self.forced_level is not None:
+            return self.forced_level
+        return self.levels.get(category, self.default_level)
+
+    def enter(self, category):
+        """
+        Starts computing (outermost) summary of object from given category.
+
+        :param str category: Category (package) name.
+        """
+        self.state.max_cost = VERBOSITY_LEVELS[self.get_level(category)]
+
+    def leave(self):
+        """
+        Finishes computing (outermost) summary.
+        """
+        self.state.max_cost = COST_NESTED
+
+
+__shared_summary_verbosity = None
+""":type: SummaryVerbosity"""
+
+
+def get_summary_verbosity():
+    """
+    Returns shared SummaryVerbosity.
+
+    :return: SummaryVerbosity singleton.
+    :rtype: SummaryVerbosity
+    """
+    global __shared_summary_verbosity
+    if __shared_summary_verbosity is None:
+        __shared_summary_verbosity = SummaryVerbosity()
+    return __shared_summary_verbosity
@@ -0,0 +1,210 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+from . import helpers
+
+# Classic tag indexes (objc-internal.h).
+TAG_NSSTRING = 2
+TAG_NSNUMBER = 3
+TAG_NSDATE = 6
+
+# Tagged pointer payload size (in bits).
+PAYLOAD_BITS = 60
+
+__MASK_64 = 0xffffffffffffffff
+
+
+class TaggedPointers(object):
+    """
+    Decodes Objective-C tagged pointers.
+
+    Tag bit and payload position depend on architecture: x86_64 uses the lowest bit as tag bit, arm64 the highest one.
+    Since iOS 14 arm64 stores tag index in the lowest bits. Tagged pointers are obfuscated with random value stored
+    in `objc_debug_taggedpointer_obfuscator`. Both obfuscator and layout are read once per process.
+
+    :param dict[int, (str, int, bool)] processes: Maps process unique ID to architecture name, obfuscator
+        and flag if tag index is stored in low bits.
+    """
+    def __init__(self):
+        super(TaggedPointers, self).__init__()
+        self.processes = dict()
+
+    def clean_cache(self):
+        """
+        Cleans cached process information.
+        """
+        self.processes = dict()
+
+    def get_info(self, process):
+        """
+        Returns architecture name, tagged pointer obfuscator and flag if tag index is stored in low bits
+        (arm64, iOS 14 and later).
+
+        :param lldb.SBProcess process: LLDB process.
+        :return: Architecture name, obfuscator and low tag index flag.
+        :rtype: (str, int, bool)
+        """
+        process_id = process.GetUniqueID()
+        if process_id in self.processes:
+            return self.processes[process_id]
+
+        target = process.GetTarget()
+        """:type: lldb.SBTarget"""
+        obfuscator = 0
+        obfuscator_address = get_symbol_load_address(target, "objc_debug_taggedpointer_obfuscator")
+        if obfuscator_address is not None:
+            error = lldb.SBError()
+            value = process.ReadPointerFromMemory(obfuscator_address, error)
+            if error.Success():
+                obfuscator = value
+        low_tag_index = get_symbol_load_address(target, "objc_debug_tag60_permutations") is not None
+
+        info = (helpers.architecture_name_from_target(target), obfuscator, low_tag_index)
+        self.processes[process_id] = info
+        return info
+
+    def get_payload(self, process, pointer, signed=False):
+        """
+        Returns payload of tagged pointer.
+
+        :param lldb.SBProcess process: LLDB process.
+        :param int pointer: Pointer.
+        :param bool signed: Returns sign extended payload.
+        :return: Payload or None if pointer is not tagged.
+        :rtype: int | None
+        """
+        if not could_be_tagged_pointer(pointer):
+            return None
+        architecture_name, obfuscator, low_tag_index = self.get_info(process)
+        return get_payload(pointer ^ obfuscator, architecture_name, low_tag_index, signed)
+
+
+def could_be_tagged_pointer(pointer):
+    """
+    Returns True if pointer has tag bit set on any architecture (fast check without process information).
+
+    :param int pointer: Pointer.
+    :rtype: bool
+    """
+    return pointer & 1 == 1 or pointer & (1 << 63) != 0
+
+
+def is_tagged_pointer(pointer, architecture_name):
+    """
+    Returns True if pointer is tagged pointer on given architecture.
+
+    :param int pointer: Pointer.
+    :param str architecture_name: Architecture name.
+    :rtype: bool
+    """
+    if architecture_name == "x86_64":
+        return pointer & 1 == 1
+    elif architecture_name == "arm64":
+        return pointer & (1 << 63) != 0
+    return False
+
+
+def get_payload(pointer, architecture_name, low_tag_index=False, signed=False):
+    """
+    Returns payload of deobfuscated tagged pointer.
+
+    :param int pointer: Deobfuscated tagged pointer.
+    :param str architecture_name: Architecture name.
+    :param bool low_tag_index: True if tag index is stored in low bits (arm64, iOS 14 and later).
+    :param bool signed: Returns sign extended payload.
+    :return: Payload or None if pointer is not tagged.
+    :rtype: int | None
+    """
+    if not is_tagged_pointer(pointer, architecture_name):
+        return None
+    if architecture_name == "x86_64":
+        # Tag bit, 3 bits of tag index and payload.
+        payload = pointer >> 4
+    elif low_tag_index:
+        # 3 bits of tag index, payload and tag bit.
+        payload = ((pointer << 1) & __MASK_64) >> 4
+    else:
+        # Payload, 3 bits of tag index and tag bit.
+        payload = ((pointer << 4) & __MASK_64) >> 4
+
+    if signed and payload & (1 << (PAYLOAD_BITS - 1)):
+        payload -= 1 << PAYLOAD_BITS
+    return payload
+
+
+def make_tagged_pointer(payload, tag_index, architecture_name):
+    """
+    Returns (not obfuscated) tagged pointer with classic layout. Used to build synthetic memory images.
+
+    :param int payload: Payload (60 bits).
+    :param int tag_index: Tag index.
+    :param str architecture_name: Architecture name.
+    :return: Tagged pointer.
+    :rtype: int
+    """
+    payload &= (1 << PAYLOAD_BITS) - 1
+    if architecture_name == "x86_64":
+        return (payload << 4) | (tag_index << 1) | 1
+    elif architecture_name == "arm64":
+        return (1 << 63) | (tag_index << 60) | payload
+    raise ValueError("Architecture {} doesn't support tagged pointers.".format(architecture_name))
+
+
+def get_symbol_load_address(target, symbol_name):
+    """
+    Returns load address of given symbol.
+
+    :param lldb.SBTarget target: LLDB target.
+    :param str symbol_name: Symbol name.
+    :return: Load address or None.
+    :rtype: int | None
+    """
+    contexts = target.FindSymbols(symbol_name)
+    """:type: lldb.SBSymbolContextList"""
+    if contexts.GetSize() == 0:
+        return None
+    symbol = contexts.GetContextAtIndex(0).GetSymbol()
+    """:type: lldb.SBSymbol"""
+    address = symbol.GetStartAddress().GetLoadAddress(target)
+    if address == lldb.LLDB_INVALID_ADDRESS:
+        return None
+    return address
+
+
+__shared_tagged_pointers = None
+""":type: TaggedPointers"""
+
+
+def get_tagged_pointers():
+    """
+    Returns shared TaggedPointers.
+
+    :return: TaggedPointers singleton.
+    :rtype: TaggedPointers
+    """
+    global __shared_tagged_pointers
+    if __shared_tagged_pointers is None:
+        __shared_tagged_pointers = TaggedPointers()
+    return __shared_tagged_pointers
@@ -0,0 +1,188 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import struct
+import threading
+import time
+
+
+class Tracer(object):
+    """
+    Binary ring buffer of hot path events. Every record is packed into preallocated buffer (timestamp, event id,
+    name id and unsigned 64 bit value), so tracing doesn't allocate objects. Event and name strings are interned.
+
+    Callers should check `enabled` before calling `trace`, so disabled tracer costs only attribute lookup.
+
+    :param bool enabled: True if events are recorded.
+    :param int size: Maximal number of records.
+    :param bytearray buffer: Records buffer.
+    :param int count: Number of all recorded events (also overwritten).
+    :param dict[str, int] string_ids: Maps interned string to its id.
+    :param list[str] strings: Interned strings.
+    :param threading.Lock lock: Lock of records and interned strings (events can be traced by several threads).
+    """
+    RECORD = struct.Struct("<dHHQ")
+    VALUE_MASK = 0xffffffffffffffff
+    DEFAULT_SIZE = 4096
+    # Maximal number of interned strings. When the table is full, new strings are not interned and are recorded
+    # with reserved id (ids are 16 bit).
+    MAX_STRINGS = 0xffff
+    OVERFLOW_STRING_ID = 0xffff
+    OVERFLOW_STRING = "<unknown>"
+
+    def __init__(self, size=DEFAULT_SIZE):
+        """
+        :param int size: Maximal number of records.
+        """
+        super(Tracer, self).__init__()
+        self.enabled = False
+        self.size = size
+        self.buffer = bytearray(self.RECORD.size * size)
+        self.count = 0
+        self.string_ids = dict()
+        self.strings = list()
+        self.lock = threading.Lock()
+
+    def enable(self, size=None):
+        """
+        Enables tracing. Changing size clears buffer.
+
+        :param int size: Maximal number of records.
+        """
+        if size is not None and size != self.size:
+            with self.lock:
+                self.size = size
+                self.buffer = bytearray(self.RECORD.size * size)
+                self.count = 0
+        self.enabled = True
+
+    def disable(self):
+        """
+        Disables tracing. Recorded events are preserved.
+        """
+        self.enabled = False
+
+    def clear(self):
+        """
+        Removes recorded events.
+        """
+        with self.lock:
+            self.count = 0
+            self.string_ids = dict()
+            self.strings = list()
+
+    def __intern(self, string):
+        """
+        Returns id of interned string (called with lock). Strings which don't fit in full table get reserved id.
+
+        :param str string: String.
+        :rtype: int
+        """
+        string_id = self.string_ids.get(string)
+        if string_id is None:
+            if len(self.strings) >= self.MAX_STRINGS:
+                return self.OVERFLOW_STRING_ID
+            string_id = len(self.strings)
+            self.string_ids[string] = string_id
+            self.strings.append(string)
+        return string_id
+
+    def trace(self, event, name="", value=0):
+        """
+        Records event.
+
+        :param str event: Event name, like "provider_init".
+        :param str name: Event subject, like class or ivar name.
+        :param int value: Event value, like offset, pointer or duration in microseconds. Value is truncated
+            to unsigned 64 bits.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            offset = (self.count % self.size) * self.RECORD.size
+            self.RECORD.pack_into(self.buffer, offset, time.time(), self.__intern(event), self.__intern(name or ""),
+                                  (value or 0) & self.VALUE_MASK)
+            self.count += 1
+
+    def records(self, limit=None):
+        """
+        Returns recorded events, from oldest to newest.
+
+        :param int limit: Maximal number of returned (newest) events.
+        :return: List of tuples: timestamp, event, name and value.
+        :rtype: list[(float, str, str, int)]
+        """
+        records = list()
+        with self.lock:
+            available = min(self.count, self.size)
+            if limit is not None:
+                available = min(available, limit)
+            for index in range(self.count - available, self.count):
+                timestamp, event_id, name_id, value = self.RECORD.unpack_from(self.buffer,
+                                                                              (index % self.size) * self.RECORD.size)
+                records.append((timestamp, self.__get_string(event_id), self.__get_string(name_id), value))
+        return records
+
+    def __get_string(self, string_id):
+        """
+        Returns interned string with given id.
+
+        :param int string_id: String id.
+        :rtype: str
+        """
+        if string_id < len(self.strings):
+            return self.strings[string_id]
+        return self.OVERFLOW_STRING
+
+    def dump(self, limit=None):
+        """
+        Returns recorded events as text.
+
+        :param int limit: Maximal number of returned (newest) events.
+        :return: Events, one per line.
+        :rtype: str
+        """
+        lines = ["Trace: {} events recorded, {} in buffer ({}).".format(
+            self.count, min(self.count, self.size), "enabled" if self.enabled else "disabled")]
+        for timestamp, event, name, value in self.records(limit):
+            lines.append("{}.{:06d} {:<20} {:<50} {}".format(time.strftime("%H:%M:%S", time.localtime(timestamp)),
+                                                            int(timestamp % 1 * 1000000), event, name, value))
+        return "\n".join(lines)
+
+
+__shared_tracer = None
+""":type: Tracer"""
+
+
+def get_tracer():
+    """
+    Returns shared Tracer.
+
+    :return: Tracer singleton.
+    :rtype: Tracer
+    """
+    global __shared_tracer
+    if __shared_tracer is None:
+        __shared_tracer = Tracer()
+    return __shared_tracer
@@ -23,19 +23,26 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from . import helpers
+from . import tracer
 import lldb
 import logging
+import threading
 
 
 class TypeCache(object):
     """
     Stores cached types.
 
+    Cached types are read without lock, missing types are added under lock (types of target are populated
+    before dictionary is published), so cache can be used from several threads.
+
     :param dict[int, dict[str, lldb.SBType]] targets: Stores cached types per target.
+    :param threading.Lock lock: Lock of adding types.
     """
     def __init__(self):
         super(TypeCache, self).__init__()
         self.targets = dict()
+        self.lock = threading.Lock()
 
     @staticmethod
     def __get_type_from_name(type_name, target):
@@ -47,8 +54,6 @@ class TypeCache(object):
         :return: Returns SBType for given name.
         :rtype: lldb.SBType | None
         """
-        if isinstance(type_name, str):
-            type_name = type_name.encode('utf-8')
         is_pointer = type_name.endswith("*")
         only_type_name = type_name.rstrip("*").strip()
         t = target.FindFirstType(only_type_name)
@@ -86,22 +91,30 @@ class TypeCache(object):
             return None
 
         target_id = self.__get_target_id(target)
-        if target_id not in self.targets:
-            self.__populate_standard_types(target, target_id)
-
-        # Find and return type from cache.
-        types = self.targets[target_id]
-        if type_name in types:
+        types = self.targets.get(target_id)
+        if types is not None and type_name in types:
             return types[type_name]
 
-        # Get type from name.
-        logger = logging.getLogger(__name__)
-        logger.info("Adding type \"{}\" to cache.".format(type_name))
-        t = self.__get_type_from_name(type_name, target)
-        if not t:
-            logger.warning("Type \"{}\" doesn't exists.".format(type_name))
-        types[type_name] = t
-        return t
+        with self.lock:
+            if target_id not in self.targets:
+                self.__populate_standard_types(target, target_id)
+
+            # Find and return type from cache (could be added by another thread).
+            types = self.targets[target_id]
+            if type_name in types:
+                return types[type_name]
+
+            # Get type from name.
+            tr = tracer.get_tracer()
+            if tr.enabled:
+                tr.trace("type_cache_miss", type_name)
+            logger = logging.getLogger(__name__)
+            logger.info("Adding type \"%s\" to cache.", type_name)
+            t = self.__get_type_from_name(type_name, target)
+            if not t:
+                logger.warning("Type \"%s\" doesn't exists.", type_name)
+            types[type_name] = t
+            return t
 
     def clean_cache(self):
         """
@@ -122,7 +135,7 @@ class TypeCache(object):
 
         is64bit = helpers.is_64bit_architecture_from_target(target)
         logger = logging.getLogger(__name__)
-        logger.debug("Populating type cache for target {!r}.".format(target_id))
+        logger.debug("Populating type cache for target %r.", target_id)
 
         # char, unsigned char
         types = dict()
@@ -182,6 +195,7 @@ class TypeCache(object):
 
 __shared_type_cache = None
 """:type: TypeCache"""
+__shared_type_cache_lock = threading.Lock()
 
 
 def get_type_cache():
@@ -193,9 +207,11 @@ def get_type_cache():
     """
     global __shared_type_cache
     if __shared_type_cache is None:
-        logger = logging.getLogger(__name__)
-        logger.debug("Creating shared TypeCache.")
-        __shared_type_cache = TypeCache()
+        with __shared_type_cache_lock:
+            if __shared_type_cache is None:
+                logger = logging.getLogger(__name__)
+                logger.debug("Creating shared TypeCache.")
+                __shared_type_cache = TypeCache()
     return __shared_type_cache
 
 
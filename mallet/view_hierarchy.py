@@ -0,0 +1,241 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import collections
+import logging
+from . import class_name_resolver
+from . import collection_decoder
+from . import helpers
+from . import loader
+from . import memory_cache
+from . import memory_regions
+from .QuartzCore import CALayer
+from .QuartzCore import CALayerInternalLayer
+from .QuartzCore import CALayerIvars
+
+
+ViewNode = collections.namedtuple("ViewNode", ["depth", "address", "class_name", "frame", "tag", "parent"])
+"""
+View found in view hierarchy.
+
+:param int depth: Depth of view (0 for root view).
+:param int address: View address.
+:param str | None class_name: View class name.
+:param (float, float, float, float) | None frame: Frame x, y, width and height or None if it cannot be decoded.
+:param int | None tag: View tag.
+:param int | None parent: Superview address (None for root view).
+"""
+
+
+class ViewHierarchyWalker(object):
+    """
+    Walks view hierarchy directly in process memory, without running code in the target (works also with crashed
+    or frozen processes).
+
+    Views are visited depth first (in order of `recursiveDescription`) and returned as soon as they are decoded.
+    Subviews are read from `_subviewCache` array, memory of all subviews of a view and their layers is prefetched
+    with few coalesced reads. Frame is computed from position and bounds of view layer (`CALayer.decode_geometry`),
+    ivar offsets are taken from class dumps.
+
+    :param lldb.SBProcess process: LLDB process.
+    :param str architecture_name: Architecture name.
+    :param bool is_64bit: True if architecture is 64 bit.
+    :param int pointer_size: Pointer size.
+    :param int | None max_depth: Maximal depth of visited views (None - unlimited).
+    :param int | None max_count: Maximal number of visited views (None - unlimited).
+    :param int count: Number of visited views.
+    :param bool truncated: True if some views were skipped because of limits.
+    :param class_dump.Ivar | None layer_ivar: `_layer` ivar of UIView.
+    :param class_dump.Ivar | None subviews_ivar: `_subviewCache` ivar of UIView.
+    :param class_dump.Ivar | None tag_ivar: `_tag` ivar of UIView.
+    :param class_dump.Ivar | None attr_ivar: `_attr` ivar of CALayer.
+    """
+    # Maximal number of pages between prefetched objects.
+    PREFETCH_MAX_GAP = 4
+
+    def __init__(self, process, max_depth=None, max_count=None):
+        """
+        :param lldb.SBProcess process: LLDB process.
+        :param int | None max_depth: Maximal depth of visited views (None - unlimited).
+        :param int | None max_count: Maximal number of visited views (None - unlimited).
+        """
+        super(ViewHierarchyWalker, self).__init__()
+        self.process = process
+        self.architecture_name = helpers.architecture_name_from_target(process.GetTarget())
+        self.is_64bit = helpers.is_64bit_architecture_from_name(self.architecture_name)
+        self.pointer_size = 8 if self.is_64bit else 4
+        self.max_depth = max_depth
+        self.max_count = max_count
+        self.count = 0
+        self.truncated = False
+
+        manager = loader.get_shared_lazy_class_dump_manager()
+        self.layer_ivar = manager.get_ivar("UIKit", self.architecture_name, "UIView", "_layer")
+        self.subviews_ivar = manager.get_ivar("UIKit", self.architecture_name, "UIView", "_subviewCache")
+        self.tag_ivar = manager.get_ivar("UIKit", self.architecture_name, "UIView", "_tag")
+        self.attr_ivar = manager.get_ivar("QuartzCore", self.architecture_name, "CALayer", "_attr")
+
+    def is_valid(self):
+        """
+        Checks if UIView ivars are available for process architecture.
+
+        :rtype: bool
+        """
+        return all(ivar is not None and ivar.offset is not None
+                   for ivar in (self.layer_ivar, self.subviews_ivar, self.tag_ivar))
+
+    def walk(self, root_address):
+        """
+        Walks view hierarchy starting from given view.
+
+        :param int root_address: Root view address.
+        :return: Generator of visited views.
+        :rtype: collections.Iterable[ViewNode]
+        """
+        resolver = class_name_resolver.get_class_name_resolver()
+        visited = set()
+        stack = [(root_address, 0, None)]
+        while len(stack) > 0:
+            if self.max_count is not None and self.count >= self.max_count:
+                self.truncated = True
+                return
+            address, depth, parent = stack.pop()
+            # Cycles are possible only in corrupted memory.
+            if address in visited:
+                continue
+            visited.add(address)
+            fields = self.read_view(address)
+            if fields is None:
+                logger = logging.getLogger(__name__)
+                logger.debug("Cannot read view at 0x%x.", address)
+                continue
+            isa, layer_address, subviews_address, tag = fields
+            self.count += 1
+
+            class_name = resolver.get_class_name(self.process, address, self.architecture_name, isa)
+            yield ViewNode(depth, address, class_name, self.get_frame(layer_address), tag, parent)
+
+            subviews = self.get_subviews(subviews_address)
+            if len(subviews) == 0:
+                continue
+            if self.max_depth is not None and depth >= self.max_depth:
+                self.truncated = True
+                continue
+            self.prefetch(subviews)
+            stack.extend((subview, depth + 1, address) for subview in reversed(subviews))
+
+    def read_view(self, address):
+        """
+        Reads isa, layer, subviews array and tag of view with single memory read.
+
+        :param int address: View address.
+        :return: Isa, layer address, subviews array address and tag or None if view memory cannot be read.
+        :rtype: (int, int, int, int) | None
+        """
+        data = memory_cache.get_memory_cache().read(self.process, address, self.get_view_size())
+        if data is None:
+            return None
+        isa = int.from_bytes(data[:self.pointer_size], "little")
+        layer_offset = self.layer_ivar.offset
+        layer_address = int.from_bytes(data[layer_offset:layer_offset + self.pointer_size], "little")
+        subviews_offset = self.subviews_ivar.offset
+        subviews_address = int.from_bytes(data[subviews_offset:subviews_offset + self.pointer_size], "little")
+        tag_offset = self.tag_ivar.offset
+        tag = int.from_bytes(data[tag_offset:tag_offset + (self.tag_ivar.size or self.pointer_size)], "little",
+                             signed=True)
+        return isa, layer_address, subviews_address, tag
+
+    def get_view_size(self):
+        """
+        Returns size of view memory which contains all read ivars.
+
+        :rtype: int
+        """
+        return max(self.layer_ivar.offset + self.pointer_size,
+                   self.subviews_ivar.offset + self.pointer_size,
+                   self.tag_ivar.offset + (self.tag_ivar.size or self.pointer_size))
+
+    def get_subviews(self, array_address):
+        """
+        Returns addresses of subviews stored in subviews array.
+
+        :param int array_address: Subviews array address.
+        :return: Subviews addresses.
+        :rtype: list[int]
+        """
+        if array_address == 0:
+            return list()
+
+        class_name = class_name_resolver.get_class_name_resolver().get_class_name(self.process, array_address,
+                                                                                 self.architecture_name)
+        subviews = collection_decoder.get_array_elements(self.process, array_address, class_name)
+        regions = memory_regions.get_memory_regions()
+        return [subview for subview in subviews
+                if regions.is_plausible_object_pointer(self.process, subview, self.architecture_name)]
+
+    def get_frame(self, layer_address):
+        """
+        Returns frame of view computed from position and bounds of its layer.
+
+        :param int layer_address: View layer address.
+        :return: Frame x, y, width and height or None.
+        :rtype: (float, float, float, float) | None
+        """
+        if layer_address == 0:
+            return None
+        geometry = CALayer.decode_geometry(self.process, layer_address, self.architecture_name, self.is_64bit)
+        if geometry is None:
+            return None
+        position_x, position_y, _, _, width, height = geometry
+        return position_x - width / 2, position_y - height / 2, width, height
+
+    def prefetch(self, addresses):
+        """
+        Prefetches memory of views, their layers and internal layers (with geometry) using coalesced reads.
+
+        :param list[int] addresses: Views addresses.
+        """
+        cache = memory_cache.get_memory_cache()
+        view_size = self.get_view_size()
+        cache.prefetch(self.process, [(address, view_size) for address in addresses], self.PREFETCH_MAX_GAP)
+        if self.attr_ivar is None or self.attr_ivar.offset is None:
+            return
+
+        # Layers, layer pointer of `_attr` structure is followed by decode_geometry.
+        layer_pointer_offset = self.attr_ivar.offset + CALayerIvars.LAYER_OFFSET
+        layers = [cache.read_unsigned(self.process, address + self.layer_ivar.offset, self.pointer_size)
+                  for address in addresses]
+        layers = [layer for layer in layers if layer]
+        cache.prefetch(self.process, [(layer + layer_pointer_offset, self.pointer_size) for layer in layers],
+                       self.PREFETCH_MAX_GAP)
+
+        # Internal layers.
+        if self.is_64bit:
+            position_offset = CALayerInternalLayer.POSITION_OFFSET_64
+        else:
+            position_offset = CALayerInternalLayer.POSITION_OFFSET_32
+        internal_layers = [cache.read_unsigned(self.process, layer + layer_pointer_offset, self.pointer_size)
+                           for layer in layers]
+        cache.prefetch(self.process, [(internal_layer + position_offset, CALayer.GEOMETRY.size)
+                                      for internal_layer in internal_layers if internal_layer], self.PREFETCH_MAX_GAP)
@@ -62,6 +62,7 @@ setup(name="mallet-lldb",
           "mallet": ["config.yml"],
           "mallet.AFNetworking": ["config.yml", "lldbinit"],
           "mallet.CFNetwork": ["config.yml", "lldbinit", "class_dumps/*.json"],
+          "mallet.commands": ["config.yml", "lldbinit"],
           "mallet.common": ["config.yml", "lldbinit"],
           "mallet.CoreGraphics": ["config.yml", "lldbinit"],
           "mallet.debug_commands": ["config.yml", "lldbinit"],
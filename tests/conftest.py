@@ -0,0 +1,123 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""
+Tests run providers and decoders against synthetic memory images (`mallet.recorded_lldb`), LLDB is not required.
+"""
+
+import io
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")))
+from mallet import recorded_lldb
+recorded_lldb.install()
+from mallet import class_name_resolver
+from mallet import collection_decoder
+from mallet import loader
+from mallet import memory_cache
+from mallet import memory_regions
+from mallet import number_decoder
+from mallet import provider_registry
+from mallet import string_decoder
+from mallet import summary_cache
+from mallet import tagged_pointer
+from mallet import tracer
+
+recorded_lldb.register_builtin_class_dumps(loader.get_shared_lazy_class_dump_manager())
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    """
+    Cleans shared caches and decoders, so every test starts with new process state.
+    """
+    string_decoder.get_string_decoder().clean_cache()
+    collection_decoder.get_collection_decoder().clean_cache()
+    number_decoder.get_number_decoder().clean_cache()
+    tagged_pointer.get_tagged_pointers().clean_cache()
+    class_name_resolver.get_class_name_resolver().clean_cache()
+    memory_regions.get_memory_regions().clean_cache()
+    memory_cache.get_memory_cache().clean_cache()
+    summary_cache.get_summary_cache().clean_cache()
+    provider_registry.get_provider_registry().clean_cache()
+    yield
+    summary_cache.get_summary_cache().enabled = False
+    tracer.get_tracer().disable()
+    tracer.get_tracer().clear()
+
+
+@pytest.fixture(scope="session")
+def class_dump_manager():
+    """
+    :rtype: mallet.class_dump.LazyClassDumpManager
+    """
+    return recorded_lldb.get_builtin_class_dump_manager()
+
+
+@pytest.fixture(params=["arm64", "armv7"])
+def builder(request, class_dump_manager):
+    """
+    Memory image builder for 64-bit and 32-bit architecture.
+
+    :rtype: recorded_lldb.MemoryImageBuilder
+    """
+    return recorded_lldb.MemoryImageBuilder(request.param, class_dump_manager)
+
+
+@pytest.fixture
+def build_target(class_dump_manager):
+    """
+    Returns function which builds target from memory image builder (target is selected in shared debugger).
+    """
+    def build(builder):
+        target = recorded_lldb.SBTarget(builder.build(), class_dump_manager)
+        recorded_lldb.debugger.SetSelectedTarget(target)
+        return target
+    return build
+
+
+class CommandResult(io.StringIO):
+    """
+    Results of command (`lldb.SBCommandReturnObject`), collects printed text and error.
+
+    :param str | None error: Error set by command.
+    """
+    error = None
+
+    def SetError(self, error):
+        self.error = error
+
+
+@pytest.fixture
+def run_command():
+    """
+    Returns function which runs command function with given arguments and returns its results.
+    """
+    def run(command, *args):
+        result = CommandResult()
+        command(recorded_lldb.debugger, list(args), result, {})
+        return result
+    return run
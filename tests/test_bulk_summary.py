@@ -0,0 +1,77 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import lldb
+from mallet import helpers
+from mallet.CFNetwork import NSURLSessionTask
+from mallet.common import BulkSummary
+
+# Summary providers by class name, subclasses of NSURLSessionTask use provider of superclass.
+PROVIDER_CLASSES = {"NSURLSessionTask": NSURLSessionTask.NSURLSessionTaskSyntheticProvider}
+
+
+def get_values(builder, build_target, count):
+    """
+    Creates array of tasks (NSURLSessionTask and its private subclass), string and nil and returns its elements.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param function build_target: Builds target.
+    :param int count: Number of tasks.
+    :rtype: list[lldb.SBValue]
+    """
+    tasks = [builder.new_object("__NSCFLocalDataTask" if i % 2 else "NSURLSessionTask",
+                                {"_taskIdentifier": i, "_state": i % 3}) for i in range(count)]
+    builder.add_variable("values", "NSArray *",
+                         builder.new_collection("__NSArrayI", tasks + [builder.new_string("text"), 0]))
+    target = build_target(builder)
+    array = target.FindVariable("values").GetDynamicValue(lldb.eDynamicDontRunTarget)
+    array.SetPreferSyntheticValue(True)
+    return [array.GetChildAtIndex(i) for i in range(array.GetNumChildren())]
+
+
+def test_groups_by_class_with_superclass_provider(builder, build_target):
+    values = get_values(builder, build_target, 4)
+    architecture_name = helpers.architecture_name_from_target(values[0].GetTarget())
+    groups = BulkSummary.get_summary_groups(values, PROVIDER_CLASSES, architecture_name)
+    assert [(g.class_name, g.provider_class, g.indexes) for g in groups] == [
+        ("NSURLSessionTask", NSURLSessionTask.NSURLSessionTaskSyntheticProvider, [0, 2]),
+        ("__NSCFLocalDataTask", NSURLSessionTask.NSURLSessionTaskSyntheticProvider, [1, 3]),
+        ("__NSCFString", None, [4]),
+        ("id", None, [5])]
+
+
+def test_summaries_in_order_of_values(builder, build_target):
+    values = get_values(builder, build_target, 4)
+    summaries = BulkSummary.get_summaries(values, {}, PROVIDER_CLASSES)
+    assert summaries == ["Running", "Suspended", "Canceling", "Running", "@\"text\"", None]
+    assert BulkSummary.get_summaries([], {}, PROVIDER_CLASSES) == []
+
+
+def test_summaries_equal_to_summaries_of_single_values(builder, build_target):
+    values = get_values(builder, build_target, 20)
+    summaries = BulkSummary.get_summaries(values, {}, PROVIDER_CLASSES)
+    # Next stop, memory is read again.
+    values[0].GetProcess().Continue()
+    assert summaries[:20] == [helpers.generic_summary_provider(v.GetDynamicValue(lldb.eDynamicDontRunTarget), {},
+                                                               NSURLSessionTask.NSURLSessionTaskSyntheticProvider)
+                              for v in values[:20]]
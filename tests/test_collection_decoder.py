@@ -0,0 +1,121 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import pytest
+from mallet import collection_decoder
+from mallet import recorded_lldb
+
+# Expected count field (offset, size, bits) per pointer size, class and Foundation version, independent
+# of decoder tables.
+COUNT_FIELDS = [
+    (8, "__NSArrayI", 1140, (8, 8, 64)),
+    (8, "__NSArrayM", 1140, (8, 8, 64)),
+    (8, "__NSArrayM", 1437, (24, 8, 64)),
+    (8, "__NSCFArray", 1140, (16, 8, 64)),
+    (8, "__NSDictionaryI", 1140, (8, 8, 58)),
+    (8, "__NSDictionaryM", 1140, (8, 8, 58)),
+    (8, "__NSDictionaryM", 1437, (20, 4, 25)),
+    (8, "__NSSetI", 1140, (8, 8, 58)),
+    (8, "__NSSetM", 1140, (8, 8, 58)),
+    (8, "__NSSetM", 1437, (28, 4, 26)),
+    (4, "__NSArrayI", 1140, (4, 4, 32)),
+    (4, "__NSArrayM", 1140, (4, 4, 32)),
+    (4, "__NSArrayM", 1437, (12, 4, 32)),
+    (4, "__NSCFArray", 1140, (8, 4, 32)),
+    (4, "__NSDictionaryI", 1140, (4, 4, 26)),
+    (4, "__NSDictionaryM", 1140, (4, 4, 26)),
+    (4, "__NSDictionaryM", 1437, (12, 4, 25)),
+    (4, "__NSSetI", 1140, (4, 4, 26)),
+    (4, "__NSSetM", 1140, (4, 4, 26)),
+    (4, "__NSSetM", 1437, (16, 4, 26)),
+]
+# Classes with constant count.
+CONSTANT_COUNTS = [("__NSArray0", 0), ("__NSSingleObjectArrayI", 1), ("__NSDictionary0", 0),
+                   ("__NSSingleEntryDictionaryI", 1)]
+
+
+@pytest.mark.parametrize("pointer_size, class_name, version, field", COUNT_FIELDS)
+def test_count_layout(build_target, class_dump_manager, pointer_size, class_name, version, field):
+    offset, size, bits = field
+    builder = recorded_lldb.MemoryImageBuilder("arm64" if pointer_size == 8 else "armv7", class_dump_manager,
+                                               foundation_version=version)
+    address = builder.new_object(class_name, size=64)
+    # Bits above count (flags of bit field) are set, they cannot change the count.
+    raw = (((1 << (size * 8)) - 1) & ~((1 << bits) - 1)) | 42
+    builder.image.write(address + offset, raw.to_bytes(size, "little"))
+    target = build_target(builder)
+    assert collection_decoder.get_collection_decoder().read_count(target.GetProcess(), address, class_name) == 42
+
+
+def test_count_of_value(builder, build_target):
+    elements = [builder.new_string("e{}".format(i)) for i in range(5)]
+    builder.add_variable("array", "NSArray *", builder.new_collection("__NSArrayI", elements))
+    target = build_target(builder)
+    value = target.FindVariable("array").GetDynamicValue(lldb.eDynamicDontRunTarget)
+    assert collection_decoder.get_collection_decoder().get_count(value) == 5
+
+
+@pytest.mark.parametrize("class_name, count", CONSTANT_COUNTS)
+def test_constant_count(builder, build_target, class_name, count):
+    address = builder.new_object(class_name, size=32)
+    target = build_target(builder)
+    assert collection_decoder.get_collection_decoder().read_count(target.GetProcess(), address, class_name) == count
+
+
+def test_layout_without_foundation_version(build_target, class_dump_manager):
+    builder = recorded_lldb.MemoryImageBuilder("arm64", class_dump_manager)
+    del builder.image.modules["Foundation"]
+    address = builder.new_object("__NSArrayM", size=64)
+    target = build_target(builder)
+    # Layout of mutable array depends on Foundation version.
+    assert collection_decoder.get_collection_decoder().read_count(target.GetProcess(), address, "__NSArrayM") is None
+
+
+def test_unsupported_class(builder, build_target):
+    address = builder.new_object("NSObject", size=32)
+    target = build_target(builder)
+    assert collection_decoder.get_collection_decoder().read_count(target.GetProcess(), address, "NSObject") is None
+
+
+@pytest.mark.parametrize("class_name", ["__NSArrayI", "__NSArrayI_Transfer", "__NSSingleObjectArrayI"])
+def test_array_elements(builder, build_target, class_name):
+    count = 1 if class_name == "__NSSingleObjectArrayI" else 4
+    elements = [builder.new_string("e{}".format(i)) for i in range(count)]
+    address = builder.new_collection(class_name, elements)
+    target = build_target(builder)
+    assert collection_decoder.get_collection_decoder().get_elements(target.GetProcess(), address,
+                                                                    class_name) == elements
+    assert collection_decoder.get_array_elements(target.GetProcess(), address, class_name) == elements
+
+
+def test_mutable_array_elements(build_target, class_dump_manager):
+    builder = recorded_lldb.MemoryImageBuilder("arm64", class_dump_manager, foundation_version=1437)
+    elements = [builder.new_string("e{}".format(i)) for i in range(3)]
+    address = builder.new_collection("__NSArrayM", elements)
+    target = build_target(builder)
+    process = target.GetProcess()
+    # Storage of mutable arrays is not decoded, elements are read from synthetic children.
+    assert collection_decoder.get_collection_decoder().get_elements(process, address, "__NSArrayM") is None
+    assert collection_decoder.get_array_elements(process, address, "__NSArrayM") == elements
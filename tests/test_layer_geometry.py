@@ -0,0 +1,85 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import lldb
+from mallet import helpers
+from mallet.QuartzCore import CALayer
+from mallet.QuartzCore import CALayerInternalLayer
+from mallet.UIKit import UIView
+
+
+def new_view(builder, position, bounds):
+    """
+    Creates UIView with layer which position and bounds are stored in internal layer.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param (float, float) position: Layer position.
+    :param (float, float, float, float) bounds: Layer bounds.
+    :return: View and layer addresses.
+    :rtype: (int, int)
+    """
+    is_64bit = builder.pointer_size == 8
+    internal = builder.allocate(0x100)
+    position_offset = CALayerInternalLayer.POSITION_OFFSET_64 if is_64bit else CALayerInternalLayer.POSITION_OFFSET_32
+    bounds_offset = CALayerInternalLayer.BOUNDS_OFFSET_64 if is_64bit else CALayerInternalLayer.BOUNDS_OFFSET_32
+    builder.write_value(internal + position_offset, "CADoublePoint", position)
+    builder.write_value(internal + bounds_offset, "CADoubleRect", bounds)
+    layer = builder.new_object("CALayer", {"_attr": {"layer": internal}})
+    return builder.new_object("UIView", {"_layer": layer, "_tag": 7}), layer
+
+
+def get_view_provider(target):
+    """
+    :rtype: UIView.UIViewSyntheticProvider
+    """
+    return UIView.UIViewSyntheticProvider(target.FindVariable("view").GetDynamicValue(lldb.eDynamicDontRunTarget), {})
+
+
+def test_decode_geometry(builder, build_target):
+    _, layer = new_view(builder, (60.0, 35.5), (0.0, 0.0, 100.0, 50.0))
+    target = build_target(builder)
+    architecture_name = helpers.architecture_name_from_target(target)
+    is_64bit = builder.pointer_size == 8
+    geometry = CALayer.decode_geometry(target.GetProcess(), layer, architecture_name, is_64bit)
+    assert geometry == (60.0, 35.5, 0.0, 0.0, 100.0, 50.0)
+    assert CALayer.decode_geometry(target.GetProcess(), 0, architecture_name, is_64bit) is None
+    assert CALayer.decode_geometry(target.GetProcess(), 0x8, architecture_name, is_64bit) is None
+
+
+def test_frame_equal_to_frame_from_providers(builder, build_target, monkeypatch):
+    view, _ = new_view(builder, (60.0, 35.5), (0.0, 0.0, 100.0, 50.0))
+    builder.add_variable("view", "UIView *", view)
+    target = build_target(builder)
+
+    provider = get_view_provider(target)
+    frame = provider.get_frame()
+    assert provider.layer_geometry is not None
+    assert (frame.x, frame.y, frame.width, frame.height) == (10.0, 10.5, 100.0, 50.0)
+    assert UIView.summary_provider(target.FindVariable("view"), {}) == "frame=(10 10.5; 100 50), tag=7"
+
+    # Layer memory cannot be decoded, frame is computed by CALayer providers.
+    monkeypatch.setattr(CALayer, "decode_geometry", lambda *args: None)
+    provider = get_view_provider(target)
+    provider_frame = provider.get_frame()
+    assert provider.layer_geometry is None
+    assert vars(provider_frame) == vars(frame)
@@ -0,0 +1,166 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import pytest
+from mallet import layer_hierarchy
+from mallet.QuartzCore import CALayerInternalLayer
+from mallet.QuartzCore import CALayerIvars
+from mallet.commands import layer_tree
+
+# Depth limit, count limit and x positions of printed layers of `new_hierarchy` hierarchy.
+LIMITS = [(0, 0, [1, 2, 3, 4, 5, 6], False),
+          (1, 0, [1, 2, 3], True),
+          (0, 4, [1, 2, 3, 4], True),
+          (2, 6, [1, 2, 3, 4, 5, 6], False)]
+
+
+def new_layer(builder, position, sublayers=None):
+    """
+    Creates CALayer with internal layer.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param (float, float) position: Layer position.
+    :param list[int] | None sublayers: Sublayers addresses.
+    :return: Layer address.
+    :rtype: int
+    """
+    is_64bit = builder.pointer_size == 8
+    internal = builder.allocate(0x100)
+    position_offset = CALayerInternalLayer.POSITION_OFFSET_64 if is_64bit else CALayerInternalLayer.POSITION_OFFSET_32
+    bounds_offset = CALayerInternalLayer.BOUNDS_OFFSET_64 if is_64bit else CALayerInternalLayer.BOUNDS_OFFSET_32
+    builder.write_value(internal + position_offset, "CADoublePoint", position)
+    builder.write_value(internal + bounds_offset, "CADoubleRect", (0.0, 0.0, 100.0, 50.0))
+    layer = builder.new_object("CALayer", {"_attr": {"layer": internal}})
+    if sublayers:
+        set_sublayers_pointer(builder, layer, builder.new_collection("__NSArrayM", sublayers))
+    return layer
+
+
+def set_sublayers_pointer(builder, layer, pointer):
+    """
+    Writes sublayers pointer of internal layer of layer.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param int layer: Layer address.
+    :param int pointer: Sublayers pointer.
+    """
+    is_64bit = builder.pointer_size == 8
+    attr_offset = [f.offset for f in builder.type_table.find_type("CALayer").fields if f.name == "_attr"][0]
+    data = builder.image.read(layer + attr_offset + CALayerIvars.LAYER_OFFSET, builder.pointer_size)
+    sublayers_offset = (CALayerInternalLayer.SUBLAYERS_OFFSET_64 if is_64bit
+                        else CALayerInternalLayer.SUBLAYERS_OFFSET_32)
+    builder.write_value(int.from_bytes(data, "little") + sublayers_offset, "void *", pointer)
+
+
+def new_hierarchy(builder, cycle=False):
+    """
+    Creates hierarchy: root (x position 1) with sublayers 2 (with sublayers 4 and 5) and 3 (with sublayer 6).
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param bool cycle: True if sublayers of layer 6 contain root and layer 2 (corrupted memory).
+    :return: Layers addresses by x position.
+    :rtype: dict[int, int]
+    """
+    layers = dict()
+    layers[4] = new_layer(builder, (4.0, 0.0))
+    layers[5] = new_layer(builder, (5.0, 0.0))
+    layers[2] = new_layer(builder, (2.0, 0.0), [layers[4], layers[5]])
+    layers[6] = new_layer(builder, (6.0, 0.0))
+    layers[3] = new_layer(builder, (3.0, 0.0), [layers[6]])
+    layers[1] = new_layer(builder, (1.0, 0.0), [layers[2], layers[3]])
+    if cycle:
+        set_sublayers_pointer(builder, layers[6], builder.new_collection("__NSArrayI", [layers[1], layers[2]]))
+    builder.add_variable("root", "CALayer *", layers[1])
+    return layers
+
+
+def test_layers_visited_breadth_first(builder, build_target):
+    layers = new_hierarchy(builder)
+    target = build_target(builder)
+    walker = layer_hierarchy.LayerHierarchyWalker(target.GetProcess())
+    nodes = list(walker.walk(layers[1]))
+    assert [(n.position[0], n.depth) for n in nodes] == [(1, 0), (2, 1), (3, 1), (4, 2), (5, 2), (6, 2)]
+    assert [n.parent for n in nodes] == [None, layers[1], layers[1], layers[2], layers[2], layers[3]]
+    assert nodes[0].class_name == "CALayer"
+    assert nodes[0].bounds == (0.0, 0.0, 100.0, 50.0)
+    assert (walker.count, walker.truncated, walker.invalid_sublayers) == (6, False, [])
+
+
+def test_sublayers_cycle_visited_once(builder, build_target):
+    layers = new_hierarchy(builder, cycle=True)
+    target = build_target(builder)
+    walker = layer_hierarchy.LayerHierarchyWalker(target.GetProcess())
+    assert [n.position[0] for n in walker.walk(layers[1])] == [1, 2, 3, 4, 5, 6]
+    assert (walker.count, walker.invalid_sublayers) == (6, [])
+
+
+@pytest.mark.parametrize("max_depth, max_count, positions, truncated", LIMITS)
+def test_limits(builder, build_target, max_depth, max_count, positions, truncated):
+    layers = new_hierarchy(builder)
+    target = build_target(builder)
+    walker = layer_hierarchy.LayerHierarchyWalker(target.GetProcess(), max_depth or None, max_count or None)
+    assert [n.position[0] for n in walker.walk(layers[1])] == positions
+    assert (walker.count, walker.truncated) == (len(positions), truncated)
+
+
+def test_layer_tree_command(builder, build_target, run_command, tmp_path):
+    layers = new_hierarchy(builder)
+    build_target(builder)
+    output_path = str(tmp_path / "layers.jsonl")
+    result = run_command(layer_tree.layer_tree, "root", "0", "0", output_path)
+    assert result.error is None
+    lines = result.getvalue().splitlines()
+    assert lines[0] == "<CALayer: 0x{:x}; position = (1, 0); bounds = (0 0; 100 50)>".format(layers[1])
+    assert lines[5] == "   |    | <CALayer: 0x{:x}; position = (6, 0); bounds = (0 0; 100 50)>".format(layers[6])
+    assert lines[-1] == "6 layers."
+    with open(output_path) as output_file:
+        nodes = [json.loads(line) for line in output_file]
+    assert nodes[3] == {"depth": 2, "address": "0x{:x}".format(layers[4]), "class": "CALayer",
+                        "position": [4.0, 0.0], "bounds": [0.0, 0.0, 100.0, 50.0],
+                        "parent": "0x{:x}".format(layers[2])}
+    assert run_command(layer_tree.layer_tree, "root", "1").getvalue().splitlines()[-1] == "3 layers (limited)."
+    assert run_command(layer_tree.layer_tree, "missing").error is not None
+
+
+@pytest.mark.parametrize("kind", ["string", "junk"])
+def test_invalid_sublayers_pointer_reported(builder, build_target, run_command, kind):
+    pointer = builder.new_string("not an array") if kind == "string" else 0x8
+    root = new_layer(builder, (1.0, 2.0))
+    set_sublayers_pointer(builder, root, pointer)
+    builder.add_variable("root", "CALayer *", root)
+    target = build_target(builder)
+
+    walker = layer_hierarchy.LayerHierarchyWalker(target.GetProcess())
+    assert len(list(walker.walk(root))) == 1
+    assert walker.invalid_sublayers == [root]
+
+    lines = run_command(layer_tree.layer_tree, "root").getvalue().splitlines()
+    assert lines[-2:] == ["1 layer.", "Warning: sublayers pointer of 1 layer failed validation (0x{:x}), "
+                                      "their sublayers are missing.".format(root)]
+
+
+def test_nil_sublayers_pointer_is_valid(builder, build_target, run_command):
+    builder.add_variable("root", "CALayer *", new_layer(builder, (1.0, 2.0)))
+    build_target(builder)
+    assert run_command(layer_tree.layer_tree, "root").getvalue().splitlines()[-1] == "1 layer."
@@ -0,0 +1,187 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import sys
+import threading
+from mallet import memory_cache
+
+
+def new_target(builder, build_target, size=3 * memory_cache.MemoryCache.PAGE_SIZE):
+    """
+    Builds target with memory block of given size filled with increasing bytes.
+
+    :return: Target and block address.
+    :rtype: (recorded_lldb.SBTarget, int)
+    """
+    address = builder.allocate(size, alignment=memory_cache.MemoryCache.PAGE_SIZE)
+    builder.image.write(address, bytes(i & 0xff for i in range(size)))
+    return build_target(builder), address
+
+
+def test_read(builder, build_target):
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    assert cache.read(process, address + 1, 3) == b"\x01\x02\x03"
+    assert cache.read_unsigned(process, address + 1, 2) == 0x0201
+    assert cache.read_signed(process, address + 0xff, 1) == -1
+    assert cache.read(process, address, 0) == b""
+    assert cache.read(process, address, -1) is None
+    # Served from cached page.
+    assert cache.read(process, address + 8, 8) == bytes(range(8, 16))
+    assert (cache.reads, cache.hits) == (1, 3)
+
+
+def test_hits_counted_from_several_threads(builder, build_target):
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    cache.read(process, address, 8)
+    # Frequent thread switches expose lost updates of counters.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def read():
+        for _ in range(2000):
+            cache.read(process, address, 8)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert (cache.reads, cache.hits) == (1, 8000)
+
+
+def test_read_across_pages(builder, build_target):
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    start = address + memory_cache.MemoryCache.PAGE_SIZE - 2
+    assert cache.read(process, start, 4) == bytes([0xfe, 0xff, 0x00, 0x01])
+    # Both pages are read with single read.
+    assert cache.reads == 1
+
+
+def test_unreadable_memory(builder, build_target):
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    assert cache.read(process, 0x7f000000, 8) is None
+    assert cache.read(process, 0x7f000000, 8) is None
+    # Unreadable page is cached too.
+    assert cache.reads == 1
+    assert cache.read(process, 0xfffffffffffffff8, 16) is None
+
+
+def test_prefetch_coalesces_reads(builder, build_target):
+    page_size = memory_cache.MemoryCache.PAGE_SIZE
+    target, address = new_target(builder, build_target, 8 * page_size)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    cache.prefetch(process, [(address, 8), (address + 2 * page_size, 8), (address + 7 * page_size, 8)], 1)
+    # First two pages are separated by one page (read together), the last one is read separately.
+    assert cache.reads == 2
+    assert cache.read(process, address + 2 * page_size, 2) == b"\x00\x01"
+    assert cache.reads == 2
+
+
+def test_new_stop_invalidates_pages(builder, build_target):
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    assert cache.read(process, address, 2) == b"\x00\x01"
+    target.image.write(address, b"\xaa\xbb")
+    # The same stop, memory is served from cache.
+    assert cache.read(process, address, 2) == b"\x00\x01"
+    process.Continue()
+    assert cache.read(process, address, 2) == b"\xaa\xbb"
+    assert cache.reads == 2
+
+
+def test_other_process_invalidates_pages(builder, build_target, class_dump_manager):
+    from mallet import recorded_lldb
+    target, address = new_target(builder, build_target)
+    cache = memory_cache.get_memory_cache()
+    assert cache.read(target.GetProcess(), address, 2) == b"\x00\x01"
+    other_target = recorded_lldb.SBTarget(target.image, class_dump_manager)
+    target.image.write(address, b"\xaa\xbb")
+    assert cache.read(other_target.GetProcess(), address, 2) == b"\xaa\xbb"
+
+
+def test_clean_cache(builder, build_target):
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    cache.read(process, address, 2)
+    target.image.write(address, b"\xaa\xbb")
+    cache.clean_cache()
+    assert (cache.reads, cache.hits) == (0, 0)
+    assert cache.read(process, address, 2) == b"\xaa\xbb"
+
+
+def test_recorder(builder, build_target):
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    recorder = cache.start_recording()
+    cache.read(process, address + 8, 8)
+    cache.read(process, address, 4)
+    cache.read(process, address + 12, 8)
+    cache.stop_recording(recorder)
+    cache.read(process, address + 100, 4)
+    assert recorder.complete
+    assert recorder.get_merged_ranges() == [(address, 4), (address + 8, 12)]
+
+    recorder = cache.start_recording()
+    cache.record_untracked_read()
+    cache.stop_recording(recorder)
+    assert not recorder.complete
+
+
+def test_expression_invalidates_pages(builder, build_target):
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    cache = memory_cache.get_memory_cache()
+    assert cache.read(process, address, 2) == b"\x00\x01"
+    # Expression changes memory in the same (natural) stop.
+    process.run_expression({address: b"\xaa\xbb"})
+    assert process.GetStopID() == 1
+    assert cache.read(process, address, 2) == b"\xaa\xbb"
+
+
+def test_expression_updates_memory_regions(builder, build_target):
+    from mallet import memory_regions
+    target, address = new_target(builder, build_target)
+    process = target.GetProcess()
+    regions = memory_regions.get_memory_regions()
+    regions.update(process)
+    stop_key = regions.stop_key
+    process.run_expression()
+    regions.update(process)
+    assert regions.stop_key != stop_key
+    assert regions.stop_key == memory_cache.get_stop_key(process)
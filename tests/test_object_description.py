@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import threading
+from mallet import object_description
+
+
+def test_running_target_forbidden_in_background_thread(builder, build_target):
+    obj = builder.new_object("NSObject")
+    builder.add_variable("obj", "NSObject *", obj)
+    target = build_target(builder)
+    target.image.descriptions[obj] = "<NSObject>"
+    value = target.FindVariable("obj")
+    describer = object_description.ObjectDescriber()
+    assert describer.get_description(value) is None
+    describer.allow_running_target = True
+    assert describer.get_description(value) == "<NSObject>"
+
+    descriptions = list()
+
+    def describe():
+        describer.forbid_running_target()
+        descriptions.append(describer.get_description(value))
+
+    thread = threading.Thread(target=describe)
+    thread.start()
+    thread.join()
+    assert descriptions == [None]
+    # Other threads still can run code.
+    assert describer.get_description(value) == "<NSObject>"
@@ -0,0 +1,86 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import pytest
+from mallet.commands import operations
+
+# Limit of printed operations of queue with 4 operations and printed summary.
+LIMITS = [(3, "3 operations (limited)."), (4, "4 operations."), (5, "4 operations."), (0, "4 operations.")]
+
+
+def new_queue(builder, states, next_indexes):
+    """
+    Creates operation queue with operations in given states.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param list[int] states: States of operations (first one is cancelled).
+    :param list[int | None] next_indexes: Index of next operation of every operation.
+    :return: Address of NSOperationQueue.
+    :rtype: int
+    """
+    operation_type = builder.type_table.find_type("NSOperation")
+    private_offset = [f.offset for f in operation_type.fields if f.name == "_private"][0]
+    next_field = [f for f in builder.type_table.find_type("__NSOperationInternal").fields if f.name == "__nextOp"][0]
+    internals = list()
+    addresses = list()
+    for index, state in enumerate(states):
+        internal = builder.new_object("__NSOperationInternal", {"__state": state, "__prio": 4,
+                                                                "__isCancelled": 1 if index == 0 else 0})
+        class_name = "NSBlockOperation" if index % 2 else "NSOperation"
+        internals.append(internal)
+        addresses.append(builder.new_object(class_name, {private_offset: ("id", internal)}))
+    for internal, next_index in zip(internals, next_indexes):
+        if next_index is not None:
+            builder.write_value(internal + next_field.offset, next_field.type.GetName(), addresses[next_index])
+    queue_internal = builder.new_object("__NSOperationQueueInternal", {"__firstOperation": addresses[0],
+                                                                       "__lastOperation": addresses[-1],
+                                                                       "__maxNumOps": -1})
+    return builder.new_object("NSOperationQueue", {"_private": queue_internal})
+
+
+def test_operations_stop_on_cycle(builder, build_target, run_command):
+    # Last operation points back to the second one.
+    builder.add_variable("queue", "NSOperationQueue *", new_queue(builder, [240, 0, 0, 240], [1, 2, 3, 1]))
+    build_target(builder)
+    result = run_command(operations.operations, "queue")
+    assert result.error is None
+    lines = result.getvalue().splitlines()
+    assert len(lines) == 8
+    assert lines[0].startswith("[0] <NSOperation: 0x")
+    assert lines[1].startswith("[1] <NSBlockOperation: 0x")
+    assert lines[4:] == ["4 operations.", "  state=0: 2", "  state=240: 2", "  cancelled: 1"]
+
+
+@pytest.mark.parametrize("max_count, summary", LIMITS)
+def test_operations_limited(builder, build_target, run_command, max_count, summary):
+    builder.add_variable("queue", "NSOperationQueue *", new_queue(builder, [0, 0, 0, 0], [1, 2, 3, None]))
+    build_target(builder)
+    lines = run_command(operations.operations, "queue", str(max_count)).getvalue().splitlines()
+    assert lines[-3:] == [summary, "  state=0: {}".format(min(max_count or 4, 4)), "  cancelled: 1"]
+
+
+def test_operations_invalid_arguments(builder, build_target, run_command):
+    builder.add_variable("queue", "NSOperationQueue *", new_queue(builder, [0], [None]))
+    build_target(builder)
+    for args in (["queue", "x"], ["missing"], []):
+        assert run_command(operations.operations, *args).error is not None
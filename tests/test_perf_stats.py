@@ -0,0 +1,134 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import pytest
+from mallet import perf_stats
+from mallet.CFNetwork import NSURLSessionTask
+from mallet.commands import perf
+
+# Samples (in seconds), percent and expected percentile (interpolated in bucket, bucket is limited by maximum).
+PERCENTILES = [([], 50, 0.0),
+               ([0.00002] * 10, 50, 0.000015),
+               ([0.00002] * 9 + [0.3], 50, 0.0000183),
+               ([0.00002] * 9 + [0.3], 99, 0.295),
+               ([2.0, 3.0], 100, 3.0)]
+
+
+@pytest.fixture
+def stats():
+    """
+    Shared latency statistics without samples, default configuration is restored after test.
+
+    :rtype: perf_stats.PerfStats
+    """
+    stats = perf_stats.get_perf_stats()
+    stats.configure()
+    stats.reset()
+    yield stats
+    stats.configure()
+    stats.reset()
+
+
+@pytest.mark.parametrize("samples, percent, percentile", PERCENTILES)
+def test_histogram_percentile(samples, percent, percentile):
+    histogram = perf_stats.LatencyHistogram()
+    for sample in samples:
+        histogram.add(sample)
+    assert histogram.count == len(samples)
+    assert histogram.max == max(samples or [0.0])
+    assert histogram.percentile(percent) == pytest.approx(percentile, rel=0.01)
+
+
+def test_histogram_buckets():
+    histogram = perf_stats.LatencyHistogram()
+    for sample in [0.00001, 0.000011, 0.001, 5.0]:
+        histogram.add(sample)
+    assert histogram.counts[0] == 1
+    assert histogram.counts[1] == 1
+    assert histogram.counts[histogram.BUCKET_BOUNDS.index(0.001)] == 1
+    assert histogram.counts[-1] == 1
+    assert histogram.total == pytest.approx(5.001021)
+
+
+def test_slow_calls_logged(builder, build_target, stats):
+    task = builder.new_object("NSURLSessionTask")
+    builder.add_variable("task", "NSURLSessionTask *", task)
+    target = build_target(builder)
+    stats.configure(slow_threshold=1.0, slow_log_size=2)
+    stats.record("Provider", "summary", 0.5, None)
+    stats.record("Provider", "summary", 1.5, target.FindVariable("task"))
+    stats.record("Provider", "num_children", 2.0, None)
+    stats.record_timeout("Provider", 0.2, None)
+    assert stats.histograms[("Provider", "summary")].count == 2
+    assert stats.timeouts["Provider"] == 1
+    # The oldest slow call is removed from full log.
+    assert [(s.operation, s.duration) for s in stats.slow_log] == [("num_children", 2.0), ("summary timeout", 0.2)]
+
+    stats.configure(slow_threshold=1.0, slow_log_size=3)
+    stats.record("Provider", "summary", 1.5, target.FindVariable("task"))
+    slow_summary = stats.slow_log[-1]
+    assert (slow_summary.type_name, slow_summary.address) == ("NSURLSessionTask *", task)
+    assert str(slow_summary).endswith("1500.0ms  summary NSURLSessionTask * (Provider) 0x{:x}".format(task))
+    lines = stats.slow_log_report().splitlines()
+    assert lines[0] == "Slow calls (threshold 1000.0ms, 3 / 3):"
+    assert len(lines) == 4
+
+
+def test_summaries_recorded(builder, build_target, stats):
+    builder.add_variable("task", "NSURLSessionTask *", builder.new_object("NSURLSessionTask"))
+    target = build_target(builder)
+    for _ in range(3):
+        NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+    assert stats.histograms[("NSURLSessionTaskSyntheticProvider", "summary")].count == 3
+
+    stats.reset()
+    stats.enabled = False
+    NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+    assert stats.histograms == dict()
+
+
+def test_perf_command(run_command, stats):
+    stats.record("FastProvider", "summary", 0.001, None)
+    stats.record("SlowProvider", "summary", 0.01, None)
+    stats.record("SlowProvider", "summary", 0.1, None)
+    lines = run_command(perf.perf, "report", "count").getvalue().splitlines()
+    assert lines[0].split() == ["Provider", "Operation", "Count", "p50", "ms", "p95", "ms", "p99", "ms", "max", "ms"]
+    assert [line.split()[:3] for line in lines[1:3]] == [["SlowProvider", "summary", "2"],
+                                                         ["FastProvider", "summary", "1"]]
+    assert lines[4] == "Slow calls (threshold 50.0ms, 1 / 100):"
+    assert len(run_command(perf.perf, "report", "p99", "1").getvalue().splitlines()) == 5
+    assert run_command(perf.perf, "slow").getvalue().splitlines()[1].endswith("summary None (SlowProvider) 0x0")
+
+    assert run_command(perf.perf, "threshold", "20").getvalue() == "Slow summary threshold: 20.0ms.\n"
+    assert stats.slow_threshold == pytest.approx(0.02)
+    assert run_command(perf.perf, "reset").getvalue() == "Latency statistics reset.\n"
+    assert stats.histograms == dict() and len(stats.slow_log) == 0
+    assert run_command(perf.perf, "disable").getvalue() == "Latency statistics disabled.\n"
+    assert run_command(perf.perf).getvalue().startswith("Latency statistics are disabled.\n")
+    assert run_command(perf.perf, "enable").getvalue() == "Latency statistics enabled.\n"
+    assert stats.enabled
+
+    assert run_command(perf.perf, "report", "mean").error == "Invalid sort column \"mean\"."
+    assert run_command(perf.perf, "report", "p50", "x").error == "Invalid limit \"x\"."
+    assert run_command(perf.perf, "threshold", "x").error == "Invalid threshold \"x\"."
+    assert run_command(perf.perf, "start").error is not None
@@ -0,0 +1,118 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import threading
+from mallet import tracer
+from mallet.CFNetwork import NSURLSessionTask
+
+
+def test_summary_reuses_provider_locked_by_other_thread(builder, build_target):
+    for name, identifier in (("first", 1), ("second", 2)):
+        task = builder.new_object("NSURLSessionTask", {"_taskIdentifier": identifier, "_state": 0})
+        builder.add_variable(name, "NSURLSessionTask *", task)
+    target = build_target(builder)
+    first = NSURLSessionTask.NSURLSessionTaskSyntheticProvider(target.FindVariable("first"), {})
+    second = NSURLSessionTask.NSURLSessionTaskSyntheticProvider(target.FindVariable("second"), {})
+    first.update()
+    second.update()
+    assert first.lock is not second.lock
+
+    t = tracer.get_tracer()
+    t.enable()
+    # Provider of another object is being updated by other thread.
+    locked = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with first.lock:
+            locked.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    try:
+        locked.wait(5)
+        summary = NSURLSessionTask.summary_provider(target.FindVariable("second"), {})
+    finally:
+        release.set()
+        thread.join()
+    assert summary == "Running"
+    assert ("provider_reuse", "NSURLSessionTaskSyntheticProvider") in [r[1:3] for r in t.records()]
+
+
+def test_summary_waits_for_registered_provider_of_same_object(builder, build_target):
+    task = builder.new_object("NSURLSessionTask", {"_taskIdentifier": 1, "_state": 0})
+    builder.add_variable("task", "NSURLSessionTask *", task)
+    target = build_target(builder)
+    provider = NSURLSessionTask.NSURLSessionTaskSyntheticProvider(target.FindVariable("task"), {})
+    provider.update()
+
+    summaries = list()
+    thread = threading.Thread(
+        target=lambda: summaries.append(NSURLSessionTask.summary_provider(target.FindVariable("task"), {})))
+    # LLDB updates registered provider in other thread.
+    with provider.lock:
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+        assert summaries == []
+    thread.join(5)
+    assert summaries == ["Running"]
+
+
+def test_registered_provider_used_by_two_threads(builder, build_target):
+    task = builder.new_object("NSURLSessionTask", {"_taskIdentifier": 1, "_state": 0})
+    builder.add_variable("task", "NSURLSessionTask *", task)
+    target = build_target(builder)
+    provider = NSURLSessionTask.NSURLSessionTaskSyntheticProvider(target.FindVariable("task"), {})
+    provider.update()
+    names = [provider.get_child_at_index(i).GetName() for i in range(provider.num_children())]
+
+    results = {"children": set(), "summaries": set()}
+    errors = list()
+
+    def show_children():
+        try:
+            for _ in range(50):
+                provider.update()
+                if provider.has_children():
+                    children = [provider.get_child_at_index(i).GetName() for i in range(provider.num_children())]
+                    results["children"].add(tuple(children))
+        except Exception as e:
+            errors.append(e)
+
+    def show_summaries():
+        try:
+            for _ in range(50):
+                results["summaries"].add(NSURLSessionTask.summary_provider(target.FindVariable("task"), {}))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=show_children), threading.Thread(target=show_summaries)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert errors == []
+    assert results == {"children": {tuple(names)}, "summaries": {"Running"}}
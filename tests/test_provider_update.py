@@ -0,0 +1,90 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+from mallet.Foundation import NSObject
+from mallet.UIKit import UINavigationController
+from mallet.UIKit import UIView
+
+
+def get_ivar_offset(builder, class_name, ivar_name):
+    """
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param str class_name: Class name.
+    :param str ivar_name: Ivar name.
+    :rtype: int
+    """
+    return [f.offset for f in builder.type_table.find_type(class_name).fields if f.name == ivar_name][0]
+
+
+def test_update_of_unchanged_object(builder, build_target):
+    builder.add_variable("view", "UIView *", builder.new_object("UIView", {"_tag": 1}))
+    target = build_target(builder)
+    provider = UIView.UIViewSyntheticProvider(target.FindVariable("view"), {})
+    assert provider.update() is False
+    assert provider.update() is True
+    # Memory didn't change after resume.
+    target.GetProcess().Continue()
+    assert provider.update() is True
+
+
+def test_update_after_memory_change(builder, build_target):
+    view = builder.new_object("UIView", {"_tag": 1})
+    builder.add_variable("view", "UIView *", view)
+    target = build_target(builder)
+    provider = UIView.UIViewSyntheticProvider(target.FindVariable("view"), {})
+    provider.update()
+    assert provider.tag_value == 1
+
+    tag_address = view + get_ivar_offset(builder, "UIView", "_tag")
+    target.GetProcess().run_expression({tag_address: (2).to_bytes(builder.pointer_size, "little")})
+    assert provider.update() is False
+    # Cached child values are dropped.
+    assert provider.tag_value == 2
+    assert provider.update() is True
+
+
+def test_update_after_proxy_collection_change(builder, build_target):
+    controllers = [builder.new_object("UIViewController") for _ in range(3)]
+    array = builder.new_collection("__NSArrayM", controllers)
+    builder.add_variable("controller", "UINavigationController *",
+                         builder.new_object("UINavigationController", {"_childViewControllers": array}))
+    target = build_target(builder)
+    provider = UINavigationController.UINavigationControllerSyntheticProvider(target.FindVariable("controller"), {})
+    provider.update()
+    assert provider.num_children() == 3
+    assert provider.update() is True
+
+    # Collection changed, memory of controller is the same.
+    target.image.elements[array].append(builder.new_object("UIViewController"))
+    target.GetProcess().Continue()
+    assert provider.update() is False
+    assert provider.num_children() == 4
+    assert provider.update() is True
+
+
+def test_update_of_unreadable_object(builder, build_target):
+    builder.add_variable("object", "NSObject *", 0x7f000)
+    target = build_target(builder)
+    provider = NSObject.NSObjectSyntheticProvider(target.FindVariable("object"), {})
+    assert provider.update() is False
+    assert provider.update() is False
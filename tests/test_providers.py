@@ -0,0 +1,48 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import pytest
+from mallet import tracer
+from mallet.StoreKit import SKProductsRequest
+from mallet.UIKit import UIView
+
+
+def test_products_request_summary(builder, build_target):
+    identifiers = builder.new_collection("__NSSetI", [builder.new_string("a"), builder.new_string("b")])
+    internal = builder.new_object("SKProductsRequestInternal", {"_productIdentifiers": identifiers})
+    request = builder.new_object("SKProductsRequest", {"_productsRequestInternal": internal})
+    builder.add_variable("request", "SKProductsRequest *", request)
+    target = build_target(builder)
+    assert SKProductsRequest.summary_provider(target.FindVariable("request"), {}) == "@\"2 products\""
+
+
+def test_traced_high_bit_pointer(builder, build_target):
+    if builder.pointer_size != 8:
+        pytest.skip("32-bit pointers don't have high bit set.")
+    builder.add_variable("view", "UIView *", 0xdeadbeefdeadbee0)
+    target = build_target(builder)
+    t = tracer.get_tracer()
+    t.enable()
+    assert UIView.summary_provider(target.FindVariable("view"), {}) is None
+    assert (t.records()[-1][1], t.records()[-1][3]) == ("implausible_pointer", 0xdeadbeefdeadbee0)
@@ -0,0 +1,152 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import threading
+import pytest
+from mallet import recorded_lldb
+from mallet import sb_accounting
+from mallet.CFNetwork import NSURLSessionTask
+from mallet.commands import sb_stats
+
+
+@pytest.fixture
+def accounting():
+    """
+    Enabled SB API accounting, disabled after test.
+
+    :rtype: sb_accounting.SBAccounting
+    """
+    accounting = sb_accounting.get_sb_accounting()
+    accounting.reset()
+    accounting.enable()
+    yield accounting
+    accounting.disable()
+    accounting.reset()
+
+
+def test_methods_wrapped_and_restored():
+    accounting = sb_accounting.get_sb_accounting()
+    original_method = recorded_lldb.SBValue.GetValueAsUnsigned
+    accounting.enable()
+    try:
+        assert recorded_lldb.SBValue.GetValueAsUnsigned.__sb_accounting_wrapped__ is original_method
+        # Enabling twice doesn't wrap wrapped methods.
+        accounting.enable()
+        assert recorded_lldb.SBValue.GetValueAsUnsigned.__sb_accounting_wrapped__ is original_method
+    finally:
+        accounting.disable()
+        accounting.reset()
+    assert recorded_lldb.SBValue.GetValueAsUnsigned is original_method
+
+
+def test_calls_counted_per_provider(builder, build_target, accounting):
+    task = builder.new_object("NSURLSessionTask", {"_taskIdentifier": 1, "_state": 0})
+    builder.add_variable("task", "NSURLSessionTask *", task)
+    target = build_target(builder)
+    target.FindVariable("task").GetValueAsUnsigned()
+    assert accounting.calls["SBTarget.FindVariable"] == 1
+    assert accounting.provider_calls[(accounting.UNKNOWN_PROVIDER, "SBValue.GetValueAsUnsigned")] == 1
+
+    NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+    provider_calls = [(key, count) for (provider_name, key), count in accounting.provider_calls.items()
+                      if provider_name == "NSURLSessionTaskSyntheticProvider"]
+    assert len(provider_calls) > 0
+    # Calls made by wrapped methods are not counted.
+    assert sum(accounting.calls.values()) == sum(accounting.provider_calls.values())
+
+
+def test_duplicated_reads_in_one_stop(builder, build_target, accounting):
+    task = builder.new_object("NSURLSessionTask", {"_taskIdentifier": 1, "_state": 0})
+    builder.add_variable("task", "NSURLSessionTask *", task)
+    target = build_target(builder)
+    value = target.FindVariable("task")
+    value.GetValueAsUnsigned()
+    value.GetValueAsUnsigned()
+    key = (accounting.UNKNOWN_PROVIDER, "SBValue.GetValueAsUnsigned")
+    assert (accounting.provider_calls[key], accounting.duplicates[key]) == (2, 1)
+    assert accounting.duplicated_addresses[("SBValue.GetValueAsUnsigned", value.GetLoadAddress())] == 1
+
+    # The same read in the next stop is not duplicated.
+    target.GetProcess().Continue()
+    value.GetValueAsUnsigned()
+    assert (accounting.provider_calls[key], accounting.duplicates[key]) == (3, 1)
+
+    # FindVariable, GetLoadAddress, GetProcess, Continue and 3 reads.
+    report = accounting.report(5)
+    assert "Total SB API calls: 7, duplicated reads: 1." in report
+    assert "       1 / 3        <none> SBValue.GetValueAsUnsigned" in report.splitlines()
+    accounting.reset()
+    assert sum(accounting.calls.values()) == 0 and sum(accounting.duplicates.values()) == 0
+
+
+def test_sb_stats_command(builder, build_target, run_command, accounting):
+    accounting.disable()
+    builder.add_variable("task", "NSURLSessionTask *", builder.new_object("NSURLSessionTask"))
+    target = build_target(builder)
+    assert run_command(sb_stats.sb_stats, "enable").getvalue() == "SB API accounting enabled.\n"
+    assert accounting.enabled
+    NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+    lines = run_command(sb_stats.sb_stats, "report", "3").getvalue().splitlines()
+    assert any(line.endswith(" NSURLSessionTaskSyntheticProvider") for line in lines)
+    # Section is limited to 3 methods.
+    methods_index = lines.index("Methods by SB API calls:")
+    assert lines[methods_index + 4] == ""
+    assert run_command(sb_stats.sb_stats, "reset").getvalue() == "SB API accounting statistics reset.\n"
+    assert sum(accounting.calls.values()) == 0
+    assert run_command(sb_stats.sb_stats, "disable").getvalue() == "SB API accounting disabled.\n"
+    assert run_command(sb_stats.sb_stats).getvalue().startswith("SB API accounting is disabled.\n")
+    assert run_command(sb_stats.sb_stats, "report", "x").error == "Invalid limit \"x\"."
+    assert run_command(sb_stats.sb_stats, "start").error is not None
+
+
+def test_calls_counted_in_two_threads(builder, build_target, accounting):
+    task = builder.new_object("NSURLSessionTask", {"_taskIdentifier": 1, "_state": 0})
+    builder.add_variable("task", "NSURLSessionTask *", task)
+    target = build_target(builder)
+    # Warms up caches, so every summary makes the same calls.
+    NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+    accounting.reset()
+    NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+    calls = sum(accounting.calls.values())
+    assert calls > 0
+    assert accounting.provider_calls[("NSURLSessionTaskSyntheticProvider", "SBValue.GetValueAsUnsigned")] > 0
+
+    accounting.reset()
+    errors = list()
+
+    def show_summaries():
+        try:
+            for _ in range(20):
+                NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=show_summaries) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert errors == []
+    # Calls of other thread in progress don't hide calls of current thread.
+    assert sum(accounting.calls.values()) == 40 * calls
+    assert "Total SB API calls: {}".format(40 * calls) in accounting.report()
@@ -0,0 +1,126 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import lldb
+import pytest
+from mallet import string_decoder
+from mallet import tagged_pointer
+
+# Length, payload and text of tagged pointer strings.
+TAGGED_PAYLOADS = [
+    # 8-bit characters.
+    (3, int.from_bytes(b"abc", "little"), "abc"),
+    # 6-bit indexes of alphabet ("e" - 0, "i" - 1, "l" - 2).
+    (8, int("".join("{:06b}".format(i) for i in [0, 1, 2, 0, 1, 2, 0, 1]), 2), "eileilei"),
+    # 5-bit indexes of alphabet.
+    (10, int("".join("{:05b}".format(i) for i in [3, 4, 5, 6, 7, 8, 9, 10, 11, 12]), 2), "otrm.apdns"),
+]
+
+
+def get_string_value(target, name):
+    """
+    :rtype: lldb.SBValue
+    """
+    return target.FindVariable(name).GetDynamicValue(lldb.eDynamicDontRunTarget)
+
+
+@pytest.mark.parametrize("class_name", ["__NSCFString", "__NSCFConstantString"])
+@pytest.mark.parametrize("text", ["", "ascii text", "zażółć gęślą jaźń"])
+def test_cf_string(builder, build_target, class_name, text):
+    builder.add_variable("string", "NSString *", builder.new_string(text, class_name))
+    target = build_target(builder)
+    decoder = string_decoder.get_string_decoder()
+    value = get_string_value(target, "string")
+    assert decoder.get_text(value) == text
+    assert decoder.get_summary(value) == "@\"{}\"".format(text)
+
+
+def test_cf_string_escaping(builder, build_target):
+    builder.add_variable("string", "NSString *", builder.new_string("a\"b\\c\nd"))
+    target = build_target(builder)
+    assert string_decoder.get_string_decoder().get_summary(get_string_value(target, "string")) == \
+        "@\"a\\\"b\\\\c\\nd\""
+
+
+def test_cf_string_truncation(builder, build_target):
+    builder.add_variable("string", "NSString *", builder.new_string("x" * 20))
+    target = build_target(builder)
+    decoder = string_decoder.get_string_decoder()
+    decoder.max_length = 8
+    try:
+        value = get_string_value(target, "string")
+        assert decoder.get_text(value) == "x" * 8 + "..."
+        assert decoder.get_summary(value) == "@\"{}...\"".format("x" * 8)
+    finally:
+        decoder.max_length = string_decoder.StringDecoder.DEFAULT_MAX_LENGTH
+
+
+def test_text_at_address(builder, build_target):
+    address = builder.new_string("field")
+    target = build_target(builder)
+    assert string_decoder.get_string_decoder().get_text_at_address(target.GetProcess(), address) == "field"
+    assert string_decoder.get_string_decoder().get_text_at_address(target.GetProcess(), 0) is None
+
+
+def test_unreadable_string(builder, build_target):
+    target = build_target(builder)
+    assert string_decoder.get_string_decoder().get_text_at_address(target.GetProcess(), 0x7f000000) is None
+
+
+@pytest.mark.parametrize("length, payload, text", TAGGED_PAYLOADS)
+def test_tagged_pointer_payload(length, payload, text):
+    assert string_decoder.StringDecoder.decode_tagged_pointer_payload((payload << 4) | length) == text
+
+
+def test_tagged_pointer_payload_too_long():
+    assert string_decoder.StringDecoder.decode_tagged_pointer_payload(12) is None
+    assert string_decoder.StringDecoder.decode_tagged_pointer_payload(None) is None
+
+
+def test_tagged_pointer_string(build_target, class_dump_manager):
+    from mallet import recorded_lldb
+    builder = recorded_lldb.MemoryImageBuilder("arm64", class_dump_manager)
+    payload = (int.from_bytes(b"tag", "little") << 4) | 3
+    pointer = builder.new_tagged_pointer("NSTaggedPointerString", tagged_pointer.TAG_NSSTRING, payload)
+    builder.add_variable("string", "NSString *", pointer)
+    target = build_target(builder)
+    value = get_string_value(target, "string")
+    assert string_decoder.get_string_decoder().get_summary(value) == "@\"tag\""
+
+
+def test_string_changed_by_expression(builder, build_target):
+    old = builder.new_string("old")
+    new = builder.new_string("new")
+    variable = builder.add_variable("string", "NSString *", old)
+    target = build_target(builder)
+    decoder = string_decoder.get_string_decoder()
+    assert decoder.get_text(get_string_value(target, "string")) == "old"
+    assert decoder.get_text_at_address(target.GetProcess(), old) == "old"
+
+    # expr string = @"new", changes variable and the old string in the same stop.
+    process = target.GetProcess()
+    contents = old + builder.pointer_size * 3 if builder.pointer_size == 8 else old + 12
+    process.run_expression({variable: new.to_bytes(builder.pointer_size, "little"), contents: b"mod"})
+    assert decoder.get_text(get_string_value(target, "string")) == "new"
+    assert decoder.get_text_at_address(process, old) == "mod"
@@ -0,0 +1,74 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from mallet import summary_budget
+from mallet.common import SummaryBase
+from mallet.CFNetwork import NSURLSessionTask
+
+
+def test_nested_clear_keeps_exceeded_flag():
+    budget = summary_budget.SummaryBudget()
+    budget.budget = -1.0
+    assert budget.enter()
+    assert budget.is_exceeded()
+    assert not budget.enter()
+    budget.clear()
+    assert budget.is_exceeded()
+    budget.leave()
+    budget.leave()
+    assert budget.exceeded
+    budget.clear()
+    assert not budget.exceeded
+
+
+def test_nested_summary_keeps_exceeded_flag(builder, build_target, monkeypatch):
+    task = builder.new_object("NSURLSessionTask", {"_taskIdentifier": 1, "_state": 0})
+    builder.add_variable("task", "NSURLSessionTask *", task)
+    target = build_target(builder)
+    budget = summary_budget.get_summary_budget()
+    # Exceeded flag is set by parent summary, nested summary doesn't check the deadline.
+    monkeypatch.setattr(budget, "budget", None)
+    budget.enter()
+    budget.state.exceeded = True
+    try:
+        NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+        assert budget.exceeded
+    finally:
+        budget.leave()
+
+
+def test_summary_value_skipped_when_budget_exceeded(builder, build_target, monkeypatch):
+    obj = builder.new_object("NSObject")
+    builder.add_variable("obj", "NSObject *", obj)
+    target = build_target(builder)
+    target.image.summaries[obj] = "summary"
+    value = target.FindVariable("obj")
+    assert SummaryBase.get_summary_value(value) == "summary"
+    budget = summary_budget.get_summary_budget()
+    monkeypatch.setattr(budget, "budget", -1.0)
+    budget.enter()
+    try:
+        assert SummaryBase.get_summary_value(value) is None
+    finally:
+        budget.leave()
@@ -0,0 +1,77 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from mallet import summary_cache
+from mallet.CFNetwork import NSURLSessionTask
+
+
+def new_task_target(builder, build_target, received):
+    """
+    Builds target with "task" variable (NSURLSessionTask).
+
+    :return: Target and address of bytes received counter.
+    :rtype: (recorded_lldb.SBTarget, int)
+    """
+    task = builder.new_object("NSURLSessionTask", {"_taskIdentifier": 1, "_state": 0,
+                                                   "_countOfBytesReceived": received})
+    builder.add_variable("task", "NSURLSessionTask *", task)
+    offset = [f.offset for f in builder.type_table.find_type("NSURLSessionTask").fields
+              if f.name == "_countOfBytesReceived"][0]
+    return build_target(builder), task + offset
+
+
+def get_summary(target):
+    return NSURLSessionTask.summary_provider(target.FindVariable("task"), {})
+
+
+def test_summary_reused_in_next_stop(builder, build_target):
+    target, _ = new_task_target(builder, build_target, 10)
+    cache = summary_cache.get_summary_cache()
+    cache.enabled = True
+    summary = get_summary(target)
+    assert "received=10" in summary
+    target.GetProcess().Continue()
+    assert get_summary(target) == summary
+    assert cache.hits == 1
+
+
+def test_summary_changed_by_expression_in_the_same_stop(builder, build_target):
+    target, counter_address = new_task_target(builder, build_target, 10)
+    cache = summary_cache.get_summary_cache()
+    cache.enabled = True
+    assert "received=10" in get_summary(target)
+    # Memory is written between two summaries in one stop (e.g. by `expr`).
+    target.GetProcess().run_expression({counter_address: (20).to_bytes(8, "little")})
+    assert "received=20" in get_summary(target)
+    assert cache.hits == 0
+
+
+def test_summary_changed_in_next_stop(builder, build_target):
+    target, counter_address = new_task_target(builder, build_target, 10)
+    cache = summary_cache.get_summary_cache()
+    cache.enabled = True
+    get_summary(target)
+    target.image.write(counter_address, (30).to_bytes(8, "little"))
+    target.GetProcess().Continue()
+    assert "received=30" in get_summary(target)
@@ -0,0 +1,54 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+from mallet import summary_prefetch
+
+
+def test_token_cancelled_by_expression_and_resume(builder, build_target):
+    builder.add_variable("value", "int", 1)
+    process = build_target(builder).GetProcess()
+    token = summary_prefetch.CancellationToken(process)
+    assert not token.is_cancelled()
+    # Expression resumes the process, memory read before it can be stale.
+    process.run_expression()
+    assert token.is_cancelled()
+
+    token = summary_prefetch.CancellationToken(process)
+    process.Continue()
+    assert token.is_cancelled()
+
+    token = summary_prefetch.CancellationToken(process)
+    token.cancel()
+    assert token.is_cancelled()
+
+
+def test_disabled_prefetcher_ignores_stop_hook(builder, build_target):
+    builder.add_variable("value", "int", 1)
+    process = build_target(builder).GetProcess()
+    prefetcher = summary_prefetch.SummaryPrefetcher()
+    prefetcher.configure(True)
+    prefetcher.stop_hook_installed = True
+    prefetcher.configure(False)
+    assert prefetcher.stop_hook_installed
+    assert not prefetcher.prefetch(process.GetSelectedThread().GetSelectedFrame())
+    assert prefetcher.worker is None
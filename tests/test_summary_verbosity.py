@@ -0,0 +1,122 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import threading
+import pytest
+from mallet import recorded_lldb
+from mallet import summary_verbosity
+from mallet.UIKit import UILabel
+from mallet.commands import summary
+
+# Configured levels, category and expected verbosity level of category.
+LEVELS = [({}, "UIKit", "full"),
+          ({"UIKit": "fast"}, "UIKit", "fast"),
+          ({"UIKit": "fast"}, "Foundation", "full"),
+          ({"default": "fast", "UIKit": "full"}, "Foundation", "fast"),
+          ({"default": "fast", "UIKit": "full"}, "UIKit", "full"),
+          ({"UIKit": "slow"}, "UIKit", "full")]
+
+
+@pytest.fixture
+def verbosity():
+    """
+    Shared summary verbosity, default levels are restored after test.
+
+    :rtype: summary_verbosity.SummaryVerbosity
+    """
+    verbosity = summary_verbosity.get_summary_verbosity()
+    verbosity.configure(dict())
+    yield verbosity
+    verbosity.configure(dict())
+    verbosity.forced_level = None
+
+
+@pytest.fixture
+def label_target(builder, build_target):
+    """
+    Target with UILabel variable "label" (text "hello", tag 2).
+
+    :rtype: recorded_lldb.SBTarget
+    """
+    label = builder.new_object("UILabel", {"_content": builder.new_string("hello"), "_tag": 2})
+    builder.add_variable("label", "UILabel *", label)
+    return build_target(builder)
+
+
+@pytest.fixture
+def label_summary():
+    """
+    UILabel summary function registered in default category of shared debugger.
+    """
+    specifier = recorded_lldb.SBTypeNameSpecifier("UILabel")
+    category = recorded_lldb.debugger.GetDefaultCategory()
+    category.AddTypeSummary(specifier,
+                            recorded_lldb.SBTypeSummary.CreateWithFunctionName("mallet.UIKit.UILabel.summary_provider"))
+    yield
+    category.DeleteTypeSummary(specifier)
+
+
+@pytest.mark.parametrize("levels, category, level", LEVELS)
+def test_configured_levels(verbosity, levels, category, level):
+    verbosity.configure(levels)
+    assert verbosity.get_level(category) == level
+    verbosity.forced_level = summary_verbosity.VERBOSITY_FAST
+    assert verbosity.get_level(category) == summary_verbosity.VERBOSITY_FAST
+
+
+def test_cost_tiers(label_target):
+    provider = UILabel.UILabelSyntheticProvider(label_target.FindVariable("label"), {})
+    costs = {r.attribute_name: r.cost for r in provider.registered_child_values}
+    assert costs["tag"] == summary_verbosity.COST_DIRECT
+    assert costs["text"] == summary_verbosity.COST_NESTED
+
+
+def test_fast_summary_skips_nested_parts(label_target, verbosity):
+    assert UILabel.summary_provider(label_target.FindVariable("label"), {}) == "text=@\"hello\", tag=2"
+    verbosity.configure({"UIKit": "fast"})
+    assert UILabel.summary_provider(label_target.FindVariable("label"), {}) == "tag=2"
+    # Maximal cost is restored after summary.
+    assert verbosity.max_cost == summary_verbosity.COST_NESTED
+
+
+def test_forced_level_of_other_thread(label_target, verbosity):
+    verbosity.forced_level = summary_verbosity.VERBOSITY_FAST
+    summaries = list()
+    thread = threading.Thread(target=lambda: summaries.append(
+        UILabel.summary_provider(label_target.FindVariable("label"), {})))
+    thread.start()
+    thread.join(10)
+    assert summaries == ["text=@\"hello\", tag=2"]
+
+
+def test_summary_command(label_target, label_summary, verbosity, run_command):
+    verbosity.configure({"UIKit": "fast"})
+    result = run_command(summary.summary, "label")
+    assert result.error is None
+    assert result.getvalue() == "(UILabel *) label = text=@\"hello\", tag=2\n"
+    assert run_command(summary.summary, "label", "fast").getvalue() == "(UILabel *) label = tag=2\n"
+    assert verbosity.forced_level is None
+
+    assert run_command(summary.summary).error == "Missing variable."
+    assert run_command(summary.summary, "label", "slow").error is not None
+    assert run_command(summary.summary, "missing").error == "Cannot find variable \"missing\"."
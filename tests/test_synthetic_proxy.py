@@ -0,0 +1,113 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+from mallet import recorded_lldb
+from mallet.CFNetwork import NSURLRequest
+from mallet.UIKit import UINavigationController
+
+
+def new_request(builder, headers):
+    """
+    Creates NSURLRequest with HTTP headers dictionary.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param list[int] headers: Headers addresses (dictionary elements).
+    :return: Request address.
+    :rtype: int
+    """
+    is_64bit = builder.pointer_size == 8
+    header_dict = builder.allocate(0x20)
+    builder.write_value(header_dict + builder.pointer_size, "NSDictionary *",
+                        builder.new_collection("__NSDictionaryM", headers))
+    http_message = builder.allocate(0x100)
+    builder.write_value(http_message + (0x60 if is_64bit else 0x30), "void *", header_dict)
+    cf_request = builder.allocate(0x100)
+    builder.write_value(cf_request + (0x58 if is_64bit else 0x30), "void *", http_message)
+    internal = builder.new_object("NSURLRequestInternal")
+    request_offset = [f.offset for f in builder.type_table.find_type("NSURLRequestInternal").fields
+                      if f.name == "request"][0]
+    builder.write_value(internal + request_offset, "void *", cf_request)
+    return builder.new_object("NSURLRequest", {"_internal": internal})
+
+
+def expand_children(provider):
+    """
+    Calls synthetic children callbacks like LLDB expanding value in variables view.
+
+    :param SummaryBase.SummaryBaseSyntheticProvider provider: Provider.
+    :return: Children.
+    :rtype: list[lldb.SBValue]
+    """
+    children = list()
+    for index in range(provider.num_children()):
+        assert provider.has_children()
+        children.append(provider.get_child_at_index(index))
+        provider.num_children()
+    return children
+
+
+def test_proxy_value_copied_once_per_update(builder, build_target):
+    headers = [builder.new_string("Accept"), builder.new_string("Host")]
+    builder.add_variable("request", "NSURLRequest *", new_request(builder, headers))
+    target = build_target(builder)
+    provider = NSURLRequest.NSURLRequestSyntheticProvider(target.FindVariable("request"), {})
+    provider.update()
+    recorded_lldb.reset_statistics()
+    children = expand_children(provider)
+    assert [c.GetValueAsUnsigned() for c in children] == headers
+    proxy = provider.get_synthetic_proxy()
+    assert provider.synthetic_proxy_count == 2
+    # Proxy value is copied (and its children counted) once for all callbacks.
+    assert recorded_lldb.statistics["SBValue.SetPreferSyntheticValue"] == 1
+    assert recorded_lldb.statistics["SBValue.GetNumChildren"] == 1
+
+    provider.update()
+    assert provider.get_synthetic_proxy() is not proxy
+    assert provider.num_children() == 2
+
+
+def test_proxy_name_copied_once_per_update(builder, build_target):
+    controllers = [builder.new_object("UIViewController") for _ in range(5)]
+    navigation_controller = builder.new_object("UINavigationController", {
+        "_childViewControllers": builder.new_collection("__NSArrayM", controllers)})
+    builder.add_variable("controller", "UINavigationController *", navigation_controller)
+    target = build_target(builder)
+    provider = UINavigationController.UINavigationControllerSyntheticProvider(target.FindVariable("controller"), {})
+    provider.update()
+    recorded_lldb.reset_statistics()
+    children = expand_children(provider)
+    assert [c.GetValueAsUnsigned() for c in children] == controllers
+    assert recorded_lldb.statistics["SBValue.GetDynamicValue"] <= 1
+    assert recorded_lldb.statistics["SBValue.GetNumChildren"] == 1
+    assert provider.get_child_index("[2]") == 2
+
+
+def test_request_without_headers_has_no_proxy(builder, build_target):
+    builder.add_variable("request", "NSURLRequest *", new_request(builder, []))
+    builder.add_variable("empty", "NSURLRequest *", builder.new_object("NSURLRequest"))
+    target = build_target(builder)
+    for name in ["request", "empty"]:
+        provider = NSURLRequest.NSURLRequestSyntheticProvider(target.FindVariable(name), {})
+        provider.update()
+        assert provider.synthetic_proxy_value is None
+        assert provider.get_synthetic_proxy() is None
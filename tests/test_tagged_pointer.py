@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import pytest
+from mallet import tagged_pointer
+
+# Pointers which are not tagged on given architecture.
+NOT_TAGGED_POINTERS = [("x86_64", 0x100000010), ("arm64", 0x100000010), ("armv7", 0x10000001)]
+
+
+@pytest.mark.parametrize("architecture_name", ["x86_64", "arm64"])
+@pytest.mark.parametrize("payload", [0, 1, 0x123456789abcdef, (1 << tagged_pointer.PAYLOAD_BITS) - 1])
+def test_payload_round_trip(architecture_name, payload):
+    pointer = tagged_pointer.make_tagged_pointer(payload, tagged_pointer.TAG_NSNUMBER, architecture_name)
+    assert tagged_pointer.is_tagged_pointer(pointer, architecture_name)
+    assert tagged_pointer.could_be_tagged_pointer(pointer)
+    assert tagged_pointer.get_payload(pointer, architecture_name) == payload
+
+
+@pytest.mark.parametrize("architecture_name", ["x86_64", "arm64"])
+def test_signed_payload(architecture_name):
+    payload = (1 << tagged_pointer.PAYLOAD_BITS) - 5
+    pointer = tagged_pointer.make_tagged_pointer(payload, tagged_pointer.TAG_NSNUMBER, architecture_name)
+    assert tagged_pointer.get_payload(pointer, architecture_name, signed=True) == -5
+
+
+def test_low_tag_index_payload():
+    # arm64 since iOS 14: tag index in the lowest bits, payload shifted by tag bit.
+    payload = 0xabcdef
+    pointer = (1 << 63) | (payload << 3) | tagged_pointer.TAG_NSSTRING
+    assert tagged_pointer.get_payload(pointer, "arm64", low_tag_index=True) == payload
+
+
+@pytest.mark.parametrize("architecture_name, pointer", NOT_TAGGED_POINTERS)
+def test_not_tagged_pointer(architecture_name, pointer):
+    assert not tagged_pointer.is_tagged_pointer(pointer, architecture_name)
+    assert tagged_pointer.get_payload(pointer, architecture_name) is None
+
+
+def test_architecture_without_tagged_pointers():
+    with pytest.raises(ValueError):
+        tagged_pointer.make_tagged_pointer(1, tagged_pointer.TAG_NSNUMBER, "armv7")
+
+
+def test_process_payload(builder, build_target):
+    if builder.pointer_size != 8:
+        pytest.skip("32-bit architectures don't use tagged pointers.")
+    pointer = builder.new_tagged_pointer("__NSCFNumber", tagged_pointer.TAG_NSNUMBER, 0x1234)
+    target = build_target(builder)
+    pointers = tagged_pointer.get_tagged_pointers()
+    assert pointers.get_payload(target.GetProcess(), pointer) == 0x1234
+    assert pointers.get_payload(target.GetProcess(), 0x100000010) is None
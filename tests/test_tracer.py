@@ -0,0 +1,129 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import threading
+from mallet import tracer
+
+
+def test_disabled_tracer_records_nothing():
+    t = tracer.Tracer(4)
+    t.trace("event", "name", 1)
+    assert t.count == 0
+    assert t.records() == []
+
+
+def test_pack_unpack_high_bit_values():
+    t = tracer.Tracer(4)
+    t.enable()
+    t.trace("implausible_pointer", "UIView", 0xdeadbeefdeadbee0)
+    t.trace("child_value", "_layer", -1)
+    assert [record[3] for record in t.records()] == [0xdeadbeefdeadbee0, 0xffffffffffffffff]
+
+
+def test_pack_unpack():
+    t = tracer.Tracer(4)
+    t.enable()
+    t.trace("provider_init", "UIViewSyntheticProvider", 42)
+    t.trace("ivar_read", "", 7)
+    t.trace("summary")
+    records = t.records()
+    assert [r[1:] for r in records] == [("provider_init", "UIViewSyntheticProvider", 42), ("ivar_read", "", 7),
+                                        ("summary", "", 0)]
+    assert records[0][0] <= records[1][0] <= records[2][0]
+
+
+def test_ring_buffer():
+    t = tracer.Tracer(3)
+    t.enable()
+    for index in range(5):
+        t.trace("event", "name", index)
+    assert t.count == 5
+    assert [r[3] for r in t.records()] == [2, 3, 4]
+    assert [r[3] for r in t.records(2)] == [3, 4]
+
+
+def test_enable_with_new_size_clears_buffer():
+    t = tracer.Tracer(3)
+    t.enable()
+    t.trace("event")
+    t.enable(5)
+    assert t.count == 0
+    assert t.size == 5
+
+
+def test_clear():
+    t = tracer.Tracer(3)
+    t.enable()
+    t.trace("event", "name", 1)
+    t.clear()
+    assert t.records() == []
+    t.trace("other", "subject", 2)
+    assert [r[1:] for r in t.records()] == [("other", "subject", 2)]
+
+
+def test_dump():
+    t = tracer.Tracer(3)
+    t.enable()
+    t.trace("event", "name", 1)
+    lines = t.dump().splitlines()
+    assert lines[0] == "Trace: 1 events recorded, 1 in buffer (enabled)."
+    assert lines[1].split()[1:] == ["event", "name", "1"]
+
+
+def test_full_string_table_doesnt_alias_strings():
+    t = tracer.Tracer(4)
+    t.enable()
+    t.trace("event", "first", 1)
+    t.strings.extend("name{}".format(i) for i in range(tracer.Tracer.MAX_STRINGS - len(t.strings)))
+    t.trace("event", "new name", 2)
+    records = t.records()
+    assert records[0][1:] == ("event", "first", 1)
+    assert records[1][1:] == ("event", tracer.Tracer.OVERFLOW_STRING, 2)
+    assert "new name" not in t.string_ids
+    assert len(t.strings) == tracer.Tracer.MAX_STRINGS
+
+
+def test_clear_while_tracing():
+    t = tracer.Tracer(64)
+    t.enable()
+    stop = threading.Event()
+
+    def trace_events():
+        index = 0
+        while not stop.is_set():
+            t.trace("event", "name{}".format(index % 10), index)
+            index += 1
+
+    thread = threading.Thread(target=trace_events)
+    thread.start()
+    try:
+        for _ in range(200):
+            t.clear()
+            t.records()
+    finally:
+        stop.set()
+        thread.join()
+    # Every record refers to interned strings of its generation.
+    for _, event, name, _ in t.records():
+        assert event == "event" and name.startswith("name")
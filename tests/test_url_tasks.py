@@ -0,0 +1,162 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import pytest
+from mallet import recorded_lldb
+from mallet.commands import url_tasks
+
+# Session classes with task collection ivar: class name, base class name and task collection ivar name.
+SESSION_CLASSES = [("__NSURLSessionLocal", "NSURLSession", "_taskMap"),
+                   ("AFURLSessionManager", "NSObject", "_mutableTaskDelegatesKeyedByTaskIdentifier")]
+
+
+def add_class_type(type_table, class_name, base_class_name, ivar_names):
+    """
+    Adds class (not present in class dumps) with base class ivars and given pointer ivars to type table.
+
+    :param recorded_lldb.TypeTable type_table: Type table.
+    :param str class_name: Class name.
+    :param str base_class_name: Base class name.
+    :param list[str] ivar_names: Names of pointer ivars.
+    """
+    base_type = type_table.find_type(base_class_name)
+    pointer_size = type_table.pointer_size
+    t = recorded_lldb.SBType(class_name, "class", max(base_type.size, pointer_size), pointer_size=pointer_size)
+    t.fields = list(base_type.fields)
+    for ivar_name in ivar_names:
+        t.size = (t.size + pointer_size - 1) // pointer_size * pointer_size
+        t.fields.append(recorded_lldb.SBTypeMember(ivar_name, t.size, type_table.find_type("NSObject *")))
+        t.size += pointer_size
+    type_table.types[class_name] = t
+
+
+def new_tasks(builder, count):
+    """
+    Creates tasks with identifiers from 1, state equal to identifier modulo 4 and URLs "http://example.com/<id>".
+    Odd tasks are private __NSCFLocalDataTask objects.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param int count: Number of tasks.
+    :return: Tasks addresses.
+    :rtype: list[int]
+    """
+    request_offset = [f.offset for f in builder.type_table.find_type("NSURLRequestInternal").fields
+                      if f.name == "request"][0]
+    # Offset of URL in CFURLRequest.
+    url_offset = 0x28 if builder.pointer_size == 8 else 0x14
+    tasks = list()
+    for identifier in range(1, count + 1):
+        cf_request = builder.allocate(0x100)
+        url = builder.new_url("http://example.com/{}".format(identifier))
+        builder.write_value(cf_request + url_offset, "NSURL *", url)
+        internal = builder.new_object("NSURLRequestInternal")
+        builder.write_value(internal + request_offset, "void *", cf_request)
+        request = builder.new_object("NSURLRequest", {"_internal": internal})
+        tasks.append(builder.new_object("__NSCFLocalDataTask" if identifier % 2 else "NSURLSessionDownloadTask",
+                                        {"_taskIdentifier": identifier, "_state": identifier % 4,
+                                         "_countOfBytesReceived": 10 * identifier,
+                                         "_countOfBytesExpectedToReceive": 1000, "_originalRequest": request}))
+    return tasks
+
+
+def new_session(builder, class_name, base_class_name, ivar_name, tasks):
+    """
+    Creates session (or session manager) with task dictionary and adds it as "session" variable.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param str class_name: Session class name.
+    :param str base_class_name: Base class name.
+    :param str ivar_name: Name of task collection ivar.
+    :param list[int] tasks: Tasks addresses.
+    :return: Session address.
+    :rtype: int
+    """
+    add_class_type(builder.type_table, class_name, base_class_name, [ivar_name])
+    session = builder.new_object(class_name, {ivar_name: builder.new_collection("__NSDictionaryM", tasks)})
+    builder.add_variable("session", "NSObject *", session)
+    return session
+
+
+def test_tasks_table(builder, build_target, run_command):
+    builder.add_variable("tasks", "NSArray *", builder.new_collection("__NSArrayI", new_tasks(builder, 5)))
+    build_target(builder)
+    result = run_command(url_tasks.url_tasks, "tasks")
+    assert result.error is None
+    lines = result.getvalue().splitlines()
+    assert len(lines) == 7
+    assert lines[1].split() == ["1", "Suspended", "10/1000", "0/0", "http://example.com/1"]
+    assert lines[4].split() == ["4", "Running", "40/1000", "0/0", "http://example.com/4"]
+    assert lines[-1] == "5 tasks."
+
+
+def test_tasks_json_and_limit(builder, build_target, run_command):
+    tasks = new_tasks(builder, 5)
+    builder.add_variable("tasks", "NSArray *", builder.new_collection("__NSArrayI", tasks))
+    build_target(builder)
+    result = run_command(url_tasks.url_tasks, "tasks", "json", "3")
+    assert result.error is None
+    tasks_json = json.loads(result.getvalue())
+    assert [t["id"] for t in tasks_json] == [1, 2, 3]
+    assert tasks_json[1] == {"id": 2, "class": "NSURLSessionDownloadTask", "address": "0x{:x}".format(tasks[1]),
+                             "state": "Canceling", "received": 20, "toReceive": 1000, "sent": 0, "toSend": 0,
+                             "description": None, "url": "http://example.com/2"}
+
+    result = run_command(url_tasks.url_tasks, "tasks", "table", "4")
+    assert result.getvalue().splitlines()[-1] == "4 tasks (limited)."
+    assert run_command(url_tasks.url_tasks, "tasks", "table", "5").getvalue().splitlines()[-1] == "5 tasks."
+    assert run_command(url_tasks.url_tasks, "tasks", "table", "0").getvalue().splitlines()[-1] == "5 tasks."
+
+
+@pytest.mark.parametrize("class_name, base_class_name, ivar_name", SESSION_CLASSES)
+def test_tasks_of_session(builder, build_target, run_command, class_name, base_class_name, ivar_name):
+    new_session(builder, class_name, base_class_name, ivar_name, new_tasks(builder, 3))
+    target = build_target(builder)
+    add_class_type(target.type_table, class_name, base_class_name, [ivar_name])
+    result = run_command(url_tasks.url_tasks, "session", "json")
+    assert result.error is None
+    tasks_json = json.loads(result.getvalue())
+    assert [(t["id"], t["state"], t["url"]) for t in tasks_json] == [(1, "Suspended", "http://example.com/1"),
+                                                                      (2, "Canceling", "http://example.com/2"),
+                                                                      (3, "Completed", "http://example.com/3")]
+
+
+def test_session_manager_session_searched(builder, build_target, run_command):
+    session = new_session(builder, "__NSURLSessionLocal", "NSURLSession", "_taskMap", new_tasks(builder, 2))
+    add_class_type(builder.type_table, "AFHTTPSessionManager", "NSObject", ["_session"])
+    builder.add_variable("manager", "NSObject *", builder.new_object("AFHTTPSessionManager", {"_session": session}))
+    target = build_target(builder)
+    add_class_type(target.type_table, "__NSURLSessionLocal", "NSURLSession", ["_taskMap"])
+    add_class_type(target.type_table, "AFHTTPSessionManager", "NSObject", ["_session"])
+    assert run_command(url_tasks.url_tasks, "manager").getvalue().splitlines()[-1] == "2 tasks."
+
+
+def test_invalid_arguments(builder, build_target, run_command):
+    builder.add_variable("tasks", "NSArray *", builder.new_collection("__NSArrayI", new_tasks(builder, 1)))
+    builder.add_variable("object", "NSObject *", builder.new_object("NSObject"))
+    build_target(builder)
+    assert run_command(url_tasks.url_tasks).error == "Missing URL session."
+    assert run_command(url_tasks.url_tasks, "tasks", "xml").error == "Invalid format \"xml\"."
+    assert run_command(url_tasks.url_tasks, "tasks", "table", "x").error == "Invalid number \"x\"."
+    assert run_command(url_tasks.url_tasks, "missing").error == "Cannot find URL session \"missing\"."
+    assert run_command(url_tasks.url_tasks, "object").error == "\"object\" has no task collections."
@@ -0,0 +1,135 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2015 Bartosz Janda
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+# the Software, and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+# IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import pytest
+from mallet import view_hierarchy
+from mallet.QuartzCore import CALayerInternalLayer
+from mallet.commands import view_tree
+
+# Depth limit, count limit and tags of printed views of `new_hierarchy` hierarchy.
+LIMITS = [(0, 0, [1, 2, 3, 4, 5], False),
+          (1, 0, [1, 2, 5], True),
+          (0, 3, [1, 2, 3], True),
+          (2, 5, [1, 2, 3, 4, 5], False)]
+
+
+def new_view(builder, tag, subviews=None, class_name="UIView"):
+    """
+    Creates view with layer (frame is (tag, 0; 10, 20)).
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :param int tag: View tag.
+    :param list[int] | None subviews: Subviews addresses.
+    :param str class_name: View class name.
+    :return: View address.
+    :rtype: int
+    """
+    is_64bit = builder.pointer_size == 8
+    internal = builder.allocate(0x100)
+    position_offset = CALayerInternalLayer.POSITION_OFFSET_64 if is_64bit else CALayerInternalLayer.POSITION_OFFSET_32
+    bounds_offset = CALayerInternalLayer.BOUNDS_OFFSET_64 if is_64bit else CALayerInternalLayer.BOUNDS_OFFSET_32
+    builder.write_value(internal + position_offset, "CADoublePoint", (tag + 5.0, 10.0))
+    builder.write_value(internal + bounds_offset, "CADoubleRect", (0.0, 0.0, 10.0, 20.0))
+    ivars = {"_layer": builder.new_object("CALayer", {"_attr": {"layer": internal}}), "_tag": tag}
+    if subviews:
+        ivars["_subviewCache"] = builder.new_collection("__NSArrayM", subviews)
+    return builder.new_object(class_name, ivars)
+
+
+def new_hierarchy(builder):
+    """
+    Creates hierarchy: root (tag 1) with subviews 2 (with subviews 3 and 4) and 5.
+
+    :param recorded_lldb.MemoryImageBuilder builder: Memory image builder.
+    :return: Views addresses by tag.
+    :rtype: dict[int, int]
+    """
+    views = dict()
+    views[3] = new_view(builder, 3, class_name="UILabel")
+    views[4] = new_view(builder, 4, class_name="UIButton")
+    views[2] = new_view(builder, 2, [views[3], views[4]])
+    views[5] = new_view(builder, 5)
+    views[1] = new_view(builder, 1, [views[2], views[5]])
+    builder.add_variable("root", "UIView *", views[1])
+    return views
+
+
+def get_walker(target, max_depth=None, max_count=None):
+    """
+    :rtype: view_hierarchy.ViewHierarchyWalker
+    """
+    return view_hierarchy.ViewHierarchyWalker(target.GetProcess(), max_depth, max_count)
+
+
+def test_views_visited_depth_first(builder, build_target):
+    views = new_hierarchy(builder)
+    target = build_target(builder)
+    walker = get_walker(target)
+    nodes = list(walker.walk(views[1]))
+    assert [(n.tag, n.depth) for n in nodes] == [(1, 0), (2, 1), (3, 2), (4, 2), (5, 1)]
+    assert [n.parent for n in nodes] == [None, views[1], views[2], views[2], views[1]]
+    assert [n.class_name for n in nodes] == ["UIView", "UIView", "UILabel", "UIButton", "UIView"]
+    assert nodes[2].frame == (3.0, 0.0, 10.0, 20.0)
+    assert (walker.count, walker.truncated) == (5, False)
+
+
+def test_subviews_cycle_visited_once(builder, build_target):
+    views = new_hierarchy(builder)
+    # Subviews of view 4 contain root and view 2 (corrupted memory).
+    offset = [f.offset for f in builder.type_table.find_type("UIView").fields if f.name == "_subviewCache"][0]
+    builder.write_value(views[4] + offset, "void *", builder.new_collection("__NSArrayI", [views[1], views[2]]))
+    target = build_target(builder)
+    walker = get_walker(target)
+    assert [n.tag for n in walker.walk(views[1])] == [1, 2, 3, 4, 5]
+    assert walker.count == 5
+
+
+@pytest.mark.parametrize("max_depth, max_count, tags, truncated", LIMITS)
+def test_limits(builder, build_target, max_depth, max_count, tags, truncated):
+    views = new_hierarchy(builder)
+    target = build_target(builder)
+    walker = get_walker(target, max_depth or None, max_count or None)
+    assert [n.tag for n in walker.walk(views[1])] == tags
+    assert (walker.count, walker.truncated) == (len(tags), truncated)
+
+
+def test_view_tree_command(builder, build_target, run_command, tmp_path):
+    views = new_hierarchy(builder)
+    build_target(builder)
+    output_path = str(tmp_path / "views.jsonl")
+    result = run_command(view_tree.view_tree, "root", "0", "0", output_path)
+    assert result.error is None
+    lines = result.getvalue().splitlines()
+    assert lines[0] == "<UIView: 0x{:x}; frame = (1 0; 10 20); tag = 1>".format(views[1])
+    assert lines[3] == "   |    | <UIButton: 0x{:x}; frame = (4 0; 10 20); tag = 4>".format(views[4])
+    assert lines[-1] == "5 views."
+    with open(output_path) as output_file:
+        nodes = [json.loads(line) for line in output_file]
+    assert [n["tag"] for n in nodes] == [1, 2, 3, 4, 5]
+    assert nodes[1] == {"depth": 1, "address": "0x{:x}".format(views[2]), "class": "UIView",
+                        "frame": [2.0, 0.0, 10.0, 20.0], "tag": 2, "parent": "0x{:x}".format(views[1])}
+
+    assert run_command(view_tree.view_tree, "root", "1", "2").getvalue().splitlines()[-1] == "2 views (limited)."
+    assert run_command(view_tree.view_tree, "root", "x").error is not None
+    assert run_command(view_tree.view_tree, "missing").error is not None